@@ -0,0 +1,27 @@
+from django.db import connections
+
+
+class ReadReplicaRouter:
+    """
+    Sends reads to the "replica" database alias and writes to "default".
+
+    With SQLite both aliases open the same WAL-mode file; the replica's
+    connections are query-only, so list and detail reads never take a
+    write lock or queue behind ingest on the writer's connection. Reads
+    inside a transaction on "default" stay there, so a write transaction
+    sees its own changes (the rollup and snapshot receivers rely on that).
+    """
+
+    def db_for_read(self, model, **hints):
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return 'replica'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,58 @@
+"""
+Production settings: the development settings plus, on SQLite, a read
+replica alias, and a cache shared between processes. Used by
+gunicorn.conf.py (`make serve`); select them elsewhere with
+DJANGO_SETTINGS_MODULE=RocketDashboard.settings_production.
+"""
+import multiprocessing
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import ALLOWED_HOSTS, BASE_DIR, CACHE_BACKENDS, CACHES, DATABASES, SECRET_KEY
+
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', ','.join(ALLOWED_HOSTS)).split(',')
+
+# gunicorn's workers, the retention job and the management commands run in
+# separate processes, and a write in any of them must reach the response
+# caches and hot windows of the others. Without CACHE_URL they share a file
+# cache next to the database; set CACHE_URL=redis://... when the workers
+# run on more than one host.
+if not os.environ.get('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': CACHE_BACKENDS['file'],
+            'LOCATION': str(BASE_DIR / 'cache'),
+        },
+    }
+
+# As computed by gunicorn.conf.py.
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+if workers > 1 and CACHES['default']['BACKEND'] == CACHE_BACKENDS['locmem']:
+    raise ImproperlyConfigured(
+        f'{workers} workers cannot share a locmem:// cache; set CACHE_URL to a file:// or redis:// URL.'
+    )
+
+if DATABASES['default']['ENGINE'] == 'RocketDashboard.sqlite3':
+    DATABASES = {
+        **DATABASES,
+        'replica': {
+            **DATABASES['default'],
+            'OPTIONS': {
+                'timeout': 20,
+                # The writer's connections have already switched the file to WAL.
+                'init_command': (
+                    'PRAGMA query_only=ON;'
+                    'PRAGMA cache_size=-20000;'
+                    'PRAGMA mmap_size=268435456;'
+                    'PRAGMA temp_store=MEMORY'
+                ),
+                'pool': True,
+            },
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+    DATABASE_ROUTERS = ['RocketDashboard.routers.ReadReplicaRouter']
@@ -0,0 +1,97 @@
+"""
+Django's SQLite backend with the ``init_command`` and ``transaction_mode``
+options that Django 5.1 adds, and a connection pool.
+
+- ``init_command``: SQL statements, separated by semicolons, run on every
+  new connection. Used to switch on WAL and tune the pragmas.
+- ``transaction_mode``: "DEFERRED", "IMMEDIATE" or "EXCLUSIVE", used to
+  begin every atomic block. SQLite begins transactions deferred: they take
+  the write lock only at their first write. In WAL mode, a transaction that
+  read first and tries to write after another connection has committed
+  fails with "database is locked" at once, without waiting out the busy
+  timeout. IMMEDIATE takes the write lock up front, so writers queue for
+  the busy timeout instead.
+
+- ``pool``: True, or the most idle connections to keep. Under ASGI,
+  Django runs every request in a new thread, and connections belong to
+  threads, so CONN_MAX_AGE cannot carry one over to the next request.
+  Instead, closing a connection hands it to a per-process pool, and opening
+  one takes it back, skipping the connect and init_command. Keep
+  CONN_MAX_AGE at 0 so connections return at the end of each request.
+
+Django 5.1 has the first two options, with the same meaning. Once on 5.1,
+ENGINE can go back to django.db.backends.sqlite3 if the pool is dropped.
+"""
+import queue
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+
+TRANSACTION_MODES = {'DEFERRED', 'EXCLUSIVE', 'IMMEDIATE'}
+DEFAULT_POOL_SIZE = 10
+
+# Idle connections per (alias, database file), shared by this process's threads.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        transaction_mode = kwargs.pop('transaction_mode', None)
+        if transaction_mode is not None and transaction_mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'settings.DATABASES[{self.alias!r}]["OPTIONS"]["transaction_mode"] '
+                f'is {transaction_mode!r}; it must be one of {", ".join(sorted(TRANSACTION_MODES))}.'
+            )
+        self.transaction_mode = transaction_mode.upper() if transaction_mode else None
+        self.init_commands = [
+            command.strip() for command in kwargs.pop('init_command', '').split(';') if command.strip()
+        ]
+        pool = kwargs.pop('pool', False)
+        self.pool_size = DEFAULT_POOL_SIZE if pool is True else int(pool or 0)
+        return kwargs
+
+    def _pool(self):
+        # An in-memory database lives only as long as its one connection.
+        if not self.pool_size or self.is_in_memory_db():
+            return None
+        key = (self.alias, str(self.settings_dict['NAME']))
+        with _pools_lock:
+            if key not in _pools:
+                _pools[key] = queue.LifoQueue(maxsize=self.pool_size)
+            return _pools[key]
+
+    def get_new_connection(self, conn_params):
+        pool = self._pool()
+        if pool is not None:
+            try:
+                # Most recently used first: its pages are the likeliest cached.
+                return pool.get_nowait()
+            except queue.Empty:
+                pass
+        conn = super().get_new_connection(conn_params)
+        for command in self.init_commands:
+            conn.execute(command)
+        return conn
+
+    def _close(self):
+        pool = self._pool()
+        if pool is not None and self.connection is not None:
+            with self.wrap_database_errors:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+            try:
+                pool.put_nowait(self.connection)
+                return
+            except queue.Full:
+                pass
+        super()._close()
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            self.cursor().execute('BEGIN')
+        else:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -14,3 +14,20 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'RocketDashboard.settings')
 
 application = get_wsgi_application()
+
+# Runs only when TELEMETRY['RETENTION_INTERVAL'] is set.
+from apps.telemetry.retention import start_scheduler  # noqa: E402
+
+start_scheduler()
+
+# Runs only when TELEMETRY['INGEST_MODE'] is "queued"; replays the journals
+# of queued entries a previous run left unwritten.
+from apps.telemetry.ingest_queue import start_queue  # noqa: E402
+
+start_queue()
+
+# Runs only when TELEMETRY['HOT_WINDOW_HOURS'] is set; loads recent telemetry
+# into memory in the background.
+from apps.telemetry.hotstore import start_hot_window  # noqa: E402
+
+start_hot_window()
@@ -1,13 +1,39 @@
+import copy
+
 from django.contrib import admin
+from django.db import transaction
+
 from .models import TelemetryEntry
+from .signals import entries_changed
 
 
 @admin.register(TelemetryEntry)
 class TelemetryEntryAdmin(admin.ModelAdmin):
     """
     Admin configuration for TelemetryEntry model.
+
+    Writes send entries_changed, like the API, so the rollups stay current.
     """
     list_display = ('satellite_id', 'timestamp', 'altitude', 'velocity', 'status')
     list_filter = ('status', 'satellite_id')
     search_fields = ('satellite_id',)
     ordering = ('-timestamp',)
+
+    def save_model(self, request, obj, form, change):
+        previous = [TelemetryEntry.objects.get(pk=obj.pk)] if change else []
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            entries_changed.send(sender=TelemetryEntry, added=[obj], removed=previous)
+
+    def delete_model(self, request, obj):
+        # delete() clears the primary key, which receivers need.
+        removed = copy.copy(obj)
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            entries_changed.send(sender=TelemetryEntry, added=[], removed=[removed])
+
+    def delete_queryset(self, request, queryset):
+        removed = list(queryset)
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            entries_changed.send(sender=TelemetryEntry, added=[], removed=removed)
@@ -0,0 +1,288 @@
+"""
+Time-bucket aggregation of telemetry for charting.
+
+Grouping happens in the database: entries are truncated to the bucket
+boundary and reduced with MIN/MAX/AVG/COUNT in a single GROUP BY query, so
+a month of data comes back as a few hundred rows rather than every sample.
+On TimescaleDB the buckets come from time_bucket() (see storage.py).
+Hourly and daily requests whose range falls on bucket boundaries are served
+from the rollup tables instead, which hold one row per satellite per bucket.
+Ranges starting inside the hot window are reduced in memory (see hotstore.py).
+"""
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import Avg, Count, F, FloatField, Max, Min, Q, Sum
+from django.db.models.functions import Cast, TruncDay, TruncHour, TruncMinute
+from django.utils import timezone
+
+from .hotstore import hot_window
+from .models import DailyRollup, HourlyRollup, TelemetryEntry
+from .storage import TimeBucket, has_timescaledb
+
+
+# Supported bucket sizes, as accepted by the ?bucket= query parameter.
+BUCKETS = {
+    '1m': TruncMinute,
+    '1h': TruncHour,
+    '1d': TruncDay,
+}
+
+# Length of each bucket size, for time_bucket().
+INTERVALS = {
+    '1m': timedelta(minutes=1),
+    '1h': timedelta(hours=1),
+    '1d': timedelta(days=1),
+}
+
+# The same truncations of a local datetime, for the hot window.
+TRUNCATIONS = {
+    '1m': lambda dt: dt.replace(second=0, microsecond=0),
+    '1h': lambda dt: dt.replace(minute=0, second=0, microsecond=0),
+    '1d': lambda dt: dt.replace(hour=0, minute=0, second=0, microsecond=0),
+}
+
+# Rollup table for each bucket size that has one, with the check that a
+# range boundary falls on the start of a bucket.
+ROLLUPS = {
+    '1h': (HourlyRollup, lambda dt: (dt.minute, dt.second, dt.microsecond) == (0, 0, 0)),
+    '1d': (DailyRollup, lambda dt: (dt.hour, dt.minute, dt.second, dt.microsecond) == (0, 0, 0, 0)),
+}
+
+MEASUREMENTS = ('altitude', 'velocity')
+STATUSES = TelemetryEntry.HealthStatus.values
+
+
+def aggregate(bucket, satellite_id=None, start=None, end=None):
+    """
+    Aggregate telemetry into ``bucket``-sized buckets, oldest first.
+
+    ``start`` is inclusive and ``end`` exclusive. Uses the hot window when
+    it holds the whole range, then the rollup table for the bucket size when
+    there is one and both boundaries are aligned to it; otherwise groups the
+    raw entries.
+    """
+    return _aggregate(bucket, None if not satellite_id else [satellite_id], start, end)
+
+
+def compare(bucket, satellite_ids, field, start=None, end=None, points=None):
+    """
+    Aggregate each of ``satellite_ids`` into ``bucket``-sized buckets on one
+    shared time axis.
+
+    Returns ``(buckets, series)``: the start of every bucket in which any of
+    the satellites has entries, oldest first, and for each satellite, in the
+    order given, a dict of lists aligned with them: "count", and the "min",
+    "max" and "avg" of ``field``, None where the satellite has no entries.
+    The sources are those of aggregate(), grouped by satellite and bucket
+    in a single query.
+
+    With ``points``, runs of consecutive buckets are merged so at most that
+    many remain, as a coarser bucket would. Unlike LTTB, which picks
+    different points for each series, that keeps the series aligned.
+    """
+    rows = _aggregate(bucket, satellite_ids, start, end, by_satellite=True)
+    buckets = list(dict.fromkeys(row['bucket'] for row in rows))
+    positions = {start: i for i, start in enumerate(buckets)}
+    series = {
+        sat: {'count': [0] * len(buckets), 'min': [None] * len(buckets),
+              'max': [None] * len(buckets), 'avg': [None] * len(buckets)}
+        for sat in satellite_ids
+    }
+    for row in rows:
+        values = series[row['satellite_id']]
+        i = positions[row['bucket']]
+        values['count'][i] = row['count']
+        for stat in ('min', 'max', 'avg'):
+            values[stat][i] = row[field][stat]
+
+    if points and len(buckets) > points:
+        size = -(-len(buckets) // points)
+        buckets = buckets[::size]
+        series = {sat: _merge(values, size) for sat, values in series.items()}
+    return buckets, series
+
+
+def _merge(values, size):
+    """
+    Merge each run of ``size`` consecutive buckets of one compare() series.
+    """
+    merged = {'count': [], 'min': [], 'max': [], 'avg': []}
+    for i in range(0, len(values['count']), size):
+        counts = values['count'][i:i + size]
+        filled = [j for j in range(i, i + len(counts)) if values['count'][j]]
+        total = sum(counts)
+        merged['count'].append(total)
+        if not filled:
+            for stat in ('min', 'max', 'avg'):
+                merged[stat].append(None)
+            continue
+        merged['min'].append(min(values['min'][j] for j in filled))
+        merged['max'].append(max(values['max'][j] for j in filled))
+        merged['avg'].append(sum(values['avg'][j] * values['count'][j] for j in filled) / total)
+    return merged
+
+
+def _aggregate(bucket, satellite_ids, start, end, by_satellite=False):
+    window = hot_window()
+    if window is not None:
+        covered = window.covers(start)
+        window.record(covered)
+        if covered:
+            return aggregate_window(window, bucket, satellite_ids, start, end, by_satellite)
+
+    filters = Q()
+    if satellite_ids is not None:
+        filters &= Q(satellite_id__in=satellite_ids)
+
+    if bucket in ROLLUPS:
+        model, aligned = ROLLUPS[bucket]
+        tz = timezone.get_current_timezone()
+        if all(dt is None or aligned(timezone.localtime(dt, tz)) for dt in (start, end)):
+            if start:
+                filters &= Q(bucket_start__gte=start)
+            if end:
+                filters &= Q(bucket_start__lt=end)
+            return aggregate_rollups(model.objects.filter(filters), by_satellite)
+
+    if start:
+        filters &= Q(timestamp__gte=start)
+    if end:
+        filters &= Q(timestamp__lt=end)
+    return aggregate_buckets(TelemetryEntry.objects.filter(filters), bucket, by_satellite)
+
+
+def aggregate_buckets(queryset, bucket, by_satellite=False):
+    """
+    Reduce ``queryset`` to one row per time bucket, oldest first.
+
+    Each row has the bucket start, the entry count, min/max/avg for every
+    measurement and a count per health status. With ``by_satellite``, rows
+    are per satellite and bucket, ordered by bucket and then satellite, and
+    carry the satellite_id.
+    """
+    aggregates = {'entries': Count('id')}
+    for field in MEASUREMENTS:
+        aggregates[f'{field}_min'] = Min(field)
+        aggregates[f'{field}_max'] = Max(field)
+        aggregates[f'{field}_avg'] = Avg(field)
+    for status in STATUSES:
+        aggregates[f'status_{status}'] = Count('id', filter=Q(status=status))
+
+    if has_timescaledb(connections[queryset.db]):
+        start = TimeBucket(INTERVALS[bucket], 'timestamp', timezone.get_current_timezone_name())
+    else:
+        start = BUCKETS[bucket]('timestamp')
+    groups = ['bucket', 'satellite_id'] if by_satellite else ['bucket']
+    rows = (
+        queryset
+        .annotate(bucket=start)
+        .values(*groups)
+        .annotate(**aggregates)
+        .order_by(*groups)
+    )
+    return [_nest(row) for row in rows]
+
+
+def aggregate_window(window, bucket, satellite_ids=None, start=None, end=None, by_satellite=False):
+    """
+    Reduce the entries held in a hot window to one row per bucket, oldest
+    first.
+
+    Produces the same shape as aggregate_buckets().
+    """
+    rows = window.aggregate(TRUNCATIONS[bucket], INTERVALS[bucket], satellite_ids, start, end, by_satellite)
+    for row in rows:
+        for field in MEASUREMENTS:
+            row[f'{field}_avg'] = row.pop(f'{field}_sum') / row['entries']
+    return [_nest(row) for row in rows]
+
+
+def aggregate_rollups(queryset, by_satellite=False):
+    """
+    Combine rollup rows across satellites into one row per bucket, oldest first.
+
+    Produces the same shape as aggregate_buckets().
+    """
+    # Named apart from the rollup columns, which annotations may not shadow.
+    aggregates = {'entries': Sum('count')}
+    for field in MEASUREMENTS:
+        aggregates[f'{field}_min'] = Min(f'{field}_min')
+        aggregates[f'{field}_max'] = Max(f'{field}_max')
+        aggregates[f'{field}_avg'] = Sum(f'{field}_sum') / Cast(Sum('count'), FloatField())
+    for status in STATUSES:
+        aggregates[f'status_{status}'] = Sum(f'{status}_count')
+
+    groups = ['satellite_id'] if by_satellite else []
+    rows = (
+        queryset
+        .values(*groups, bucket=F('bucket_start'))
+        .annotate(**aggregates)
+        .order_by('bucket', *groups)
+    )
+    return [_nest(row) for row in rows]
+
+
+def _nest(row):
+    """
+    Reshape a flat aggregate row into the nested API representation.
+    """
+    return {
+        **({'satellite_id': row['satellite_id']} if 'satellite_id' in row else {}),
+        'bucket': row['bucket'],
+        'count': row['entries'],
+        **{
+            field: {
+                'min': row[f'{field}_min'],
+                'max': row[f'{field}_max'],
+                'avg': row[f'{field}_avg'],
+            }
+            for field in MEASUREMENTS
+        },
+        'status': {status: row[f'status_{status}'] for status in STATUSES},
+    }
+
+
+def lttb(points, threshold):
+    """
+    Downsample ``points`` to ``threshold`` items with Largest-Triangle-Three-Buckets.
+
+    ``points`` is a sequence of ``(x, y)`` pairs ordered by ``x``. Returns
+    the indices of the points to keep; every index when there are no more
+    than ``threshold`` points or ``threshold`` is below 3. The first and last points are always
+    kept, and each bucket in between keeps the point that forms the largest
+    triangle with its neighbours, which preserves peaks and troughs that
+    plain striding would drop.
+    """
+    length = len(points)
+    if threshold >= length or threshold < 3:
+        return list(range(length))
+
+    selected = [0]
+    every = (length - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket, used as the triangle's third vertex.
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, length)
+        span = next_end - next_start
+        avg_x = sum(points[j][0] for j in range(next_start, next_end)) / span
+        avg_y = sum(points[j][1] for j in range(next_start, next_end)) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        selected.append(best)
+        a = best
+
+    selected.append(length - 1)
+    return selected
@@ -0,0 +1,197 @@
+"""
+Response caching for the telemetry list and detail endpoints.
+
+Rendered JSON responses are kept in a per-process LRU. Keys include a
+generation counter held in Django's cache: every telemetry write bumps the
+counter, which makes the cached responses unreachable. The old entries are
+then evicted by the LRU or expire after their TTL. Writes bump the list
+counter and the counter of every entry they change, so detail responses of
+untouched entries survive. With several worker processes, the counters must
+live in a cache shared between them (CACHE_URL, see settings.py) so that a
+write in one process invalidates all.
+
+Responses carry an ETag computed from the body; a request whose
+If-None-Match matches gets a 304 without a body, cached or not.
+"""
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+from apps.telemetry.conf import telemetry_setting
+from apps.telemetry.metrics import render_response
+
+
+LIST_GENERATION_KEY = 'telemetry:generation:list'
+ENTRY_GENERATION_KEY = 'telemetry:generation:entry:{pk}'
+
+
+class ResponseCache:
+    """
+    A thread-safe LRU of rendered responses with a per-item TTL.
+    """
+
+    def __init__(self):
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item['expires'] <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item
+
+    def set(self, key, data, content, content_type, etag):
+        item = {
+            'data': data,
+            'content': content,
+            'content_type': content_type,
+            'etag': etag,
+            'expires': time.monotonic() + telemetry_setting('CACHE_TTL'),
+        }
+        max_entries = telemetry_setting('CACHE_MAX_ENTRIES')
+        with self._lock:
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+response_cache = ResponseCache()
+
+
+def get_generation(key):
+    # Start from a random value so that a counter lost from the cache does
+    # not restart at a number earlier responses were cached under.
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, secrets.randbits(32), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, secrets.randbits(32), timeout=None)
+
+
+def invalidate(pks=()):
+    """
+    Invalidate cached lists, and the cached details of the entries in ``pks``.
+    """
+    bump_generation(LIST_GENERATION_KEY)
+    for pk in pks:
+        bump_generation(ENTRY_GENERATION_KEY.format(pk=pk))
+
+
+def on_entries_changed(sender, added=(), removed=(), **kwargs):
+    pks = [entry.pk for entry in removed]
+    # Bump now so that the writer's own later reads are fresh, and again on
+    # commit, since a concurrent reader may have cached the pre-commit state
+    # under the first bump.
+    invalidate(pks)
+    transaction.on_commit(lambda: invalidate(pks))
+
+
+def make_etag(content):
+    return '"%s"' % hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    Serve GET requests from the response cache, with ETag revalidation.
+
+    Only JSON responses are cached; the browsable API's HTML carries
+    per-request state. Views set ``cache_scope`` and implement
+    ``get_cache_generation()``.
+    """
+    cache_scope = None
+
+    def get_cache_generation(self):
+        return get_generation(LIST_GENERATION_KEY)
+
+    def get_cache_key(self, request):
+        if telemetry_setting('CACHE_TTL') <= 0:
+            return None
+        if request.accepted_renderer.format != 'json':
+            return None
+        # Blank parameters filter nothing, and parameter order does not
+        # matter, so neither should split the cache.
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values if value
+        )
+        # Pagination links are absolute, so the host is part of the key, and
+        # Accept parameters such as indent change the rendered body.
+        return (
+            self.cache_scope,
+            self.get_cache_generation(),
+            request.build_absolute_uri(request.path),
+            tuple(params),
+            request.accepted_media_type,
+        )
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        if key is not None:
+            item = response_cache.get(key)
+            if item is not None:
+                if self._etag_matches(request, item['etag']):
+                    return self._not_modified(item['etag'])
+                # Already rendered: assigning the content skips rendering.
+                response = Response(item['data'])
+                response.content = item['content']
+                response['Content-Type'] = item['content_type']
+                response['ETag'] = item['etag']
+                response['Cache-Control'] = 'no-cache'
+                return response
+        self._cache_key = key
+        return super().get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method != 'GET' or response.status_code != 200 or response.has_header('ETag'):
+            return response
+
+        render_response(response)
+        etag = make_etag(response.content)
+        key = getattr(self, '_cache_key', None)
+        if key is not None:
+            response_cache.set(key, response.data, response.content, response['Content-Type'], etag)
+        if self._etag_matches(request, etag):
+            return self._not_modified(etag)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def _etag_matches(self, request, etag):
+        header = request.headers.get('If-None-Match')
+        return bool(header) and (header.strip() == '*' or etag in parse_etags(header))
+
+    def _not_modified(self, etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
@@ -0,0 +1,154 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class TelemetryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for telemetry keyed on ``(<ordering field>, id)``.
+
+    PageNumberPagination issues a ``COUNT(*)`` and an ``OFFSET`` that grows
+    with the page number, so deep pages get slower the further a client
+    scrolls. Here the cursor stores the sort value and primary key of the
+    last row served, and each page is a range query that walks the index
+    from that row onwards, so page 10,000 costs the same as page 1.
+
+    The sort field comes from the view's OrderingFilter (``-timestamp`` by
+    default) and ``id`` is always appended as a tie-breaker. Because that
+    pair is unique, cursors never need DRF's offset fallback. Ordering by
+    more than one field is rejected with a 400 rather than cut short.
+    """
+    ordering = '-timestamp'
+
+    # Clients scrolling through a long list fetch it in larger chunks. Each
+    # page is one index range scan whatever its size, so the cap only bounds
+    # the response.
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    # Separates the sort value from the primary key inside a cursor position.
+    # The primary key is always numeric, so splitting on the last separator
+    # is safe even if the sort value contains one.
+    position_separator = '|'
+
+    multiple_ordering_message = 'Cursor pagination orders by a single field.'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if len(ordering) > 1:
+            raise exceptions.ValidationError({'ordering': [self.multiple_ordering_message]})
+        field = ordering[0]
+        # The timestamp indexes are descending and SQLite keeps the rowid
+        # ascending within them, so running the tie-breaker opposite to the
+        # sort field lets the index satisfy the whole ORDER BY.
+        tiebreaker = 'id' if field.startswith('-') else '-id'
+        return (field, tiebreaker)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (reverse, current_position) = (False, None)
+        else:
+            (_, reverse, current_position) = self.cursor
+
+        # Fetch one extra row to find out whether another page follows.
+        results = self._fetch(queryset, current_position, reverse, self.page_size + 1)
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _fetch(self, queryset, position, reverse, limit):
+        """
+        Up to ``limit`` rows after ``position``, in the cursor's direction.
+
+        Rows from the hot window (hotstore.WindowRows) are sought there
+        first, falling back to their queryset when the window cannot be sure
+        of the page.
+        """
+        if hasattr(queryset, 'seek'):
+            parsed = None if position is None else self._parse_position(queryset, position)
+            results = queryset.seek(parsed, reverse, limit)
+            if results is not None:
+                return results
+            queryset = queryset.queryset
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if position is not None:
+            queryset = queryset.filter(self._position_filter(queryset, position, reverse))
+        return list(queryset[:limit])
+
+    def _parse_position(self, queryset, position):
+        """
+        The sort value and primary key of a cursor position.
+        """
+        value, _, pk = position.rpartition(self.position_separator)
+        field_name = self.ordering[0].lstrip('-')
+        model_field = queryset.model._meta.get_field(field_name)
+        try:
+            return model_field.to_python(value), int(pk)
+        except (ValidationError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position_filter(self, queryset, position, reverse):
+        """
+        Build the keyset comparison that selects rows after ``position``.
+
+        For an ascending sort this is ``field >= value AND (field > value OR
+        id > pk)``, written that way so the leading range condition can seek
+        into the index.
+        """
+        value, pk = self._parse_position(queryset, position)
+        field_name = self.ordering[0].lstrip('-')
+
+        # Test for: (cursor reversed) XOR (ordering reversed), per column.
+        field_lookup, pk_lookup = (
+            'lt' if reverse != order.startswith('-') else 'gt'
+            for order in self.ordering
+        )
+        return (
+            Q(**{f'{field_name}__{field_lookup}e': value})
+            & (Q(**{f'{field_name}__{field_lookup}': value}) | Q(**{f'id__{pk_lookup}': pk}))
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip('-')
+        if isinstance(instance, dict):
+            value, pk = instance[field_name], instance['id']
+        else:
+            # Model instances, or the named rows of the list's values_list() path.
+            value, pk = getattr(instance, field_name), instance.id
+        return f'{value}{self.position_separator}{pk}'
@@ -0,0 +1,44 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.utils import json
+
+from apps.telemetry.frames import MEDIA_TYPE as FRAME_MEDIA_TYPE, FrameError, decode_frames
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON into a list with one item per line.
+
+    Blank lines are skipped so that a trailing newline is harmless. Like
+    DRF's JSONParser, NaN and Infinity are rejected.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        rows = []
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line.decode(encoding), parse_constant=json.strict_constant))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {line_number} - {exc}')
+        return rows
+
+
+class FrameParser(BaseParser):
+    """
+    Parses binary telemetry frames (see frames.py) into a list of entries.
+    """
+    media_type = FRAME_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return decode_frames(stream.read())
+        except FrameError as exc:
+            raise ParseError(f'Frame parse error - {exc}')
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from apps.telemetry.frames import MEDIA_TYPE as FRAME_MEDIA_TYPE, encode_frames
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders a list of flat records as CSV with a header row.
+
+    Pass ``{'header': False}`` as the renderer context to omit the header,
+    e.g. for every chunk of a streamed export but the first.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if not data:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if renderer_context.get('header', True):
+            writer.writerow(data[0].keys())
+        writer.writerows(record.values() for record in data)
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders a list of records as newline-delimited JSON, one record per line.
+
+    The counterpart of NDJSONParser.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Compact and unescaped, like DRF's JSONRenderer.
+        return ''.join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+            for record in data
+        ).encode()
+
+
+class FrameRenderer(BaseRenderer):
+    """
+    Renders entries as binary telemetry frames (see frames.py), the
+    counterpart of FrameParser.
+
+    Takes a list of entries, one entry, or a page of them. A page's links
+    move to a Link header, and its count, when it has one, to X-Total-Count.
+    Error responses are rendered as JSON.
+    """
+    media_type = FRAME_MEDIA_TYPE
+    format = 'frame'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None and response.status_code >= 400:
+            response['Content-Type'] = JSONRenderer.media_type
+            return JSONRenderer().render(data)
+
+        if isinstance(data, dict) and 'results' in data:
+            if response is not None:
+                links = [f'<{data[rel]}>; rel="{rel}"' for rel in ('next', 'previous') if data.get(rel)]
+                if links:
+                    response['Link'] = ', '.join(links)
+                if 'count' in data:
+                    response['X-Total-Count'] = str(data['count'])
+            data = data['results']
+        elif isinstance(data, dict):
+            data = [data]
+        return encode_frames(data)
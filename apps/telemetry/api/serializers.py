@@ -1,6 +1,11 @@
-from rest_framework import serializers
+import math
 
-from apps.telemetry.models import TelemetryEntry
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from apps.telemetry.aggregation import BUCKETS, MEASUREMENTS
+from apps.telemetry.conf import telemetry_setting
+from apps.telemetry.models import SatelliteState, TelemetryEntry, TelemetryEvent
 
 
 class APIRootSerializer(serializers.Serializer):
@@ -16,7 +21,7 @@ class TelemetryEntrySerializer(serializers.ModelSerializer):
 
     Handles validation for incoming telemetry data:
     - timestamp must be a valid ISO 8601 datetime (handled by DateTimeField).
-    - altitude and velocity must be positive numbers.
+    - altitude and velocity must be positive, finite numbers.
     - status must be one of the defined HealthStatus choices (enforced by model).
     """
 
@@ -30,9 +35,211 @@ class TelemetryEntrySerializer(serializers.ModelSerializer):
     def validate_altitude(self, value):
         if value < 0:
             raise serializers.ValidationError('Altitude must be a positive number.')
+        if not math.isfinite(value):
+            raise serializers.ValidationError(serializers.FloatField.default_error_messages['invalid'])
         return value
 
     def validate_velocity(self, value):
         if value < 0:
             raise serializers.ValidationError('Velocity must be a positive number.')
+        if not math.isfinite(value):
+            raise serializers.ValidationError(serializers.FloatField.default_error_messages['invalid'])
+        return value
+
+
+def represent_entry_rows(rows):
+    """
+    Read-only fast path equivalent to ``TelemetryEntrySerializer(rows, many=True).data``.
+
+    ``rows`` are tuples from ``values_list(*TelemetryEntrySerializer.Meta.fields)``.
+    Building a serializer per row and calling every field's
+    ``to_representation`` dominates the cost of listing entries. Only the
+    timestamp needs converting, and DateTimeField looks up the current time
+    zone and output format for every value, so that is done once here.
+    """
+    fields = TelemetryEntrySerializer.Meta.fields
+    timestamp_index = fields.index('timestamp')
+    field = TelemetryEntrySerializer().fields['timestamp']
+
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        format_timestamp = field.to_representation
+    else:
+        tz = field.default_timezone()
+
+        def format_timestamp(value):
+            if tz is not None:
+                value = value.astimezone(tz)
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+
+    data = []
+    for row in rows:
+        item = dict(zip(fields, row))
+        item['timestamp'] = format_timestamp(row[timestamp_index])
+        data.append(item)
+    return data
+
+
+class TimeRangeQuerySerializer(serializers.Serializer):
+    """
+    Validates optional ``from``/``to`` query parameters.
+
+    ``from`` is inclusive and ``to`` is exclusive, so consecutive ranges
+    never share an entry.
+    """
+
+    def get_fields(self):
+        # "from" is a keyword, so these cannot be declared as class attributes.
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField(input_formats=['iso-8601'], required=False)
+        fields['to'] = serializers.DateTimeField(input_formats=['iso-8601'], required=False)
+        return fields
+
+    def validate(self, attrs):
+        start, end = attrs.get('from'), attrs.get('to')
+        if start and end and start >= end:
+            raise serializers.ValidationError({'to': 'Must be later than "from".'})
+        return attrs
+
+
+class CommaSeparatedField(serializers.CharField):
+    """
+    A query parameter holding a comma-separated list, e.g. "SAT-001,SAT-002".
+
+    Blank items are dropped and duplicates kept once, in order.
+    """
+
+    def to_internal_value(self, data):
+        values = super().to_internal_value(data)
+        return list(dict.fromkeys(value.strip() for value in values.split(',') if value.strip()))
+
+
+# Lookups accepted on the measurements, e.g. ?altitude__gte=400.
+RANGE_LOOKUPS = ('gt', 'gte', 'lt', 'lte')
+
+
+class TelemetryFilterQuerySerializer(TimeRangeQuerySerializer):
+    """
+    Validates the filters of the telemetry list and export.
+
+    ``satellite_id__in`` and ``status__in`` take comma-separated lists, and
+    each measurement takes ``__gt``, ``__gte``, ``__lt`` and ``__lte``
+    bounds.
+    """
+    satellite_id = serializers.CharField(required=False, allow_blank=True)
+    satellite_id__in = CommaSeparatedField(required=False, allow_blank=True)
+    status = serializers.CharField(required=False, allow_blank=True)
+    status__in = CommaSeparatedField(required=False, allow_blank=True)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in MEASUREMENTS:
+            for lookup in RANGE_LOOKUPS:
+                fields[f'{field}__{lookup}'] = serializers.FloatField(required=False)
+        return fields
+
+
+class TelemetryCompareQuerySerializer(TimeRangeQuerySerializer):
+    """
+    Validates the query parameters of the compare endpoint.
+    """
+    satellite_id__in = CommaSeparatedField()
+    bucket = serializers.ChoiceField(choices=list(BUCKETS))
+    field = serializers.ChoiceField(choices=MEASUREMENTS, default='altitude')
+    points = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_satellite_id__in(self, value):
+        if not value:
+            raise serializers.ValidationError('At least one satellite ID is required.')
+        limit = telemetry_setting('COMPARE_MAX_SATELLITES')
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} satellites can be compared at once.')
+        return value
+
+
+class EventQuerySerializer(TimeRangeQuerySerializer):
+    """
+    Validates the query parameters of the event list.
+    """
+    satellite_id = serializers.CharField(required=False)
+    kind = serializers.ChoiceField(choices=TelemetryEvent.Kind.choices, required=False)
+    status = serializers.ChoiceField(choices=TelemetryEntry.HealthStatus.choices, required=False)
+
+
+class TelemetryAggregateQuerySerializer(TimeRangeQuerySerializer):
+    """
+    Validates the query parameters of the aggregate endpoint.
+    """
+    satellite_id = serializers.CharField(required=False)
+    bucket = serializers.ChoiceField(choices=list(BUCKETS))
+    points = serializers.IntegerField(min_value=3, required=False)
+    field = serializers.ChoiceField(choices=MEASUREMENTS, default='altitude')
+
+
+class TelemetryBulkDeleteSerializer(serializers.Serializer):
+    """
+    Validates the body of a bulk DELETE: optional IDs of the entries to target.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, required=False)
+
+    def validate_ids(self, value):
+        limit = telemetry_setting('BULK_MAX_ROWS')
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} IDs can be given at once.')
         return value
+
+
+class TelemetryBulkUpdateSerializer(TelemetryBulkDeleteSerializer, TelemetryEntrySerializer):
+    """
+    Validates the body of a bulk PATCH: optional IDs of the entries to target
+    and the fields to set on all of them, checked as for a single update.
+    """
+
+    class Meta(TelemetryEntrySerializer.Meta):
+        fields = ['ids', 'satellite_id', 'timestamp', 'altitude', 'velocity', 'status']
+
+    def validate(self, attrs):
+        if not attrs.keys() - {'ids'}:
+            raise serializers.ValidationError('At least one field to change is required.')
+        return attrs
+
+
+class SatelliteStateSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a satellite's latest telemetry snapshot.
+
+    ``latest`` has the same shape as a telemetry entry, so clients can
+    treat it like one.
+    """
+    latest = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SatelliteState
+        fields = ['satellite_id', 'last_seen', 'latest']
+
+    def get_latest(self, state):
+        return {
+            'id': state.entry_id,
+            'satellite_id': state.satellite_id,
+            'timestamp': self.fields['last_seen'].to_representation(state.last_seen),
+            'altitude': state.altitude,
+            'velocity': state.velocity,
+            'status': state.status,
+        }
+
+
+class TelemetryEventSerializer(serializers.ModelSerializer):
+    """
+    Serializer for status changes and anomalies found on ingest.
+    """
+
+    class Meta:
+        model = TelemetryEvent
+        fields = [
+            'id', 'satellite_id', 'timestamp', 'kind', 'entry_id', 'previous_status', 'status',
+            'field', 'value', 'expected', 'score', 'detected_at',
+        ]
+        read_only_fields = fields
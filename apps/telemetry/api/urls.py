@@ -6,5 +6,14 @@ app_name = 'telemetry_api'
 urlpatterns = [
     path('', views.APIRootView.as_view(), name='api-root'),
     path('telemetry/', views.TelemetryListCreateView.as_view(), name='telemetry-list'),
+    path('telemetry/aggregate/', views.TelemetryAggregateView.as_view(), name='telemetry-aggregate'),
+    path('telemetry/compare/', views.TelemetryCompareView.as_view(), name='telemetry-compare'),
+    path('telemetry/export/', views.TelemetryExportView.as_view(), name='telemetry-export'),
+    path('telemetry/stream/', views.TelemetryStreamView.as_view(), name='telemetry-stream'),
+    path('telemetry/bulk/', views.TelemetryBulkView.as_view(), name='telemetry-bulk'),
+    path('telemetry/ingest/', views.TelemetryIngestView.as_view(), name='telemetry-ingest'),
+    path('telemetry/hot/', views.TelemetryHotWindowView.as_view(), name='telemetry-hot'),
     path('telemetry/<int:pk>/', views.TelemetryDetailView.as_view(), name='telemetry-detail'),
+    path('events/', views.EventListView.as_view(), name='event-list'),
+    path('satellites/', views.SatelliteListView.as_view(), name='satellite-list'),
 ]
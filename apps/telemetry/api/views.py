@@ -1,12 +1,48 @@
+import copy
+
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
 from django.db.models import Q
-from rest_framework import generics, permissions
+from django.http import JsonResponse, StreamingHttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from apps.telemetry.models import TelemetryEntry
-from .serializers import TelemetryEntrySerializer
+from apps.telemetry.aggregation import MEASUREMENTS, aggregate, compare, lttb
+from apps.telemetry.bulk_edit import delete_entries, update_entries
+from apps.telemetry.conf import telemetry_setting
+from apps.telemetry.export import aiter_chunks, export_chunks, gzip_chunks
+from apps.telemetry.hotstore import WindowRows, get_window, hot_window
+from apps.telemetry.ingest import validate_rows, write_entries
+from apps.telemetry.ingest_queue import QueueFull, get_queue
+from apps.telemetry.models import SatelliteState, TelemetryEntry, TelemetryEvent
+from apps.telemetry.signals import entries_changed
+from apps.telemetry.streaming import event_stream
+from .caching import ENTRY_GENERATION_KEY, CachedResponseMixin, get_generation
+from .pagination import TelemetryCursorPagination
+from .parsers import FrameParser, NDJSONParser
+from .renderers import CSVRenderer, FrameRenderer, NDJSONRenderer
+from .serializers import (
+    RANGE_LOOKUPS,
+    EventQuerySerializer,
+    SatelliteStateSerializer,
+    TelemetryAggregateQuerySerializer,
+    TelemetryBulkDeleteSerializer,
+    TelemetryBulkUpdateSerializer,
+    TelemetryEntrySerializer,
+    TelemetryCompareQuerySerializer,
+    TelemetryEventSerializer,
+    TelemetryFilterQuerySerializer,
+    represent_entry_rows,
+)
 
 
 class APIRootView(APIView):
@@ -18,45 +54,576 @@ class APIRootView(APIView):
     def get(self, request, format=None):
         return Response({
             'telemetry': reverse('telemetry_api:telemetry-list', request=request, format=format),
+            'satellites': reverse('telemetry_api:satellite-list', request=request, format=format),
+            'ingest': reverse('telemetry_api:telemetry-ingest', request=request, format=format),
+            'hot_window': reverse('telemetry_api:telemetry-hot', request=request, format=format),
+            'events': reverse('telemetry_api:event-list', request=request, format=format),
         })
 
 
-class TelemetryListCreateView(generics.ListCreateAPIView):
+def queued_ingest():
+    return telemetry_setting('INGEST_MODE') == 'queued'
+
+
+def enqueue(entries):
     """
-    GET  /api/telemetry/     - Retrieve all telemetry data.
-    POST /api/telemetry/     - Add a new telemetry entry.
+    Hand validated entries to the ingest queue. Returns None once they are
+    journaled, or a 503 response asking the client to retry.
+    """
+    try:
+        get_queue().put(entries)
+    except QueueFull as exc:
+        return Response(
+            {'detail': str(exc)},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'},
+        )
+    return None
+
+
+class TelemetryFilterMixin:
+    """
+    Filtering and ordering shared by the telemetry list and export.
 
     Supports optional query parameters for filtering:
     - satellite_id: Filter by satellite ID.
+    - satellite_id__in: Comma-separated satellite IDs, any of which match.
     - status: Filter by health status (e.g. "healthy", "critical").
+    - status__in: Comma-separated health statuses, any of which match.
+    - altitude__gt, altitude__gte, altitude__lt, altitude__lte and the same
+      for velocity: Bounds on the measurements.
+    - from / to: ISO 8601 timestamp range; "from" is inclusive, "to" exclusive.
+    - ordering: Any of ordering_fields, prefixed with "-" for descending.
 
-    Uses Q objects to build filters so multiple conditions are AND'd together.
+    Uses Q objects to build filters so multiple conditions are AND'd together,
+    all in one query; a list of satellites still probes the
+    (satellite_id, -timestamp) index once per ID. The validated parameters
+    are kept in ``self.filters``: the allowed ``satellite_ids`` and
+    ``statuses`` (None when unrestricted), ``from``, ``to`` and the measurement
+    bounds in ``ranges``.
     """
-    serializer_class = TelemetryEntrySerializer
     filter_backends = [OrderingFilter]
     ordering_fields = ['satellite_id', 'timestamp', 'altitude', 'velocity', 'status']
     ordering = ['-timestamp']
 
     def get_queryset(self):
-        queryset = TelemetryEntry.objects.all()
-        filters = Q()
+        params = TelemetryFilterQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        self.filters = {
+            'satellite_ids': _selection(params.get('satellite_id'), params.get('satellite_id__in')),
+            'statuses': _selection(params.get('status'), params.get('status__in')),
+            'from': params.get('from'),
+            'to': params.get('to'),
+            'ranges': {
+                f'{field}__{lookup}': params[f'{field}__{lookup}']
+                for field in MEASUREMENTS
+                for lookup in RANGE_LOOKUPS
+                if f'{field}__{lookup}' in params
+            },
+        }
+
+        filters = Q(**self.filters['ranges'])
+        if self.filters['satellite_ids'] is not None:
+            filters &= Q(satellite_id__in=self.filters['satellite_ids'])
+        if self.filters['statuses'] is not None:
+            filters &= Q(status__in=self.filters['statuses'])
+        if self.filters['from']:
+            filters &= Q(timestamp__gte=self.filters['from'])
+        if self.filters['to']:
+            filters &= Q(timestamp__lt=self.filters['to'])
+        return TelemetryEntry.objects.filter(filters)
+
+
+def _selection(value, values):
+    """
+    The values allowed by a single-value filter and a list filter on the same
+    field together, or None when neither is given.
+    """
+    selected = [value] if value else None
+    if values:
+        selected = [item for item in values if selected is None or item in selected]
+    return selected
+
+
+# The default renderers plus binary frames (see frames.py), chosen with
+# "Accept: application/x-telemetry-frame" or ?format=frame.
+ENTRY_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, FrameRenderer]
+
+
+class TelemetryListCreateView(TelemetryFilterMixin, CachedResponseMixin, generics.ListCreateAPIView):
+    """
+    GET  /api/telemetry/     - Retrieve all telemetry data.
+    POST /api/telemetry/     - Add a new telemetry entry.
+
+    Filters as described in TelemetryFilterMixin, plus:
+    - pagination: Set to "cursor" to page with opaque next/previous cursors
+      instead of page numbers. Cursor pages skip the COUNT(*) and OFFSET, so
+      their cost does not grow with depth.
+
+    JSON GET responses are cached per normalized query string until the next
+    telemetry write (see caching.py) and carry an ETag for conditional GETs.
+
+    With TELEMETRY['INGEST_MODE'] = 'queued', a valid POST is queued and
+    answered with 202 before it is written (see ingest_queue.py).
+
+    Lists can also be rendered as binary frames (see FrameRenderer).
+
+    Listing reads plain tuples with values_list() instead of model instances
+    and skips the per-row serializer (see represent_entry_rows()). Lists
+    ordered by timestamp are read from the hot window when it holds all
+    they could show (see hotstore.py).
+    """
+    serializer_class = TelemetryEntrySerializer
+    renderer_classes = ENTRY_RENDERER_CLASSES
+    cache_scope = 'telemetry-list'
+
+    @property
+    def pagination_class(self):
+        # Cursor links carry the pagination parameter forward, so following
+        # `next`/`previous` stays in cursor mode.
+        if self.request.query_params.get('pagination') == 'cursor':
+            return TelemetryCursorPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
 
-        satellite_id = self.request.query_params.get('satellite_id')
-        if satellite_id:
-            filters &= Q(satellite_id=satellite_id)
+    def list(self, request, *args, **kwargs):
+        fields = self.get_serializer_class().Meta.fields
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*fields, named=True)
 
-        status = self.request.query_params.get('status')
-        if status:
-            filters &= Q(status=status)
+        rows = self.get_window_rows(queryset)
+        page = self.paginate_queryset(queryset if rows is None else rows)
+        if page is not None:
+            return self.get_paginated_response(represent_entry_rows(page))
+        return Response(represent_entry_rows(queryset))
 
-        return queryset.filter(filters)
+    def get_window_rows(self, queryset):
+        """
+        The hot window's rows standing in for ``queryset``, or None when the
+        window is off, not ready or cannot serve this list.
+        """
+        window = hot_window()
+        if window is None:
+            return None
+        ordering = list(OrderingFilter().get_ordering(self.request, queryset, self))
+        cursor = self.pagination_class is TelemetryCursorPagination
+        # Page numbers need the count of every match, so the whole range.
+        # The window does not index the measurements, so bounds on them are
+        # left to the database.
+        if (
+            ordering not in (['timestamp'], ['-timestamp'])
+            or not (cursor or window.covers(self.filters['from']))
+            or self.filters['ranges']
+        ):
+            window.record(False)
+            return None
+        if not cursor:
+            window.record(True)
+        return WindowRows(
+            window, queryset,
+            satellite_ids=self.filters['satellite_ids'],
+            statuses=self.filters['statuses'],
+            start=self.filters['from'],
+            end=self.filters['to'],
+            descending=ordering == ['-timestamp'],
+        )
 
+    def create(self, request, *args, **kwargs):
+        if not queued_ingest():
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return enqueue([TelemetryEntry(**serializer.validated_data)]) or Response(
+            {'queued': 1}, status=status.HTTP_202_ACCEPTED,
+        )
 
-class TelemetryDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            instance = serializer.save()
+            entries_changed.send(sender=TelemetryEntry, added=[instance], removed=[])
+
+
+class TelemetryDetailView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /api/telemetry/<id>/  - Retrieve a specific telemetry entry by ID.
     PUT    /api/telemetry/<id>/  - Update a specific telemetry entry.
     DELETE /api/telemetry/<id>/  - Delete a specific telemetry entry.
+
+    GET responses are cached until the entry itself is changed.
     """
     queryset = TelemetryEntry.objects.all()
     serializer_class = TelemetryEntrySerializer
+    renderer_classes = ENTRY_RENDERER_CLASSES
+    cache_scope = 'telemetry-detail'
+
+    def get_cache_generation(self):
+        return get_generation(ENTRY_GENERATION_KEY.format(pk=self.kwargs['pk']))
+
+    def perform_update(self, serializer):
+        previous = copy.copy(serializer.instance)
+        with transaction.atomic():
+            instance = serializer.save()
+            entries_changed.send(sender=TelemetryEntry, added=[instance], removed=[previous])
+
+    def perform_destroy(self, instance):
+        # delete() clears the primary key, which receivers need.
+        removed = copy.copy(instance)
+        with transaction.atomic():
+            instance.delete()
+            entries_changed.send(sender=TelemetryEntry, added=[], removed=[removed])
+
+
+class SatelliteListView(generics.ListAPIView):
+    """
+    GET /api/satellites/  - The latest entry of every satellite.
+
+    Reads the SatelliteState snapshot, which is updated whenever telemetry is
+    written, so the cost depends on the number of satellites rather than the
+    number of entries. Not paginated for the same reason. The hot window
+    keeps the same snapshot in memory and answers first when it is ready.
+    """
+    queryset = SatelliteState.objects.all()
+    serializer_class = SatelliteStateSerializer
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        window = hot_window()
+        states = window.satellites() if window is not None else None
+        if window is not None:
+            window.record(states is not None)
+        if states is None:
+            return super().list(request, *args, **kwargs)
+        return Response(self.get_serializer(states, many=True).data)
+
+
+class EventListView(generics.ListAPIView):
+    """
+    GET /api/events/  - Status changes and anomalies, newest first.
+
+    Events are recorded as telemetry is written (see detection.py).
+    Supports optional query parameters for filtering:
+    - satellite_id: Filter by satellite ID.
+    - kind: "status_change" or "anomaly".
+    - status: Filter by the status the satellite reported with the event.
+    - from / to: ISO 8601 timestamp range; "from" is inclusive, "to" exclusive.
+    """
+    serializer_class = TelemetryEventSerializer
+
+    def get_queryset(self):
+        query = EventQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        filters = Q()
+        for name in ('satellite_id', 'kind', 'status'):
+            if params.get(name):
+                filters &= Q(**{name: params[name]})
+        if params.get('from'):
+            filters &= Q(timestamp__gte=params['from'])
+        if params.get('to'):
+            filters &= Q(timestamp__lt=params['to'])
+        return TelemetryEvent.objects.filter(filters)
+
+
+class TelemetryExportView(TelemetryFilterMixin, generics.GenericAPIView):
+    """
+    GET /api/telemetry/export/?format=csv|ndjson|frame  - Download matching entries.
+
+    Takes the same filters and ordering as the list, without pagination.
+    The body is streamed as the rows are read, a chunk of
+    TELEMETRY['EXPORT_CHUNK_SIZE'] at a time, so memory use is constant
+    however many entries match. Clients that send "Accept-Encoding: gzip"
+    get a gzip-encoded stream, compressed as it is produced.
+
+    Errors are reported as JSON whichever format was requested.
+    """
+    renderer_classes = [CSVRenderer, NDJSONRenderer, FrameRenderer]
+
+    def get(self, request, format=None):
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+
+        chunks = export_chunks(queryset, renderer)
+        gzipped = re_accepts_gzip.search(request.headers.get('Accept-Encoding', ''))
+        if gzipped:
+            chunks = gzip_chunks(chunks)
+        if isinstance(request._request, ASGIRequest):
+            chunks = aiter_chunks(chunks)
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f'; charset={renderer.charset}'
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="telemetry.{renderer.format}"'
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+    def handle_exception(self, exc):
+        # The export renderers only handle lists of entries.
+        self.request.accepted_renderer = JSONRenderer()
+        self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+
+class TelemetryBulkView(TelemetryFilterMixin, APIView):
+    """
+    POST   /api/telemetry/bulk/  - Add a batch of telemetry entries.
+    PATCH  /api/telemetry/bulk/  - Change fields of many existing entries.
+    DELETE /api/telemetry/bulk/  - Delete many existing entries.
+
+    Accepts a JSON array (application/json), one entry per line
+    (application/x-ndjson) or binary frames (application/x-telemetry-frame,
+    see frames.py). The batch is validated in a single pass rather
+    than through a serializer per row, and the valid rows are written as
+    multi-row INSERTs of up to TELEMETRY['BULK_CHUNK_SIZE'] rows inside one
+    transaction.
+
+    Responds with the number of rows created and an error list keyed by row
+    index: 201 if every row was stored, 207 if some were rejected and 400 if
+    none were. With TELEMETRY['INGEST_MODE'] = 'queued', the valid rows are
+    queued instead and the response counts them as "queued", with 202 in
+    place of 201.
+
+    PATCH and DELETE target the entries whose IDs are listed in the body's
+    "ids", the entries matching the list view's filters in the query string,
+    or both at once. A PATCH body also holds the fields to set, checked as
+    for a single update. At least one of the two is required, so an empty
+    request cannot change the whole table. Entries are changed
+    TELEMETRY['BULK_EDIT_BATCH_SIZE'] per transaction (see bulk_edit.py) and
+    the response counts them as "updated" or "deleted".
+    """
+    parser_classes = [JSONParser, NDJSONParser, FrameParser]
+
+    def post(self, request, format=None):
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response(
+                {'detail': 'Expected a list of telemetry entries.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_rows = telemetry_setting('BULK_MAX_ROWS')
+        if len(rows) > max_rows:
+            return Response(
+                {'detail': f'A batch may contain at most {max_rows} entries.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        entries, errors = validate_rows(rows)
+        queued = queued_ingest()
+        if not queued:
+            write_entries(entries)
+        elif entries and (busy := enqueue(entries)):
+            return busy
+
+        if not errors:
+            response_status = status.HTTP_202_ACCEPTED if queued else status.HTTP_201_CREATED
+        elif entries:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'queued' if queued else 'created': len(entries), 'errors': errors}, status=response_status)
+
+    def patch(self, request, format=None):
+        serializer = TelemetryBulkUpdateSerializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        changes = dict(serializer.validated_data)
+        queryset = self.get_target_queryset(changes.pop('ids', None))
+        if queryset is None:
+            return self.untargeted()
+        return Response({'updated': update_entries(queryset, changes)})
+
+    def delete(self, request, format=None):
+        serializer = TelemetryBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_target_queryset(serializer.validated_data.get('ids'))
+        if queryset is None:
+            return self.untargeted()
+        return Response({'deleted': delete_entries(queryset)})
+
+    def get_target_queryset(self, ids):
+        """
+        The entries a bulk edit targets: those with the given ``ids`` that
+        match the query string's filters. None if neither was given.
+        """
+        queryset = self.get_queryset()
+        filtered = (
+            self.filters['satellite_ids'] is not None
+            or self.filters['statuses'] is not None
+            or self.filters['from']
+            or self.filters['to']
+            or self.filters['ranges']
+        )
+        if ids is None and not filtered:
+            return None
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return queryset
+
+    def untargeted(self):
+        return Response(
+            {'detail': 'Give the IDs of the entries to change, at least one filter, or both.'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class TelemetryIngestView(APIView):
+    """
+    GET /api/telemetry/ingest/  - The ingest mode and, when queued, the lag.
+
+    In queued mode, reports this process's queue: entries and requests
+    waiting, the age of the oldest in seconds ("lag_seconds"), totals
+    written, the time of the last write and the last write error. Each
+    server process has its own queue.
+    """
+
+    def get(self, request, format=None):
+        mode = telemetry_setting('INGEST_MODE')
+        if mode != 'queued':
+            return Response({'mode': mode})
+        queue_status = get_queue().status()
+        if queue_status['last_write']:
+            queue_status['last_write'] = serializers.DateTimeField().to_representation(queue_status['last_write'])
+        return Response({'mode': mode, **queue_status})
+
+
+class TelemetryHotWindowView(APIView):
+    """
+    GET /api/telemetry/hot/  - Size and use of this process's hot window.
+
+    Reports whether the window is enabled and loaded, where it starts, the
+    entries and satellites held, its memory use in bytes against
+    TELEMETRY['HOT_WINDOW_MAX_ENTRIES'], entries evicted to stay within it,
+    and the queries answered from it ("hits") or passed to the database
+    ("misses"). Each server process has its own window.
+    """
+
+    def get(self, request, format=None):
+        window = get_window()
+        if window is None:
+            return Response({'enabled': False})
+        window_status = window.status()
+        to_representation = serializers.DateTimeField().to_representation
+        for key in ('window_start', 'loaded_at'):
+            if window_status[key]:
+                window_status[key] = to_representation(window_status[key])
+        return Response({'enabled': True, **window_status})
+
+
+class TelemetryAggregateView(APIView):
+    """
+    GET /api/telemetry/aggregate/  - Telemetry reduced to fixed time buckets.
+
+    Query parameters:
+    - bucket (required): Bucket size, one of "1m", "1h" or "1d".
+    - satellite_id: Only aggregate this satellite.
+    - from / to: ISO 8601 range; "from" is inclusive, "to" exclusive.
+    - points: Downsample the buckets to at most this many with LTTB, keeping
+      the shape of the "field" series (altitude by default) for charting.
+
+    The grouping is a single GROUP BY query, over the rollup tables for
+    hourly and daily buckets with aligned ranges. Each result holds the
+    bucket start, entry count, min/max/avg altitude and velocity, and a
+    count per health status.
+    """
+
+    def get(self, request, format=None):
+        params = TelemetryAggregateQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        results = aggregate(
+            params['bucket'],
+            satellite_id=params.get('satellite_id'),
+            start=params.get('from'),
+            end=params.get('to'),
+        )
+
+        if params.get('points'):
+            field = params['field']
+            series = [(row['bucket'].timestamp(), row[field]['avg']) for row in results]
+            results = [results[i] for i in lttb(series, params['points'])]
+
+        to_representation = serializers.DateTimeField().to_representation
+        for row in results:
+            row['bucket'] = to_representation(row['bucket'])
+        return Response({'bucket': params['bucket'], 'results': results})
+
+
+class TelemetryCompareView(APIView):
+    """
+    GET /api/telemetry/compare/  - Several satellites' series side by side.
+
+    Query parameters:
+    - satellite_id__in (required): Comma-separated satellite IDs, at most
+      TELEMETRY['COMPARE_MAX_SATELLITES'].
+    - bucket (required): Bucket size, one of "1m", "1h" or "1d".
+    - field: The measurement compared, altitude by default.
+    - from / to: ISO 8601 range; "from" is inclusive, "to" exclusive.
+    - points: Merge consecutive buckets so at most this many remain.
+
+    Replaces a request per satellite with one response and a single query
+    grouped by satellite and bucket (see aggregation.compare()). "buckets"
+    lists the bucket starts, and "series" holds, per satellite, lists of
+    count, min, max and avg aligned with them; null marks a bucket the
+    satellite has no entries in.
+    """
+
+    def get(self, request, format=None):
+        params = TelemetryCompareQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        buckets, series = compare(
+            params['bucket'],
+            params['satellite_id__in'],
+            params['field'],
+            start=params.get('from'),
+            end=params.get('to'),
+            points=params.get('points'),
+        )
+        to_representation = serializers.DateTimeField().to_representation
+        return Response({
+            'bucket': params['bucket'],
+            'field': params['field'],
+            'buckets': [to_representation(start) for start in buckets],
+            'series': series,
+        })
+
+
+class TelemetryStreamView(View):
+    """
+    GET /api/telemetry/stream/  - Server-Sent Events feed of new telemetry.
+
+    Query parameters:
+    - satellite_id: Only stream entries for this satellite.
+
+    Each new entry is sent as a "telemetry" event whose id is the entry id,
+    so EventSource's automatic reconnect resumes where it left off via the
+    Last-Event-ID header. Streams close after TELEMETRY['STREAM_MAX_SECONDS']
+    and the browser reconnects.
+
+    A plain Django async view rather than a DRF one, since DRF views are
+    synchronous. Needs the ASGI application: under WSGI the response could
+    not be streamed, so it answers 501.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {'detail': 'Streaming requires the ASGI server (RocketDashboard.asgi).'},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        try:
+            last_event_id = int(request.headers.get('Last-Event-ID', ''))
+        except ValueError:
+            last_event_id = None
+
+        response = StreamingHttpResponse(
+            event_stream(request.GET.get('satellite_id'), last_event_id),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx and similar proxies from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
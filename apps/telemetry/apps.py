@@ -5,3 +5,18 @@ class TelemetryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     # Make sure to scope name of app to be withing the apps namespace.
     name = 'apps.telemetry'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import detection, hotstore, metrics, rollups, snapshots
+        from .api import caching
+        from .signals import entries_changed
+
+        connection_created.connect(metrics.install_query_recorder, dispatch_uid='telemetry_query_recorder')
+
+        entries_changed.connect(rollups.on_entries_changed, dispatch_uid='telemetry_rollups')
+        entries_changed.connect(snapshots.on_entries_changed, dispatch_uid='telemetry_snapshots')
+        entries_changed.connect(detection.on_entries_changed, dispatch_uid='telemetry_detection')
+        entries_changed.connect(caching.on_entries_changed, dispatch_uid='telemetry_response_cache')
+        entries_changed.connect(hotstore.on_entries_changed, dispatch_uid='telemetry_hot_window')
@@ -0,0 +1,135 @@
+"""
+Archiving of old telemetry into monthly files.
+
+The live table holds recent history. Whole months before a cutoff are moved
+out to ``telemetry-YYYY-MM.ndjson.gz``, one file per month, in the format of
+the NDJSON export. Rows move a batch at a time: each batch is appended to
+the file as a complete gzip member and synced to disk, then deleted in its
+own short transaction, so writers never wait behind a table-wide DELETE and
+an interrupted run loses nothing. Rows that were written but not yet deleted
+when a run stopped are written again by the next run; restoring skips them.
+
+The rollups and satellite snapshots are left as they are. They already
+summarise the archived months, so hourly and daily aggregates over them keep
+working, and restoring a month puts back the raw rows without counting them
+in the rollups a second time. ``rebuild_rollups`` keeps the rollups from
+before the oldest live entry, but ``--discard-history`` replaces them from
+the live table alone; run that only after restoring whatever was archived.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from . import hotstore, snapshots
+from .api.caching import invalidate
+from .api.renderers import NDJSONRenderer
+from .api.serializers import TelemetryEntrySerializer, represent_entry_rows
+from .ingest import validate_rows
+from .models import TelemetryEntry
+
+
+def next_month(month):
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def month_start(dt):
+    """
+    The start of ``dt``'s month in the current time zone.
+    """
+    dt = timezone.localtime(dt)
+    return datetime(dt.year, dt.month, 1, tzinfo=dt.tzinfo)
+
+
+def archive_path(directory, month):
+    return Path(directory) / f'telemetry-{month:%Y-%m}.ndjson.gz'
+
+
+def archivable_months(before):
+    """
+    Return the start of every month that has entries and ends by ``before``.
+    """
+    oldest = TelemetryEntry.objects.filter(timestamp__lt=before).aggregate(oldest=Min('timestamp'))['oldest']
+    months = []
+    month = month_start(oldest) if oldest else None
+    while month is not None and next_month(month) <= before:
+        if TelemetryEntry.objects.filter(timestamp__gte=month, timestamp__lt=next_month(month)).exists():
+            months.append(month)
+        month = next_month(month)
+    return months
+
+
+def archive_month(month, directory, batch_size):
+    """
+    Move the entries of the month starting at ``month`` to its archive file.
+
+    Returns the number of entries moved.
+    """
+    path = archive_path(directory, month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    renderer = NDJSONRenderer()
+    # Ascending timestamp walks the descending timestamp index backwards, and
+    # every batch starts where the deleted one ended.
+    queryset = (
+        TelemetryEntry.objects
+        .filter(timestamp__gte=month, timestamp__lt=next_month(month))
+        .order_by('timestamp')
+        .values_list(*TelemetryEntrySerializer.Meta.fields)
+    )
+
+    moved = 0
+    while rows := list(queryset[:batch_size]):
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+                archive.write(renderer.render(represent_entry_rows(rows)))
+            raw.flush()
+            os.fsync(raw.fileno())
+        with transaction.atomic():
+            TelemetryEntry.objects.filter(id__in=[row[0] for row in rows]).delete()
+        moved += len(rows)
+
+    if moved:
+        # Detail responses of archived entries expire with the cache TTL.
+        invalidate()
+        hotstore.invalidate(next_month(month))
+    return moved
+
+
+def restore_file(path, batch_size):
+    """
+    Insert the entries of an archive file back under their original ids.
+
+    Entries that already exist are skipped. Returns the number of entries
+    read from the file.
+    """
+    restored = 0
+    latest = None
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        while lines := list(islice(archive, batch_size)):
+            rows = [json.loads(line) for line in lines]
+            entries, errors = validate_rows(rows)
+            if errors:
+                line = restored + errors[0]['index'] + 1
+                raise ValueError(f'{path}, line {line}: {errors[0]["errors"]}')
+            for entry, row in zip(entries, rows):
+                entry.pk = row['id']
+            with transaction.atomic():
+                TelemetryEntry.objects.bulk_create(entries, ignore_conflicts=True)
+                snapshots.apply_changes(added=entries)
+            restored += len(entries)
+            newest = max(entry.timestamp for entry in entries)
+            latest = newest if latest is None else max(latest, newest)
+
+    invalidate()
+    if latest is not None:
+        # Restored entries bypass entries_changed.
+        hotstore.invalidate(latest)
+    return restored
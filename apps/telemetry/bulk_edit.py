@@ -0,0 +1,81 @@
+"""
+Bulk updates and deletes of existing telemetry.
+
+The entries to change are picked by a queryset, usually the list view's
+filters, and are handled TELEMETRY['BULK_EDIT_BATCH_SIZE'] at a time in ID
+order. Each batch is its own transaction. Its rows are read, changed with
+one UPDATE or DELETE, and sent with entries_changed, so the rollups,
+snapshots, hot window and response cache follow as they do for a single PUT
+or DELETE. Batches are short, so other writers queue behind one batch
+rather than the whole edit, and the edit pauses for
+TELEMETRY['BULK_EDIT_PAUSE'] seconds between batches to let them in.
+
+Each batch starts after the last ID of the one before rather than at an
+offset. Updated rows that still match are therefore not visited twice, and
+nothing is skipped when deleted rows leave the selection. A failure rolls
+back only its own batch; the batches before it stay committed. Entries
+written while an edit runs are included if they match and sort after the
+batches already done. Entries still waiting in the ingest queue are not.
+"""
+import copy
+import time
+
+from django.db import transaction
+
+from .conf import telemetry_setting
+from .models import TelemetryEntry
+from .signals import entries_changed
+
+
+def _in_batches(queryset, apply, batch_size, pause):
+    """
+    Call ``apply`` with each batch of entries matched by ``queryset``, inside
+    the batch's transaction. Returns the number of entries matched.
+    """
+    batch_size = batch_size or telemetry_setting('BULK_EDIT_BATCH_SIZE')
+    pause = telemetry_setting('BULK_EDIT_PAUSE') if pause is None else pause
+    queryset = queryset.order_by('pk')
+
+    total = 0
+    last = None
+    while True:
+        with transaction.atomic():
+            batch = queryset if last is None else queryset.filter(pk__gt=last)
+            entries = list(batch.select_for_update()[:batch_size])
+            if entries:
+                apply(entries)
+        total += len(entries)
+        if len(entries) < batch_size:
+            return total
+        last = entries[-1].pk
+        time.sleep(pause)
+
+
+def update_entries(queryset, changes, batch_size=None, pause=None):
+    """
+    Set the fields in ``changes`` on every entry matched by ``queryset``.
+
+    Returns the number of entries updated.
+    """
+    def apply(entries):
+        TelemetryEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(**changes)
+        updated = [copy.copy(entry) for entry in entries]
+        for entry in updated:
+            for field, value in changes.items():
+                setattr(entry, field, value)
+        entries_changed.send(sender=TelemetryEntry, added=updated, removed=entries)
+
+    return _in_batches(queryset, apply, batch_size, pause)
+
+
+def delete_entries(queryset, batch_size=None, pause=None):
+    """
+    Delete every entry matched by ``queryset``.
+
+    Returns the number of entries deleted.
+    """
+    def apply(entries):
+        TelemetryEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        entries_changed.send(sender=TelemetryEntry, added=[], removed=entries)
+
+    return _in_batches(queryset, apply, batch_size, pause)
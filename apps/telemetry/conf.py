@@ -0,0 +1,114 @@
+from django.conf import settings
+
+
+# Defaults for the TELEMETRY settings dict. Projects override individual keys
+# in settings.py, the same way REST_FRAMEWORK overrides DRF's defaults.
+DEFAULTS = {
+    # Rows per INSERT batch on the bulk ingest path.
+    'BULK_CHUNK_SIZE': 5000,
+    # Largest batch a single bulk ingest request may contain.
+    'BULK_MAX_ROWS': 100_000,
+    # "sync" writes POSTed entries before responding; "queued" accepts them
+    # with 202 and writes them in batches from a queue (see ingest_queue.py).
+    'INGEST_MODE': 'sync',
+    # Most entries waiting in each process's ingest queue; POSTs beyond it
+    # get 503.
+    'INGEST_QUEUE_SIZE': 200_000,
+    # Most entries the queue writes per transaction.
+    'INGEST_BATCH_SIZE': 5000,
+    # Seconds queued entries may wait for a batch to fill before they are
+    # written anyway.
+    'INGEST_FLUSH_INTERVAL': 0.2,
+    # Where the ingest queues keep their journals, relative to the working
+    # directory unless absolute.
+    'INGEST_JOURNAL_DIR': 'ingest-journal',
+    # Whether each journal append is fsynced before the POST is answered.
+    # Without it, entries survive a crash of the server but not of the host.
+    'INGEST_FSYNC': True,
+    # Size at which an ingest journal is emptied once everything in it is
+    # written.
+    'INGEST_JOURNAL_MAX_BYTES': 64 * 1024 * 1024,
+    # Most entries a bulk PATCH or DELETE changes per transaction.
+    'BULK_EDIT_BATCH_SIZE': 2000,
+    # Seconds to pause between bulk edit batches so other writers get the
+    # lock.
+    'BULK_EDIT_PAUSE': 0.01,
+    # Hours of recent telemetry each server process keeps in memory to answer
+    # list, satellite and aggregate queries without the database (see
+    # hotstore.py). None disables the hot window. It only starts with a
+    # CACHES backend shared between processes, never LocMemCache.
+    'HOT_WINDOW_HOURS': 24,
+    # Most entries the hot window holds, about 33 bytes each. Beyond it the
+    # oldest are dropped and the window starts later.
+    'HOT_WINDOW_MAX_ENTRIES': 2_000_000,
+    # Most satellites one request to the compare endpoint may ask for.
+    'COMPARE_MAX_SATELLITES': 100,
+    # Whether written entries are checked for status changes and anomalies,
+    # recorded as events (see detection.py).
+    'DETECTION_ENABLED': True,
+    # Weight of the newest rate of change in its moving mean and variance;
+    # higher adapts faster and forgets sooner.
+    'DETECTION_ALPHA': 0.1,
+    # Standard deviations from its moving mean at which a rate of change is
+    # reported as an anomaly.
+    'DETECTION_THRESHOLD': 6.0,
+    # Rates of change a satellite must have sent before its anomalies are
+    # reported.
+    'DETECTION_WARMUP': 10,
+    # Smallest standard deviation assumed for each rate of change, in units
+    # per second, so a satellite whose readings barely move is not flagged
+    # for every small change.
+    'DETECTION_RATE_FLOOR': {'altitude': 0.01, 'velocity': 0.00001},
+    # Seconds between the stream broker's polls for new entries.
+    'STREAM_POLL_INTERVAL': 1.0,
+    # Most entries the broker reads per poll; a full batch is followed by
+    # another poll straight away rather than a sleep.
+    'STREAM_BATCH_SIZE': 1000,
+    # Events buffered per subscriber before it is disconnected as too slow.
+    'STREAM_QUEUE_SIZE': 1000,
+    # Seconds of silence before a keep-alive comment is sent.
+    'STREAM_KEEPALIVE': 15.0,
+    # Seconds before a stream is closed so the client reconnects. Bounds how
+    # long a subscription can outlive a client that went away silently.
+    'STREAM_MAX_SECONDS': 300.0,
+    # Seconds a cached list or detail response may be served; 0 disables
+    # the response cache. Writes invalidate it sooner.
+    'CACHE_TTL': 30,
+    # Most responses kept in each process's response cache.
+    'CACHE_MAX_ENTRIES': 1000,
+    # Rows read from the database and rendered at a time by the export.
+    'EXPORT_CHUNK_SIZE': 2000,
+    # Where archive_telemetry writes its monthly files, relative to the
+    # working directory unless absolute.
+    'ARCHIVE_DIR': 'archive',
+    # Entries moved per transaction when archiving or restoring.
+    'ARCHIVE_BATCH_SIZE': 5000,
+    # Days of raw telemetry kept by the retention job; older entries survive
+    # only in the rollups. None keeps everything.
+    'RETENTION_DAYS': None,
+    # Entries deleted per statement by the retention job.
+    'RETENTION_BATCH_SIZE': 5000,
+    # Seconds to pause between retention batches so writers get the lock.
+    'RETENTION_PAUSE': 0.01,
+    # Seconds between runs of the in-process retention job started by the
+    # WSGI/ASGI application. None disables it; use the retention command
+    # from cron instead.
+    'RETENTION_INTERVAL': None,
+    # SQLite pages released per incremental vacuum step.
+    'COMPACT_PAGES': 1000,
+    # Whether RequestMetricsMiddleware profiles requests for Server-Timing
+    # and /metrics. Read once at startup.
+    'METRICS_ENABLED': True,
+    # Queries taking at least this many milliseconds are logged with their SQL.
+    'SLOW_QUERY_MS': 100,
+    # A request running the same SELECT this many times is logged as a
+    # likely N+1 pattern.
+    'N_PLUS_ONE_THRESHOLD': 10,
+}
+
+
+def telemetry_setting(name):
+    """
+    Return a telemetry setting, falling back to its default.
+    """
+    return getattr(settings, 'TELEMETRY', {}).get(name, DEFAULTS[name])
@@ -0,0 +1,196 @@
+"""
+Detection of status changes and anomalies as telemetry is written.
+
+Each added entry is compared with its satellite's SatelliteBaseline, then
+the baseline is moved forward to include it. Two kinds of TelemetryEvent
+are recorded:
+
+- status_change: the entry's status differs from the satellite's previous
+  one. Changes to critical are also logged as warnings.
+- anomaly: the altitude or velocity changed at a rate more than
+  TELEMETRY['DETECTION_THRESHOLD'] standard deviations from its
+  exponentially weighted moving mean, i.e. it jumped.
+
+The baseline is a few numbers per satellite, so memory and the work per
+entry stay constant however long a satellite reports. Rates of change
+rather than raw values are tracked so that an orbit's steady swing between
+perigee and apogee is not itself an anomaly, and so gaps in reporting are
+allowed for.
+
+The receiver runs inside the write's transaction, like the snapshots, so
+single POSTs, bulk and queued ingest are all covered and events commit or
+roll back with their entries. Baselines are locked while they are
+advanced, so concurrent writers for one satellite take turns. Entries
+timestamped no later than their satellite's last one arrive out of order:
+they are neither compared nor folded into the statistics. Updates and
+deletes of existing entries are not checked.
+"""
+import logging
+from operator import attrgetter
+
+from django.db import transaction
+
+from .conf import telemetry_setting
+from .models import SatelliteBaseline, TelemetryEntry, TelemetryEvent
+
+
+logger = logging.getLogger(__name__)
+
+# (measurement, field of its rate's moving mean, field of its variance)
+TRACKED = (
+    ('altitude', 'altitude_rate', 'altitude_rate_var'),
+    ('velocity', 'velocity_rate', 'velocity_rate_var'),
+)
+BASELINE_FIELDS = [
+    'samples', 'last_seen', 'status', 'altitude', 'velocity',
+    'altitude_rate', 'altitude_rate_var', 'velocity_rate', 'velocity_rate_var',
+]
+
+
+def _start(entry):
+    return SatelliteBaseline(
+        satellite_id=entry.satellite_id,
+        samples=0,
+        last_seen=entry.timestamp,
+        status=entry.status,
+        altitude=entry.altitude,
+        velocity=entry.velocity,
+        altitude_rate=0.0,
+        altitude_rate_var=0.0,
+        velocity_rate=0.0,
+        velocity_rate_var=0.0,
+    )
+
+
+def detect(baselines, entries, alpha, threshold, warmup, rate_floor):
+    """
+    Compare ``entries`` with their satellites' baselines and advance them.
+
+    ``baselines`` maps satellite IDs to SatelliteBaseline instances and is
+    updated in place; satellites not in it yet start a new baseline from
+    their first entry. Entries are taken oldest first. Returns the unsaved
+    TelemetryEvents found.
+    """
+    events = []
+    decay = 1 - alpha
+    floors = [rate_floor[measurement] ** 2 for measurement, _, _ in TRACKED]
+
+    for entry in sorted(entries, key=attrgetter('timestamp')):
+        baseline = baselines.get(entry.satellite_id)
+        if baseline is None:
+            baselines[entry.satellite_id] = _start(entry)
+            continue
+        elapsed = (entry.timestamp - baseline.last_seen).total_seconds()
+        if elapsed <= 0:
+            continue
+
+        if entry.status != baseline.status:
+            events.append(TelemetryEvent(
+                satellite_id=entry.satellite_id,
+                timestamp=entry.timestamp,
+                kind=TelemetryEvent.Kind.STATUS_CHANGE,
+                entry_id=entry.pk,
+                previous_status=baseline.status,
+                status=entry.status,
+            ))
+            baseline.status = entry.status
+
+        warm = baseline.samples >= warmup
+        for (measurement, rate_field, var_field), floor in zip(TRACKED, floors):
+            value = getattr(entry, measurement)
+            previous = getattr(baseline, measurement)
+            mean = getattr(baseline, rate_field)
+            var = getattr(baseline, var_field)
+
+            deviation = (value - previous) / elapsed - mean
+            squared = deviation * deviation
+            spread = var if var > floor else floor
+            limit = threshold * threshold * spread
+            if warm and squared > limit:
+                events.append(TelemetryEvent(
+                    satellite_id=entry.satellite_id,
+                    timestamp=entry.timestamp,
+                    kind=TelemetryEvent.Kind.ANOMALY,
+                    entry_id=entry.pk,
+                    status=entry.status,
+                    field=measurement,
+                    value=value,
+                    expected=previous + mean * elapsed,
+                    score=deviation / spread ** 0.5,
+                ))
+                # An anomaly is folded in only as far as the threshold, so a
+                # spike does not widen the variance enough to hide the next.
+                deviation = limit ** 0.5 if deviation > 0 else -limit ** 0.5
+                squared = limit
+
+            # West's incremental EWMA of the mean and variance.
+            setattr(baseline, rate_field, mean + alpha * deviation)
+            setattr(baseline, var_field, decay * (var + alpha * squared))
+            setattr(baseline, measurement, value)
+
+        baseline.last_seen = entry.timestamp
+        baseline.samples += 1
+
+    return events
+
+
+def apply_changes(added=(), removed=()):
+    """
+    Check newly added entries and record what is found. Returns the events.
+
+    Must be called after the raw rows have been written.
+    """
+    if not telemetry_setting('DETECTION_ENABLED'):
+        return []
+    # An update sends the entry as both removed and added; only new entries
+    # are checked.
+    replaced = {entry.pk for entry in removed}
+    entries = [entry for entry in added if entry.pk is None or entry.pk not in replaced]
+    if not entries:
+        return []
+
+    with transaction.atomic():
+        baselines = {
+            baseline.satellite_id: baseline
+            for baseline in SatelliteBaseline.objects.select_for_update().filter(
+                satellite_id__in={entry.satellite_id for entry in entries},
+            )
+        }
+        existing = list(baselines.values())
+        events = detect(
+            baselines,
+            entries,
+            alpha=telemetry_setting('DETECTION_ALPHA'),
+            threshold=telemetry_setting('DETECTION_THRESHOLD'),
+            warmup=telemetry_setting('DETECTION_WARMUP'),
+            rate_floor=telemetry_setting('DETECTION_RATE_FLOOR'),
+        )
+        created = [baseline for baseline in baselines.values() if baseline.pk is None]
+
+        # A concurrent writer may have started the same baseline since the
+        # SELECT above; take over its row rather than fail.
+        SatelliteBaseline.objects.bulk_create(
+            created, update_conflicts=True, unique_fields=['satellite_id'], update_fields=BASELINE_FIELDS,
+        )
+        SatelliteBaseline.objects.bulk_update(existing, BASELINE_FIELDS)
+        TelemetryEvent.objects.bulk_create(events)
+
+    for event in events:
+        if event.kind == TelemetryEvent.Kind.STATUS_CHANGE and event.status == TelemetryEntry.HealthStatus.CRITICAL:
+            logger.warning(
+                '%s changed from %s to critical at %s', event.satellite_id, event.previous_status, event.timestamp,
+            )
+    return events
+
+
+def reset_baselines():
+    """
+    Forget every satellite's baseline, after entries were written or removed
+    without entries_changed. Each satellite starts a new one, and warms up
+    again, with its next entry.
+    """
+    SatelliteBaseline.objects.all().delete()
+
+
+def on_entries_changed(sender, added=(), removed=(), **kwargs):
+    apply_changes(added=added, removed=removed)
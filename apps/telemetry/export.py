@@ -0,0 +1,53 @@
+"""
+Streaming export of telemetry.
+
+Rows are read with a chunked iterator, which is a server-side cursor on
+PostgreSQL, and rendered a chunk at a time, so memory use depends on
+TELEMETRY['EXPORT_CHUNK_SIZE'] rather than on how many entries match.
+Compression is a single gzip stream fed chunk by chunk.
+"""
+import zlib
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from .api.serializers import TelemetryEntrySerializer, represent_entry_rows
+from .conf import telemetry_setting
+
+
+def export_chunks(queryset, renderer):
+    """
+    Yield ``queryset`` rendered with ``renderer``, one chunk of entries at a time.
+    """
+    chunk_size = telemetry_setting('EXPORT_CHUNK_SIZE')
+    rows = queryset.values_list(*TelemetryEntrySerializer.Meta.fields).iterator(chunk_size=chunk_size)
+    context = {'header': True}
+    while chunk := list(islice(rows, chunk_size)):
+        yield renderer.render(represent_entry_rows(chunk), renderer_context=context)
+        context = {'header': False}
+
+
+def gzip_chunks(chunks):
+    """
+    Compress an iterable of bytes into one gzip stream.
+
+    Every chunk is flushed so the client receives data as it is produced
+    rather than once the compressor's buffer fills.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+async def aiter_chunks(chunks):
+    """
+    Iterate a synchronous iterator of bytes from async code.
+
+    Under ASGI, Django collects a synchronous streaming iterator into a list
+    before sending it. Advancing the iterator in the database thread one
+    chunk at a time keeps the export streaming.
+    """
+    advance = sync_to_async(next)
+    while (chunk := await advance(chunks, None)) is not None:
+        yield chunk
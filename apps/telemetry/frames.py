@@ -0,0 +1,152 @@
+"""
+A compact binary encoding of telemetry entries.
+
+JSON spends most of its bytes, and most of the parse time, on repeating
+field names, satellite IDs and ISO timestamps. A frame stores each distinct
+satellite ID once and every entry as a fixed-size struct, little-endian:
+
+    header      magic b"TLM1", uint16 satellite count, uint32 entry count
+    satellites  per satellite: uint16 byte length, UTF-8 ID
+    entries     per entry, 35 bytes:
+                int64   id (0 for entries not yet stored)
+                int64   timestamp, milliseconds since the Unix epoch (UTC)
+                uint16  index into the satellite table
+                float64 altitude
+                float64 velocity
+                uint8   index of the status in HEALTH_STATUSES
+
+Frames are self-contained and may be concatenated, so a stream of them
+(the export, a chunk at a time) parses the same as one large frame.
+Timestamps are kept to the millisecond; finer precision is dropped. NaN and
+infinite measurements are rejected like other malformed input.
+"""
+import math
+import struct
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from .models import TelemetryEntry
+
+
+MEDIA_TYPE = 'application/x-telemetry-frame'
+MAGIC = b'TLM1'
+HEADER = struct.Struct('<4sHI')
+NAME_LENGTH = struct.Struct('<H')
+ENTRY = struct.Struct('<qqHddB')
+
+HEALTH_STATUSES = tuple(TelemetryEntry.HealthStatus.values)
+STATUS_CODES = {status: code for code, status in enumerate(HEALTH_STATUSES)}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MILLISECOND = timedelta(milliseconds=1)
+# Frames hold at most this many satellites, the range of the uint16 index.
+MAX_SATELLITES = 0xFFFF
+
+
+class FrameError(ValueError):
+    """
+    Raised for bytes that are not a valid sequence of frames.
+    """
+
+
+def _epoch_ms(timestamp):
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return (timestamp - EPOCH) // MILLISECOND
+
+
+def encode_frames(entries):
+    """
+    Encode entry dicts, as the API represents them, into frame bytes.
+
+    Timestamps may be datetimes or ISO 8601 strings; a missing id is
+    written as 0. Larger sets of satellites are split across frames.
+    """
+    frames = []
+    satellites = {}
+    packed = []
+    pack = ENTRY.pack
+    for entry in entries:
+        satellite_id = entry['satellite_id']
+        index = satellites.get(satellite_id)
+        if index is None:
+            if len(satellites) == MAX_SATELLITES:
+                frames.append(_frame(satellites, packed))
+                satellites = {}
+                packed = []
+            index = satellites[satellite_id] = len(satellites)
+        packed.append(pack(
+            entry.get('id') or 0,
+            _epoch_ms(entry['timestamp']),
+            index,
+            entry['altitude'],
+            entry['velocity'],
+            STATUS_CODES[entry['status']],
+        ))
+    frames.append(_frame(satellites, packed))
+    return b''.join(frames)
+
+
+def _frame(satellites, packed):
+    names = []
+    for satellite_id in satellites:
+        name = satellite_id.encode()
+        names.append(NAME_LENGTH.pack(len(name)) + name)
+    return HEADER.pack(MAGIC, len(satellites), len(packed)) + b''.join(names) + b''.join(packed)
+
+
+def decode_frames(data):
+    """
+    Decode frame bytes into entry dicts with ``id`` (None when 0),
+    ``satellite_id``, ``timestamp`` (an aware UTC datetime), ``altitude``,
+    ``velocity`` and ``status``.
+
+    Raises FrameError for malformed input, including NaN or infinite
+    measurements.
+    """
+    data = memoryview(data)
+    entries = []
+    offset = 0
+    while offset < len(data):
+        try:
+            magic, satellite_count, entry_count = HEADER.unpack_from(data, offset)
+        except struct.error:
+            raise FrameError(f'Truncated frame header at byte {offset}.')
+        if magic != MAGIC:
+            raise FrameError(f'No frame starts at byte {offset}.')
+        offset += HEADER.size
+
+        satellites = []
+        try:
+            for _ in range(satellite_count):
+                length, = NAME_LENGTH.unpack_from(data, offset)
+                offset += NAME_LENGTH.size
+                if offset + length > len(data):
+                    raise struct.error
+                satellites.append(str(data[offset:offset + length], 'utf-8'))
+                offset += length
+        except struct.error:
+            raise FrameError('Truncated satellite table.')
+        except UnicodeDecodeError:
+            raise FrameError('Satellite IDs must be UTF-8.')
+
+        end = offset + entry_count * ENTRY.size
+        if end > len(data):
+            raise FrameError('Truncated entries.')
+        try:
+            for pk, ms, satellite, altitude, velocity, status in ENTRY.iter_unpack(data[offset:end]):
+                if not (math.isfinite(altitude) and math.isfinite(velocity)):
+                    raise FrameError('Altitude and velocity must be finite.')
+                entries.append({
+                    'id': pk or None,
+                    'satellite_id': satellites[satellite],
+                    'timestamp': EPOCH + ms * MILLISECOND,
+                    'altitude': altitude,
+                    'velocity': velocity,
+                    'status': HEALTH_STATUSES[status],
+                })
+        except IndexError:
+            raise FrameError('Entry refers to an unknown satellite or status.')
+        except OverflowError:
+            raise FrameError('Timestamp out of range.')
+        offset = end
+    return entries
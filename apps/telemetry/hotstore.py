@@ -0,0 +1,791 @@
+"""
+An in-memory, column-oriented window of recent telemetry.
+
+Most dashboard queries look at the last day. A HotWindow keeps every entry
+from the last TELEMETRY['HOT_WINDOW_HOURS'] hours in this process, as one
+set of column arrays per satellite: ids and timestamps (microseconds since
+the epoch) as int64, altitude and velocity as float64 and the status as a
+uint8 code. The arrays are packed C values from the array module, about 33
+bytes an entry, sorted by timestamp. A time range is then two bisects, and
+the reductions behind an aggregate bucket (min, max, sum and a count per
+status) run over array slices in C rather than over Python objects.
+
+The list (page numbers and cursors), /api/satellites/ and the aggregates
+are answered from the window when everything they could return lies inside
+it, and from the database otherwise: a page-numbered list or an aggregate
+needs a ``from`` inside the window, while a cursor page of the newest
+entries only needs the window to hold a full page of matches.
+
+The window follows writes through entries_changed, once their transaction
+commits. Writes in other processes are noticed through generation counters
+in Django's cache, as the response cache does: new entries are caught up
+with one query for ids above the highest read from the database, rather
+than the highest written here, since another process may commit a lower id
+after it. Updates or deletions elsewhere make the window reload. Like the stream broker, the catch-up
+relies on ids committing in order, which SQLite guarantees. A process-local
+cache (LocMemCache, the default) would hide those counters from the other
+workers and from management commands, so the window is not started with one.
+
+Memory is bounded by TELEMETRY['HOT_WINDOW_MAX_ENTRIES']. Beyond it the
+oldest entries are dropped and the window starts later, so fewer queries
+fall inside it. GET /api/telemetry/hot/ and /metrics report the window's
+size, memory use and hit rate.
+"""
+import bisect
+import heapq
+import logging
+import math
+import threading
+import time
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .conf import telemetry_setting
+from .models import SatelliteState, TelemetryEntry
+
+
+logger = logging.getLogger(__name__)
+
+MEASUREMENTS = ('altitude', 'velocity')
+STATUSES = tuple(TelemetryEntry.HealthStatus.values)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+HOUR = 3600 * 1_000_000
+
+# Bumped by every process on committing new entries, and on committing
+# changes to or removals of existing ones.
+APPEND_GENERATION_KEY = 'telemetry:generation:hot:append'
+REWRITE_GENERATION_KEY = 'telemetry:generation:hot:rewrite'
+# Cache backends other processes cannot read, and so cannot share the
+# generation counters through.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+# Share of HOT_WINDOW_MAX_ENTRIES kept when the window outgrows it, so that
+# eviction runs now and then rather than on every write.
+EVICT_TO = 0.9
+# Microseconds the window may reach back beyond HOT_WINDOW_HOURS before the
+# oldest entries are trimmed.
+TRIM_SLACK = 60 * 1_000_000
+LOAD_CHUNK_SIZE = 10_000
+
+# Rows in the shape of the list's values_list(named=True) rows.
+Row = namedtuple('Row', ['id', 'satellite_id', 'timestamp', 'altitude', 'velocity', 'status'])
+
+
+def to_micros(dt):
+    return (dt - EPOCH) // MICROSECOND
+
+
+def from_micros(micros):
+    return EPOCH + micros * MICROSECOND
+
+
+def entry_row(entry):
+    """
+    ``(id, satellite_id, microseconds, altitude, velocity, status code)`` for
+    a TelemetryEntry.
+    """
+    return (
+        entry.pk, entry.satellite_id, to_micros(entry.timestamp),
+        entry.altitude, entry.velocity, STATUS_CODES[entry.status],
+    )
+
+
+class Columns:
+    """
+    One satellite's entries in the window, as parallel arrays.
+
+    Sorted by timestamp and, within a timestamp, by id descending: the
+    list's order, read backwards.
+    """
+    __slots__ = ('ids', 'times', 'altitude', 'velocity', 'status')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.times = array('q')
+        self.altitude = array('d')
+        self.velocity = array('d')
+        self.status = array('B')
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def arrays(self):
+        return (self.ids, self.times, self.altitude, self.velocity, self.status)
+
+    @property
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self.arrays)
+
+    def position(self, micros, pk):
+        """
+        The index at which the entry (micros, pk) is or would be.
+        """
+        ids = self.ids
+        i = bisect.bisect_left(self.times, micros)
+        end = bisect.bisect_right(self.times, micros, i)
+        while i < end and ids[i] > pk:
+            i += 1
+        return i
+
+    def holds(self, i, micros, pk):
+        return i < len(self.times) and self.times[i] == micros and self.ids[i] == pk
+
+    def insert(self, pk, micros, altitude, velocity, status):
+        """
+        Add an entry in order. Returns False if it is already held.
+        """
+        times = self.times
+        if not times or micros > times[-1] or (micros == times[-1] and pk < self.ids[-1]):
+            # Entries nearly always arrive newest last.
+            for column, value in zip(self.arrays, (pk, micros, altitude, velocity, status)):
+                column.append(value)
+            return True
+        i = self.position(micros, pk)
+        if self.holds(i, micros, pk):
+            return False
+        for column, value in zip(self.arrays, (pk, micros, altitude, velocity, status)):
+            column.insert(i, value)
+        return True
+
+    def remove(self, pk, micros):
+        """
+        Remove an entry. Returns False if it was not held.
+        """
+        i = self.position(micros, pk)
+        if not self.holds(i, micros, pk):
+            return False
+        for column in self.arrays:
+            del column[i]
+        return True
+
+    def trim(self, cutoff):
+        """
+        Drop the entries before ``cutoff``. Returns how many were dropped.
+        """
+        i = bisect.bisect_left(self.times, cutoff)
+        if i:
+            for column in self.arrays:
+                del column[:i]
+        return i
+
+    def count_from(self, cutoff):
+        return len(self.times) - bisect.bisect_left(self.times, cutoff)
+
+    def span(self, start=None, end=None):
+        """
+        The index range of the entries from ``start`` (inclusive) to ``end``
+        (exclusive), in microseconds.
+        """
+        lo = 0 if start is None else bisect.bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect.bisect_left(self.times, end)
+        return lo, hi
+
+    def count(self, lo, hi, statuses=None):
+        if statuses is None:
+            return hi - lo
+        status = self.status[lo:hi]
+        return sum(status.count(code) for code in statuses)
+
+    def keys(self, lo, hi, statuses, descending, tag):
+        """
+        Sort keys ``(micros, -id, index, tag)`` of the entries in ``lo:hi``
+        with one of ``statuses``, newest first when ``descending``.
+        """
+        times, ids, status = self.times, self.ids, self.status
+        indices = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        for i in indices:
+            if statuses is None or status[i] in statuses:
+                yield times[i], -ids[i], i, tag
+
+    def row(self, satellite_id, i):
+        return Row(
+            self.ids[i], satellite_id, from_micros(self.times[i]),
+            self.altitude[i], self.velocity[i], STATUSES[self.status[i]],
+        )
+
+    def latest(self):
+        """
+        ``(id, micros, altitude, velocity, status code)`` of the newest entry
+        by timestamp and then id, which heads the last run of equal times.
+        """
+        i = bisect.bisect_left(self.times, self.times[-1])
+        return self.ids[i], self.times[i], self.altitude[i], self.velocity[i], self.status[i]
+
+
+class HotWindow:
+    """
+    The last ``hours`` of telemetry, held in Columns per satellite.
+
+    Every method is thread-safe; queries and writes take turns on one lock.
+    """
+
+    def __init__(self, hours, max_entries):
+        self.length = int(hours * HOUR)
+        self.max_entries = max_entries
+
+        self._columns = {}
+        # The latest entry of every satellite, in or out of the window, as
+        # (id, micros, altitude, velocity, status code). Satellites whose
+        # latest entry was removed and could not be replaced are unknown.
+        self._latest = {}
+        self._unknown = set()
+        # Every entry from here on, in microseconds, is held.
+        self._start = None
+        self._size = 0
+        # Every entry up to this id was read from the database, by load() or
+        # _catch_up(). Local writes do not move it: another process may
+        # commit a lower id after them.
+        self._synced_id = 0
+        self._generations = (None, None)
+
+        self._lock = threading.RLock()
+        self._ready = False
+        self._loading = False
+        # Changes committed during a load, applied once it finishes.
+        self._pending = None
+
+        self.loaded_at = None
+        self.load_seconds = None
+        self.evicted = 0
+        self.hits = 0
+        self.misses = 0
+
+    # Loading
+
+    def load(self):
+        """
+        Read the window from the database, replacing what is held.
+        """
+        started = time.monotonic()
+        with self._lock:
+            self._ready = False
+            self._pending = []
+            for key in (APPEND_GENERATION_KEY, REWRITE_GENERATION_KEY):
+                cache.add(key, 0, timeout=None)
+            generations = _read_generations()
+        start = to_micros(timezone.now()) - self.length
+        max_id = TelemetryEntry.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+
+        columns = {}
+        size = 0
+        rows = (
+            TelemetryEntry.objects
+            .filter(timestamp__gte=from_micros(start))
+            .order_by('satellite_id', 'timestamp', '-id')
+            .values_list('id', 'satellite_id', 'timestamp', 'altitude', 'velocity', 'status')
+        )
+        for pk, satellite_id, timestamp, altitude, velocity, status in rows.iterator(chunk_size=LOAD_CHUNK_SIZE):
+            target = columns.get(satellite_id)
+            if target is None:
+                target = columns[satellite_id] = Columns()
+            size += target.insert(pk, to_micros(timestamp), altitude, velocity, STATUS_CODES[status])
+        latest = {
+            state.satellite_id: (
+                state.entry_id, to_micros(state.last_seen), state.altitude, state.velocity, STATUS_CODES[state.status],
+            )
+            for state in SatelliteState.objects.all()
+        }
+
+        with self._lock:
+            self._columns = columns
+            self._latest = latest
+            self._unknown = set()
+            self._start = start
+            self._size = size
+            self._synced_id = max_id
+            self._generations = generations
+            for added, removed in self._pending:
+                self._apply(added, removed)
+            self._pending = None
+            self._evict()
+            self._ready = True
+            self._loading = False
+            self.loaded_at = timezone.now()
+            self.load_seconds = round(time.monotonic() - started, 3)
+        logger.info('Loaded %d entries into the hot window in %.2fs', size, self.load_seconds)
+
+    def start(self):
+        """
+        Load the window in a background thread; queries use the database
+        until it is ready.
+        """
+        with self._lock:
+            if self._loading:
+                return
+            self._loading = True
+            self._ready = False
+        threading.Thread(target=self._load_in_background, name='telemetry-hot-window', daemon=True).start()
+
+    def _load_in_background(self):
+        try:
+            self.load()
+        except Exception:
+            logger.exception('Loading the hot window failed')
+            with self._lock:
+                self._loading = False
+                self._pending = None
+        finally:
+            connection.close()
+
+    # Writes
+
+    def apply(self, added=(), removed=()):
+        """
+        Bring the window up to date with committed changes, given as
+        entry_row() tuples.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((added, removed))
+            elif self._ready:
+                self._apply(added, removed)
+            # Otherwise no load has started yet, and it will read these.
+            append, rewrite = self._generations
+            # A counter that moved further was also bumped by another
+            # process, whose changes the next query catches up with.
+            if added:
+                generation = _bump(APPEND_GENERATION_KEY)
+                if append is not None and generation == append + 1:
+                    append = generation
+            if removed:
+                generation = _bump(REWRITE_GENERATION_KEY)
+                if rewrite is not None and generation == rewrite + 1:
+                    rewrite = generation
+            self._generations = (append, rewrite)
+
+    def _apply(self, added, removed):
+        touched = set()
+        for pk, satellite_id, micros, *_ in removed:
+            columns = self._columns.get(satellite_id)
+            if columns is not None and columns.remove(pk, micros):
+                self._size -= 1
+                if not columns:
+                    del self._columns[satellite_id]
+            latest = self._latest.get(satellite_id)
+            if latest is not None and latest[0] == pk:
+                del self._latest[satellite_id]
+                self._unknown.add(satellite_id)
+                touched.add(satellite_id)
+
+        for pk, satellite_id, micros, altitude, velocity, status in added:
+            if micros >= self._start:
+                columns = self._columns.get(satellite_id)
+                if columns is None:
+                    columns = self._columns[satellite_id] = Columns()
+                self._size += columns.insert(pk, micros, altitude, velocity, status)
+            latest = self._latest.get(satellite_id)
+            if satellite_id in self._unknown:
+                touched.add(satellite_id)
+            elif latest is None or (micros, pk) > (latest[1], latest[0]):
+                self._latest[satellite_id] = (pk, micros, altitude, velocity, status)
+
+        # Every entry newer than the window start is held, so a satellite
+        # with entries in the window has its latest among them.
+        for satellite_id in touched:
+            columns = self._columns.get(satellite_id)
+            if columns:
+                self._latest[satellite_id] = columns.latest()
+                self._unknown.discard(satellite_id)
+        self._evict()
+
+    def _trim(self, cutoff):
+        for satellite_id, columns in list(self._columns.items()):
+            self._size -= columns.trim(cutoff)
+            if not columns:
+                del self._columns[satellite_id]
+        self._start = cutoff
+
+    def _evict(self):
+        """
+        Move the window start forward until it holds at most EVICT_TO of
+        max_entries.
+        """
+        if self._size <= self.max_entries:
+            return
+        target = int(self.max_entries * EVICT_TO)
+        lo = self._start
+        hi = max(columns.times[-1] for columns in self._columns.values()) + 1
+        # The earliest start keeping no more than target entries.
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if sum(columns.count_from(middle) for columns in self._columns.values()) > target:
+                lo = middle + 1
+            else:
+                hi = middle
+        size = self._size
+        self._trim(lo)
+        self.evicted += size - self._size
+
+    # Keeping up with other processes
+
+    def sync(self):
+        """
+        Make the window current for a query. Returns False when the database
+        must answer instead.
+        """
+        with self._lock:
+            if not self._ready:
+                return False
+            append, rewrite = _read_generations()
+            if rewrite != self._generations[1]:
+                # Changed or removed elsewhere: only a reload can tell how.
+                self.start()
+                return False
+            if append != self._generations[0]:
+                self._catch_up()
+                self._generations = (append, rewrite)
+            cutoff = to_micros(timezone.now()) - self.length
+            if cutoff - self._start > TRIM_SLACK:
+                self._trim(cutoff)
+            return True
+
+    def _catch_up(self):
+        # Local writes since the last sync are read again; Columns.insert()
+        # skips the entries already held.
+        rows = TelemetryEntry.objects.filter(id__gt=self._synced_id).order_by('id')
+        added = [entry_row(entry) for entry in rows.iterator(chunk_size=LOAD_CHUNK_SIZE)]
+        if added:
+            self._apply(added, ())
+            self._synced_id = added[-1][0]
+
+    def invalidate(self):
+        """
+        Reload the window here and in every process sharing the cache.
+        """
+        _bump(REWRITE_GENERATION_KEY)
+        self.start()
+
+    # Queries
+
+    def covers(self, start):
+        """
+        Whether every entry from ``start`` on is held.
+        """
+        return self._ready and start is not None and to_micros(start) >= self._start
+
+    def _selected(self, satellite_ids):
+        if satellite_ids is None:
+            return list(self._columns.items())
+        return [(sat, self._columns[sat]) for sat in satellite_ids if sat in self._columns]
+
+    def count(self, satellite_ids, statuses, start, end):
+        with self._lock:
+            return sum(columns.count(*columns.span(start, end), statuses) for _, columns in self._selected(satellite_ids))
+
+    def rows(self, satellite_ids, statuses, start, end, descending, after=None, offset=0, limit=None):
+        """
+        Matching entries in list order: by timestamp, newest first when
+        ``descending``, then by id the other way. ``after`` is a
+        ``(micros, id)`` position the rows follow.
+        """
+        with self._lock:
+            selected = self._selected(satellite_ids)
+            iterators = []
+            for tag, (_, columns) in enumerate(selected):
+                lo, hi = columns.span(start, end)
+                if after is not None:
+                    i = columns.position(*after)
+                    if descending:
+                        hi = min(hi, i)
+                    else:
+                        lo = max(lo, i + columns.holds(i, *after))
+                iterators.append(columns.keys(lo, hi, statuses, descending, tag))
+            merged = heapq.merge(*iterators, reverse=descending)
+            stop = None if limit is None else offset + limit
+            return [
+                selected[tag][1].row(selected[tag][0], i)
+                for _, _, i, tag in islice(merged, offset, stop)
+            ]
+
+    def aggregate(self, truncate, interval, satellite_ids=None, start=None, end=None, by_satellite=False):
+        """
+        Reduce the entries in the range to one row per bucket, oldest first,
+        with the bucket start, "entries", min/max/sum per measurement and a
+        count per status. ``truncate`` maps a local datetime to the start of
+        its bucket and ``interval`` is the bucket length. With
+        ``by_satellite``, each satellite's buckets are separate rows that
+        also carry its "satellite_id", ordered by bucket and then satellite.
+        """
+        start = None if start is None else to_micros(start)
+        end = None if end is None else to_micros(end)
+        buckets = {}
+        with self._lock:
+            selected = []
+            for sat, columns in self._selected(satellite_ids):
+                lo, hi = columns.span(start, end)
+                if lo < hi:
+                    selected.append((sat, columns, lo, hi))
+            if not selected:
+                return []
+            first = min(columns.times[lo] for _, columns, lo, _ in selected)
+            last = max(columns.times[hi - 1] for _, columns, _, hi in selected)
+            starts, bounds = _bucket_bounds(truncate, interval, first, last)
+
+            for sat, columns, i, hi in selected:
+                times = columns.times
+                while i < hi:
+                    k = bisect.bisect_right(bounds, times[i]) - 1
+                    j = bisect.bisect_left(times, bounds[k + 1], i, hi)
+                    key = (k, sat) if by_satellite else k
+                    row = buckets.get(key)
+                    if row is None:
+                        row = buckets[key] = _empty_bucket(starts[k])
+                        if by_satellite:
+                            row['satellite_id'] = sat
+                    row['entries'] += j - i
+                    for field in MEASUREMENTS:
+                        values = getattr(columns, field)[i:j]
+                        row[f'{field}_min'] = min(row[f'{field}_min'], min(values))
+                        row[f'{field}_max'] = max(row[f'{field}_max'], max(values))
+                        row[f'{field}_sum'] += sum(values)
+                    status = columns.status[i:j]
+                    for code, name in enumerate(STATUSES):
+                        row[f'status_{name}'] += status.count(code)
+                    i = j
+        return [buckets[key] for key in sorted(buckets)]
+
+    def satellites(self):
+        """
+        Unsaved SatelliteState instances for every satellite, or None while
+        a satellite's latest entry is unknown.
+        """
+        with self._lock:
+            if self._unknown:
+                return None
+            return [
+                SatelliteState(
+                    satellite_id=satellite_id, entry_id=pk, last_seen=from_micros(micros),
+                    altitude=altitude, velocity=velocity, status=STATUSES[status],
+                )
+                for satellite_id, (pk, micros, altitude, velocity, status) in sorted(self._latest.items())
+            ]
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def metrics(self):
+        """
+        ``(name, kind, help text, value)`` samples for /metrics.
+        """
+        status = self.status()
+        return [
+            ('telemetry_hot_window_entries', 'gauge', 'Entries held in the hot window.', status['entries']),
+            ('telemetry_hot_window_bytes', 'gauge', 'Bytes of column data in the hot window.', status['bytes']),
+            ('telemetry_hot_window_evicted_total', 'counter', 'Entries dropped to keep the window within HOT_WINDOW_MAX_ENTRIES.', status['evicted_entries']),
+            ('telemetry_hot_window_hits_total', 'counter', 'Queries answered from the hot window.', status['hits']),
+            ('telemetry_hot_window_misses_total', 'counter', 'Queries the hot window passed to the database.', status['misses']),
+        ]
+
+    def status(self):
+        """
+        The window's size and use, for GET /api/telemetry/hot/ and /metrics.
+        """
+        with self._lock:
+            return {
+                'ready': self._ready,
+                'hours': self.length / HOUR,
+                'window_start': from_micros(self._start) if self._start is not None else None,
+                'entries': self._size,
+                'satellites': len(self._columns),
+                'max_entries': self.max_entries,
+                'bytes': sum(columns.nbytes for columns in self._columns.values()),
+                'evicted_entries': self.evicted,
+                'hits': self.hits,
+                'misses': self.misses,
+                'loaded_at': self.loaded_at,
+                'load_seconds': self.load_seconds,
+            }
+
+
+def _bucket_bounds(truncate, interval, first, last):
+    """
+    The starts of the buckets from the one holding ``first`` to the one
+    holding ``last``, as local datetimes and as microseconds, the latter
+    followed by the end of the last bucket.
+    """
+    tz = timezone.get_current_timezone()
+    starts = [truncate(timezone.localtime(from_micros(first), tz))]
+    bounds = [to_micros(starts[0])]
+    while True:
+        following = truncate(timezone.localtime(starts[-1] + interval, tz))
+        micros = to_micros(following)
+        if micros <= bounds[-1]:
+            # A repeated hour when clocks go back: step past it.
+            following = truncate(timezone.localtime(from_micros(bounds[-1]) + interval, tz))
+            micros = to_micros(following)
+        bounds.append(micros)
+        if micros > last:
+            return starts, bounds
+        starts.append(following)
+
+
+def _empty_bucket(bucket):
+    row = {'bucket': bucket, 'entries': 0}
+    for field in MEASUREMENTS:
+        row[f'{field}_min'] = math.inf
+        row[f'{field}_max'] = -math.inf
+        row[f'{field}_sum'] = 0.0
+    for status in STATUSES:
+        row[f'status_{status}'] = 0
+    return row
+
+
+def _read_generations():
+    values = cache.get_many([APPEND_GENERATION_KEY, REWRITE_GENERATION_KEY])
+    return values.get(APPEND_GENERATION_KEY), values.get(REWRITE_GENERATION_KEY)
+
+
+def _bump(key):
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted in between; the next query reloads or catches up.
+        return None
+
+
+class WindowRows:
+    """
+    The list's matching entries in a hot window, standing in for its queryset.
+
+    Page-number pagination takes the len() and slices, so it is only given
+    one when the filtered range lies inside the window. Cursor pagination
+    calls seek(), and falls back to ``queryset`` when that returns None.
+    """
+    model = TelemetryEntry
+
+    def __init__(self, window, queryset, satellite_ids=None, statuses=None, start=None, end=None, descending=True):
+        self.window = window
+        self.queryset = queryset
+        self.satellite_ids = satellite_ids
+        # Codes of the wanted statuses; an unknown status matches nothing.
+        self.statuses = None if statuses is None else {STATUS_CODES[s] for s in statuses if s in STATUS_CODES}
+        self.start = start
+        self.end = end
+        self.descending = descending
+
+    def _rows(self, descending, after=None, offset=0, limit=None):
+        return self.window.rows(
+            self.satellite_ids, self.statuses,
+            None if self.start is None else to_micros(self.start),
+            None if self.end is None else to_micros(self.end),
+            descending, after=after, offset=offset, limit=limit,
+        )
+
+    def __len__(self):
+        return self.window.count(
+            self.satellite_ids, self.statuses,
+            None if self.start is None else to_micros(self.start),
+            None if self.end is None else to_micros(self.end),
+        )
+
+    def __getitem__(self, index):
+        # Paginator only takes slices.
+        offset = index.start or 0
+        return self._rows(self.descending, offset=offset, limit=index.stop - offset)
+
+    def seek(self, position, reverse, limit):
+        """
+        Up to ``limit`` rows following ``position``, a ``(timestamp, id)``
+        pair, walking the list backwards when ``reverse``. None when entries
+        older than the window could be among them.
+        """
+        descending = self.descending != reverse
+        after = None if position is None else (to_micros(position[0]), position[1])
+        rows = self._rows(descending, after=after, limit=limit)
+        if descending:
+            # Everything outside the window is older than a full page.
+            complete = len(rows) == limit or self.window.covers(self.start)
+        else:
+            complete = any(self.window.covers(bound) for bound in (self.start, position and position[0]))
+        self.window.record(complete)
+        return rows if complete else None
+
+
+_window = None
+
+
+def hot_window():
+    """
+    This process's hot window when it can answer a query, else None.
+    """
+    window = _window
+    if window is None or not window.sync():
+        return None
+    return window
+
+
+def get_window():
+    """
+    This process's hot window, ready or not, or None when it is disabled.
+    """
+    return _window
+
+
+def start_hot_window():
+    """
+    Create the window and warm it in the background, when
+    TELEMETRY['HOT_WINDOW_HOURS'] is set and the default cache is shared
+    between processes.
+    """
+    global _window
+
+    hours = telemetry_setting('HOT_WINDOW_HOURS')
+    if hours and _window is None:
+        backend = caches['default']
+        if isinstance(backend, PROCESS_LOCAL_CACHES):
+            logger.warning(
+                'Not starting the hot window: the %s cache is not shared between processes, so writes '
+                'by other workers and management commands would never reach it. Set CACHE_URL to a '
+                'shared cache.',
+                type(backend).__name__,
+            )
+            return None
+        _window = HotWindow(hours, telemetry_setting('HOT_WINDOW_MAX_ENTRIES'))
+        _window.start()
+    return _window
+
+
+def stop_hot_window():
+    global _window
+
+    _window = None
+
+
+def invalidate(latest):
+    """
+    Reload the windows that reach back to ``latest``, after entries up to
+    it were changed without entries_changed (retention, archiving).
+    """
+    hours = telemetry_setting('HOT_WINDOW_HOURS')
+    if hours and latest >= timezone.now() - timedelta(hours=hours):
+        if _window is not None:
+            _window.invalidate()
+        else:
+            _bump(REWRITE_GENERATION_KEY)
+
+
+def on_entries_changed(sender, added=(), removed=(), **kwargs):
+    window = _window
+    if window is None:
+        return
+    added = [entry_row(entry) for entry in added]
+    removed = [entry_row(entry) for entry in removed]
+    transaction.on_commit(lambda: window.apply(added, removed))
@@ -0,0 +1,235 @@
+"""
+Batch validation and writes for the bulk telemetry ingest path.
+
+Running TelemetryEntrySerializer once per row costs far more than the INSERT
+itself, so batches are checked here in a single pass with the same rules and
+error messages as the serializer. Writes use the same multi-row INSERT that
+bulk_create issues, but skip its per-value field preparation, which profiling
+showed to be most of bulk_create's cost for this model. On PostgreSQL they
+use COPY instead (see storage.py).
+"""
+import datetime
+import math
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import fields
+from rest_framework.utils import humanize_datetime
+
+from .conf import telemetry_setting
+from .models import TelemetryEntry
+from .signals import entries_changed
+from .storage import copy_rows, reserve_ids, supports_copy
+
+
+SATELLITE_ID_MAX_LENGTH = TelemetryEntry._meta.get_field('satellite_id').max_length
+STATUSES = frozenset(TelemetryEntry.HealthStatus.values)
+DEFAULT_STATUS = TelemetryEntry._meta.get_field('status').default
+
+# Reuse DRF's wording so bulk errors read the same as single-entry errors.
+MESSAGES = {
+    'required': fields.Field.default_error_messages['required'],
+    'null': fields.Field.default_error_messages['null'],
+    'not_a_dict': 'Invalid data. Expected a dictionary, but got {datatype}.',
+    'invalid_string': fields.CharField.default_error_messages['invalid'],
+    'blank': fields.CharField.default_error_messages['blank'],
+    'max_length': fields.CharField.default_error_messages['max_length'].format(
+        max_length=SATELLITE_ID_MAX_LENGTH,
+    ),
+    'invalid_datetime': fields.DateTimeField.default_error_messages['invalid'].format(
+        format=humanize_datetime.datetime_formats(['iso-8601']),
+    ),
+    'invalid_number': fields.FloatField.default_error_messages['invalid'],
+    'min_value': fields.FloatField.default_error_messages['min_value'].format(min_value=0),
+    'invalid_choice': fields.ChoiceField.default_error_messages['invalid_choice'],
+}
+
+
+class RowError(Exception):
+    """
+    Raised by the field cleaners with a message for the offending field.
+    """
+
+
+# Each cleaner takes the raw value and the current timezone and returns the
+# value to store, or raises RowError. None is handled by validate_rows().
+def _clean_satellite_id(value, tz):
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise RowError(MESSAGES['invalid_string'])
+    value = str(value).strip()
+    if not value:
+        raise RowError(MESSAGES['blank'])
+    if len(value) > SATELLITE_ID_MAX_LENGTH:
+        raise RowError(MESSAGES['max_length'])
+    return value
+
+
+def _clean_timestamp(value, tz):
+    if isinstance(value, datetime.datetime):
+        parsed = value
+    elif isinstance(value, str):
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise RowError(MESSAGES['invalid_datetime'])
+    else:
+        raise RowError(MESSAGES['invalid_datetime'])
+
+    # Same normalisation as DRF's DateTimeField.enforce_timezone().
+    if timezone.is_aware(parsed):
+        return parsed.astimezone(tz)
+    try:
+        return timezone.make_aware(parsed, tz)
+    except ValueError:
+        raise RowError(MESSAGES['invalid_datetime'])
+
+
+def _clean_measurement(value, tz):
+    if isinstance(value, str) and len(value) > fields.FloatField.MAX_STRING_LENGTH:
+        raise RowError(MESSAGES['invalid_number'])
+    try:
+        value = float(value)
+    except (TypeError, ValueError, OverflowError):
+        raise RowError(MESSAGES['invalid_number'])
+    if value < 0:
+        raise RowError(MESSAGES['min_value'])
+    if not math.isfinite(value):
+        raise RowError(MESSAGES['invalid_number'])
+    return value
+
+
+def _clean_status(value, tz):
+    if str(value) not in STATUSES:
+        raise RowError(MESSAGES['invalid_choice'].format(input=value))
+    return str(value)
+
+
+FIELDS = (
+    ('satellite_id', _clean_satellite_id),
+    ('timestamp', _clean_timestamp),
+    ('altitude', _clean_measurement),
+    ('velocity', _clean_measurement),
+    ('status', _clean_status),
+)
+
+
+def validate_rows(rows):
+    """
+    Validate raw telemetry dicts in one pass.
+
+    Returns ``(entries, errors)``: unsaved TelemetryEntry instances for the
+    valid rows, and ``{'index': i, 'errors': {field: [message]}}`` for every
+    row that failed, where ``i`` is the row's position in ``rows``.
+    """
+    tz = timezone.get_current_timezone()
+    entries = []
+    errors = []
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            message = MESSAGES['not_a_dict'].format(datatype=type(row).__name__)
+            errors.append({'index': index, 'errors': {'non_field_errors': [message]}})
+            continue
+
+        values = {}
+        row_errors = {}
+        for name, clean in FIELDS:
+            value = row.get(name)
+            if value is None:
+                if name == 'status' and name not in row:
+                    values[name] = DEFAULT_STATUS
+                else:
+                    row_errors[name] = [MESSAGES['null' if name in row else 'required']]
+                continue
+            try:
+                values[name] = clean(value, tz)
+            except RowError as exc:
+                row_errors[name] = [str(exc)]
+
+        if row_errors:
+            errors.append({'index': index, 'errors': row_errors})
+        else:
+            entries.append(TelemetryEntry(**values))
+
+    return entries, errors
+
+
+def write_entries(entries, chunk_size=None):
+    """
+    Insert ``entries`` in chunks inside a single transaction.
+
+    Each chunk is one multi-row INSERT of at most ``chunk_size`` rows
+    (TELEMETRY['BULK_CHUNK_SIZE'] by default), further capped by the
+    backend's parameter limit; on PostgreSQL the whole batch is one COPY.
+    Either the whole batch is committed or none of it is, together with
+    whatever the entries_changed receivers write. Primary keys are set on
+    the instances when the backend can return them, as bulk_create does.
+    """
+    if not entries:
+        return entries
+
+    alias = router.db_for_write(TelemetryEntry)
+    connection = connections[alias]
+    with transaction.atomic(using=alias):
+        if supports_copy(connection):
+            _copy(connection, entries)
+        else:
+            _insert(connection, entries, chunk_size or telemetry_setting('BULK_CHUNK_SIZE'))
+        for entry in entries:
+            entry._state.adding = False
+            entry._state.db = alias
+        entries_changed.send(sender=TelemetryEntry, added=entries, removed=[])
+    return entries
+
+
+def _insert(connection, entries, chunk_size):
+    opts = TelemetryEntry._meta
+    insert_fields = [opts.get_field(name) for name, _ in FIELDS]
+    batch_size = min(chunk_size, connection.ops.bulk_batch_size(insert_fields, entries) or chunk_size)
+
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(field.column) for field in insert_fields)
+    row_sql = '(' + ', '.join(['%s'] * len(insert_fields)) + ')'
+    returning_sql = ''
+    if connection.features.can_return_rows_from_bulk_insert:
+        returning_sql, _ = connection.ops.return_insert_columns([opts.pk])
+    adapt_datetime = connection.ops.adapt_datetimefield_value
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(entries), batch_size):
+            chunk = entries[start:start + batch_size]
+            params = []
+            for entry in chunk:
+                params += (
+                    entry.satellite_id,
+                    adapt_datetime(entry.timestamp),
+                    entry.altitude,
+                    entry.velocity,
+                    entry.status,
+                )
+            cursor.execute(
+                f'INSERT INTO {qn(opts.db_table)} ({columns}) VALUES '
+                f'{", ".join([row_sql] * len(chunk))} {returning_sql}',
+                params,
+            )
+            if returning_sql:
+                for entry, (pk,) in zip(chunk, cursor.fetchall()):
+                    entry.pk = pk
+
+
+def _copy(connection, entries):
+    opts = TelemetryEntry._meta
+    for entry, pk in zip(entries, reserve_ids(connection, TelemetryEntry, len(entries))):
+        entry.pk = pk
+    copy_rows(
+        connection,
+        opts.db_table,
+        [opts.pk.column] + [opts.get_field(name).column for name, _ in FIELDS],
+        (
+            (entry.pk, entry.satellite_id, entry.timestamp, entry.altitude, entry.velocity, entry.status)
+            for entry in entries
+        ),
+    )
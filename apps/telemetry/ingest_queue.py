@@ -0,0 +1,377 @@
+"""
+Queued ingest: accept telemetry now, write it in batches shortly after.
+
+With TELEMETRY['INGEST_MODE'] = 'queued', POSTs to /api/telemetry/ and
+/api/telemetry/bulk/ validate their entries, hand them to this process's
+IngestQueue and answer 202 Accepted without waiting for a transaction. A
+writer thread takes the queued entries in batches of up to
+INGEST_BATCH_SIZE and writes each batch with write_entries() in one
+transaction, so a burst of small requests costs a few commits instead of
+one each, and requests no longer queue for SQLite's write lock.
+
+Durability comes from a journal, as in a write-ahead log: every accepted
+request is appended to this queue's journal file, and fsynced, before it is
+acknowledged. Records carry increasing sequence numbers, and each batch
+stores the last one it wrote in an IngestCheckpoint row in the same
+transaction. A journal whose process has gone (its file lock is free) is
+replayed from after its checkpoint by the next queue to start, so after a
+crash or restart every acknowledged entry is written exactly once.
+
+The queue holds at most INGEST_QUEUE_SIZE entries; beyond that, requests
+get 503 and should retry. Entries appear in the list, rollups and stream
+once their batch is written; GET /api/telemetry/ingest/ reports the lag.
+"""
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .conf import telemetry_setting
+from .ingest import write_entries
+from .models import IngestCheckpoint, TelemetryEntry
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = '.journal'
+# Seconds the writer waits after a failed batch before trying it again.
+RETRY_DELAY = 1.0
+
+
+class QueueFull(Exception):
+    """
+    Raised when accepting entries would take the queue past its size.
+    """
+
+
+def _encode(sequence, entries):
+    rows = [
+        (entry.satellite_id, entry.timestamp.isoformat(), entry.altitude, entry.velocity, entry.status)
+        for entry in entries
+    ]
+    return (json.dumps({'sequence': sequence, 'rows': rows}, separators=(',', ':')) + '\n').encode()
+
+
+def _decode(line):
+    record = json.loads(line)
+    entries = [
+        TelemetryEntry(None, satellite_id, parse_datetime(timestamp), altitude, velocity, status)
+        for satellite_id, timestamp, altitude, velocity, status in record['rows']
+    ]
+    return record['sequence'], entries
+
+
+def read_journal(path):
+    """
+    Return the ``(sequence, entries)`` records of a journal file, in order.
+
+    An incomplete last line, from a crash during the append, is ignored: its
+    request was never acknowledged.
+    """
+    records = []
+    with open(path, 'rb') as journal:
+        for line in journal:
+            try:
+                records.append(_decode(line))
+            except ValueError:
+                logger.warning('Ignoring an incomplete record at the end of %s', path)
+                break
+    return records
+
+
+def _write_batch(journal, records):
+    """
+    Write the entries of ``records`` and the journal's new checkpoint in
+    one transaction.
+    """
+    entries = [entry for _, batch in records for entry in batch]
+    with transaction.atomic():
+        write_entries(entries)
+        IngestCheckpoint.objects.update_or_create(journal=journal, defaults={'sequence': records[-1][0]})
+    return len(entries)
+
+
+def recover_journals(directory, batch_size):
+    """
+    Replay the journals in ``directory`` whose queues are gone, then delete
+    them. Returns the number of entries written.
+    """
+    written = 0
+    for path in sorted(Path(directory).glob(f'*{JOURNAL_SUFFIX}')):
+        with open(path, 'rb') as journal:
+            try:
+                # A live queue holds the lock on its own journal.
+                fcntl.flock(journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            if os.fstat(journal.fileno()).st_nlink == 0:
+                # Another process replayed and deleted it first.
+                continue
+            checkpoint = IngestCheckpoint.objects.filter(journal=path.name).first()
+            applied = checkpoint.sequence if checkpoint else 0
+            pending = [record for record in read_journal(path) if record[0] > applied]
+            for batch in _batches(pending, batch_size):
+                written += _write_batch(path.name, batch)
+            IngestCheckpoint.objects.filter(journal=path.name).delete()
+            path.unlink()
+        if pending:
+            logger.info('Replayed %d journal records from %s', len(pending), path.name)
+    return written
+
+
+def _batches(records, batch_size):
+    """
+    Split ``records`` into runs of whole records holding up to
+    ``batch_size`` entries; a larger record makes a batch of its own.
+    """
+    batch = []
+    size = 0
+    for record in records:
+        if batch and size + len(record[1]) > batch_size:
+            yield batch
+            batch = []
+            size = 0
+        batch.append(record)
+        size += len(record[1])
+    if batch:
+        yield batch
+
+
+class IngestQueue:
+    """
+    A bounded, journaled queue of validated entries and its writer thread.
+    """
+
+    def __init__(self, directory, max_entries, batch_size, flush_interval, fsync=True, max_journal_bytes=None):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_journal_bytes = max_journal_bytes
+
+        self.journal_name = f'{uuid.uuid4().hex}{JOURNAL_SUFFIX}'
+        self._journal = None
+        self._records = deque()  # (sequence, entries, time accepted)
+        self._queued = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # Held while a batch is written, so drain() and the thread take turns.
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+
+        self.written = 0
+        self.batches = 0
+        self.last_write = None
+        self.last_error = None
+
+    def open(self):
+        """
+        Replay abandoned journals and start this queue's own.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        recover_journals(self.directory, self.batch_size)
+        self._journal = open(self.directory / self.journal_name, 'ab')
+        fcntl.flock(self._journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def start(self):
+        """
+        Open the queue and start the writer thread.
+        """
+        self.open()
+        self._thread = threading.Thread(target=self._run, name='telemetry-ingest', daemon=True)
+        self._thread.start()
+
+    def put(self, entries):
+        """
+        Journal ``entries`` and queue them for writing. Returns the record's
+        sequence number once it is durable.
+        """
+        with self._lock:
+            if self._queued + len(entries) > self.max_entries:
+                raise QueueFull(f'The ingest queue holds {self._queued} of {self.max_entries} entries.')
+            self._sequence += 1
+            self._journal.write(_encode(self._sequence, entries))
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._records.append((self._sequence, entries, time.monotonic()))
+            self._queued += len(entries)
+            # The writer times its wait from the oldest record.
+            self._changed.notify()
+            return self._sequence
+
+    def _take(self):
+        """
+        The oldest queued records, up to a batch of entries. They stay
+        queued until written.
+        """
+        records = []
+        size = 0
+        with self._lock:
+            for sequence, entries, _ in self._records:
+                if records and size + len(entries) > self.batch_size:
+                    break
+                records.append((sequence, entries))
+                size += len(entries)
+        return records
+
+    def _write_next(self):
+        """
+        Write the next batch, if any. Returns the number of entries written.
+        """
+        with self._write_lock:
+            records = self._take()
+            if not records:
+                return 0
+            written = _write_batch(self.journal_name, records)
+            with self._lock:
+                for _ in records:
+                    self._records.popleft()
+                self._queued -= written
+                self.written += written
+                self.batches += 1
+                self.last_write = timezone.now()
+                self.last_error = None
+                self._truncate_journal()
+                self._changed.notify_all()
+            return written
+
+    def _truncate_journal(self):
+        # Called with the lock held. Every record is in the table once the
+        # queue is empty, so the journal can start over; the sequence
+        # numbers keep increasing, so the checkpoint stays valid.
+        if self._records or not self.max_journal_bytes or self._journal.tell() < self.max_journal_bytes:
+            return
+        self._journal.truncate(0)
+        self._journal.seek(0)
+
+    def drain(self):
+        """
+        Write everything queued, in the calling thread. Returns the number
+        of entries written.
+        """
+        written = 0
+        while batch := self._write_next():
+            written += batch
+        return written
+
+    def _run(self):
+        try:
+            while self._wait_for_batch():
+                try:
+                    self._write_next()
+                except Exception as exc:
+                    logger.exception('Writing queued telemetry failed; retrying')
+                    with self._lock:
+                        self.last_error = str(exc)
+                    # Start the retry with a fresh connection.
+                    connection.close()
+                    time.sleep(RETRY_DELAY)
+        finally:
+            connection.close()
+
+    def _wait_for_batch(self):
+        """
+        Block until a batch is full or the oldest entries have waited
+        flush_interval. Returns False when the queue is closing.
+        """
+        with self._lock:
+            while not self._stopping and self._queued < self.batch_size:
+                if not self._records:
+                    self._changed.wait()
+                    continue
+                remaining = self._records[0][2] + self.flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return not self._stopping
+
+    def close(self):
+        """
+        Stop the writer, write what is queued and remove the journal.
+        """
+        with self._lock:
+            self._stopping = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.drain()
+        IngestCheckpoint.objects.filter(journal=self.journal_name).delete()
+        os.unlink(self._journal.name)
+        self._journal.close()
+
+    def status(self):
+        """
+        The queue's lag and totals, for GET /api/telemetry/ingest/.
+        """
+        with self._lock:
+            oldest = self._records[0][2] if self._records else None
+            return {
+                'queued_entries': self._queued,
+                'queued_requests': len(self._records),
+                'lag_seconds': round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+                'written_entries': self.written,
+                'written_batches': self.batches,
+                'last_write': self.last_write,
+                'last_error': self.last_error,
+                'journal_bytes': self._journal.tell(),
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """
+    This process's ingest queue, started on first use.
+    """
+    global _queue
+
+    with _queue_lock:
+        if _queue is None:
+            _queue = IngestQueue(
+                telemetry_setting('INGEST_JOURNAL_DIR'),
+                max_entries=telemetry_setting('INGEST_QUEUE_SIZE'),
+                batch_size=telemetry_setting('INGEST_BATCH_SIZE'),
+                flush_interval=telemetry_setting('INGEST_FLUSH_INTERVAL'),
+                fsync=telemetry_setting('INGEST_FSYNC'),
+                max_journal_bytes=telemetry_setting('INGEST_JOURNAL_MAX_BYTES'),
+            )
+            _queue.start()
+    return _queue
+
+
+def start_queue():
+    """
+    Start the queue with the server when INGEST_MODE is "queued", so that
+    journals left by a previous run are replayed straight away.
+    """
+    if telemetry_setting('INGEST_MODE') == 'queued':
+        return get_queue()
+    return None
+
+
+def stop_queue():
+    """
+    Write what is queued and stop the writer; the next request starts a new
+    queue.
+    """
+    global _queue
+
+    with _queue_lock:
+        if _queue is not None:
+            _queue.close()
+            _queue = None
@@ -0,0 +1,230 @@
+"""
+Load test harness for a running server.
+
+Client threads each hold one keep-alive connection and send a weighted mix
+of API requests for a fixed time. Every request's latency is recorded, and
+the report gives throughput and p50/p95/p99 latency per scenario and
+overall. Only the standard library is used, so it runs anywhere the
+project does; on a single machine it competes with the server for CPU, so
+compare runs made the same way.
+"""
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode, urlsplit
+
+
+STATUSES = ('healthy', 'warning', 'critical')
+PERCENTILES = (50, 95, 99)
+# Deepest page the list scenario asks for.
+MAX_PAGE = 20
+
+
+def _entry(rng, satellite_ids):
+    return {
+        'satellite_id': rng.choice(satellite_ids),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'altitude': round(rng.uniform(300, 1200), 3),
+        'velocity': round(rng.uniform(7.0, 7.8), 4),
+        'status': rng.choice(STATUSES),
+    }
+
+
+def _list(rng, ctx):
+    params = {}
+    if rng.random() < 0.5:
+        params['satellite_id'] = rng.choice(ctx['satellite_ids'])
+    if rng.random() < 0.3:
+        params['status'] = rng.choice(STATUSES)
+    if not params:
+        # Only the unfiltered list is known to be this deep.
+        params['page'] = rng.randint(1, ctx['pages'])
+    return 'GET', f'/api/telemetry/?{urlencode(params)}', None
+
+
+def _cursor(rng, ctx):
+    params = {'pagination': 'cursor', 'satellite_id': rng.choice(ctx['satellite_ids'])}
+    return 'GET', f'/api/telemetry/?{urlencode(params)}', None
+
+
+def _detail(rng, ctx):
+    return 'GET', f'/api/telemetry/{rng.choice(ctx["entry_ids"])}/', None
+
+
+def _aggregate(rng, ctx):
+    params = {'bucket': rng.choice(['1h', '1d']), 'points': 200}
+    if rng.random() < 0.5:
+        params['satellite_id'] = rng.choice(ctx['satellite_ids'])
+    return 'GET', f'/api/telemetry/aggregate/?{urlencode(params)}', None
+
+
+def _satellites(rng, ctx):
+    return 'GET', '/api/satellites/', None
+
+
+def _create(rng, ctx):
+    return 'POST', '/api/telemetry/', _entry(rng, ctx['satellite_ids'])
+
+
+def _bulk(rng, ctx):
+    return 'POST', '/api/telemetry/bulk/', [_entry(rng, ctx['satellite_ids']) for _ in range(100)]
+
+
+# name -> (default weight, request builder)
+SCENARIOS = {
+    'list': (30, _list),
+    'cursor': (15, _cursor),
+    'detail': (20, _detail),
+    'aggregate': (10, _aggregate),
+    'satellites': (10, _satellites),
+    'create': (10, _create),
+    'bulk': (5, _bulk),
+}
+WRITE_SCENARIOS = {'create', 'bulk'}
+
+
+def percentile(sorted_values, p):
+    """
+    The nearest-rank ``p``th percentile of an ascending list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Client:
+    """
+    One keep-alive HTTP connection to the server under test.
+    """
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+
+    def request(self, method, path, body=None):
+        headers = {'Accept': 'application/json'}
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request.
+            self.connection.close()
+            raise
+        return response.status, data
+
+    def close(self):
+        self.connection.close()
+
+
+def discover(url, timeout=10):
+    """
+    Fetch the satellite and entry ids the scenarios pick from.
+    """
+    client = Client(url, timeout)
+    try:
+        _, body = client.request('GET', '/api/satellites/')
+        satellite_ids = [state['satellite_id'] for state in json.loads(body)] or ['SAT-001']
+        _, body = client.request('GET', '/api/telemetry/?pagination=cursor')
+        entry_ids = [entry['id'] for entry in json.loads(body)['results']] or [1]
+        _, body = client.request('GET', '/api/telemetry/')
+        page = json.loads(body)
+        page_size = len(page['results']) or 1
+        pages = min(math.ceil(page['count'] / page_size), MAX_PAGE) or 1
+    finally:
+        client.close()
+    return {'satellite_ids': satellite_ids, 'entry_ids': entry_ids, 'pages': pages}
+
+
+def run(url, concurrency=8, duration=10.0, weights=None, seed=0, timeout=30):
+    """
+    Drive ``url`` with ``concurrency`` clients for ``duration`` seconds.
+
+    ``weights`` maps scenario names to relative weights; scenarios left out
+    are not run. Returns the report built by summarise().
+    """
+    weights = weights or {name: weight for name, (weight, _) in SCENARIOS.items()}
+    names = [name for name, weight in weights.items() if weight > 0]
+    ctx = discover(url, timeout)
+
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        rng = random.Random(f'{seed}:{index}')
+        client = Client(url, timeout)
+        local_samples = defaultdict(list)
+        local_errors = defaultdict(int)
+        try:
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, [weights[name] for name in names])[0]
+                method, path, body = SCENARIOS[name][1](rng, ctx)
+                started = time.perf_counter()
+                try:
+                    status, _ = client.request(method, path, body)
+                except (OSError, http.client.HTTPException):
+                    status = None
+                elapsed = time.perf_counter() - started
+                if status is None or status >= 400:
+                    local_errors[name] += 1
+                else:
+                    local_samples[name].append(elapsed)
+        finally:
+            client.close()
+            with lock:
+                for name, values in local_samples.items():
+                    samples[name].extend(values)
+                for name, count in local_errors.items():
+                    errors[name] += count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarise(samples, errors, time.perf_counter() - started, concurrency)
+
+
+def _stats(latencies, error_count, elapsed):
+    latencies = sorted(latencies)
+    stats = {
+        'requests': len(latencies) + error_count,
+        'errors': error_count,
+        'throughput': len(latencies) / elapsed,
+    }
+    for p in PERCENTILES:
+        value = percentile(latencies, p)
+        stats[f'p{p}_ms'] = None if value is None else value * 1000
+    stats['max_ms'] = latencies[-1] * 1000 if latencies else None
+    return stats
+
+
+def summarise(samples, errors, elapsed, concurrency):
+    """
+    Build the report: per-scenario and overall request counts, errors,
+    successful requests per second and latency percentiles in milliseconds.
+    """
+    names = sorted(samples.keys() | errors.keys())
+    return {
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'scenarios': {name: _stats(samples.get(name, []), errors.get(name, 0), elapsed) for name in names},
+        'total': _stats(
+            [value for values in samples.values() for value in values],
+            sum(errors.values()),
+            elapsed,
+        ),
+    }
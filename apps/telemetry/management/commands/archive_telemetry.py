@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.telemetry.archive import archivable_months, archive_month, archive_path
+from apps.telemetry.conf import telemetry_setting
+
+
+class Command(BaseCommand):
+    """
+    Moves whole months of old telemetry out of the live table into one
+    gzipped NDJSON file per month. See apps/telemetry/archive.py.
+    """
+    help = 'Archives telemetry from months before --before into monthly NDJSON files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', required=True,
+            help='First month to keep, as YYYY-MM. Every earlier month is archived.',
+        )
+        parser.add_argument(
+            '--dir', default=telemetry_setting('ARCHIVE_DIR'),
+            help='Directory for the archive files (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=telemetry_setting('ARCHIVE_BATCH_SIZE'),
+            help='Entries moved per transaction (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='List the months that would be archived without moving anything.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            before = datetime.strptime(options['before'], '%Y-%m')
+        except ValueError:
+            raise CommandError('--before must be a month as YYYY-MM.')
+        before = timezone.make_aware(before)
+
+        months = archivable_months(before)
+        if not months:
+            self.stdout.write('Nothing to archive.')
+            return
+
+        for month in months:
+            path = archive_path(options['dir'], month)
+            if options['dry_run']:
+                self.stdout.write(f'Would archive {month:%Y-%m} to {path}.')
+                continue
+            moved = archive_month(month, options['dir'], options['batch_size'])
+            self.stdout.write(f'Archived {moved} entries from {month:%Y-%m} to {path}.')
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Successfully archived {len(months)} months.'))
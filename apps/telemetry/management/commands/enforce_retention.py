@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.telemetry.conf import telemetry_setting
+from apps.telemetry.retention import enable_incremental_vacuum, run_retention
+
+
+class Command(BaseCommand):
+    """
+    Folds raw telemetry older than the retention period into the rollups,
+    deletes it in batches and compacts the database. See
+    apps/telemetry/retention.py.
+    """
+    help = 'Deletes raw telemetry older than the retention period, keeping its rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=telemetry_setting('RETENTION_DAYS'),
+            help="Days of raw telemetry to keep (default: TELEMETRY['RETENTION_DAYS']).",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=telemetry_setting('RETENTION_BATCH_SIZE'),
+            help='Entries deleted per statement (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report how many entries would be deleted without deleting them.',
+        )
+        parser.add_argument(
+            '--no-compact', action='store_true',
+            help='Skip the vacuum and analyze step.',
+        )
+        parser.add_argument(
+            '--enable-incremental-vacuum', action='store_true',
+            help='Switch SQLite to incremental auto-vacuum first. Runs a full VACUUM once.',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is None:
+            raise CommandError("No retention period: pass --days or set TELEMETRY['RETENTION_DAYS'].")
+        if options['days'] < 0:
+            raise CommandError('--days must not be negative.')
+
+        if options['enable_incremental_vacuum']:
+            try:
+                enable_incremental_vacuum()
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write('Enabled incremental auto-vacuum.')
+
+        report = run_retention(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            compact_after=not options['no_compact'],
+        )
+
+        cutoff = f'{report["cutoff"]:%Y-%m-%d %H:%M %Z}'
+        if options['dry_run']:
+            self.stdout.write(f'Would delete {report["deleted"]} entries from before {cutoff}.')
+            return
+
+        self.stdout.write(
+            f'Deleted {report["deleted"]} entries from before {cutoff} over {report["days"]} days '
+            f'in {report["purge_seconds"]:.2f}s, writing {report["rollup_rows"]} rollup rows.'
+        )
+        if report['pages_freed'] is not None and report['deleted'] and not options['no_compact']:
+            self.stdout.write(f'Freed {report["pages_freed"]} pages in {report["compact_seconds"]:.2f}s.')
+        self.stdout.write(self.style.SUCCESS('Successfully enforced telemetry retention.'))
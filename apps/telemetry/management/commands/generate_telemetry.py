@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.telemetry.models import DailyRollup, HourlyRollup, TelemetryEntry, TelemetryEvent
+from apps.telemetry.synthetic import generate
+
+
+class Command(BaseCommand):
+    """
+    Generates large volumes of realistic telemetry for reproducing scaling
+    problems locally. See apps/telemetry/synthetic.py.
+    """
+    help = 'Generates synthetic telemetry with realistic orbits and status changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=1_000_000,
+            help='Approximate number of entries to generate (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--satellites', type=int, default=100,
+            help='Number of satellites (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=10.0,
+            help='Seconds between reports of one satellite (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help='Generator processes (default: one per CPU).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=10_000,
+            help='Entries generated and written per chunk (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed for the fleet and noise; the same seed gives the same data.',
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Delete all telemetry first.',
+        )
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['satellites'] < 1 or options['interval'] <= 0:
+            raise CommandError('--rows, --satellites and --interval must be positive.')
+        if options['satellites'] > 999:
+            raise CommandError('--satellites may be at most 999.')
+
+        if options['clear']:
+            # The generator adds to the rollups rather than rebuilding them,
+            # so they go too, as do the events found in the old entries; it
+            # rebuilds the snapshots and drops the baselines itself.
+            with transaction.atomic():
+                TelemetryEntry.objects.all().delete()
+                HourlyRollup.objects.all().delete()
+                DailyRollup.objects.all().delete()
+                TelemetryEvent.objects.all().delete()
+            self.stdout.write('Cleared all telemetry entries.')
+
+        started = time.perf_counter()
+        report_every = max(options['rows'] // 20, options['chunk_size'])
+        next_report = report_every
+
+        def progress(written):
+            nonlocal next_report
+            if written >= next_report:
+                rate = written / (time.perf_counter() - started)
+                self.stdout.write(f'{written} entries ({rate:,.0f}/s)')
+                next_report += report_every
+
+        written = generate(
+            rows=options['rows'],
+            satellites=options['satellites'],
+            interval=options['interval'],
+            end=timezone.now(),
+            processes=options['processes'],
+            chunk_size=options['chunk_size'],
+            seed=options['seed'],
+            progress=progress,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully generated {written} telemetry entries in {elapsed:.1f}s ({written / elapsed:,.0f}/s).'
+        ))
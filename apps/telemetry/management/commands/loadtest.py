@@ -0,0 +1,84 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.telemetry.loadtest import PERCENTILES, SCENARIOS, WRITE_SCENARIOS, run
+
+
+class Command(BaseCommand):
+    """
+    Drives a running server with concurrent API requests and reports
+    throughput and latency percentiles. See apps/telemetry/loadtest.py.
+    """
+    help = 'Load tests the telemetry API of a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default='http://localhost:8000',
+            help='Base URL of the server under test (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=8,
+            help='Concurrent clients (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10.0,
+            help='Seconds to run (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--mix',
+            help='Scenario weights as name=weight pairs, e.g. "list=3,detail=1". '
+                 f'Scenarios: {", ".join(SCENARIOS)}.',
+        )
+        parser.add_argument(
+            '--read-only', action='store_true',
+            help='Leave out the scenarios that write.',
+        )
+        parser.add_argument(
+            '--json', dest='json_path',
+            help='Also write the report as JSON to this file.',
+        )
+
+    def handle(self, *args, **options):
+        weights = {name: weight for name, (weight, _) in SCENARIOS.items()}
+        if options['mix']:
+            weights = {}
+            for pair in options['mix'].split(','):
+                name, _, weight = pair.partition('=')
+                if name.strip() not in SCENARIOS:
+                    raise CommandError(f'Unknown scenario "{name.strip()}".')
+                try:
+                    weights[name.strip()] = float(weight or 1)
+                except ValueError:
+                    raise CommandError(f'Invalid weight for "{name.strip()}".')
+        if options['read_only']:
+            weights = {name: weight for name, weight in weights.items() if name not in WRITE_SCENARIOS}
+        if not any(weight > 0 for weight in weights.values()):
+            raise CommandError('No scenarios to run.')
+
+        try:
+            report = run(
+                options['url'],
+                concurrency=options['concurrency'],
+                duration=options['duration'],
+                weights=weights,
+            )
+        except OSError as exc:
+            raise CommandError(f'Cannot reach {options["url"]}: {exc}')
+
+        columns = ['requests', 'errors', 'req/s'] + [f'p{p} ms' for p in PERCENTILES] + ['max ms']
+        self.stdout.write(f'{"scenario":<12}' + ''.join(f'{column:>10}' for column in columns))
+        rows = list(report['scenarios'].items()) + [('total', report['total'])]
+        for name, stats in rows:
+            values = [stats['requests'], stats['errors'], f'{stats["throughput"]:.1f}']
+            for key in [f'p{p}_ms' for p in PERCENTILES] + ['max_ms']:
+                values.append('-' if stats[key] is None else f'{stats[key]:.1f}')
+            self.stdout.write(f'{name:<12}' + ''.join(f'{value:>10}' for value in values))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully sent {report["total"]["requests"]} requests from {report["concurrency"]} clients '
+            f'in {report["seconds"]:.1f}s.'
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.telemetry.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the hourly and daily rollup tables from the raw telemetry.
+    """
+    help = (
+        'Rebuilds the hourly and daily telemetry rollups from the raw entries. Rollups from before the day '
+        'of the oldest raw entry are kept, since retention and archiving leave them as the only record of '
+        'that history; --discard-history drops them too.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--discard-history', action='store_true',
+            help='Also delete the rollups older than every raw entry. Their history is lost.',
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(keep_history=not options['discard_history'])
+        for model, count in written.items():
+            self.stdout.write(f'Wrote {count} {model._meta.verbose_name} rows.')
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt telemetry rollups.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.telemetry.snapshots import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every satellite's latest-state snapshot from the raw telemetry.
+    """
+    help = 'Rebuilds the latest-state snapshot of every satellite from scratch'
+
+    def handle(self, *args, **options):
+        count = rebuild_snapshots()
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} satellite states.'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.telemetry.archive import restore_file
+from apps.telemetry.conf import telemetry_setting
+
+
+class Command(BaseCommand):
+    """
+    Loads archive files written by archive_telemetry back into the live table.
+    """
+    help = 'Restores archived telemetry files into the telemetry table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Archive files (telemetry-YYYY-MM.ndjson.gz).')
+        parser.add_argument(
+            '--batch-size', type=int, default=telemetry_setting('ARCHIVE_BATCH_SIZE'),
+            help='Entries inserted per transaction (default: %(default)s).',
+        )
+
+    def handle(self, *args, **options):
+        for path in options['files']:
+            try:
+                restored = restore_file(path, options['batch_size'])
+            except (OSError, ValueError) as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(f'Restored {restored} entries from {path}.')
+        self.stdout.write(self.style.SUCCESS('Successfully restored telemetry.'))
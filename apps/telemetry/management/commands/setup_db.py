@@ -4,18 +4,25 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from apps.telemetry.models import TelemetryEntry
+from apps.telemetry import hotstore
+from apps.telemetry.api.caching import invalidate
+from apps.telemetry.detection import reset_baselines
+from apps.telemetry.models import TelemetryEntry, TelemetryEvent
+from apps.telemetry.rollups import rebuild_rollups
+from apps.telemetry.snapshots import rebuild_snapshots
 
 
 class Command(BaseCommand):
     """
-    Clears all telemetry data and populates the database with 100 random entries.
+    Clears all telemetry data and populates the database with 100 random entries,
+    then rebuilds the rollups and satellite states to match.
     """
     help = 'Clears the telemetry table and seeds it with 100 random entries'
 
     def handle(self, *args, **options):
         # Delete all entries to start fresh.
         TelemetryEntry.objects.all().delete()
+        TelemetryEvent.objects.all().delete()
         self.stdout.write('Cleared all telemetry entries.')
 
         statuses = [choice[0] for choice in TelemetryEntry.HealthStatus.choices]
@@ -39,3 +46,15 @@ class Command(BaseCommand):
 
         TelemetryEntry.objects.bulk_create(entries)
         self.stdout.write(self.style.SUCCESS(f'Successfully created {len(entries)} telemetry entries.'))
+
+        # bulk_create bypasses the incremental rollup and snapshot updates,
+        # and detection, whose baselines now describe deleted entries.
+        # The old rollups describe the deleted entries.
+        rebuild_rollups(keep_history=False)
+        rebuild_snapshots()
+        reset_baselines()
+        self.stdout.write('Rebuilt telemetry rollups and satellite states.')
+
+        # Nor does it invalidate cached API responses or hot windows.
+        invalidate()
+        hotstore.invalidate(now)
@@ -0,0 +1,244 @@
+"""
+Per-request timing and database metrics.
+
+RequestMetricsMiddleware starts a RequestProfile for every request and
+makes it current through a context variable. Every database connection
+carries record_query() as an execute wrapper (installed when the connection
+is opened), which adds each query's time to the current profile. Context
+variables follow a request into the threads that sync_to_async runs its
+sync code in, so queries are attributed under ASGI as well as WSGI. Outside
+a request, the wrapper costs one context variable lookup.
+
+When the request finishes, its profile is folded into the process-wide
+``registry``. /metrics exposes the registry in the Prometheus text format. A
+metric is labelled by the URL pattern name of its view, so the number of
+series is bounded. Each worker process keeps its own registry, so
+Prometheus should scrape every process.
+"""
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+
+from .conf import telemetry_setting
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the request duration histogram, in seconds.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+current_profile = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """
+    What one request spent its time on.
+    """
+    __slots__ = ('started', 'queries', 'db_seconds', 'statements', 'slow_queries', 'render_started', 'render_seconds')
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = Counter()
+        self.slow_queries = []
+        self.render_started = None
+        self.render_seconds = 0.0
+
+    def add_query(self, sql, seconds, slow_seconds):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[sql] += 1
+        if seconds >= slow_seconds:
+            self.slow_queries.append((sql, seconds))
+
+    def repeated_selects(self, threshold):
+        """
+        SELECTs run at least ``threshold`` times with only their parameters
+        changing, the mark of an N+1 access pattern: ``[(sql, times)]``.
+        """
+        return [
+            (sql, count) for sql, count in self.statements.items()
+            if count >= threshold and sql.lstrip()[:6].upper() == 'SELECT'
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding each query to the current profile.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, perf_counter() - started, telemetry_setting('SLOW_QUERY_MS') / 1000)
+
+
+def render_response(response):
+    """
+    ``response.render()``, timed as part of the current profile. For views
+    that render before returning; responses rendered by Django's handler
+    are timed by the middleware.
+    """
+    profile = current_profile.get()
+    if profile is None or response.is_rendered:
+        return response.render()
+    started = perf_counter()
+    try:
+        return response.render()
+    finally:
+        profile.render_seconds += perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created receiver adding record_query() to new connections.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class ViewMetrics:
+    """
+    Running totals for one view and HTTP method.
+    """
+
+    def __init__(self):
+        self.responses = Counter()
+        self.duration_buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration_seconds = 0.0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.response_bytes = 0
+        self.slow_queries = 0
+        self.n_plus_one = 0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe per-process totals of every profiled request.
+    """
+
+    def __init__(self):
+        self._views = defaultdict(ViewMetrics)
+        self._lock = threading.Lock()
+
+    def observe(self, view, method, status, seconds, profile, response_bytes, n_plus_one):
+        with self._lock:
+            metrics = self._views[view, method]
+            metrics.responses[status] += 1
+            metrics.duration_buckets[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+            metrics.duration_seconds += seconds
+            metrics.db_queries += profile.queries
+            metrics.db_seconds += profile.db_seconds
+            metrics.render_seconds += profile.render_seconds
+            metrics.response_bytes += response_bytes
+            metrics.slow_queries += len(profile.slow_queries)
+            metrics.n_plus_one += n_plus_one
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+    def render(self):
+        """
+        The totals in the Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = []
+
+            def family(name, kind, help_text, samples):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for suffix, labels, value in samples:
+                    label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+                    lines.append(f'{name}{suffix}{{{label_text}}} {value}')
+
+            family('http_requests_total', 'counter', 'Requests by view, method and status.', [
+                ('', (('view', view), ('method', method), ('status', status)), count)
+                for (view, method), metrics in views
+                for status, count in sorted(metrics.responses.items())
+            ])
+
+            histogram = []
+            for (view, method), metrics in views:
+                labels = (('view', view), ('method', method))
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS + ('+Inf',), metrics.duration_buckets):
+                    cumulative += count
+                    histogram.append(('_bucket', labels + (('le', bound),), cumulative))
+                histogram.append(('_sum', labels, _number(metrics.duration_seconds)))
+                histogram.append(('_count', labels, cumulative))
+            family('http_request_duration_seconds', 'histogram', 'Wall time spent in Django per request.', histogram)
+
+            for name, attribute, help_text in (
+                ('http_db_queries_total', 'db_queries', 'Database queries run while handling requests.'),
+                ('http_db_duration_seconds_total', 'db_seconds', 'Time spent in database queries.'),
+                ('http_render_duration_seconds_total', 'render_seconds', 'Time spent rendering response bodies.'),
+                ('http_response_bytes_total', 'response_bytes', 'Bytes of non-streaming response bodies.'),
+                ('http_slow_queries_total', 'slow_queries', 'Queries slower than TELEMETRY["SLOW_QUERY_MS"].'),
+                ('http_n_plus_one_total', 'n_plus_one', 'Requests that repeated a SELECT like an N+1 loop.'),
+            ):
+                family(name, 'counter', help_text, [
+                    ('', (('view', view), ('method', method)), _number(getattr(metrics, attribute)))
+                    for (view, method), metrics in views
+                ])
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _number(value):
+    return f'{value:.6f}' if isinstance(value, float) else value
+
+
+def render_values(values):
+    """
+    Unlabelled ``(name, kind, help text, value)`` samples in the text
+    exposition format.
+    """
+    lines = []
+    for name, kind, help_text, value in values:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.append(f'{name} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def finish(profile, view, method, status, response_bytes):
+    """
+    Close ``profile``: log its slow queries and N+1 patterns, and add it to
+    the registry. Returns the request's wall time in seconds.
+    """
+    seconds = perf_counter() - profile.started
+    for sql, query_seconds in profile.slow_queries:
+        logger.warning('Slow query (%.1f ms) in %s: %s', query_seconds * 1000, view, sql)
+    repeated = profile.repeated_selects(telemetry_setting('N_PLUS_ONE_THRESHOLD'))
+    for sql, count in repeated:
+        logger.warning('Possible N+1 in %s: same SELECT run %d times: %s', view, count, sql)
+    registry.observe(view, method, status, seconds, profile, response_bytes, int(bool(repeated)))
+    return seconds
+
+
+def server_timing(profile, seconds):
+    """
+    Server-Timing header value for a finished profile.
+    """
+    return (
+        f'total;dur={seconds * 1000:.2f}, '
+        f'db;dur={profile.db_seconds * 1000:.2f};desc="{profile.queries} queries", '
+        f'render;dur={profile.render_seconds * 1000:.2f}'
+    )
@@ -0,0 +1,73 @@
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+
+from .conf import telemetry_setting
+from .metrics import RequestProfile, current_profile, finish, server_timing
+
+
+class RequestMetricsMiddleware:
+    """
+    Profiles every request: wall time, database queries and their time,
+    response rendering time and body size (see metrics.py).
+
+    Adds a Server-Timing header, which browser developer tools show next to
+    each request, and feeds the /metrics endpoint. Slow queries and repeated
+    SELECTs are logged with their SQL. Listed first in MIDDLEWARE so the
+    wall time covers the other middleware too. TELEMETRY['METRICS_ENABLED']
+    = False removes it.
+
+    Works under WSGI and ASGI without forcing async requests into a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not telemetry_setting('METRICS_ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.process_response(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.process_response(request, response, profile)
+
+    def process_template_response(self, request, response):
+        # Called just before DRF and template responses are rendered; the
+        # callback runs right after.
+        profile = current_profile.get()
+        if profile is not None:
+            profile.render_started = perf_counter()
+
+            def rendered(response):
+                profile.render_seconds += perf_counter() - profile.render_started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def process_response(self, request, response, profile):
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match else 'unmatched'
+        response_bytes = 0 if response.streaming else len(response.content)
+        seconds = finish(profile, view, request.method, response.status_code, response_bytes)
+        response['Server-Timing'] = server_timing(profile, seconds)
+        return response
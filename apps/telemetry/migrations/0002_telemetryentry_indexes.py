@@ -0,0 +1,25 @@
+# Generated by Django 4.2.3 on 2026-10-17 17:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telemetry', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='telemetryentry',
+            index=models.Index(fields=['satellite_id', '-timestamp'], name='telemetry_sat_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telemetryentry',
+            index=models.Index(fields=['status', '-timestamp'], name='telemetry_status_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telemetryentry',
+            index=models.Index(fields=['-timestamp'], name='telemetry_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.3 on 2026-10-17 17:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telemetry', '0002_telemetryentry_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('satellite_id', models.CharField(max_length=100)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('altitude_sum', models.FloatField(default=0)),
+                ('altitude_min', models.FloatField(null=True)),
+                ('altitude_max', models.FloatField(null=True)),
+                ('velocity_sum', models.FloatField(default=0)),
+                ('velocity_min', models.FloatField(null=True)),
+                ('velocity_max', models.FloatField(null=True)),
+                ('healthy_count', models.PositiveIntegerField(default=0)),
+                ('warning_count', models.PositiveIntegerField(default=0)),
+                ('critical_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('satellite_id', models.CharField(max_length=100)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('altitude_sum', models.FloatField(default=0)),
+                ('altitude_min', models.FloatField(null=True)),
+                ('altitude_max', models.FloatField(null=True)),
+                ('velocity_sum', models.FloatField(default=0)),
+                ('velocity_min', models.FloatField(null=True)),
+                ('velocity_max', models.FloatField(null=True)),
+                ('healthy_count', models.PositiveIntegerField(default=0)),
+                ('warning_count', models.PositiveIntegerField(default=0)),
+                ('critical_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket_start'], name='hourly_rollup_bucket_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hourlyrollup',
+            constraint=models.UniqueConstraint(fields=('satellite_id', 'bucket_start'), name='hourly_rollup_sat_bucket_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyrollup',
+            index=models.Index(fields=['bucket_start'], name='daily_rollup_bucket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('satellite_id', 'bucket_start'), name='daily_rollup_sat_bucket_uniq'),
+        ),
+    ]
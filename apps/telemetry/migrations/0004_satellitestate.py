@@ -0,0 +1,28 @@
+# Generated by Django 4.2.3 on 2026-10-17 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telemetry', '0003_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SatelliteState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('satellite_id', models.CharField(max_length=100, unique=True)),
+                ('entry_id', models.BigIntegerField()),
+                ('last_seen', models.DateTimeField()),
+                ('altitude', models.FloatField()),
+                ('velocity', models.FloatField()),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('warning', 'Warning'), ('critical', 'Critical')], max_length=20)),
+            ],
+            options={
+                'ordering': ['satellite_id'],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+INDEX_NAME = 'telemetry_ts_brin'
+
+
+# Rows arrive in roughly timestamp order, so each range of table pages
+# covers a narrow span of time and a BRIN index narrows time-range scans
+# (aggregation, export, retention, archiving) at a fraction of a B-tree's
+# size. The B-tree on -timestamp stays for the list's ORDER BY ... LIMIT.
+# BRIN is PostgreSQL-only; other databases skip this migration.
+def create_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    TelemetryEntry = apps.get_model('telemetry', 'TelemetryEntry')
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {qn(INDEX_NAME)} ON {qn(TelemetryEntry._meta.db_table)} '
+        f'USING brin ({qn("timestamp")}) WITH (autosummarize = on)'
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(INDEX_NAME)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telemetry', '0004_satellitestate'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.3 on 2026-10-17 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telemetry', '0005_telemetryentry_brin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('journal', models.CharField(max_length=100, unique=True)),
+                ('sequence', models.BigIntegerField()),
+            ],
+        ),
+    ]
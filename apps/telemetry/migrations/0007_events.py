@@ -0,0 +1,53 @@
+# Generated by Django 4.2.3 on 2026-10-17 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telemetry', '0006_ingestcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SatelliteBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('satellite_id', models.CharField(max_length=100, unique=True)),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('last_seen', models.DateTimeField()),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('warning', 'Warning'), ('critical', 'Critical')], max_length=20)),
+                ('altitude', models.FloatField()),
+                ('velocity', models.FloatField()),
+                ('altitude_rate', models.FloatField(default=0.0)),
+                ('altitude_rate_var', models.FloatField(default=0.0)),
+                ('velocity_rate', models.FloatField(default=0.0)),
+                ('velocity_rate_var', models.FloatField(default=0.0)),
+            ],
+            options={
+                'ordering': ['satellite_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TelemetryEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('satellite_id', models.CharField(max_length=100)),
+                ('timestamp', models.DateTimeField()),
+                ('kind', models.CharField(choices=[('status_change', 'Status change'), ('anomaly', 'Anomaly')], max_length=20)),
+                ('entry_id', models.BigIntegerField(blank=True, null=True)),
+                ('previous_status', models.CharField(blank=True, choices=[('healthy', 'Healthy'), ('warning', 'Warning'), ('critical', 'Critical')], max_length=20)),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('warning', 'Warning'), ('critical', 'Critical')], max_length=20)),
+                ('field', models.CharField(blank=True, max_length=20)),
+                ('value', models.FloatField(blank=True, null=True)),
+                ('expected', models.FloatField(blank=True, null=True)),
+                ('score', models.FloatField(blank=True, null=True)),
+                ('detected_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-timestamp', '-id'],
+                'indexes': [models.Index(fields=['satellite_id', '-timestamp'], name='event_sat_ts_idx'), models.Index(fields=['kind', '-timestamp'], name='event_kind_ts_idx'), models.Index(fields=['-timestamp'], name='event_ts_idx')],
+            },
+        ),
+    ]
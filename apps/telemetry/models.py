@@ -42,6 +42,200 @@ class TelemetryEntry(models.Model):
         # Most recent data is typically the most relevant for monitoring.
         ordering = ['-timestamp']
         verbose_name_plural = 'telemetry entries'
+        # Cover the list endpoint's filter/sort paths so that filtering by
+        # satellite or status and ordering by newest first avoid a full scan and sort.
+        indexes = [
+            models.Index(fields=['satellite_id', '-timestamp'], name='telemetry_sat_ts_idx'),
+            models.Index(fields=['status', '-timestamp'], name='telemetry_status_ts_idx'),
+            models.Index(fields=['-timestamp'], name='telemetry_ts_idx'),
+        ]
 
     def __str__(self):
         return f'{self.satellite_id} - {self.timestamp}'
+
+
+class TelemetryRollup(models.Model):
+    """
+    Pre-aggregated telemetry for one satellite over one time bucket.
+
+    Rollups are kept current as entries are written (see rollups.py), so
+    long-range aggregate queries read one row per bucket instead of every
+    entry in it. Averages are derived as sum / count.
+    """
+
+    satellite_id = models.CharField(max_length=100)
+
+    # Start of the bucket in the current timezone, as TruncHour/TruncDay return it.
+    bucket_start = models.DateTimeField()
+
+    count = models.PositiveIntegerField(default=0)
+    altitude_sum = models.FloatField(default=0)
+    altitude_min = models.FloatField(null=True)
+    altitude_max = models.FloatField(null=True)
+    velocity_sum = models.FloatField(default=0)
+    velocity_min = models.FloatField(null=True)
+    velocity_max = models.FloatField(null=True)
+
+    # Status histogram, one column per HealthStatus.
+    healthy_count = models.PositiveIntegerField(default=0)
+    warning_count = models.PositiveIntegerField(default=0)
+    critical_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ['bucket_start']
+
+    def __str__(self):
+        return f'{self.satellite_id} - {self.bucket_start}'
+
+
+class HourlyRollup(TelemetryRollup):
+    """
+    Telemetry rolled up per satellite per hour.
+    """
+
+    class Meta(TelemetryRollup.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['satellite_id', 'bucket_start'], name='hourly_rollup_sat_bucket_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket_start'], name='hourly_rollup_bucket_idx'),
+        ]
+
+
+class DailyRollup(TelemetryRollup):
+    """
+    Telemetry rolled up per satellite per day.
+    """
+
+    class Meta(TelemetryRollup.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['satellite_id', 'bucket_start'], name='daily_rollup_sat_bucket_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket_start'], name='daily_rollup_bucket_idx'),
+        ]
+
+
+class SatelliteState(models.Model):
+    """
+    The latest telemetry entry of each satellite.
+
+    A snapshot kept current as entries are written (see snapshots.py), so
+    listing every satellite's current state reads one row per satellite
+    however large the telemetry table grows. The entry's values are copied
+    here rather than joined.
+    """
+
+    satellite_id = models.CharField(max_length=100, unique=True)
+
+    # A plain id rather than a ForeignKey: bulk deletes of old telemetry must
+    # not make Django collect and update snapshot rows entry by entry.
+    entry_id = models.BigIntegerField()
+
+    # Timestamp of the latest entry, i.e. when the satellite was last heard from.
+    last_seen = models.DateTimeField()
+    altitude = models.FloatField()
+    velocity = models.FloatField()
+    status = models.CharField(max_length=20, choices=TelemetryEntry.HealthStatus.choices)
+
+    class Meta:
+        ordering = ['satellite_id']
+
+    def __str__(self):
+        return f'{self.satellite_id} - {self.last_seen}'
+
+
+class IngestCheckpoint(models.Model):
+    """
+    The last record of an ingest journal written to the telemetry table.
+
+    Updated in the same transaction as the entries (see ingest_queue.py),
+    so replaying a journal after a crash skips exactly what was committed.
+    """
+
+    # File name of the journal within TELEMETRY['INGEST_JOURNAL_DIR'].
+    journal = models.CharField(max_length=100, unique=True)
+    sequence = models.BigIntegerField()
+
+    def __str__(self):
+        return f'{self.journal} - {self.sequence}'
+
+
+class SatelliteBaseline(models.Model):
+    """
+    The rolling statistics the detector compares each new entry with.
+
+    A fixed handful of values per satellite however much telemetry it sends
+    (see detection.py): its last entry's time, status and values, and an
+    exponentially weighted mean and variance of how fast each value changes.
+    """
+
+    satellite_id = models.CharField(max_length=100, unique=True)
+
+    # Rates of change observed so far; anomalies are only reported once
+    # there have been TELEMETRY['DETECTION_WARMUP'] of them.
+    samples = models.PositiveIntegerField(default=0)
+
+    last_seen = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=TelemetryEntry.HealthStatus.choices)
+    altitude = models.FloatField()
+    velocity = models.FloatField()
+
+    # EWMA of the rate of change, in units per second, and its variance.
+    altitude_rate = models.FloatField(default=0.0)
+    altitude_rate_var = models.FloatField(default=0.0)
+    velocity_rate = models.FloatField(default=0.0)
+    velocity_rate_var = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ['satellite_id']
+
+    def __str__(self):
+        return f'{self.satellite_id} - {self.last_seen}'
+
+
+class TelemetryEvent(models.Model):
+    """
+    A status transition or anomaly found in a satellite's telemetry as it
+    was written.
+    """
+
+    class Kind(models.TextChoices):
+        STATUS_CHANGE = 'status_change', 'Status change'
+        ANOMALY = 'anomaly', 'Anomaly'
+
+    satellite_id = models.CharField(max_length=100)
+    # Timestamp of the entry the event was found in.
+    timestamp = models.DateTimeField()
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+
+    # A plain id, as on SatelliteState: events outlive the raw entries that
+    # retention and archiving remove. Null when the backend does not return
+    # the ids of bulk inserted rows.
+    entry_id = models.BigIntegerField(null=True, blank=True)
+
+    # Status changes: the status before and after.
+    previous_status = models.CharField(max_length=20, choices=TelemetryEntry.HealthStatus.choices, blank=True)
+    status = models.CharField(max_length=20, choices=TelemetryEntry.HealthStatus.choices)
+
+    # Anomalies: the measurement that jumped, its value, the value its recent
+    # rate of change predicted, and how many standard deviations the observed
+    # rate was from the expected one.
+    field = models.CharField(max_length=20, blank=True)
+    value = models.FloatField(null=True, blank=True)
+    expected = models.FloatField(null=True, blank=True)
+    score = models.FloatField(null=True, blank=True)
+
+    detected_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            models.Index(fields=['satellite_id', '-timestamp'], name='event_sat_ts_idx'),
+            models.Index(fields=['kind', '-timestamp'], name='event_kind_ts_idx'),
+            models.Index(fields=['-timestamp'], name='event_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.satellite_id} - {self.kind} - {self.timestamp}'
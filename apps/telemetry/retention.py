@@ -0,0 +1,206 @@
+"""
+Retention of raw telemetry.
+
+Raw entries older than TELEMETRY['RETENTION_DAYS'] are reduced to the
+hourly and daily rollups and then deleted. Work is done a day at a time,
+oldest first. The day's rollup buckets are recomputed from its raw rows, so
+they are exact even if some entries bypassed the incremental updates, and
+the rows are then deleted TELEMETRY['RETENTION_BATCH_SIZE'] at a time. Every
+batch is its own short statement, so writers queue behind one batch rather
+than the whole purge.
+
+Afterwards the freed space is compacted in steps: on SQLite, databases in
+incremental auto-vacuum mode release COMPACT_PAGES pages per step, and
+``PRAGMA optimize`` refreshes the statistics with a bounded analysis; on
+PostgreSQL the table is vacuumed and analysed, which does not block writes.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.db import connection, connections
+from django.db.models import Min
+from django.utils import timezone
+
+from . import hotstore
+from .api.caching import invalidate
+from .conf import telemetry_setting
+from .models import TelemetryEntry
+from .rollups import refresh_rollups
+
+
+logger = logging.getLogger(__name__)
+
+# The last report produced in this process, for monitoring.
+last_report = None
+
+
+def day_start(dt):
+    return timezone.localtime(dt).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def retention_cutoff(days, now=None):
+    """
+    The start of the oldest day kept when keeping ``days`` days.
+
+    Aligned to a day so that no rollup bucket is left half purged.
+    """
+    return day_start((now or timezone.now()) - timedelta(days=days))
+
+
+def purge_day(day, batch_size, pause):
+    """
+    Fold one day of raw entries into the rollups and delete them.
+
+    Returns ``(rollup_rows, deleted)``.
+    """
+    end = day + timedelta(days=1)
+    rollup_rows = refresh_rollups(day, end)
+
+    queryset = TelemetryEntry.objects.filter(timestamp__gte=day, timestamp__lt=end).order_by()
+    deleted = 0
+    while ids := list(queryset.values_list('id', flat=True)[:batch_size]):
+        deleted += TelemetryEntry.objects.filter(id__in=ids).delete()[0]
+        time.sleep(pause)
+    return rollup_rows, deleted
+
+
+def compact(pages=None):
+    """
+    Return freed space to the filesystem and refresh planner statistics.
+
+    Returns the number of SQLite pages released, or None where that is not
+    known.
+    """
+    pages = pages or telemetry_setting('COMPACT_PAGES')
+    table = TelemetryEntry._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('PRAGMA auto_vacuum')
+            incremental = cursor.fetchone()[0] == 2
+            cursor.execute('PRAGMA freelist_count')
+            free_before = free = cursor.fetchone()[0]
+            while incremental and free:
+                cursor.execute(f'PRAGMA incremental_vacuum({int(pages)})')
+                cursor.fetchall()
+                cursor.execute('PRAGMA freelist_count')
+                free = cursor.fetchone()[0]
+            cursor.execute('PRAGMA analysis_limit = 1000')
+            cursor.execute('PRAGMA optimize')
+            return free_before - free
+        if connection.vendor == 'postgresql':
+            # VACUUM cannot run inside a transaction; ANALYZE can.
+            command = 'ANALYZE' if connection.in_atomic_block else 'VACUUM (ANALYZE)'
+            cursor.execute(f'{command} {connection.ops.quote_name(table)}')
+        else:
+            cursor.execute(f'ANALYZE TABLE {connection.ops.quote_name(table)}')
+    return None
+
+
+def enable_incremental_vacuum():
+    """
+    Switch a SQLite database to incremental auto-vacuum.
+
+    The mode only takes effect after a full VACUUM, which rewrites the
+    database and blocks writers while it runs, so this is a one-off step.
+    """
+    if connection.vendor != 'sqlite':
+        raise ValueError('Incremental vacuum is specific to SQLite.')
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        cursor.execute('VACUUM')
+
+
+def run_retention(days=None, batch_size=None, pause=None, now=None, dry_run=False, compact_after=True):
+    """
+    Purge raw entries older than ``days`` days into the rollups.
+
+    Returns a report with the cutoff, the days purged, the rollup rows
+    written, the entries deleted, the pages compacted and the seconds spent
+    in each phase. Does nothing when no retention period is configured.
+    """
+    global last_report
+
+    days = telemetry_setting('RETENTION_DAYS') if days is None else days
+    batch_size = batch_size or telemetry_setting('RETENTION_BATCH_SIZE')
+    pause = telemetry_setting('RETENTION_PAUSE') if pause is None else pause
+
+    report = {
+        'cutoff': None,
+        'days': 0,
+        'rollup_rows': 0,
+        'deleted': 0,
+        'pages_freed': 0,
+        'purge_seconds': 0.0,
+        'compact_seconds': 0.0,
+    }
+    if days is None:
+        return report
+
+    cutoff = retention_cutoff(days, now)
+    report['cutoff'] = cutoff
+    expired = TelemetryEntry.objects.filter(timestamp__lt=cutoff)
+    if dry_run:
+        report['deleted'] = expired.count()
+        return report
+
+    started = time.perf_counter()
+    while oldest := expired.aggregate(oldest=Min('timestamp'))['oldest']:
+        rollup_rows, deleted = purge_day(day_start(oldest), batch_size, pause)
+        report['days'] += 1
+        report['rollup_rows'] += rollup_rows
+        report['deleted'] += deleted
+    report['purge_seconds'] = time.perf_counter() - started
+
+    if report['deleted']:
+        invalidate()
+        hotstore.invalidate(cutoff)
+        if compact_after:
+            started = time.perf_counter()
+            report['pages_freed'] = compact()
+            report['compact_seconds'] = time.perf_counter() - started
+
+    last_report = report
+    return report
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler():
+    """
+    Run retention every TELEMETRY['RETENTION_INTERVAL'] seconds in a daemon
+    thread of this process.
+
+    Does nothing unless both RETENTION_DAYS and RETENTION_INTERVAL are set,
+    or if the thread is already running. Every worker process of a server
+    starts its own; concurrent runs delete disjoint batches and are harmless,
+    but a single cron job running the retention command is cheaper.
+    """
+    global _scheduler
+
+    interval = telemetry_setting('RETENTION_INTERVAL')
+    if not interval or telemetry_setting('RETENTION_DAYS') is None:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = threading.Thread(target=_schedule, args=(interval,), name='telemetry-retention', daemon=True)
+            _scheduler.start()
+    return _scheduler
+
+
+def _schedule(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            report = run_retention()
+            logger.info(
+                'Telemetry retention deleted %d entries in %.1fs and freed %s pages in %.1fs',
+                report['deleted'], report['purge_seconds'], report['pages_freed'], report['compact_seconds'],
+            )
+        except Exception:
+            logger.exception('Telemetry retention failed')
+        finally:
+            connections.close_all()
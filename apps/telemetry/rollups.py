@@ -0,0 +1,296 @@
+"""
+Incremental maintenance of the hourly and daily rollup tables.
+
+New entries are folded into their buckets' running totals. MIN and MAX
+cannot be undone by subtraction, so buckets that lose an entry (through an
+update or delete) are recomputed from the raw rows instead.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import DailyRollup, HourlyRollup, TelemetryEntry
+
+
+# (model, database truncation, Python truncation, bucket length), finest first.
+ROLLUPS = (
+    (HourlyRollup, TruncHour, lambda dt: dt.replace(minute=0, second=0, microsecond=0), timedelta(hours=1)),
+    (DailyRollup, TruncDay, lambda dt: dt.replace(hour=0, minute=0, second=0, microsecond=0), timedelta(days=1)),
+)
+
+MEASUREMENTS = ('altitude', 'velocity')
+STATUSES = TelemetryEntry.HealthStatus.values
+STAT_FIELDS = (
+    ['count']
+    + [f'{field}_{stat}' for field in MEASUREMENTS for stat in ('sum', 'min', 'max')]
+    + [f'{status}_count' for status in STATUSES]
+)
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def _aggregates():
+    """
+    Aggregate expressions producing every rollup statistic from raw entries.
+    """
+    aggregates = {'count': Count('id')}
+    for field in MEASUREMENTS:
+        aggregates[f'{field}_sum'] = Sum(field)
+        aggregates[f'{field}_min'] = Min(field)
+        aggregates[f'{field}_max'] = Max(field)
+    for status in STATUSES:
+        aggregates[f'{status}_count'] = Count('id', filter=Q(status=status))
+    return aggregates
+
+
+def _grouped(queryset, trunc):
+    return (
+        queryset
+        .annotate(bucket_start=trunc('timestamp'))
+        .values('satellite_id', 'bucket_start')
+        .annotate(**_aggregates())
+        .order_by()
+    )
+
+
+def _lower(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _higher(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _entry_stats(entries):
+    """
+    Rollup statistics for a group of entries.
+    """
+    stats = {'count': len(entries)}
+    for field in MEASUREMENTS:
+        values = [getattr(entry, field) for entry in entries]
+        stats[f'{field}_sum'] = sum(values)
+        stats[f'{field}_min'] = min(values)
+        stats[f'{field}_max'] = max(values)
+    statuses = Counter(entry.status for entry in entries)
+    for status in STATUSES:
+        stats[f'{status}_count'] = statuses[status]
+    return stats
+
+
+def _combine(a, b):
+    """
+    Combine two sets of rollup statistics into one.
+    """
+    return {
+        name: (
+            _lower(a[name], b[name]) if name.endswith('_min')
+            else _higher(a[name], b[name]) if name.endswith('_max')
+            else a[name] + b[name]
+        )
+        for name in STAT_FIELDS
+    }
+
+
+def _merge(row, stats):
+    current = {name: getattr(row, name) for name in STAT_FIELDS}
+    for name, value in _combine(current, stats).items():
+        setattr(row, name, value)
+
+
+def _locked_rows(model, keys):
+    """
+    Return ``{(satellite_id, bucket_start): row}`` for ``keys``, locked for update.
+
+    Missing rows are inserted empty first so that concurrent writers
+    serialise on the row lock rather than racing to create it.
+    """
+    model.objects.bulk_create(
+        [model(satellite_id=sat, bucket_start=start) for sat, start in keys],
+        ignore_conflicts=True,
+    )
+    rows = model.objects.select_for_update().filter(
+        satellite_id__in={sat for sat, _ in keys},
+        bucket_start__in={start for _, start in keys},
+    )
+    return {(row.satellite_id, row.bucket_start): row for row in rows if (row.satellite_id, row.bucket_start) in keys}
+
+
+def _write(model, rows):
+    """
+    Store the statistics of locked ``rows``.
+
+    An upsert of the final values is far cheaper than bulk_update(), which
+    builds a CASE expression per column over every row. The rows are
+    locked, so the values cannot have changed since they were read.
+    """
+    model.objects.bulk_create(
+        [
+            model(
+                satellite_id=row.satellite_id,
+                bucket_start=row.bucket_start,
+                **{name: getattr(row, name) for name in STAT_FIELDS},
+            )
+            for row in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['satellite_id', 'bucket_start'],
+        update_fields=STAT_FIELDS,
+    )
+
+
+def _increment(model, deltas):
+    rows = _locked_rows(model, deltas.keys())
+    for key, row in rows.items():
+        _merge(row, deltas[key])
+    _write(model, rows.values())
+
+
+def _recompute(model, trunc, span, keys):
+    starts = [start for _, start in keys]
+    raw = TelemetryEntry.objects.filter(
+        satellite_id__in={sat for sat, _ in keys},
+        timestamp__gte=min(starts),
+        timestamp__lt=max(starts) + span,
+    )
+    totals = {
+        (row['satellite_id'], row['bucket_start']): row
+        for row in _grouped(raw, trunc)
+    }
+
+    empty = keys - totals.keys()
+    if empty:
+        query = Q()
+        for sat, start in empty:
+            query |= Q(satellite_id=sat, bucket_start=start)
+        model.objects.filter(query).delete()
+
+    rows = _locked_rows(model, keys & totals.keys())
+    for key, row in rows.items():
+        for name in STAT_FIELDS:
+            setattr(row, name, totals[key][name])
+    _write(model, rows.values())
+
+
+def hourly_stats(entries):
+    """
+    Rollup statistics of ``entries`` per ``(satellite_id, hour start)``.
+
+    Statistics of separate groups of entries can be merged with
+    merge_stats() and applied together with apply_stats().
+    """
+    tz = timezone.get_current_timezone()
+    finest_truncate = ROLLUPS[0][2]
+    groups = defaultdict(list)
+    for entry in entries:
+        groups[entry.satellite_id, finest_truncate(entry.timestamp.astimezone(tz))].append(entry)
+    return {key: _entry_stats(entries) for key, entries in groups.items()}
+
+
+def merge_stats(total, stats):
+    """
+    Merge the hourly statistics ``stats`` into ``total`` in place.
+    """
+    for key, value in stats.items():
+        total[key] = _combine(total[key], value) if key in total else value
+    return total
+
+
+def apply_changes(added=(), removed=()):
+    """
+    Bring the rollups up to date with entries that were added and removed.
+
+    Must be called after the raw rows have been written, since removed
+    buckets are recomputed from the table.
+    """
+    # Group the added entries by the finest bucket once; coarser rollups
+    # combine these groups rather than revisiting every entry.
+    apply_stats(hourly_stats(added), removed)
+
+
+def apply_stats(group_stats, removed=()):
+    """
+    Add hourly statistics from hourly_stats() to the rollups, and recompute
+    the buckets of ``removed`` entries.
+    """
+    tz = timezone.get_current_timezone()
+    with transaction.atomic():
+        for model, trunc, truncate, span in ROLLUPS:
+            stale = {(e.satellite_id, truncate(e.timestamp.astimezone(tz))) for e in removed}
+
+            deltas = {}
+            for (sat, start), stats in group_stats.items():
+                key = (sat, truncate(start))
+                # Recomputed buckets already include the added entries.
+                if key in stale:
+                    continue
+                deltas[key] = _combine(deltas[key], stats) if key in deltas else stats
+
+            if stale:
+                _recompute(model, trunc, span, stale)
+            if deltas:
+                _increment(model, deltas)
+
+
+def rebuild_rollups(keep_history=True):
+    """
+    Recreate the rollup rows from the raw telemetry table.
+
+    Retention and archiving delete raw rows whole days at a time and leave
+    the rollups as the only record of them, so buckets before the day of the
+    oldest raw entry are kept, and none are touched while the table is
+    empty. With ``keep_history=False`` every rollup row is replaced, and
+    that history is lost.
+
+    Returns a dict mapping each rollup model to the number of rows written.
+    """
+    oldest = TelemetryEntry.objects.aggregate(oldest=Min('timestamp'))['oldest']
+    if keep_history and oldest is None:
+        return {model: 0 for model, _, _, _ in ROLLUPS}
+    truncate_day = ROLLUPS[-1][2]
+
+    written = {}
+    with transaction.atomic():
+        for model, trunc, _, _ in ROLLUPS:
+            replaced = model.objects.all()
+            if keep_history:
+                replaced = replaced.filter(bucket_start__gte=truncate_day(timezone.localtime(oldest)))
+            replaced.delete()
+            rows = (model(**row) for row in _grouped(TelemetryEntry.objects.all(), trunc).iterator())
+            written[model] = 0
+            while batch := list(islice(rows, REBUILD_BATCH_SIZE)):
+                model.objects.bulk_create(batch)
+                written[model] += len(batch)
+    return written
+
+
+def refresh_rollups(start, end):
+    """
+    Recompute, from the raw rows, every rollup bucket with entries between
+    ``start`` and ``end``, which must fall on day boundaries.
+
+    Buckets without raw rows are left alone: retention and archiving remove
+    raw rows on purpose and keep their rollups. Returns the number of
+    rollup rows written.
+    """
+    raw = TelemetryEntry.objects.filter(timestamp__gte=start, timestamp__lt=end)
+    written = 0
+    with transaction.atomic():
+        for model, trunc, _, _ in ROLLUPS:
+            rows = [model(**row) for row in _grouped(raw, trunc)]
+            model.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['satellite_id', 'bucket_start'],
+                update_fields=STAT_FIELDS,
+            )
+            written += len(rows)
+    return written
+
+
+def on_entries_changed(sender, added=(), removed=(), **kwargs):
+    apply_changes(added=added, removed=removed)
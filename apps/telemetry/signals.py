@@ -0,0 +1,8 @@
+from django.dispatch import Signal
+
+
+# Sent after telemetry entries are written through the API or the bulk
+# ingest path, inside the same transaction as the write. Receivers get
+# ``added`` and ``removed`` lists of TelemetryEntry instances; an update
+# sends the entry's previous values as removed and its new values as added.
+entries_changed = Signal()
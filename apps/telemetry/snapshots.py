@@ -0,0 +1,104 @@
+"""
+Maintenance of the SatelliteState snapshot.
+
+An added entry replaces a satellite's snapshot when it is newer, by
+timestamp and then id. When the entry a snapshot was taken from is updated
+or deleted, the satellite's latest entry is looked up again; the
+(satellite_id, -timestamp) index makes that a single index probe.
+"""
+from django.db import transaction
+
+from .models import SatelliteState, TelemetryEntry
+
+
+STATE_FIELDS = ['entry_id', 'last_seen', 'altitude', 'velocity', 'status']
+
+
+def _is_newer(entry, state):
+    return (entry.timestamp, entry.pk) > (state.last_seen, state.entry_id)
+
+
+def _copy(entry, state):
+    state.entry_id = entry.pk
+    state.last_seen = entry.timestamp
+    state.altitude = entry.altitude
+    state.velocity = entry.velocity
+    state.status = entry.status
+
+
+def _latest_entry(satellite_id):
+    return TelemetryEntry.objects.filter(satellite_id=satellite_id).order_by('-timestamp', '-id').first()
+
+
+def apply_changes(added=(), removed=()):
+    """
+    Bring the snapshots up to date with entries that were added and removed.
+
+    Must be called after the raw rows have been written.
+    """
+    newest = {}
+    for entry in added:
+        current = newest.get(entry.satellite_id)
+        if current is None or (entry.timestamp, entry.pk) > (current.timestamp, current.pk):
+            newest[entry.satellite_id] = entry
+
+    removed_ids = {entry.pk for entry in removed}
+    satellites = newest.keys() | {entry.satellite_id for entry in removed}
+    if not satellites:
+        return
+
+    with transaction.atomic():
+        states = {
+            state.satellite_id: state
+            for state in SatelliteState.objects.select_for_update().filter(satellite_id__in=satellites)
+        }
+
+        # Snapshots taken from a removed entry are looked up again; the
+        # lookup sees the added entries too, since they are already written.
+        stale = [sat for sat, state in states.items() if state.entry_id in removed_ids]
+        for sat in stale:
+            latest = _latest_entry(sat)
+            if latest is None:
+                states.pop(sat).delete()
+                newest.pop(sat, None)
+            else:
+                newest[sat] = latest
+
+        changed = []
+        created = []
+        for sat, entry in newest.items():
+            state = states.get(sat)
+            if state is None:
+                state = SatelliteState(satellite_id=sat)
+                _copy(entry, state)
+                created.append(state)
+            elif state.satellite_id in stale or _is_newer(entry, state):
+                _copy(entry, state)
+                changed.append(state)
+
+        # A concurrent writer may have created the same satellite since the
+        # SELECT above; take over its row rather than fail.
+        SatelliteState.objects.bulk_create(
+            created, update_conflicts=True, unique_fields=['satellite_id'], update_fields=STATE_FIELDS,
+        )
+        SatelliteState.objects.bulk_update(changed, STATE_FIELDS)
+
+
+def rebuild_snapshots():
+    """
+    Recreate every snapshot from the raw telemetry table. Returns the count.
+    """
+    with transaction.atomic():
+        SatelliteState.objects.all().delete()
+        satellites = list(TelemetryEntry.objects.order_by().values_list('satellite_id', flat=True).distinct())
+        states = []
+        for sat in satellites:
+            state = SatelliteState(satellite_id=sat)
+            _copy(_latest_entry(sat), state)
+            states.append(state)
+        SatelliteState.objects.bulk_create(states)
+    return len(states)
+
+
+def on_entries_changed(sender, added=(), removed=(), **kwargs):
+    apply_changes(added=added, removed=removed)
@@ -0,0 +1,84 @@
+"""
+Backend-specific fast paths for telemetry storage.
+
+Everything works through the ORM on any database. Where PostgreSQL offers
+something much faster, it is used when the connection supports it, so the
+same views run unchanged on SQLite in development and tests:
+
+- Bulk inserts use COPY, which streams rows without building a statement
+  and binding parameters per value. COPY cannot return the new ids, so they
+  are drawn from the table's sequence first and copied in explicitly.
+- Time buckets use TimescaleDB's time_bucket() when the extension is
+  installed. Otherwise Django's Trunc functions compile to PostgreSQL's
+  native date_trunc().
+- Migration 0005 adds a BRIN index on the timestamp, which summarises each
+  range of table pages in a few bytes and so stays small however large the
+  table grows.
+"""
+import csv
+import io
+
+from django.db.models import DateTimeField, DurationField, Func, Value
+
+
+def supports_copy(connection):
+    return connection.vendor == 'postgresql'
+
+
+def has_timescaledb(connection):
+    """
+    Whether the TimescaleDB extension is installed in the database; checked
+    once per connection wrapper.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    if not hasattr(connection, '_has_timescaledb'):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb')")
+            connection._has_timescaledb = cursor.fetchone()[0]
+    return connection._has_timescaledb
+
+
+class TimeBucket(Func):
+    """
+    TimescaleDB's time_bucket(): the start of the ``interval``-long bucket
+    containing ``expression``, with buckets aligned in ``tzname``.
+    """
+    function = 'time_bucket'
+    output_field = DateTimeField()
+
+    def __init__(self, interval, expression, tzname):
+        super().__init__(Value(interval, output_field=DurationField()), expression, Value(tzname))
+
+
+def reserve_ids(connection, model, count):
+    """
+    Draw ``count`` primary keys from ``model``'s sequence, in ascending order.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return sorted(pk for pk, in cursor.fetchall())
+
+
+def copy_rows(connection, table, columns, rows):
+    """
+    Insert ``rows``, tuples of values for ``columns``, into ``table`` with COPY.
+    """
+    qn = connection.ops.quote_name
+    sql = f'COPY {qn(table)} ({", ".join(qn(column) for column in columns)}) FROM STDIN'
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy'):
+            # psycopg 3 adapts each value as it would a query parameter.
+            with raw.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            # psycopg2 only copies from a file.
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            raw.copy_expert(f'{sql} WITH (FORMAT csv)', buffer)
@@ -0,0 +1,224 @@
+"""
+In-process fan-out of newly inserted telemetry to Server-Sent Event streams.
+
+A single broker per process polls the table for entries with an id above the
+last one it has seen and hands each new entry, already encoded as an SSE
+event, to every matching subscriber. However many clients are connected, the
+database sees one query per poll interval.
+
+Every subscriber has a bounded queue. A subscriber that falls a full queue
+behind is dropped: its stream finishes what was queued, sends an ``overflow``
+event and closes, and the browser reconnects with Last-Event-ID to replay
+what it missed from the table.
+
+Entries are picked up in primary key order, which matches commit order on
+SQLite, where writes are serialised. On backends with concurrent writers an
+entry whose transaction commits after a higher id has been polled is not
+streamed; it still appears in the list endpoint.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.db.models import Max
+
+from .api.serializers import TelemetryEntrySerializer
+from .conf import telemetry_setting
+from .models import TelemetryEntry
+
+
+logger = logging.getLogger(__name__)
+
+
+def encode_event(data, event=None, event_id=None):
+    """
+    Encode one Server-Sent Event as bytes.
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event is not None:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+def fetch_events(after_id, limit, satellite_id=None, up_to_id=None):
+    """
+    Return ``(id, satellite_id, event_bytes)`` for up to ``limit`` entries
+    with an id above ``after_id``, in id order.
+    """
+    queryset = TelemetryEntry.objects.filter(id__gt=after_id).order_by('id')
+    if satellite_id:
+        queryset = queryset.filter(satellite_id=satellite_id)
+    if up_to_id is not None:
+        queryset = queryset.filter(id__lte=up_to_id)
+    data = TelemetryEntrySerializer(queryset[:limit], many=True).data
+    return [
+        (item['id'], item['satellite_id'], encode_event(item, event='telemetry', event_id=item['id']))
+        for item in data
+    ]
+
+
+def latest_id():
+    return TelemetryEntry.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+
+class Subscription:
+    """
+    One stream's view of the broker: a bounded queue of encoded events.
+    """
+
+    def __init__(self, satellite_id, maxsize, start_id):
+        self.satellite_id = satellite_id or None
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+        # The broker's position when the subscription started: entries
+        # above it arrive through the queue.
+        self.start_id = start_id
+
+
+class TelemetryBroker:
+    """
+    Polls for new telemetry and fans it out to the subscriptions.
+
+    The polling task runs only while there are subscribers. Its position is
+    the highest entry id already delivered; a new subscription starts from
+    there, so it receives entries inserted after it subscribed.
+    """
+
+    def __init__(self):
+        # satellite_id -> subscriptions; None holds the unfiltered ones.
+        self.subscriptions = defaultdict(set)
+        self.last_id = None
+        self._task = None
+
+    def __len__(self):
+        return sum(len(subs) for subs in self.subscriptions.values())
+
+    async def subscribe(self, satellite_id=None):
+        if self.last_id is None:
+            latest = await sync_to_async(latest_id)()
+            # Another subscription may have started the broker meanwhile.
+            if self.last_id is None:
+                self.last_id = latest
+        # No await from here on, so no poll can move last_id past start_id
+        # before the subscription is registered.
+        subscription = Subscription(satellite_id, telemetry_setting('STREAM_QUEUE_SIZE'), self.last_id)
+        self.subscriptions[subscription.satellite_id].add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subs = self.subscriptions.get(subscription.satellite_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self.subscriptions[subscription.satellite_id]
+        if not self.subscriptions:
+            # Nobody is listening, so there is no position worth keeping.
+            if self._task is not None:
+                self._task.cancel()
+            self._task = None
+            self.last_id = None
+
+    async def poll(self):
+        """
+        Read one batch of new entries and publish it. Returns the batch size.
+        """
+        events = await sync_to_async(fetch_events)(self.last_id, telemetry_setting('STREAM_BATCH_SIZE'))
+        if events:
+            self.last_id = events[-1][0]
+            self.publish(events)
+        return len(events)
+
+    def publish(self, events):
+        by_satellite = defaultdict(list)
+        for _, satellite_id, payload in events:
+            by_satellite[satellite_id].append(payload)
+
+        everyone = list(self.subscriptions.get(None, ()))
+        for satellite_id, payloads in by_satellite.items():
+            for subscription in everyone + list(self.subscriptions.get(satellite_id, ())):
+                self._deliver(subscription, payloads)
+
+    def _deliver(self, subscription, payloads):
+        if subscription.overflowed:
+            return
+        for payload in payloads:
+            try:
+                subscription.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+                return
+
+    async def _run(self):
+        batch_size = telemetry_setting('STREAM_BATCH_SIZE')
+        while self.subscriptions:
+            try:
+                fetched = await self.poll()
+            except Exception:
+                # A failed read (e.g. a locked database) must not end every
+                # stream; try again on the next tick.
+                logger.exception('Telemetry stream poll failed')
+                fetched = 0
+            if fetched < batch_size:
+                await asyncio.sleep(telemetry_setting('STREAM_POLL_INTERVAL'))
+
+
+broker = TelemetryBroker()
+
+
+async def event_stream(satellite_id=None, last_event_id=None):
+    """
+    Yield SSE bytes for new entries until the stream's time limit is reached.
+
+    When ``last_event_id`` is given, entries after it that were inserted
+    before the subscription started are replayed first, so a reconnecting
+    client misses nothing. If more were missed than a queue holds, a
+    ``reset`` event tells the client to reload instead.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + telemetry_setting('STREAM_MAX_SECONDS')
+    keepalive = telemetry_setting('STREAM_KEEPALIVE')
+    subscription = await broker.subscribe(satellite_id)
+    try:
+        yield b'retry: 3000\n\n'
+
+        # Entries above start_id are already on their way through the
+        # queue; replaying them too would send them twice.
+        start_id = subscription.start_id
+        if last_event_id is not None and last_event_id < start_id:
+            limit = telemetry_setting('STREAM_QUEUE_SIZE')
+            missed = await sync_to_async(fetch_events)(
+                last_event_id, limit + 1, satellite_id=satellite_id, up_to_id=start_id,
+            )
+            if len(missed) > limit:
+                yield encode_event({'last_id': start_id}, event='reset')
+            else:
+                yield b''.join(payload for _, _, payload in missed)
+
+        queue = subscription.queue
+        while True:
+            if subscription.overflowed and queue.empty():
+                yield encode_event({'detail': 'Stream fell too far behind.'}, event='overflow')
+                return
+            timeout = min(keepalive, deadline - loop.time())
+            if timeout <= 0:
+                return
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield b': keepalive\n\n'
+                continue
+            # Send whatever else is already queued in the same chunk.
+            chunk = [payload]
+            while not queue.empty():
+                chunk.append(queue.get_nowait())
+            yield b''.join(chunk)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,217 @@
+"""
+Synthetic telemetry at production scale.
+
+Every satellite follows a Keplerian orbit: its altitude swings between
+perigee and apogee over the orbital period, and its velocity follows from
+the vis-viva equation, so the two move against each other the way real
+tracks do. Health is driven by a slowly varying per-satellite signal. A
+satellite drifts from healthy to warning to critical and back through warning,
+staying in each state for a while rather than flipping sample to sample.
+
+Both are closed-form functions of time, so any window of samples can be
+generated independently. Windows are generated in worker processes, with
+values already adapted for the database, and inserted by the parent in
+order, one chunk per transaction, with at most a few chunks in flight;
+memory stays flat however many rows are requested.
+
+The workers also compute each window's hourly rollup statistics. The parent
+merges them and adds them to the rollups once at the end, and rebuilds the
+satellite snapshots. That is far cheaper than updating both per chunk, and
+than regrouping millions of rows in SQL, but an interrupted run leaves the
+rollups behind the table until ``rebuild_rollups`` is run. The generated
+entries are not checked for events; the detection baselines, which never
+saw them, are dropped, and the hot windows reload.
+"""
+import math
+import os
+import random
+from collections import deque
+from datetime import timedelta
+from multiprocessing import get_context
+
+import django
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+from . import hotstore
+from .api.caching import invalidate
+from .detection import reset_baselines
+from .models import TelemetryEntry
+from .rollups import apply_stats, hourly_stats, merge_stats
+from .snapshots import rebuild_snapshots
+from .storage import copy_rows, supports_copy
+
+
+EARTH_RADIUS = 6371.0  # km
+MU = 398600.4418  # Earth's gravitational parameter, km^3/s^2
+
+# (share of the fleet, perigee altitude range in km, eccentricity range)
+ORBIT_CLASSES = (
+    (0.7, (350.0, 1200.0), (0.0005, 0.02)),   # LEO
+    (0.2, (19000.0, 23000.0), (0.001, 0.01)),  # MEO, navigation constellations
+    (0.1, (35780.0, 35790.0), (0.0, 0.0005)),  # GEO
+)
+
+COLUMNS = ('satellite_id', 'timestamp', 'altitude', 'velocity', 'status')
+
+# Health signal thresholds; the signal ranges over roughly [-1, 1].
+WARNING_LEVEL = 0.55
+CRITICAL_LEVEL = 0.8
+
+
+class Satellite:
+    """
+    Orbit, health signal and reporting offset of one synthetic satellite.
+    """
+
+    def __init__(self, number, interval, seed):
+        rng = random.Random(f'{seed}:{number}')
+        self.satellite_id = f'SAT-{number:03d}'
+
+        share = rng.random()
+        for weight, perigee_range, eccentricity_range in ORBIT_CLASSES:
+            if share < weight:
+                break
+            share -= weight
+        perigee = EARTH_RADIUS + rng.uniform(*perigee_range)
+        self.eccentricity = rng.uniform(*eccentricity_range)
+        self.semi_major_axis = perigee / (1 - self.eccentricity)
+        self.mean_motion = math.sqrt(MU / self.semi_major_axis ** 3)  # rad/s
+        self.mean_anomaly = rng.uniform(0, 2 * math.pi)
+
+        # Three slow waves, periods from hours to weeks, make up the health
+        # signal. Their sum only rarely reaches the critical level.
+        self.health_waves = [
+            (rng.uniform(0.2, 0.45), 2 * math.pi / rng.uniform(low, high), rng.uniform(0, 2 * math.pi))
+            for low, high in ((3 * 3600, 12 * 3600), (2 * 86400, 5 * 86400), (10 * 86400, 30 * 86400))
+        ]
+
+        # Satellites report at the same interval but not in lockstep.
+        self.offset = rng.uniform(0, interval)
+
+    def position(self, t):
+        """
+        Altitude (km) and velocity (km/s) at ``t`` seconds since the epoch.
+        """
+        mean_anomaly = self.mean_anomaly + self.mean_motion * t
+        # One Newton step from a first-order guess solves Kepler's equation
+        # well enough for the small eccentricities used here.
+        e = self.eccentricity
+        anomaly = mean_anomaly + e * math.sin(mean_anomaly)
+        anomaly -= (anomaly - e * math.sin(anomaly) - mean_anomaly) / (1 - e * math.cos(anomaly))
+        radius = self.semi_major_axis * (1 - e * math.cos(anomaly))
+        velocity = math.sqrt(MU * (2 / radius - 1 / self.semi_major_axis))
+        return radius - EARTH_RADIUS, velocity
+
+    def status(self, t):
+        health = sum(amplitude * math.sin(frequency * t + phase) for amplitude, frequency, phase in self.health_waves)
+        if health >= CRITICAL_LEVEL:
+            return TelemetryEntry.HealthStatus.CRITICAL.value
+        if health >= WARNING_LEVEL:
+            return TelemetryEntry.HealthStatus.WARNING.value
+        return TelemetryEntry.HealthStatus.HEALTHY.value
+
+
+def generate_window(start, interval, first, last, satellite_count, seed):
+    """
+    Rows for samples ``first`` to ``last`` (exclusive) of every satellite.
+
+    Returns ``(satellite_id, timestamp, altitude, velocity, status)`` tuples
+    in timestamp order.
+    """
+    satellites = sorted((Satellite(n, interval, seed) for n in range(1, satellite_count + 1)), key=lambda s: s.offset)
+    rng = random.Random(f'{seed}:window:{first}')
+    epoch = start.timestamp()
+    rows = []
+    for sample in range(first, last):
+        for satellite in satellites:
+            t = epoch + sample * interval + satellite.offset
+            altitude, velocity = satellite.position(t)
+            rows.append((
+                satellite.satellite_id,
+                start + timedelta(seconds=t - epoch),
+                # Measurement noise of a few tens of metres and cm/s.
+                round(max(altitude + rng.gauss(0, 0.05), 0.0), 3),
+                round(max(velocity + rng.gauss(0, 0.0005), 0.0), 4),
+                satellite.status(t),
+            ))
+    return rows
+
+
+def _generate_window(args):
+    """
+    Worker task: one window's rows, adapted for the database, and their
+    hourly rollup statistics.
+    """
+    rows = generate_window(*args)
+    stats = hourly_stats(TelemetryEntry(None, *row) for row in rows)
+    adapt_datetime = connections[DEFAULT_DB_ALIAS].ops.adapt_datetimefield_value
+    return [(sat, adapt_datetime(ts), altitude, velocity, status) for sat, ts, altitude, velocity, status in rows], stats
+
+
+def insert_rows(rows):
+    """
+    Insert adapted rows from generate_window() in one transaction.
+    """
+    opts = TelemetryEntry._meta
+    if supports_copy(connection):
+        with transaction.atomic():
+            copy_rows(connection, opts.db_table, [opts.get_field(name).column for name in COLUMNS], rows)
+        return
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(opts.get_field(name).column) for name in COLUMNS)
+    placeholders = ', '.join(['%s'] * len(COLUMNS))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {qn(opts.db_table)} ({columns}) VALUES ({placeholders})', rows)
+
+
+def generate(rows, satellites, interval, end, processes=None, chunk_size=10_000, seed=0, progress=None):
+    """
+    Generate and insert about ``rows`` entries for ``satellites`` satellites
+    reporting every ``interval`` seconds, ending at ``end``.
+
+    ``progress`` is called with the running total after every chunk.
+    Updates the rollups, snapshots, detection baselines and hot windows
+    afterwards. Returns the number of entries written.
+    """
+    samples = max(rows // satellites, 1)
+    start = end - timedelta(seconds=samples * interval)
+    per_window = max(chunk_size // satellites, 1)
+    windows = [
+        (start, interval, first, min(first + per_window, samples), satellites, seed)
+        for first in range(0, samples, per_window)
+    ]
+
+    written = 0
+    stats = {}
+
+    def write(result):
+        nonlocal written
+        window_rows, window_stats = result
+        insert_rows(window_rows)
+        merge_stats(stats, window_stats)
+        written += len(window_rows)
+        if progress:
+            progress(written)
+
+    if processes == 1:
+        for window in windows:
+            write(_generate_window(window))
+    else:
+        # Workers only generate; the parent is the single writer, which is
+        # what SQLite allows, and keeps the ids in timestamp order.
+        processes = processes or os.cpu_count()
+        with get_context().Pool(processes, initializer=django.setup) as pool:
+            pending = deque()
+            for window in windows:
+                pending.append(pool.apply_async(_generate_window, (window,)))
+                if len(pending) >= 2 * processes:
+                    write(pending.popleft().get())
+            while pending:
+                write(pending.popleft().get())
+
+    apply_stats(stats)
+    rebuild_snapshots()
+    reset_baselines()
+    invalidate()
+    hotstore.invalidate(end)
+    return written
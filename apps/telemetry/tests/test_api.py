@@ -1,17 +1,20 @@
+import json
+
 import pytest
 from django.urls import reverse
-from rest_framework.test import APIClient
 
-from apps.telemetry.api.serializers import TelemetryEntrySerializer
+from apps.telemetry.aggregation import lttb
+from apps.telemetry.api.pagination import TelemetryCursorPagination
+from apps.telemetry.api.serializers import TelemetryEntrySerializer, represent_entry_rows
+from apps.telemetry.ingest import validate_rows, write_entries
 from apps.telemetry.models import TelemetryEntry
-
-
-@pytest.fixture
-def api_client():
-    return APIClient()
+from apps.telemetry.rollups import rebuild_rollups
 
 
 TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+TELEMETRY_AGGREGATE_URL = reverse('telemetry_api:telemetry-aggregate')
+TELEMETRY_COMPARE_URL = reverse('telemetry_api:telemetry-compare')
 API_ROOT_URL = reverse('telemetry_api:api-root')
 
 
@@ -88,6 +91,55 @@ class TestTelemetryList:
         assert response.status_code == 200
         assert len(response.data['results']) == 0
 
+    def test_filter_by_time_range(self, api_client, make_entry):
+        make_entry(timestamp='2025-01-15T11:59:59Z')
+        inside = make_entry(timestamp='2025-01-15T12:00:00Z')
+        make_entry(timestamp='2025-01-15T13:00:00Z')
+        response = api_client.get(
+            TELEMETRY_LIST_URL,
+            {'from': '2025-01-15T12:00:00Z', 'to': '2025-01-15T13:00:00Z'},
+        )
+        assert [e['id'] for e in response.data['results']] == [inside.id]
+
+    def test_invalid_time_range_returns_400(self, api_client):
+        response = api_client.get(
+            TELEMETRY_LIST_URL,
+            {'from': '2025-01-15T13:00:00Z', 'to': '2025-01-15T12:00:00Z'},
+        )
+        assert response.status_code == 400
+        assert 'to' in response.data
+
+    def test_filter_by_several_satellites_and_statuses(self, api_client, make_entry):
+        make_entry(satellite_id='SAT-001', status='healthy')
+        warning = make_entry(satellite_id='SAT-002', status='warning')
+        critical = make_entry(satellite_id='SAT-003', status='critical')
+        make_entry(satellite_id='SAT-004', status='critical')
+        response = api_client.get(TELEMETRY_LIST_URL, {
+            'satellite_id__in': 'SAT-001, SAT-002,SAT-003,', 'status__in': 'warning,critical', 'ordering': 'satellite_id',
+        })
+        assert [e['id'] for e in response.data['results']] == [warning.id, critical.id]
+
+    def test_single_and_list_filters_combine(self, api_client, make_entry):
+        make_entry(satellite_id='SAT-001')
+        make_entry(satellite_id='SAT-002')
+        response = api_client.get(TELEMETRY_LIST_URL, {'satellite_id': 'SAT-001', 'satellite_id__in': 'SAT-002'})
+        assert response.data['count'] == 0
+
+    def test_filter_by_measurement_ranges(self, api_client, make_entry):
+        make_entry(altitude=399.0, velocity=7.0)
+        inside = make_entry(altitude=400.0, velocity=7.5)
+        make_entry(altitude=450.0, velocity=8.0)
+        make_entry(altitude=500.0, velocity=7.5)
+        response = api_client.get(TELEMETRY_LIST_URL, {
+            'altitude__gte': 400, 'altitude__lt': 500, 'velocity__lte': 7.5, 'velocity__gt': 7.0,
+        })
+        assert [e['id'] for e in response.data['results']] == [inside.id]
+
+    def test_invalid_range_returns_400(self, api_client):
+        response = api_client.get(TELEMETRY_LIST_URL, {'altitude__gte': 'high'})
+        assert response.status_code == 400
+        assert 'altitude__gte' in response.data
+
 
 @pytest.mark.django_db
 class TestTelemetryOrdering:
@@ -142,6 +194,90 @@ class TestTelemetryOrdering:
         assert response.status_code == 200
 
 
+@pytest.mark.django_db
+class TestTelemetryCursorPagination:
+
+    @pytest.fixture(autouse=True)
+    def small_pages(self, monkeypatch):
+        monkeypatch.setattr(TelemetryCursorPagination, 'page_size', 3)
+
+    def walk(self, api_client, params, direction='next'):
+        """Follow cursor links from the first response until they run out."""
+        response = api_client.get(TELEMETRY_LIST_URL, {**params, 'pagination': 'cursor'})
+        pages = []
+        while True:
+            assert response.status_code == 200
+            pages.append(response.data['results'])
+            link = response.data[direction]
+            if link is None:
+                return pages
+            response = api_client.get(link)
+
+    def test_cursor_response_has_no_count(self, api_client, make_entry):
+        make_entry()
+        response = api_client.get(TELEMETRY_LIST_URL, {'pagination': 'cursor'})
+        assert response.status_code == 200
+        assert 'count' not in response.data
+        assert response.data['previous'] is None
+        assert response.data['next'] is None
+
+    def test_walks_every_entry_once_with_tied_timestamps(self, api_client, make_entry):
+        # Duplicate timestamps must not cause rows to be skipped or repeated.
+        entries = [
+            make_entry(timestamp=f'2025-01-0{1 + i // 3}T00:00:00Z')
+            for i in range(10)
+        ]
+        pages = self.walk(api_client, {})
+        seen = [e['id'] for page in pages for e in page]
+        # Newest first; ties keep ascending id order (sorted() is stable).
+        expected = sorted(entries, key=lambda e: e.timestamp, reverse=True)
+        assert seen == [e.pk for e in expected]
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+
+    def test_previous_links_walk_back_to_first_page(self, api_client, make_entry):
+        for i in range(7):
+            make_entry(timestamp=f'2025-01-0{1 + i}T00:00:00Z')
+        forward = self.walk(api_client, {})
+
+        response = api_client.get(TELEMETRY_LIST_URL, {'pagination': 'cursor'})
+        while response.data['next']:
+            response = api_client.get(response.data['next'])
+        backward = [response.data['results']]
+        while response.data['previous']:
+            response = api_client.get(response.data['previous'])
+            backward.append(response.data['results'])
+        assert backward == list(reversed(forward))
+
+    def test_respects_ordering_and_filters(self, api_client, make_entry):
+        for altitude in [300.0, 100.0, 200.0, 100.0, 400.0]:
+            make_entry(satellite_id='SAT-001', altitude=altitude)
+        make_entry(satellite_id='SAT-002', altitude=50.0)
+        pages = self.walk(api_client, {'satellite_id': 'SAT-001', 'ordering': 'altitude'})
+        results = [e for page in pages for e in page]
+        assert [e['altitude'] for e in results] == [100.0, 100.0, 200.0, 300.0, 400.0]
+        assert {e['satellite_id'] for e in results} == {'SAT-001'}
+
+    def test_page_size_is_carried_by_links_and_capped(self, api_client, make_entry, monkeypatch):
+        monkeypatch.setattr(TelemetryCursorPagination, 'max_page_size', 4)
+        for i in range(7):
+            make_entry(timestamp=f'2025-01-0{1 + i}T00:00:00Z')
+        assert [len(page) for page in self.walk(api_client, {'page_size': 5})] == [4, 3]
+        assert [len(page) for page in self.walk(api_client, {'page_size': 2})] == [2, 2, 2, 1]
+
+    def test_invalid_cursor_returns_404(self, api_client, make_entry):
+        make_entry()
+        response = api_client.get(TELEMETRY_LIST_URL, {'pagination': 'cursor', 'cursor': 'bogus'})
+        assert response.status_code == 404
+
+    def test_multiple_ordering_fields_return_400(self, api_client, make_entry):
+        make_entry()
+        response = api_client.get(TELEMETRY_LIST_URL, {'pagination': 'cursor', 'ordering': 'satellite_id,-altitude'})
+        assert response.status_code == 400
+        assert 'ordering' in response.data
+        # Page numbers still take several fields.
+        assert api_client.get(TELEMETRY_LIST_URL, {'ordering': 'satellite_id,-altitude'}).status_code == 200
+
+
 @pytest.mark.django_db
 class TestTelemetryCreate:
 
@@ -185,6 +321,308 @@ class TestTelemetryCreate:
         assert response.status_code == 201
 
 
+# ---------------------------------------------------------------------------
+# Bulk ingest
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestTelemetryBulkCreate:
+
+    def test_create_json_array(self, api_client):
+        rows = [{**VALID_PAYLOAD, 'satellite_id': f'SAT-{i:03d}'} for i in range(5)]
+        response = api_client.post(TELEMETRY_BULK_URL, rows, format='json')
+        assert response.status_code == 201
+        assert response.data == {'created': 5, 'errors': []}
+        assert TelemetryEntry.objects.count() == 5
+
+    def test_create_ndjson(self, api_client):
+        body = '\n'.join(json.dumps({**VALID_PAYLOAD, 'altitude': i}) for i in range(3)) + '\n'
+        response = api_client.post(TELEMETRY_BULK_URL, body, content_type='application/x-ndjson')
+        assert response.status_code == 201
+        assert sorted(TelemetryEntry.objects.values_list('altitude', flat=True)) == [0.0, 1.0, 2.0]
+
+    def test_invalid_ndjson_line_reports_line_number(self, api_client):
+        body = json.dumps(VALID_PAYLOAD) + '\n{not json}\n'
+        response = api_client.post(TELEMETRY_BULK_URL, body, content_type='application/x-ndjson')
+        assert response.status_code == 400
+        assert 'line 2' in response.data['detail']
+
+    def test_ndjson_rejects_non_finite_constants(self, api_client):
+        body = json.dumps({**VALID_PAYLOAD, 'altitude': float('nan')}) + '\n'
+        response = api_client.post(TELEMETRY_BULK_URL, body, content_type='application/x-ndjson')
+        assert response.status_code == 400
+        assert 'line 1' in response.data['detail']
+        assert TelemetryEntry.objects.count() == 0
+
+    def test_non_finite_values_are_row_errors(self, api_client):
+        rows = [VALID_PAYLOAD, {**VALID_PAYLOAD, 'altitude': 'NaN'}, {**VALID_PAYLOAD, 'velocity': 'inf'}]
+        response = api_client.post(TELEMETRY_BULK_URL, rows, format='json')
+        assert response.status_code == 207
+        assert [(e['index'], list(e['errors'])) for e in response.data['errors']] == [(1, ['altitude']), (2, ['velocity'])]
+        assert TelemetryEntry.objects.count() == 1
+
+    def test_partial_batch_returns_per_row_errors(self, api_client):
+        rows = [
+            VALID_PAYLOAD,
+            {**VALID_PAYLOAD, 'altitude': -1},
+            {**VALID_PAYLOAD, 'status': 'exploded', 'timestamp': 'yesterday'},
+        ]
+        response = api_client.post(TELEMETRY_BULK_URL, rows, format='json')
+        assert response.status_code == 207
+        assert response.data['created'] == 1
+        assert [e['index'] for e in response.data['errors']] == [1, 2]
+        assert set(response.data['errors'][1]['errors']) == {'status', 'timestamp'}
+        assert TelemetryEntry.objects.count() == 1
+
+    def test_all_invalid_returns_400(self, api_client):
+        response = api_client.post(TELEMETRY_BULK_URL, [{}, 'junk'], format='json')
+        assert response.status_code == 400
+        assert response.data['created'] == 0
+        assert TelemetryEntry.objects.count() == 0
+
+    def test_rejects_non_list_body(self, api_client):
+        response = api_client.post(TELEMETRY_BULK_URL, VALID_PAYLOAD, format='json')
+        assert response.status_code == 400
+
+    def test_rejects_oversized_batch(self, api_client, settings):
+        settings.TELEMETRY = {'BULK_MAX_ROWS': 2}
+        response = api_client.post(TELEMETRY_BULK_URL, [VALID_PAYLOAD] * 3, format='json')
+        assert response.status_code == 400
+        assert TelemetryEntry.objects.count() == 0
+
+    def test_writes_in_chunks(self, api_client, settings):
+        settings.TELEMETRY = {'BULK_CHUNK_SIZE': 2}
+        response = api_client.post(TELEMETRY_BULK_URL, [VALID_PAYLOAD] * 5, format='json')
+        assert response.status_code == 201
+        assert TelemetryEntry.objects.count() == 5
+
+    def test_write_entries_sets_primary_keys(self):
+        entries, _ = validate_rows([VALID_PAYLOAD] * 3)
+        write_entries(entries, chunk_size=2)
+        assert sorted(e.pk for e in entries) == sorted(TelemetryEntry.objects.values_list('pk', flat=True))
+
+
+class TestBulkValidationParity:
+    """
+    The bulk validator must accept and reject exactly what the serializer does.
+    """
+
+    @pytest.mark.parametrize('row', [
+        VALID_PAYLOAD,
+        {k: v for k, v in VALID_PAYLOAD.items() if k != 'status'},
+        {**VALID_PAYLOAD, 'satellite_id': '  SAT-009  '},
+        {**VALID_PAYLOAD, 'satellite_id': 42},
+        {**VALID_PAYLOAD, 'satellite_id': ''},
+        {**VALID_PAYLOAD, 'satellite_id': 'X' * 101},
+        {**VALID_PAYLOAD, 'satellite_id': None},
+        {**VALID_PAYLOAD, 'timestamp': '2025-06-01T08:30:00+02:00'},
+        {**VALID_PAYLOAD, 'timestamp': '2025-06-01T08:30:00'},
+        {**VALID_PAYLOAD, 'timestamp': '15/01/2025 12:00'},
+        {**VALID_PAYLOAD, 'altitude': '12.5'},
+        {**VALID_PAYLOAD, 'altitude': 'high'},
+        {**VALID_PAYLOAD, 'velocity': -5.0},
+        {**VALID_PAYLOAD, 'altitude': 'nan'},
+        {**VALID_PAYLOAD, 'altitude': float('inf')},
+        {**VALID_PAYLOAD, 'velocity': '-Infinity'},
+        {**VALID_PAYLOAD, 'status': 'exploded'},
+        {**VALID_PAYLOAD, 'status': None},
+        {},
+    ])
+    def test_matches_serializer(self, row):
+        serializer = TelemetryEntrySerializer(data=row)
+        entries, errors = validate_rows([row])
+        if serializer.is_valid():
+            assert errors == []
+            entry = entries[0]
+            for field, value in serializer.validated_data.items():
+                assert getattr(entry, field) == value
+        else:
+            assert entries == []
+            assert errors[0]['errors'] == serializer.errors
+
+
+@pytest.mark.django_db
+class TestListReadParity:
+    """
+    The list's values_list() path must render exactly what the serializer does.
+    """
+
+    @pytest.fixture
+    def entries(self, make_entry):
+        return [
+            make_entry(timestamp='2025-01-15T12:00:00Z'),
+            make_entry(timestamp='2025-01-15T12:00:00.123456Z', altitude=400, velocity=7),
+            make_entry(timestamp='2025-06-01T08:30:00+02:00', satellite_id='SAT-002', status='critical'),
+            make_entry(timestamp='2024-12-31T23:59:59.5-05:00', altitude=0.1 + 0.2, status='warning'),
+        ]
+
+    def rows(self):
+        fields = TelemetryEntrySerializer.Meta.fields
+        return TelemetryEntry.objects.order_by('id').values_list(*fields)
+
+    def test_matches_serializer(self, entries):
+        expected = TelemetryEntrySerializer(TelemetryEntry.objects.order_by('id'), many=True).data
+        assert represent_entry_rows(self.rows()) == expected
+
+    def test_matches_serializer_in_other_timezone(self, entries, settings):
+        settings.TIME_ZONE = 'America/New_York'
+        expected = TelemetryEntrySerializer(TelemetryEntry.objects.order_by('id'), many=True).data
+        assert represent_entry_rows(self.rows()) == expected
+
+    def test_response_body_matches_serializer(self, api_client, entries):
+        response = api_client.get(TELEMETRY_LIST_URL, {'ordering': 'timestamp'})
+        expected = TelemetryEntrySerializer(TelemetryEntry.objects.order_by('timestamp'), many=True).data
+        assert json.loads(response.content)['results'] == json.loads(json.dumps(expected))
+
+    def test_cursor_pages_match(self, api_client, entries, monkeypatch):
+        monkeypatch.setattr(TelemetryCursorPagination, 'page_size', 3)
+        first = api_client.get(TELEMETRY_LIST_URL, {'pagination': 'cursor'}).json()
+        second = api_client.get(first['next']).json()
+        ids = [item['id'] for item in first['results'] + second['results']]
+        assert ids == list(TelemetryEntry.objects.order_by('-timestamp').values_list('id', flat=True))
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestTelemetryAggregate:
+
+    @pytest.fixture
+    def entries(self, make_entry):
+        make_entry(timestamp='2025-01-15T10:05:00Z', altitude=400.0, velocity=7.0)
+        make_entry(timestamp='2025-01-15T10:45:00Z', altitude=600.0, velocity=8.0, status='warning')
+        make_entry(timestamp='2025-01-15T11:30:00Z', altitude=500.0, velocity=7.5, status='critical')
+        make_entry(timestamp='2025-01-15T11:40:00Z', satellite_id='SAT-002', altitude=900.0)
+        rebuild_rollups()
+
+    def test_hourly_buckets(self, api_client, entries):
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, {'bucket': '1h', 'satellite_id': 'SAT-001'})
+        assert response.status_code == 200
+        first, second = response.data['results']
+        assert first['bucket'] == '2025-01-15T10:00:00Z'
+        assert first['count'] == 2
+        assert first['altitude'] == {'min': 400.0, 'max': 600.0, 'avg': 500.0}
+        assert first['velocity'] == {'min': 7.0, 'max': 8.0, 'avg': 7.5}
+        assert first['status'] == {'healthy': 1, 'warning': 1, 'critical': 0}
+        assert second['bucket'] == '2025-01-15T11:00:00Z'
+        assert second['status'] == {'healthy': 0, 'warning': 0, 'critical': 1}
+
+    def test_all_satellites_by_default(self, api_client, entries):
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, {'bucket': '1d'})
+        [day] = response.data['results']
+        assert day['bucket'] == '2025-01-15T00:00:00Z'
+        assert day['count'] == 4
+        assert day['altitude']['max'] == 900.0
+
+    def test_time_range(self, api_client, entries):
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, {
+            'bucket': '1m', 'from': '2025-01-15T10:45:00Z', 'to': '2025-01-15T11:40:00Z',
+        })
+        assert [r['bucket'] for r in response.data['results']] == [
+            '2025-01-15T10:45:00Z', '2025-01-15T11:30:00Z',
+        ]
+
+    @pytest.mark.parametrize('params', [
+        {},
+        {'bucket': '5m'},
+        {'bucket': '1h', 'from': 'yesterday'},
+        {'bucket': '1h', 'from': '2025-01-16T00:00:00Z', 'to': '2025-01-15T00:00:00Z'},
+        {'bucket': '1h', 'points': 2},
+    ])
+    def test_invalid_params(self, api_client, params):
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, params)
+        assert response.status_code == 400
+
+    def test_points_caps_series(self, api_client, make_entry):
+        for minute in range(30):
+            make_entry(timestamp=f'2025-01-15T10:{minute:02d}:00Z', altitude=900.0 if minute == 17 else 400.0)
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, {'bucket': '1m', 'points': 5})
+        buckets = [r['bucket'] for r in response.data['results']]
+        assert len(buckets) == 5
+        assert buckets[0] == '2025-01-15T10:00:00Z'
+        assert buckets[-1] == '2025-01-15T10:29:00Z'
+        assert '2025-01-15T10:17:00Z' in buckets
+
+
+@pytest.mark.django_db
+class TestTelemetryCompare:
+
+    @pytest.fixture
+    def entries(self, make_entry):
+        make_entry(timestamp='2025-01-15T10:05:00Z', altitude=400.0)
+        make_entry(timestamp='2025-01-15T10:45:00Z', altitude=600.0)
+        make_entry(timestamp='2025-01-15T12:30:00Z', altitude=500.0)
+        make_entry(timestamp='2025-01-15T11:40:00Z', satellite_id='SAT-002', altitude=900.0, velocity=3.0)
+        make_entry(timestamp='2025-01-15T11:45:00Z', satellite_id='SAT-003', altitude=100.0)
+        rebuild_rollups()
+
+    @pytest.mark.parametrize('params', [
+        {},
+        {'from': '2025-01-15T10:05:00Z'},
+    ])
+    def test_series_are_aligned(self, api_client, entries, django_assert_num_queries, params):
+        # Aligned ranges read the rollups, others the raw entries; one query either way.
+        with django_assert_num_queries(1):
+            response = api_client.get(TELEMETRY_COMPARE_URL, {
+                'satellite_id__in': 'SAT-002,SAT-001,SAT-404', 'bucket': '1h', **params,
+            })
+        assert response.status_code == 200
+        assert response.data['buckets'] == ['2025-01-15T10:00:00Z', '2025-01-15T11:00:00Z', '2025-01-15T12:00:00Z']
+        series = response.data['series']
+        assert list(series) == ['SAT-002', 'SAT-001', 'SAT-404']
+        assert series['SAT-001'] == {
+            'count': [2, 0, 1], 'min': [400.0, None, 500.0], 'max': [600.0, None, 500.0], 'avg': [500.0, None, 500.0],
+        }
+        assert series['SAT-002']['avg'] == [None, 900.0, None]
+        assert series['SAT-404']['count'] == [0, 0, 0]
+
+    def test_field_and_points(self, api_client, entries):
+        response = api_client.get(TELEMETRY_COMPARE_URL, {
+            'satellite_id__in': 'SAT-001,SAT-002', 'bucket': '1h', 'field': 'velocity', 'points': 2,
+        })
+        assert response.data['field'] == 'velocity'
+        # Consecutive buckets merge: 10:00 with 11:00, then 12:00.
+        assert response.data['buckets'] == ['2025-01-15T10:00:00Z', '2025-01-15T12:00:00Z']
+        assert response.data['series']['SAT-001']['count'] == [2, 1]
+        assert response.data['series']['SAT-002'] == {'count': [1, 0], 'min': [3.0, None], 'max': [3.0, None], 'avg': [3.0, None]}
+
+    def test_merged_average_is_weighted(self, api_client, make_entry):
+        make_entry(timestamp='2025-01-15T10:00:00Z', altitude=100.0)
+        make_entry(timestamp='2025-01-15T10:00:30Z', altitude=200.0)
+        make_entry(timestamp='2025-01-15T10:01:00Z', altitude=400.0)
+        response = api_client.get(TELEMETRY_COMPARE_URL, {'satellite_id__in': 'SAT-001', 'bucket': '1m', 'points': 1})
+        assert response.data['series']['SAT-001']['avg'] == [pytest.approx(700.0 / 3)]
+
+    @pytest.mark.parametrize('params', [
+        {'bucket': '1h'},
+        {'satellite_id__in': ',', 'bucket': '1h'},
+        {'satellite_id__in': 'SAT-001,SAT-002,SAT-003', 'bucket': '1h'},
+        {'satellite_id__in': 'SAT-001', 'bucket': '1h', 'field': 'status'},
+    ])
+    def test_invalid_params(self, api_client, settings, params):
+        settings.TELEMETRY = {'COMPARE_MAX_SATELLITES': 2}
+        response = api_client.get(TELEMETRY_COMPARE_URL, params)
+        assert response.status_code == 400
+
+
+class TestLTTB:
+
+    def test_keeps_everything_under_threshold(self):
+        assert lttb([(0, 1), (1, 2)], 5) == [0, 1]
+
+    def test_keeps_endpoints_and_peaks(self):
+        points = [(x, 0.0) for x in range(100)]
+        points[42] = (42, 10.0)
+        points[77] = (77, -10.0)
+        selected = lttb(points, 6)
+        assert len(selected) == 6
+        assert selected[0] == 0 and selected[-1] == 99
+        assert 42 in selected and 77 in selected
+        assert selected == sorted(selected)
+
+
 # ---------------------------------------------------------------------------
 # Detail / Update / Delete
 # ---------------------------------------------------------------------------
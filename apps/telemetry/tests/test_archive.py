@@ -0,0 +1,128 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.telemetry.aggregation import aggregate
+from apps.telemetry.archive import restore_file
+from apps.telemetry.models import HourlyRollup, SatelliteState, TelemetryEntry
+from apps.telemetry.rollups import rebuild_rollups
+from apps.telemetry.snapshots import rebuild_snapshots
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def entries(make_entry):
+    created = [
+        make_entry(timestamp='2025-01-10T00:00:00Z'),
+        make_entry(timestamp='2025-01-31T23:59:59Z', satellite_id='SAT-002', status='critical'),
+        make_entry(timestamp='2025-02-01T00:00:00Z'),
+        make_entry(timestamp='2025-03-15T12:00:00Z'),
+    ]
+    rebuild_rollups()
+    rebuild_snapshots()
+    return created
+
+
+def archive(tmp_path, before, *args):
+    out = StringIO()
+    call_command('archive_telemetry', '--before', before, '--dir', str(tmp_path), *args, stdout=out)
+    return out.getvalue()
+
+
+def read_archive(path):
+    with gzip.open(path, 'rt') as archive:
+        return [json.loads(line) for line in archive]
+
+
+class TestArchiveTelemetry:
+
+    def test_moves_whole_months_before_cutoff(self, tmp_path, entries):
+        output = archive(tmp_path, '2025-03')
+        assert 'Archived 2 entries from 2025-01' in output
+        assert 'Archived 1 entries from 2025-02' in output
+
+        assert list(TelemetryEntry.objects.values_list('id', flat=True)) == [entries[3].id]
+        january = read_archive(tmp_path / 'telemetry-2025-01.ndjson.gz')
+        assert [row['id'] for row in january] == [entries[0].id, entries[1].id]
+        assert january[1] == {
+            'id': entries[1].id,
+            'satellite_id': 'SAT-002',
+            'timestamp': '2025-01-31T23:59:59Z',
+            'altitude': 500.0,
+            'velocity': 7.5,
+            'status': 'critical',
+        }
+        assert not (tmp_path / 'telemetry-2025-03.ndjson.gz').exists()
+
+    def test_moves_in_batches(self, tmp_path, entries):
+        archive(tmp_path, '2025-02', '--batch-size', '1')
+        path = tmp_path / 'telemetry-2025-01.ndjson.gz'
+        # One gzip member per batch, read back as a single stream.
+        assert path.read_bytes().count(b'\x1f\x8b\x08') == 2
+        assert len(read_archive(path)) == 2
+
+    def test_keeps_rollups_and_snapshots(self, tmp_path, entries):
+        rollups = HourlyRollup.objects.count()
+        archive(tmp_path, '2025-03')
+        assert HourlyRollup.objects.count() == rollups
+        assert [row['count'] for row in aggregate('1d')] == [1, 1, 1, 1]
+        assert SatelliteState.objects.get(satellite_id='SAT-002').entry_id == entries[1].id
+
+    def test_dry_run(self, tmp_path, entries):
+        output = archive(tmp_path, '2025-03', '--dry-run')
+        assert 'Would archive 2025-01' in output
+        assert TelemetryEntry.objects.count() == 4
+        assert not list(tmp_path.iterdir())
+
+    def test_nothing_to_archive(self, tmp_path, entries):
+        assert 'Nothing to archive.' in archive(tmp_path, '2025-01')
+
+    def test_rejects_bad_month(self, tmp_path):
+        with pytest.raises(CommandError):
+            archive(tmp_path, '2025-13')
+
+    def test_invalidates_cached_lists(self, tmp_path, entries, client):
+        assert client.get('/api/telemetry/').json()['count'] == 4
+        archive(tmp_path, '2025-03')
+        assert client.get('/api/telemetry/').json()['count'] == 1
+
+
+class TestRestoreTelemetry:
+
+    def test_restores_original_ids(self, tmp_path, entries):
+        archive(tmp_path, '2025-03')
+        path = tmp_path / 'telemetry-2025-01.ndjson.gz'
+        call_command('restore_telemetry', str(path), stdout=StringIO())
+
+        restored = TelemetryEntry.objects.get(pk=entries[1].pk)
+        assert restored.satellite_id == 'SAT-002'
+        assert restored.status == 'critical'
+        assert TelemetryEntry.objects.count() == 3
+        # Already counted in the rollups.
+        assert [row['count'] for row in aggregate('1d')] == [1, 1, 1, 1]
+
+    def test_skips_entries_already_present(self, tmp_path, entries):
+        # As after a run interrupted between writing and deleting a batch.
+        archive(tmp_path, '2025-02')
+        path = tmp_path / 'telemetry-2025-01.ndjson.gz'
+        restore_file(path, batch_size=10)
+        restore_file(path, batch_size=10)
+        assert TelemetryEntry.objects.count() == 4
+
+    def test_restores_snapshot_of_archived_satellite(self, tmp_path, entries):
+        archive(tmp_path, '2025-03')
+        SatelliteState.objects.all().delete()
+        call_command('restore_telemetry', str(tmp_path / 'telemetry-2025-01.ndjson.gz'), stdout=StringIO())
+        assert SatelliteState.objects.get(satellite_id='SAT-002').entry_id == entries[1].id
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / 'telemetry-2025-01.ndjson.gz'
+        with gzip.open(path, 'wt') as archive:
+            archive.write(json.dumps({'id': 1, 'satellite_id': 'SAT-001'}) + '\n')
+        with pytest.raises(CommandError, match='line 1'):
+            call_command('restore_telemetry', str(path), stdout=StringIO())
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.urls import reverse
+
+from apps.telemetry.bulk_edit import delete_entries, update_entries
+from apps.telemetry.ingest import write_entries
+from apps.telemetry.models import DailyRollup, HourlyRollup, SatelliteState, TelemetryEntry
+from apps.telemetry.rollups import STAT_FIELDS, rebuild_rollups
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+
+START = datetime(2025, 1, 15, 10, tzinfo=timezone.utc)
+
+
+def rollups():
+    return [
+        {
+            (row.satellite_id, row.bucket_start): {name: getattr(row, name) for name in STAT_FIELDS}
+            for row in model.objects.all()
+        }
+        for model in (HourlyRollup, DailyRollup)
+    ]
+
+
+def assert_rollups_match_rebuild():
+    incremental = rollups()
+    rebuild_rollups()
+    assert rollups() == incremental
+
+
+@pytest.fixture
+def entries(db):
+    """
+    Two satellites reporting every 20 minutes for four hours.
+    """
+    return write_entries([
+        TelemetryEntry(
+            None,
+            satellite_id,
+            START + timedelta(minutes=20 * i),
+            400.0 + 10 * i,
+            7.5,
+            'healthy',
+        )
+        for satellite_id in ('SAT-001', 'SAT-002')
+        for i in range(12)
+    ])
+
+
+def bulk_url(**params):
+    query = '&'.join(f'{key}={value}' for key, value in params.items())
+    return f'{TELEMETRY_BULK_URL}?{query}' if query else TELEMETRY_BULK_URL
+
+
+@pytest.mark.django_db
+class TestBulkUpdate:
+
+    def test_relabel_a_satellite_over_a_window(self, api_client, entries):
+        url = bulk_url(satellite_id='SAT-001', **{'from': '2025-01-15T11:00:00Z', 'to': '2025-01-15T12:00:00Z'})
+        response = api_client.patch(url, {'status': 'critical'}, format='json')
+        assert response.status_code == 200
+        assert response.data == {'updated': 3}
+
+        critical = TelemetryEntry.objects.filter(status='critical')
+        assert {(e.satellite_id, e.timestamp.hour) for e in critical} == {('SAT-001', 11)}
+        hour = HourlyRollup.objects.get(satellite_id='SAT-001', bucket_start=START + timedelta(hours=1))
+        assert (hour.healthy_count, hour.critical_count) == (0, 3)
+        assert_rollups_match_rebuild()
+
+    def test_by_ids(self, api_client, entries):
+        ids = [entries[0].pk, entries[13].pk]
+        response = api_client.patch(TELEMETRY_BULK_URL, {'ids': ids, 'altitude': 999.0}, format='json')
+        assert response.data == {'updated': 2}
+        assert set(TelemetryEntry.objects.filter(altitude=999.0).values_list('pk', flat=True)) == set(ids)
+        assert_rollups_match_rebuild()
+
+    def test_ids_and_filters_combine(self, api_client, entries):
+        ids = [entries[0].pk, entries[13].pk]
+        response = api_client.patch(bulk_url(satellite_id='SAT-002'), {'ids': ids, 'status': 'warning'}, format='json')
+        assert response.data == {'updated': 1}
+        assert TelemetryEntry.objects.get(status='warning').pk == entries[13].pk
+
+    def test_updates_snapshots(self, api_client, entries):
+        api_client.patch(bulk_url(satellite_id='SAT-002'), {'status': 'critical'}, format='json')
+        assert SatelliteState.objects.get(satellite_id='SAT-002').status == 'critical'
+        assert SatelliteState.objects.get(satellite_id='SAT-001').status == 'healthy'
+
+    def test_invalidates_cached_responses(self, api_client, entries):
+        api_client.get(TELEMETRY_LIST_URL, {'status': 'critical'})
+        api_client.patch(bulk_url(satellite_id='SAT-001'), {'status': 'critical'}, format='json')
+        assert api_client.get(TELEMETRY_LIST_URL, {'status': 'critical'}).data['count'] == 12
+
+    @pytest.mark.parametrize('body, field', [
+        ({'status': 'meteor'}, 'status'),
+        ({'altitude': -1}, 'altitude'),
+        ({'ids': []}, 'ids'),
+        ({'ids': ['x'], 'status': 'warning'}, 'ids'),
+        ({'ids': [1]}, 'non_field_errors'),
+    ])
+    def test_invalid_body(self, api_client, entries, body, field):
+        response = api_client.patch(bulk_url(satellite_id='SAT-001'), body, format='json')
+        assert response.status_code == 400
+        assert field in response.data
+        assert not TelemetryEntry.objects.exclude(status='healthy').exists()
+
+    def test_requires_ids_or_a_filter(self, api_client, entries):
+        response = api_client.patch(TELEMETRY_BULK_URL, {'status': 'critical'}, format='json')
+        assert response.status_code == 400
+        assert 'detail' in response.data
+        assert not TelemetryEntry.objects.filter(status='critical').exists()
+
+    def test_too_many_ids(self, api_client, entries, settings):
+        settings.TELEMETRY = {'BULK_MAX_ROWS': 2}
+        response = api_client.patch(TELEMETRY_BULK_URL, {'ids': [1, 2, 3], 'status': 'warning'}, format='json')
+        assert response.status_code == 400
+        assert 'ids' in response.data
+
+
+@pytest.mark.django_db
+class TestBulkDelete:
+
+    def test_by_filters(self, api_client, entries):
+        response = api_client.delete(bulk_url(satellite_id='SAT-001', altitude__gte=450))
+        assert response.status_code == 200
+        assert response.data == {'deleted': 7}
+        assert TelemetryEntry.objects.filter(satellite_id='SAT-001').count() == 5
+        assert_rollups_match_rebuild()
+
+    def test_by_ids(self, api_client, entries):
+        ids = [entry.pk for entry in entries[:3]]
+        response = api_client.delete(TELEMETRY_BULK_URL, {'ids': ids}, format='json')
+        assert response.data == {'deleted': 3}
+        assert not TelemetryEntry.objects.filter(pk__in=ids).exists()
+
+    def test_snapshots_fall_back_to_the_remaining_entries(self, api_client, entries):
+        api_client.delete(bulk_url(satellite_id='SAT-001', **{'from': '2025-01-15T13:00:00Z'}))
+        state = SatelliteState.objects.get(satellite_id='SAT-001')
+        assert state.entry_id == entries[8].pk
+
+        api_client.delete(bulk_url(satellite_id='SAT-002'))
+        assert not SatelliteState.objects.filter(satellite_id='SAT-002').exists()
+        assert not HourlyRollup.objects.filter(satellite_id='SAT-002').exists()
+
+    def test_requires_ids_or_a_filter(self, api_client, entries):
+        response = api_client.delete(TELEMETRY_BULK_URL)
+        assert response.status_code == 400
+        assert TelemetryEntry.objects.count() == 24
+
+    def test_invalid_filter(self, api_client, entries):
+        response = api_client.delete(bulk_url(altitude__gt='high'))
+        assert response.status_code == 400
+        assert TelemetryEntry.objects.count() == 24
+
+
+@pytest.mark.django_db
+class TestBatches:
+
+    def test_updates_each_entry_once(self, entries):
+        # Updated rows still match the filter, so an offset or a re-run of
+        # the filter would visit them again.
+        queryset = TelemetryEntry.objects.filter(altitude__gte=400)
+        assert update_entries(queryset, {'altitude': 1000.0}, batch_size=5, pause=0) == 24
+        assert set(TelemetryEntry.objects.values_list('altitude', flat=True)) == {1000.0}
+        assert_rollups_match_rebuild()
+
+    def test_deletes_in_batches(self, entries):
+        assert delete_entries(TelemetryEntry.objects.all(), batch_size=5, pause=0) == 24
+        assert not TelemetryEntry.objects.exists()
+        assert not HourlyRollup.objects.exists()
+        assert not SatelliteState.objects.exists()
+
+    def test_uses_the_configured_batch_size(self, entries, settings, monkeypatch):
+        settings.TELEMETRY = {'BULK_EDIT_BATCH_SIZE': 10, 'BULK_EDIT_PAUSE': 0}
+        sizes = []
+        monkeypatch.setattr(
+            'apps.telemetry.bulk_edit.entries_changed.send',
+            lambda sender, added, removed: sizes.append(len(removed)),
+        )
+        delete_entries(TelemetryEntry.objects.all())
+        assert sizes == [10, 10, 4]
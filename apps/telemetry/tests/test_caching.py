@@ -0,0 +1,176 @@
+import pytest
+from django.core.cache.backends.filebased import FileBasedCache
+from django.urls import reverse
+
+from apps.telemetry.api import caching
+from apps.telemetry.api.caching import ResponseCache, response_cache
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+
+PAYLOAD = {
+    'satellite_id': 'SAT-001',
+    'timestamp': '2025-01-15T12:00:00Z',
+    'altitude': 500.0,
+    'velocity': 7.5,
+    'status': 'critical',
+}
+
+
+def detail_url(pk):
+    return reverse('telemetry_api:telemetry-detail', args=[pk])
+
+
+@pytest.fixture
+def entry(api_client):
+    return api_client.post(TELEMETRY_LIST_URL, PAYLOAD, format='json').data
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_repeated_list_request_skips_the_database(self, api_client, entry, django_assert_num_queries):
+        first = api_client.get(TELEMETRY_LIST_URL, {'status': 'critical'})
+        with django_assert_num_queries(0):
+            second = api_client.get(TELEMETRY_LIST_URL, {'status': 'critical'})
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.data == first.data
+        assert second['Content-Type'] == 'application/json'
+
+    def test_query_params_are_normalized(self, api_client, entry, django_assert_num_queries):
+        api_client.get(f'{TELEMETRY_LIST_URL}?status=critical&ordering=-timestamp')
+        with django_assert_num_queries(0):
+            api_client.get(f'{TELEMETRY_LIST_URL}?ordering=-timestamp&satellite_id=&status=critical')
+
+    def test_create_invalidates_lists(self, api_client, entry):
+        assert api_client.get(TELEMETRY_LIST_URL).data['count'] == 1
+        api_client.post(TELEMETRY_LIST_URL, PAYLOAD, format='json')
+        assert api_client.get(TELEMETRY_LIST_URL).data['count'] == 2
+
+    def test_bulk_ingest_invalidates_lists(self, api_client, entry):
+        api_client.get(TELEMETRY_LIST_URL)
+        api_client.post(TELEMETRY_BULK_URL, [PAYLOAD] * 3, format='json')
+        assert api_client.get(TELEMETRY_LIST_URL).data['count'] == 4
+
+    def test_update_invalidates_only_that_detail(self, api_client, entry, django_assert_num_queries):
+        other = api_client.post(TELEMETRY_LIST_URL, PAYLOAD, format='json').data
+        api_client.get(detail_url(entry['id']))
+        api_client.get(detail_url(other['id']))
+
+        api_client.patch(detail_url(entry['id']), {'status': 'healthy'}, format='json')
+
+        assert api_client.get(detail_url(entry['id'])).data['status'] == 'healthy'
+        with django_assert_num_queries(0):
+            api_client.get(detail_url(other['id']))
+
+    def test_delete_invalidates_detail(self, api_client, entry):
+        api_client.get(detail_url(entry['id']))
+        api_client.delete(detail_url(entry['id']))
+        assert api_client.get(detail_url(entry['id'])).status_code == 404
+
+    def test_invalidated_on_commit(self, api_client, entry, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            api_client.post(TELEMETRY_LIST_URL, PAYLOAD, format='json')
+        generation = caching.get_generation(caching.LIST_GENERATION_KEY)
+        for callback in callbacks:
+            callback()
+        assert caching.get_generation(caching.LIST_GENERATION_KEY) != generation
+
+    def test_accept_parameters_are_part_of_the_key(self, api_client, entry):
+        compact = api_client.get(TELEMETRY_LIST_URL, HTTP_ACCEPT='application/json')
+        indented = api_client.get(TELEMETRY_LIST_URL, HTTP_ACCEPT='application/json; indent=4')
+        assert b'\n' not in compact.content
+        assert b'\n' in indented.content
+        assert api_client.get(TELEMETRY_LIST_URL, HTTP_ACCEPT='application/json').content == compact.content
+        assert len(response_cache) == 2
+
+    def test_browsable_api_is_not_cached(self, api_client, entry):
+        api_client.get(TELEMETRY_LIST_URL, HTTP_ACCEPT='text/html')
+        assert len(response_cache) == 0
+
+    def test_zero_ttl_disables_cache(self, api_client, entry, settings, django_assert_num_queries):
+        settings.TELEMETRY = {'CACHE_TTL': 0}
+        api_client.get(TELEMETRY_LIST_URL)
+        with django_assert_num_queries(2):
+            api_client.get(TELEMETRY_LIST_URL)
+
+    def test_entries_expire_after_ttl(self, api_client, entry, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(caching.time, 'monotonic', lambda: now[0])
+        api_client.get(TELEMETRY_LIST_URL)
+        now[0] += 31
+        assert len(response_cache) == 1
+        assert response_cache.get(next(iter(response_cache._items))) is None
+
+    def test_lru_evicts_least_recently_used(self, api_client, entry, settings):
+        settings.TELEMETRY = {'CACHE_MAX_ENTRIES': 2}
+        api_client.get(TELEMETRY_LIST_URL, {'status': 'healthy'})
+        api_client.get(TELEMETRY_LIST_URL, {'status': 'warning'})
+        api_client.get(TELEMETRY_LIST_URL, {'status': 'healthy'})
+        api_client.get(TELEMETRY_LIST_URL, {'status': 'critical'})
+        cached = [dict(key[3]).get('status') for key in response_cache._items]
+        assert cached == ['healthy', 'critical']
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+
+    def test_matching_etag_returns_304(self, api_client, entry):
+        etag = api_client.get(TELEMETRY_LIST_URL)['ETag']
+        response = api_client.get(TELEMETRY_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response['ETag'] == etag
+
+    def test_etag_matches_without_cache(self, api_client, entry, settings):
+        settings.TELEMETRY = {'CACHE_TTL': 0}
+        etag = api_client.get(detail_url(entry['id']))['ETag']
+        response = api_client.get(detail_url(entry['id']), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_changed_content_returns_200(self, api_client, entry):
+        etag = api_client.get(TELEMETRY_LIST_URL)['ETag']
+        api_client.post(TELEMETRY_LIST_URL, PAYLOAD, format='json')
+        response = api_client.get(TELEMETRY_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+class TestSharedCache:
+    """
+    Two server processes: each has its own response cache and its own
+    client of a file cache they share.
+    """
+
+    @pytest.fixture
+    def processes(self, tmp_path, monkeypatch):
+        processes = [(ResponseCache(), FileBasedCache(str(tmp_path), {})) for _ in range(2)]
+
+        def run(process, request):
+            responses, shared = processes[process]
+            with monkeypatch.context() as patch:
+                patch.setattr(caching, 'response_cache', responses)
+                patch.setattr(caching, 'cache', shared)
+                return request()
+
+        return run
+
+    def test_write_in_one_process_invalidates_the_other(self, processes, api_client, entry):
+        def count():
+            return api_client.get(TELEMETRY_LIST_URL).data['count']
+
+        assert processes(0, count) == 1
+        assert processes(1, count) == 1
+        processes(1, lambda: api_client.post(TELEMETRY_LIST_URL, PAYLOAD, format='json'))
+        assert processes(0, count) == 2
+
+    def test_update_in_one_process_invalidates_the_others_detail(self, processes, api_client, entry):
+        def status():
+            return api_client.get(detail_url(entry['id'])).data['status']
+
+        assert processes(0, status) == 'critical'
+        processes(1, lambda: api_client.patch(detail_url(entry['id']), {'status': 'healthy'}, format='json'))
+        assert processes(0, status) == 'healthy'
@@ -0,0 +1,153 @@
+import sqlite3
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from RocketDashboard.routers import ReadReplicaRouter
+from RocketDashboard.sqlite3.base import DatabaseWrapper, _pools
+from apps.telemetry.models import TelemetryEntry
+
+
+@pytest.fixture
+def database(django_db_blocker, tmp_path):
+    """
+    Returns a function opening a wrapper of the project's SQLite backend
+    on a file, with the given OPTIONS.
+    """
+    wrappers = []
+
+    def database(alias='test', name=tmp_path / 'db.sqlite3', **options):
+        settings_dict = connections.configure_settings({
+            'default': {},
+            alias: {'ENGINE': 'RocketDashboard.sqlite3', 'NAME': str(name), 'OPTIONS': options},
+        })[alias]
+        wrapper = DatabaseWrapper(settings_dict, alias)
+        wrappers.append(wrapper)
+        return wrapper
+
+    with django_db_blocker.unblock():
+        yield database
+        for wrapper in wrappers:
+            wrapper.close()
+        for key in [key for key in _pools if key[1].startswith(str(tmp_path))]:
+            pool = _pools.pop(key)
+            while not pool.empty():
+                pool.get_nowait().close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_init_command_runs_on_each_connection(database):
+    db = database(init_command='PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;')
+    assert pragma(db, 'journal_mode') == 'wal'
+    assert pragma(db, 'synchronous') == 1
+    db.close()
+    # synchronous is per connection, so it must be set again.
+    assert pragma(db, 'synchronous') == 1
+
+
+def test_query_only_connection_cannot_write(database):
+    db = database(init_command='PRAGMA query_only=ON')
+    with pytest.raises(Exception, match='readonly'):
+        with db.cursor() as cursor:
+            cursor.execute('CREATE TABLE t (id INTEGER)')
+
+
+@pytest.mark.parametrize('mode, expected', [(None, 'BEGIN'), ('immediate', 'BEGIN IMMEDIATE')])
+def test_transaction_mode(database, mode, expected):
+    db = database(**({'transaction_mode': mode} if mode else {}))
+    db.ensure_connection()
+    with CaptureQueriesContext(db) as queries:
+        # What atomic() calls to open a transaction.
+        db._start_transaction_under_autocommit()
+        db.rollback()
+    assert queries.captured_queries[0]['sql'] == expected
+
+
+def test_invalid_transaction_mode(database):
+    db = database(transaction_mode='LAZY')
+    with pytest.raises(ImproperlyConfigured, match='transaction_mode'):
+        db.ensure_connection()
+
+
+def test_pool_reuses_connections(database):
+    db = database(pool=True, init_command='PRAGMA journal_mode=WAL')
+    db.ensure_connection()
+    first = db.connection
+    db.close()
+    with CaptureQueriesContext(db) as queries:
+        db.ensure_connection()
+    assert db.connection is first
+    # Pooled connections are already set up.
+    assert not queries.captured_queries
+
+
+def test_pool_is_shared_between_wrappers(database):
+    # Under ASGI each request thread has its own wrapper.
+    first, second = database(pool=True), database(pool=True)
+    first.ensure_connection()
+    raw = first.connection
+    first.close()
+    second.ensure_connection()
+    assert second.connection is raw
+
+
+def test_pool_rolls_back_returned_connections(database):
+    db = database(pool=True)
+    with db.cursor() as cursor:
+        cursor.execute('CREATE TABLE t (id INTEGER)')
+    db.set_autocommit(False)
+    with db.cursor() as cursor:
+        cursor.execute('INSERT INTO t VALUES (1)')
+    db.close()
+
+    db.ensure_connection()
+    assert not db.connection.in_transaction
+    with db.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM t')
+        assert cursor.fetchone()[0] == 0
+
+
+def test_pool_is_bounded(database):
+    wrappers = [database(pool=2) for _ in range(3)]
+    raw = []
+    for wrapper in wrappers:
+        wrapper.ensure_connection()
+        raw.append(wrapper.connection)
+    for wrapper in wrappers:
+        wrapper.close()
+
+    assert _pools['test', wrappers[0].settings_dict['NAME']].qsize() == 2
+    # The connection that did not fit was closed.
+    with pytest.raises(sqlite3.ProgrammingError):
+        raw[2].execute('SELECT 1')
+
+
+def test_in_memory_database_is_not_pooled(database):
+    db = database(alias='memory', name=':memory:', pool=True)
+    db.ensure_connection()
+    db.close()
+    assert not any(alias == 'memory' for alias, _ in _pools)
+
+
+class TestReadReplicaRouter:
+    router = ReadReplicaRouter()
+
+    def test_reads_go_to_replica(self):
+        assert self.router.db_for_read(TelemetryEntry) == 'replica'
+        assert self.router.db_for_write(TelemetryEntry) == 'default'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_reads_in_a_transaction_stay_on_default(self):
+        with transaction.atomic():
+            assert self.router.db_for_read(TelemetryEntry) == 'default'
+
+    def test_migrations_run_on_default_only(self):
+        assert self.router.allow_migrate('default', 'telemetry')
+        assert not self.router.allow_migrate('replica', 'telemetry')
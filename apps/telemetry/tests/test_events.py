@@ -0,0 +1,187 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.telemetry.detection import detect
+from apps.telemetry.ingest import write_entries
+from apps.telemetry.models import SatelliteBaseline, TelemetryEntry, TelemetryEvent
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+EVENTS_URL = reverse('telemetry_api:event-list')
+
+START = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+OPTIONS = {'alpha': 0.1, 'threshold': 6.0, 'warmup': 10, 'rate_floor': {'altitude': 0.01, 'velocity': 0.00001}}
+
+
+def orbit(count, satellite_id='SAT-001', offset=0, statuses=None):
+    """
+    ``count`` entries ten seconds apart, following a smooth orbit-like swing.
+    """
+    return [
+        TelemetryEntry(
+            None,
+            satellite_id,
+            START + timedelta(seconds=10 * (offset + i)),
+            500.0 + 20 * math.sin((offset + i) / 50),
+            7.6 - 0.02 * math.sin((offset + i) / 50),
+            statuses[i] if statuses else 'healthy',
+        )
+        for i in range(count)
+    ]
+
+
+class TestDetect:
+
+    def test_smooth_motion_is_not_an_anomaly(self):
+        baselines = {}
+        assert detect(baselines, orbit(500), **OPTIONS) == []
+        baseline = baselines['SAT-001']
+        assert baseline.samples == 499
+        assert baseline.last_seen == START + timedelta(seconds=4990)
+
+    def test_jump(self):
+        entries = orbit(40)
+        entries[30].altitude += 5.0
+        events = detect({}, entries, **OPTIONS)
+
+        # Up, then back down.
+        assert [(event.kind, event.field, event.timestamp) for event in events] == [
+            ('anomaly', 'altitude', entries[30].timestamp),
+            ('anomaly', 'altitude', entries[31].timestamp),
+        ]
+        up, down = events
+        assert up.value == entries[30].altitude
+        assert up.expected == pytest.approx(entries[30].altitude - 5.0, abs=0.05)
+        assert up.score > 6 and down.score < -6
+
+    def test_no_anomalies_while_warming_up(self):
+        entries = orbit(8)
+        entries[5].velocity += 1.0
+        assert detect({}, entries, **OPTIONS) == []
+
+    def test_status_changes(self):
+        statuses = ['healthy', 'healthy', 'warning', 'critical', 'critical', 'warning']
+        events = detect({}, orbit(6, statuses=statuses), **OPTIONS)
+        assert [(event.previous_status, event.status) for event in events] == [
+            ('healthy', 'warning'), ('warning', 'critical'), ('critical', 'warning'),
+        ]
+        assert {event.kind for event in events} == {'status_change'}
+
+    def test_out_of_order_entries_are_skipped(self):
+        baselines = {}
+        detect(baselines, orbit(20), **OPTIONS)
+        late = orbit(1, statuses=['critical'])
+        late[0].altitude = 0.0
+        assert detect(baselines, late, **OPTIONS) == []
+        assert baselines['SAT-001'].samples == 19
+
+    def test_gaps_scale_the_expected_change(self):
+        baselines = {}
+        detect(baselines, orbit(30), **OPTIONS)
+        # An hour later the orbit has moved on, as its rate predicted.
+        assert detect(baselines, orbit(1, offset=390), **OPTIONS) == []
+
+    def test_satellites_are_independent(self):
+        entries = orbit(30) + orbit(30, satellite_id='SAT-002')
+        entries[45].altitude += 10.0
+        events = detect({}, entries, **OPTIONS)
+        assert {event.satellite_id for event in events} == {'SAT-002'}
+
+
+@pytest.mark.django_db
+class TestDetectionOnIngest:
+
+    def test_bulk_ingest_records_events(self):
+        statuses = ['healthy'] * 20 + ['critical'] * 20
+        entries = orbit(40, statuses=statuses)
+        entries[30].velocity += 0.5
+        write_entries(entries)
+
+        events = TelemetryEvent.objects.order_by('timestamp', 'id')
+        assert [(event.kind, event.field) for event in events] == [
+            ('status_change', ''), ('anomaly', 'velocity'), ('anomaly', 'velocity'),
+        ]
+        assert events[1].entry_id == entries[30].pk
+        baseline = SatelliteBaseline.objects.get()
+        assert (baseline.samples, baseline.status) == (39, 'critical')
+
+    def test_baselines_carry_over_between_writes(self):
+        write_entries(orbit(20))
+        jumped = orbit(1, offset=20)
+        jumped[0].altitude += 5.0
+        write_entries(jumped)
+        assert TelemetryEvent.objects.get().field == 'altitude'
+        assert SatelliteBaseline.objects.get().samples == 20
+
+    def test_post_and_critical_warning(self, caplog):
+        write_entries(orbit(2))
+        response = APIClient().post(TELEMETRY_LIST_URL, {
+            'satellite_id': 'SAT-001', 'timestamp': '2025-01-15T12:01:00Z', 'altitude': 500.0, 'velocity': 7.6,
+            'status': 'critical',
+        }, format='json')
+        assert response.status_code == 201
+
+        event = TelemetryEvent.objects.get()
+        assert (event.previous_status, event.status, event.entry_id) == ('healthy', 'critical', response.data['id'])
+        assert 'SAT-001 changed from healthy to critical' in caplog.text
+
+    def test_updates_are_not_checked(self):
+        entry, = write_entries(orbit(1))
+        response = APIClient().patch(
+            reverse('telemetry_api:telemetry-detail', args=[entry.pk]), {'status': 'critical'}, format='json',
+        )
+        assert response.status_code == 200
+        assert not TelemetryEvent.objects.exists()
+
+    def test_disabled(self, settings):
+        settings.TELEMETRY = {'DETECTION_ENABLED': False}
+        write_entries(orbit(3, statuses=['healthy', 'warning', 'critical']))
+        assert not TelemetryEvent.objects.exists()
+        assert not SatelliteBaseline.objects.exists()
+
+
+@pytest.mark.django_db
+class TestEventAPI:
+
+    @pytest.fixture(autouse=True)
+    def events(self):
+        write_entries(
+            orbit(4, statuses=['healthy', 'warning', 'healthy', 'critical'])
+            + orbit(2, satellite_id='SAT-002', statuses=['healthy', 'warning'])
+        )
+
+    def test_list(self):
+        response = APIClient().get(EVENTS_URL)
+        assert response.status_code == 200
+        assert response.data['count'] == 4
+        results = response.data['results']
+        # Equal timestamps come newest event first.
+        assert [(event['satellite_id'], event['status']) for event in results] == [
+            ('SAT-001', 'critical'), ('SAT-001', 'healthy'), ('SAT-002', 'warning'), ('SAT-001', 'warning'),
+        ]
+        assert set(results[0]) == {
+            'id', 'satellite_id', 'timestamp', 'kind', 'entry_id', 'previous_status', 'status',
+            'field', 'value', 'expected', 'score', 'detected_at',
+        }
+
+    @pytest.mark.parametrize('params, count', [
+        ({'satellite_id': 'SAT-002'}, 1),
+        ({'kind': 'status_change', 'status': 'warning'}, 2),
+        ({'kind': 'anomaly'}, 0),
+        ({'from': '2025-01-15T12:00:20Z'}, 2),
+        ({'to': '2025-01-15T12:00:20Z'}, 2),
+    ])
+    def test_filters(self, params, count):
+        response = APIClient().get(EVENTS_URL, params)
+        assert response.status_code == 200
+        assert response.data['count'] == count
+
+    def test_invalid_filter(self):
+        response = APIClient().get(EVENTS_URL, {'kind': 'meteor'})
+        assert response.status_code == 400
+        assert 'kind' in response.data
@@ -0,0 +1,138 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+
+from apps.telemetry.api.views import TelemetryExportView
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_EXPORT_URL = reverse('telemetry_api:telemetry-export')
+
+
+@pytest.fixture
+def entries(make_entry):
+    return [
+        make_entry(satellite_id='SAT-001', timestamp='2025-01-15T12:00:00Z', status='healthy'),
+        make_entry(satellite_id='SAT-002', timestamp='2025-01-15T12:00:01.5Z', status='critical'),
+        make_entry(satellite_id='SAT-001', timestamp='2025-01-15T12:00:02Z', status='warning'),
+        make_entry(satellite_id='SAT-002', timestamp='2025-01-15T12:00:03Z', status='healthy'),
+        make_entry(satellite_id='SAT-001', timestamp='2025-01-15T12:00:04Z', status='critical'),
+    ]
+
+
+def export(api_client, **params):
+    response = api_client.get(TELEMETRY_EXPORT_URL, params)
+    assert response.status_code == 200
+    return response, b''.join(response.streaming_content)
+
+
+def parse_ndjson(body):
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+@pytest.mark.django_db
+class TestTelemetryExport:
+
+    def test_ndjson_matches_list(self, api_client, entries):
+        response, body = export(api_client, format='ndjson')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'] == 'attachment; filename="telemetry.ndjson"'
+        listed = api_client.get(TELEMETRY_LIST_URL).json()['results']
+        assert parse_ndjson(body) == listed
+
+    def test_csv(self, api_client, entries):
+        response, body = export(api_client, format='csv')
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        assert [row['id'] for row in rows] == [str(entry.id) for entry in reversed(entries)]
+        assert rows[3] == {
+            'id': str(entries[1].id),
+            'satellite_id': 'SAT-002',
+            'timestamp': '2025-01-15T12:00:01.500000Z',
+            'altitude': '500.0',
+            'velocity': '7.5',
+            'status': 'critical',
+        }
+
+    def test_csv_header_once_across_chunks(self, api_client, entries, settings):
+        settings.TELEMETRY = {'EXPORT_CHUNK_SIZE': 2}
+        response = api_client.get(TELEMETRY_EXPORT_URL, {'format': 'csv'})
+        chunks = list(response.streaming_content)
+        assert len(chunks) == 3
+        lines = b''.join(chunks).decode().splitlines()
+        assert lines[0] == 'id,satellite_id,timestamp,altitude,velocity,status'
+        assert len(lines) == 6
+
+    def test_filters_and_ordering(self, api_client, entries):
+        _, body = export(
+            api_client,
+            format='ndjson',
+            satellite_id='SAT-001',
+            status='critical',
+            ordering='timestamp',
+        )
+        assert [item['id'] for item in parse_ndjson(body)] == [entries[4].id]
+
+        _, body = export(
+            api_client,
+            format='ndjson',
+            ordering='timestamp',
+            **{'from': '2025-01-15T12:00:01Z', 'to': '2025-01-15T12:00:03Z'},
+        )
+        assert [item['id'] for item in parse_ndjson(body)] == [entries[1].id, entries[2].id]
+
+    def test_empty_export(self, api_client):
+        _, body = export(api_client, format='csv')
+        assert body == b''
+
+    def test_gzip(self, api_client, entries, settings):
+        settings.TELEMETRY = {'EXPORT_CHUNK_SIZE': 2}
+        plain = export(api_client, format='csv')[1]
+        response = api_client.get(TELEMETRY_EXPORT_URL, {'format': 'csv'}, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        chunks = list(response.streaming_content)
+        # Every chunk is flushed as soon as it is rendered.
+        assert all(chunks[:-1])
+        assert gzip.decompress(b''.join(chunks)) == plain
+
+    def test_uncompressed_without_accept_encoding(self, api_client, entries):
+        response, _ = export(api_client, format='csv')
+        assert not response.has_header('Content-Encoding')
+
+    def test_invalid_time_range_returns_json_400(self, api_client):
+        response = api_client.get(TELEMETRY_EXPORT_URL, {'format': 'csv', 'from': 'yesterday'})
+        assert response.status_code == 400
+        assert response['Content-Type'] == 'application/json'
+        assert 'from' in response.json()
+
+    def test_unknown_format_returns_404(self, api_client):
+        response = api_client.get(TELEMETRY_EXPORT_URL, {'format': 'xml'})
+        assert response.status_code == 404
+        assert response['Content-Type'] == 'application/json'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_streams_asynchronously_under_asgi(settings, async_connections):
+    settings.TELEMETRY = {'EXPORT_CHUNK_SIZE': 1}
+    for second in range(3):
+        TelemetryEntry.objects.create(
+            satellite_id='SAT-001', timestamp=f'2025-01-15T12:00:0{second}Z', altitude=500.0, velocity=7.5,
+        )
+    request = AsyncRequestFactory().get(TELEMETRY_EXPORT_URL, {'format': 'ndjson'})
+    response = TelemetryExportView.as_view()(request)
+    assert response.is_async
+
+    async def consume():
+        return [chunk async for chunk in response.streaming_content]
+
+    chunks = asyncio.run(consume())
+    assert len(chunks) == 3
+    assert len(parse_ndjson(b''.join(chunks))) == 3
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.telemetry.frames import ENTRY, HEADER, MEDIA_TYPE, FrameError, decode_frames, encode_frames
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+TELEMETRY_EXPORT_URL = reverse('telemetry_api:telemetry-export')
+
+
+def entry(**overrides):
+    return {
+        'id': None,
+        'satellite_id': 'SAT-001',
+        'timestamp': datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc),
+        'altitude': 500.125,
+        'velocity': 7.5,
+        'status': 'healthy',
+        **overrides,
+    }
+
+
+class TestFrames:
+
+    def test_round_trip(self):
+        entries = [
+            entry(id=1),
+            entry(satellite_id='SAT-002', status='critical'),
+            entry(id=3, satellite_id='SAT-001', altitude=35786.0004, status='warning'),
+        ]
+        data = encode_frames(entries)
+        # Each satellite ID is stored once.
+        assert len(data) == HEADER.size + 2 * (2 + len('SAT-001')) + 3 * ENTRY.size
+        assert decode_frames(data) == entries
+
+    def test_timestamps_keep_milliseconds(self):
+        data = encode_frames([entry(timestamp='2025-01-15T12:00:00.123456+02:00')])
+        assert decode_frames(data)[0]['timestamp'] == datetime(2025, 1, 15, 10, 0, 0, 123000, tzinfo=timezone.utc)
+
+    def test_frames_concatenate(self):
+        data = encode_frames([entry(satellite_id='SAT-001')]) + encode_frames([entry(satellite_id='SAT-002')])
+        assert [e['satellite_id'] for e in decode_frames(data)] == ['SAT-001', 'SAT-002']
+
+    def test_empty(self):
+        assert decode_frames(encode_frames([])) == []
+
+    @pytest.mark.parametrize('data, message', [
+        (b'JSON', 'Truncated frame header'),
+        (b'XXXX' + bytes(6), 'No frame starts'),
+        (encode_frames([entry()])[:-1], 'Truncated entries'),
+        (encode_frames([entry()])[:12], 'Truncated satellite table'),
+        (encode_frames([entry()])[:-1] + b'\x09', 'unknown satellite or status'),
+        (encode_frames([entry(altitude=float('nan'))]), 'must be finite'),
+        (encode_frames([entry(velocity=float('inf'))]), 'must be finite'),
+        (encode_frames([entry(altitude=float('-inf'))]), 'must be finite'),
+    ])
+    def test_malformed(self, data, message):
+        with pytest.raises(FrameError, match=message):
+            decode_frames(data)
+
+
+@pytest.mark.django_db
+class TestFrameAPI:
+
+    @pytest.fixture
+    def entries(self, make_entry):
+        return [
+            make_entry(satellite_id=f'SAT-00{i % 2 + 1}', timestamp=f'2025-01-15T12:00:0{i}Z', altitude=400.0 + i)
+            for i in range(3)
+        ]
+
+    def test_list(self):
+        TelemetryEntry.objects.bulk_create([
+            TelemetryEntry(satellite_id=f'SAT-00{i % 2 + 1}', timestamp=datetime(2025, 1, 15, 12, i, tzinfo=timezone.utc),
+                           altitude=400.0 + i, velocity=7.5)
+            for i in range(51)
+        ])
+        client = APIClient()
+        json_page = client.get(TELEMETRY_LIST_URL).json()
+        response = client.get(TELEMETRY_LIST_URL, HTTP_ACCEPT=MEDIA_TYPE)
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == MEDIA_TYPE
+        assert response['X-Total-Count'] == '51'
+        assert response['Link'] == f'<{json_page["next"]}>; rel="next"'
+        decoded = decode_frames(response.content)
+        assert [e['id'] for e in decoded] == [e['id'] for e in json_page['results']]
+        assert decoded[0]['timestamp'] == datetime(2025, 1, 15, 12, 50, tzinfo=timezone.utc)
+        assert decoded[0]['altitude'] == 450.0
+
+    def test_format_parameter_and_detail(self, entries):
+        response = APIClient().get(reverse('telemetry_api:telemetry-detail', args=[entries[0].pk]), {'format': 'frame'})
+        assert response.status_code == 200
+        assert decode_frames(response.content)[0]['id'] == entries[0].pk
+
+    def test_errors_are_json(self):
+        response = APIClient().get(TELEMETRY_LIST_URL, {'from': 'soon'}, HTTP_ACCEPT=MEDIA_TYPE)
+        assert response.status_code == 400
+        assert response['Content-Type'] == 'application/json'
+        assert 'from' in response.json()
+
+    def test_export(self, entries, settings):
+        settings.TELEMETRY = {'EXPORT_CHUNK_SIZE': 2}
+        response = APIClient().get(TELEMETRY_EXPORT_URL, {'format': 'frame', 'ordering': 'timestamp'})
+        assert response.status_code == 200
+        # One frame per chunk.
+        decoded = decode_frames(b''.join(response.streaming_content))
+        assert [e['id'] for e in decoded] == [e.pk for e in entries]
+
+    def test_bulk_ingest(self):
+        body = encode_frames([entry(), entry(satellite_id='SAT-002', status='warning')])
+        response = APIClient().post(TELEMETRY_BULK_URL, body, content_type=MEDIA_TYPE)
+        assert response.status_code == 201
+        assert response.data == {'created': 2, 'errors': []}
+        stored = TelemetryEntry.objects.get(satellite_id='SAT-002')
+        assert (stored.timestamp, stored.altitude, stored.status) == (entry()['timestamp'], 500.125, 'warning')
+
+    def test_bulk_ingest_validates(self):
+        body = encode_frames([entry(altitude=-1.0)])
+        response = APIClient().post(TELEMETRY_BULK_URL, body, content_type=MEDIA_TYPE)
+        assert response.status_code == 400
+        assert response.data['errors'][0]['errors'] == {'altitude': ['Ensure this value is greater than or equal to 0.']}
+
+    def test_bulk_ingest_malformed(self):
+        response = APIClient().post(TELEMETRY_BULK_URL, b'TLM1\x00', content_type=MEDIA_TYPE)
+        assert response.status_code == 400
+        assert 'Frame parse error' in response.data['detail']
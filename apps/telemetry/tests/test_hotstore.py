@@ -0,0 +1,344 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from apps.telemetry import hotstore
+from apps.telemetry.api.pagination import TelemetryCursorPagination
+from apps.telemetry.hotstore import Columns, HotWindow
+from apps.telemetry.ingest import write_entries
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_AGGREGATE_URL = reverse('telemetry_api:telemetry-aggregate')
+TELEMETRY_COMPARE_URL = reverse('telemetry_api:telemetry-compare')
+TELEMETRY_HOT_URL = reverse('telemetry_api:telemetry-hot')
+SATELLITES_URL = reverse('telemetry_api:satellite-list')
+
+NOW = timezone.now().replace(second=0, microsecond=0)
+STATUSES = ['healthy', 'warning', 'critical']
+
+
+def minutes_ago(minutes):
+    return NOW - timedelta(minutes=minutes)
+
+
+def entries(count, start=0):
+    """
+    ``count`` entries a minute apart, the newest ``start`` minutes ago,
+    alternating between two satellites.
+    """
+    return [
+        TelemetryEntry(
+            None, f'SAT-00{i % 2 + 1}', minutes_ago(start + i), 400.0 + i * 1.5, 7.0 + i % 4, STATUSES[i % 3],
+        )
+        for i in range(count)
+    ]
+
+
+def entry_queries(queries):
+    return [query['sql'] for query in queries.captured_queries if 'telemetry_telemetryentry' in query['sql']]
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(settings):
+    settings.TELEMETRY = {'CACHE_TTL': 0}
+
+
+@pytest.fixture
+def start_window(monkeypatch):
+    """
+    Returns a function loading a HotWindow and making it this process's.
+    """
+    def start_window(hours=24, max_entries=1000):
+        window = HotWindow(hours, max_entries)
+        window.load()
+        monkeypatch.setattr(hotstore, '_window', window)
+        return window
+
+    return start_window
+
+
+def without_window(monkeypatch, request):
+    with monkeypatch.context() as patch:
+        patch.setattr(hotstore, '_window', None)
+        return request()
+
+
+class TestColumns:
+
+    def test_keeps_timestamp_then_descending_id_order(self):
+        columns = Columns()
+        for pk, micros in [(1, 10), (3, 30), (2, 20), (5, 20), (4, 20)]:
+            assert columns.insert(pk, micros, 1.0, 2.0, 0)
+        assert not columns.insert(5, 20, 1.0, 2.0, 0)
+        assert list(zip(columns.times, columns.ids)) == [(10, 1), (20, 5), (20, 4), (20, 2), (30, 3)]
+        assert columns.latest()[:2] == (3, 30)
+
+        assert columns.remove(4, 20)
+        assert not columns.remove(4, 20)
+        assert columns.trim(20) == 1
+        assert list(columns.ids) == [5, 2, 3]
+        assert columns.span(20, 30) == (0, 2)
+        assert columns.nbytes == 3 * 33
+
+
+@pytest.mark.django_db
+class TestWindowQueries:
+
+    @pytest.fixture(autouse=True)
+    def data(self):
+        # Two days of entries; the window holds the first.
+        write_entries(entries(60) + entries(30, start=60 * 30))
+
+    @pytest.mark.parametrize('params', [
+        {'from': minutes_ago(100).isoformat()},
+        {'from': minutes_ago(100).isoformat(), 'to': minutes_ago(20).isoformat(), 'page': 2},
+        {'from': minutes_ago(100).isoformat(), 'status': 'warning', 'satellite_id': 'SAT-002'},
+        {'from': minutes_ago(100).isoformat(), 'ordering': 'timestamp'},
+        {'from': minutes_ago(100).isoformat(), 'status': 'lost'},
+        {'from': minutes_ago(100).isoformat(), 'satellite_id__in': 'SAT-002,SAT-003', 'status__in': 'warning,critical'},
+    ])
+    def test_list_pages(self, start_window, monkeypatch, params):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 7)
+        window = start_window()
+        client = APIClient()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(TELEMETRY_LIST_URL, params)
+        assert response.status_code == 200
+        assert not entry_queries(queries)
+        assert response.json() == without_window(monkeypatch, lambda: client.get(TELEMETRY_LIST_URL, params).json())
+        assert window.hits == 1
+
+    def test_list_reaching_past_the_window_uses_the_database(self, start_window):
+        window = start_window()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(TELEMETRY_LIST_URL, {'ordering': '-altitude', 'from': minutes_ago(10).isoformat()})
+            APIClient().get(TELEMETRY_LIST_URL)
+            APIClient().get(TELEMETRY_LIST_URL, {'from': minutes_ago(10).isoformat(), 'altitude__gte': 450})
+        assert response.status_code == 200
+        assert entry_queries(queries)
+        assert (window.hits, window.misses) == (0, 3)
+
+    @pytest.mark.parametrize('params', [{}, {'ordering': 'timestamp'}, {'status': 'critical'}])
+    def test_cursor_pages(self, start_window, monkeypatch, params):
+        monkeypatch.setattr(TelemetryCursorPagination, 'page_size', 8)
+        # Cursors order equal timestamps by id.
+        write_entries(entries(9, start=3))
+        start_window()
+        client = APIClient()
+
+        def walk(url, link):
+            pages = []
+            while url:
+                page = client.get(url).json()
+                pages.append(page['results'])
+                url = page[link]
+            return pages
+
+        first = f'{TELEMETRY_LIST_URL}?pagination=cursor&' + '&'.join(f'{k}={v}' for k, v in params.items())
+        pages = walk(first, 'next')
+        expected = without_window(monkeypatch, lambda: walk(first, 'next'))
+        assert pages == expected
+        assert len(pages) > 2
+
+        # And back again from the last page.
+        last = client.get(first).json()
+        while last['next']:
+            last_url = last['next']
+            last = client.get(last_url).json()
+        back = walk(client.get(last_url).json()['previous'], 'previous')
+        assert back == without_window(monkeypatch, lambda: walk(client.get(last_url).json()['previous'], 'previous'))
+
+    def test_newest_cursor_page_stays_in_memory(self, start_window):
+        start_window()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(TELEMETRY_LIST_URL, {'pagination': 'cursor'})
+        assert len(response.data['results']) == 50
+        assert not entry_queries(queries)
+
+    @pytest.mark.parametrize('bucket', ['1m', '1h', '1d'])
+    def test_aggregate(self, start_window, monkeypatch, bucket):
+        window = start_window()
+        params = {'bucket': bucket, 'from': minutes_ago(70).isoformat(), 'to': minutes_ago(3).isoformat()}
+        client = APIClient()
+
+        with CaptureQueriesContext(connection) as queries:
+            results = client.get(TELEMETRY_AGGREGATE_URL, params).json()['results']
+        expected = without_window(monkeypatch, lambda: client.get(TELEMETRY_AGGREGATE_URL, params).json()['results'])
+        assert not entry_queries(queries)
+        assert window.hits == 1
+
+        assert [row['bucket'] for row in results] == [row['bucket'] for row in expected]
+        for row, expected_row in zip(results, expected):
+            assert row['count'] == expected_row['count']
+            assert row['status'] == expected_row['status']
+            for field in ('altitude', 'velocity'):
+                assert row[field] == pytest.approx(expected_row[field])
+
+    def test_compare(self, start_window, monkeypatch):
+        start_window()
+        params = {'satellite_id__in': 'SAT-002,SAT-001', 'bucket': '1m', 'from': minutes_ago(70).isoformat()}
+        client = APIClient()
+
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(TELEMETRY_COMPARE_URL, params).json()
+        expected = without_window(monkeypatch, lambda: client.get(TELEMETRY_COMPARE_URL, params).json())
+        assert not entry_queries(queries)
+        assert data['buckets'] == expected['buckets']
+        assert list(data['series']) == ['SAT-002', 'SAT-001']
+        for sat, series in data['series'].items():
+            assert series['count'] == expected['series'][sat]['count']
+            assert series['avg'] == pytest.approx(expected['series'][sat]['avg'])
+
+    def test_aggregate_reaching_past_the_window(self, start_window):
+        window = start_window()
+        response = APIClient().get(TELEMETRY_AGGREGATE_URL, {'bucket': '1d'})
+        assert sum(row['count'] for row in response.data['results']) == 90
+        assert window.misses == 1
+
+    def test_satellites(self, start_window, monkeypatch):
+        start_window()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(SATELLITES_URL)
+        assert not queries.captured_queries
+        assert response.json() == without_window(monkeypatch, lambda: APIClient().get(SATELLITES_URL).json())
+
+
+@pytest.mark.django_db
+class TestWindowUpdates:
+
+    def list_ids(self, **params):
+        response = APIClient().get(TELEMETRY_LIST_URL, {'from': minutes_ago(60).isoformat(), **params})
+        return [entry['id'] for entry in response.data['results']]
+
+    def test_follows_api_writes_once_committed(self, start_window, django_capture_on_commit_callbacks):
+        write_entries(entries(4))
+        window = start_window()
+        client = APIClient()
+        newest = TelemetryEntry.objects.order_by('-timestamp', 'id').first()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = client.post(TELEMETRY_LIST_URL, {
+                'satellite_id': 'SAT-003', 'timestamp': minutes_ago(1).isoformat(), 'altitude': 1.0, 'velocity': 2.0,
+            }, format='json').data
+            client.put(reverse('telemetry_api:telemetry-detail', args=[newest.pk]), {
+                'satellite_id': 'SAT-001', 'timestamp': minutes_ago(30).isoformat(), 'altitude': 3.0, 'velocity': 4.0,
+            }, format='json')
+            client.delete(reverse('telemetry_api:telemetry-detail', args=[created['id']]))
+        assert window.status()['entries'] == 4
+
+        database = list(TelemetryEntry.objects.order_by('-timestamp', 'id').values_list('id', flat=True))
+        assert self.list_ids() == database
+        # The updated entry was SAT-001's latest; it is found again in the window.
+        satellites = {state['satellite_id']: state for state in APIClient().get(SATELLITES_URL).data}
+        assert set(satellites) == {'SAT-001', 'SAT-002'}
+        assert satellites['SAT-001']['latest']['id'] == (
+            TelemetryEntry.objects.filter(satellite_id='SAT-001').order_by('-timestamp', '-id').first().pk
+        )
+
+    def test_uncommitted_writes_are_not_applied(self, start_window, django_capture_on_commit_callbacks):
+        window = start_window()
+        with django_capture_on_commit_callbacks() as callbacks:
+            write_entries(entries(2))
+            assert window.status()['entries'] == 0
+        for callback in callbacks:
+            callback()
+        assert window.status()['entries'] == 2
+
+    def test_catches_up_with_other_processes(self, start_window, monkeypatch):
+        window = start_window()
+        # Written by another process: no entries_changed here, only its bump.
+        TelemetryEntry.objects.bulk_create(entries(3))
+        hotstore._bump(hotstore.APPEND_GENERATION_KEY)
+        assert len(self.list_ids()) == 3
+        assert window.status()['entries'] == 3
+
+        reloads = []
+        monkeypatch.setattr(window, 'start', lambda: reloads.append(True))
+        hotstore._bump(hotstore.REWRITE_GENERATION_KEY)
+        assert hotstore.hot_window() is None
+        assert reloads
+
+    def test_catches_up_with_lower_ids_committed_elsewhere(self, start_window, django_capture_on_commit_callbacks):
+        window = start_window()
+        # Another process commits first, but bumps the counter after this
+        # process has written and bumped it.
+        other = TelemetryEntry.objects.bulk_create(entries(1, start=2))
+        with django_capture_on_commit_callbacks(execute=True):
+            local = write_entries(entries(1))
+        hotstore._bump(hotstore.APPEND_GENERATION_KEY)
+
+        database = list(TelemetryEntry.objects.order_by('-timestamp', 'id').values_list('id', flat=True))
+        assert self.list_ids() == database == [local[0].pk, other[0].pk]
+        assert window.status()['entries'] == 2
+
+    def test_retention_inside_the_window_reloads(self, start_window, monkeypatch):
+        window = start_window()
+        reloads = []
+        monkeypatch.setattr(window, 'start', lambda: reloads.append(True))
+        hotstore.invalidate(minutes_ago(60 * 48))
+        assert not reloads
+        hotstore.invalidate(minutes_ago(60))
+        assert reloads
+
+    def test_memory_is_bounded(self, start_window):
+        write_entries(entries(30))
+        window = start_window(max_entries=20)
+
+        status = window.status()
+        assert status['entries'] <= 18
+        assert status['evicted_entries'] == 30 - status['entries']
+        assert status['bytes'] == status['entries'] * 33
+        assert not window.covers(minutes_ago(60))
+        assert window.covers(status['window_start'])
+        # The list still comes out whole, from the database.
+        assert len(self.list_ids()) == 30
+
+
+@pytest.mark.django_db
+def test_status_and_metrics(start_window):
+    write_entries(entries(6))
+    start_window()
+
+    status = APIClient().get(TELEMETRY_HOT_URL).data
+    assert status['enabled'] and status['ready']
+    assert (status['entries'], status['satellites'], status['bytes']) == (6, 2, 6 * 33)
+
+    metrics = APIClient().get(reverse('telemetry:metrics')).content.decode()
+    assert 'telemetry_hot_window_entries 6' in metrics
+    assert 'telemetry_hot_window_bytes 198' in metrics
+
+
+@pytest.mark.django_db
+def test_status_when_disabled():
+    assert APIClient().get(TELEMETRY_HOT_URL).data == {'enabled': False}
+
+
+class TestStartup:
+
+    @pytest.fixture(autouse=True)
+    def no_window(self, monkeypatch):
+        monkeypatch.setattr(hotstore, '_window', None)
+        monkeypatch.setattr(HotWindow, 'start', lambda window: None)
+
+    def test_not_started_with_a_process_local_cache(self, settings, caplog):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        assert hotstore.start_hot_window() is None
+        assert hotstore.get_window() is None
+        assert 'not shared between processes' in caplog.text
+
+    def test_started_with_a_shared_cache(self, settings, tmp_path):
+        settings.CACHES = {
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': str(tmp_path)},
+        }
+        window = hotstore.start_hot_window()
+        assert window is not None
+        assert hotstore.get_window() is window
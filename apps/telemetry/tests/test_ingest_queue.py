@@ -0,0 +1,217 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.telemetry import ingest_queue
+from apps.telemetry.ingest_queue import IngestQueue, QueueFull, read_journal
+from apps.telemetry.models import HourlyRollup, IngestCheckpoint, TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+TELEMETRY_INGEST_URL = reverse('telemetry_api:telemetry-ingest')
+
+START = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def entries(count, offset=0):
+    return [
+        TelemetryEntry(None, 'SAT-001', START + timedelta(seconds=offset + i), 500.0, 7.5, 'healthy')
+        for i in range(count)
+    ]
+
+
+def row(second=0, **overrides):
+    return {
+        'satellite_id': 'SAT-001',
+        'timestamp': f'2025-01-15T12:00:{second:02d}Z',
+        'altitude': 500.0,
+        'velocity': 7.5,
+        **overrides,
+    }
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    """
+    Returns a function opening an IngestQueue on a journal directory; the
+    writer thread is not started.
+    """
+    queues = []
+
+    def make_queue(**options):
+        options = {'max_entries': 10, 'batch_size': 3, 'flush_interval': 0.01, 'fsync': False, **options}
+        queue = IngestQueue(tmp_path, **options)
+        queue.open()
+        queues.append(queue)
+        return queue
+
+    yield make_queue
+    for queue in queues:
+        if not queue._journal.closed:
+            queue.close()
+
+
+def crash(queue):
+    # Closing the file releases its lock, as the death of the process would.
+    queue._journal.close()
+
+
+@pytest.mark.django_db
+class TestIngestQueue:
+
+    def test_put_journals_before_queueing(self, make_queue):
+        queue = make_queue()
+        assert queue.put(entries(2)) == 1
+        assert queue.put(entries(1, offset=2)) == 2
+
+        records = read_journal(queue._journal.name)
+        assert [(sequence, len(batch)) for sequence, batch in records] == [(1, 2), (2, 1)]
+        assert records[1][1][0].timestamp == START + timedelta(seconds=2)
+        assert not TelemetryEntry.objects.exists()
+        assert queue.status()['queued_entries'] == 3
+
+    def test_drain_writes_whole_requests_in_batches(self, make_queue):
+        queue = make_queue()
+        for count in (2, 1, 2, 4):
+            queue.put(entries(count))
+
+        assert queue.drain() == 9
+        # [2, 1], [2], [4]: a request is never split, and one larger than
+        # the batch size is a batch of its own.
+        assert queue.batches == 3
+        assert TelemetryEntry.objects.count() == 9
+        assert IngestCheckpoint.objects.get(journal=queue.journal_name).sequence == 4
+        assert HourlyRollup.objects.get().count == 9
+        assert queue.status()['queued_entries'] == 0
+
+    def test_full_queue_rejects(self, make_queue):
+        queue = make_queue(max_entries=3)
+        queue.put(entries(2))
+        with pytest.raises(QueueFull):
+            queue.put(entries(2))
+        assert len(read_journal(queue._journal.name)) == 1
+
+    def test_replays_unwritten_records_after_a_crash(self, make_queue):
+        crashed = make_queue()
+        crashed.put(entries(2))
+        crashed.put(entries(1, offset=2))
+        crashed.put(entries(2, offset=3))
+        crashed._write_next()
+        crash(crashed)
+        assert TelemetryEntry.objects.count() == 3
+
+        make_queue()
+        # Exactly the records after the checkpoint are written.
+        timestamps = TelemetryEntry.objects.order_by('timestamp').values_list('timestamp', flat=True)
+        assert list(timestamps) == [START + timedelta(seconds=i) for i in range(5)]
+        assert not IngestCheckpoint.objects.filter(journal=crashed.journal_name).exists()
+        assert not (crashed.directory / crashed.journal_name).exists()
+
+    def test_live_journals_are_not_replayed(self, make_queue):
+        live = make_queue()
+        live.put(entries(1))
+        make_queue()
+        assert not TelemetryEntry.objects.exists()
+        assert live.drain() == 1
+
+    def test_incomplete_last_record_is_ignored(self, make_queue):
+        crashed = make_queue()
+        crashed.put(entries(1))
+        crashed._journal.write(b'{"sequence":2,"rows":[["SAT-0')
+        crash(crashed)
+
+        make_queue()
+        assert TelemetryEntry.objects.count() == 1
+
+    def test_journal_starts_over_once_written(self, make_queue):
+        queue = make_queue(max_journal_bytes=1)
+        queue.put(entries(1))
+        assert queue.status()['journal_bytes'] > 0
+        queue.drain()
+        assert queue.status()['journal_bytes'] == 0
+        queue.put(entries(1, offset=1))
+        assert [sequence for sequence, _ in read_journal(queue._journal.name)] == [2]
+
+    def test_close_writes_the_rest_and_removes_the_journal(self, make_queue):
+        queue = make_queue()
+        queue.put(entries(1))
+        queue.close()
+        assert TelemetryEntry.objects.count() == 1
+        assert not (queue.directory / queue.journal_name).exists()
+        assert not IngestCheckpoint.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_writer_thread_flushes_partial_batches(tmp_path):
+    queue = IngestQueue(tmp_path, max_entries=10, batch_size=100, flush_interval=0.05, fsync=False)
+    queue.start()
+    try:
+        queue.put(entries(2))
+        deadline = time.monotonic() + 5
+        while queue.written < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert TelemetryEntry.objects.count() == 2
+    finally:
+        queue.close()
+
+
+@pytest.fixture
+def queued(settings, tmp_path):
+    settings.TELEMETRY = {'INGEST_MODE': 'queued', 'INGEST_JOURNAL_DIR': str(tmp_path), 'INGEST_QUEUE_SIZE': 3}
+    yield
+    ingest_queue.stop_queue()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('queued')
+class TestQueuedIngestAPI:
+
+    def test_post_is_accepted_then_written(self):
+        response = APIClient().post(TELEMETRY_LIST_URL, row(), format='json')
+        assert response.status_code == 202
+        assert response.data == {'queued': 1}
+        ingest_queue.stop_queue()
+        assert TelemetryEntry.objects.get().timestamp == START
+
+    def test_invalid_post_is_rejected(self):
+        response = APIClient().post(TELEMETRY_LIST_URL, row(altitude=-1), format='json')
+        assert response.status_code == 400
+        assert 'altitude' in response.data
+
+    def test_bulk(self):
+        response = APIClient().post(TELEMETRY_BULK_URL, [row(0), row(1, status='lost')], format='json')
+        assert response.status_code == 207
+        assert response.data['queued'] == 1
+        assert response.data['errors'][0]['index'] == 1
+
+        response = APIClient().post(TELEMETRY_BULK_URL, [row(2)], format='json')
+        assert response.status_code == 202
+        ingest_queue.stop_queue()
+        assert TelemetryEntry.objects.count() == 2
+
+    def test_full_queue_answers_503(self):
+        ingest_queue.get_queue()._write_lock.acquire()
+        try:
+            APIClient().post(TELEMETRY_BULK_URL, [row(0), row(1), row(2)], format='json')
+            response = APIClient().post(TELEMETRY_LIST_URL, row(3), format='json')
+        finally:
+            ingest_queue.get_queue()._write_lock.release()
+        assert response.status_code == 503
+        assert response['Retry-After'] == '1'
+
+    def test_lag(self):
+        response = APIClient().get(TELEMETRY_INGEST_URL)
+        assert response.status_code == 200
+        assert response.data['mode'] == 'queued'
+        assert response.data['queued_entries'] == 0
+        assert response.data['lag_seconds'] == 0.0
+
+
+@pytest.mark.django_db
+def test_lag_in_sync_mode():
+    response = APIClient().get(TELEMETRY_INGEST_URL)
+    assert response.data == {'mode': 'sync'}
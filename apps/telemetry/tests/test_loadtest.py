@@ -0,0 +1,59 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.telemetry.loadtest import percentile, run, summarise
+from apps.telemetry.models import TelemetryEntry
+
+
+class TestReport:
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([7], 99) == 7
+        assert percentile([], 50) is None
+
+    def test_summarise(self):
+        report = summarise({'list': [0.01, 0.02, 0.03, 0.04]}, {'list': 1, 'detail': 2}, elapsed=2.0, concurrency=3)
+
+        assert report['concurrency'] == 3
+        assert report['scenarios']['list'] == {
+            'requests': 5, 'errors': 1, 'throughput': 2.0,
+            'p50_ms': 20.0, 'p95_ms': 40.0, 'p99_ms': 40.0, 'max_ms': 40.0,
+        }
+        assert report['scenarios']['detail']['p50_ms'] is None
+        assert report['total']['requests'] == 7
+        assert report['total']['errors'] == 3
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRun:
+    @pytest.fixture
+    def entries(self, make_entry):
+        return [make_entry(satellite_id=f'SAT-00{n % 3 + 1}') for n in range(30)]
+
+    def test_drives_every_scenario(self, live_server, entries):
+        report = run(live_server.url, concurrency=2, duration=1.0)
+
+        assert report['total']['requests'] > 0
+        assert report['total']['errors'] == 0
+        assert report['total']['p50_ms'] <= report['total']['p99_ms']
+        assert TelemetryEntry.objects.count() > len(entries)
+
+    def test_read_only_mix(self, live_server, entries):
+        out = StringIO()
+        call_command(
+            'loadtest', url=live_server.url, concurrency=1, duration=0.5,
+            mix='list=1,detail=1,bulk=1', read_only=True, stdout=out,
+        )
+
+        assert TelemetryEntry.objects.count() == len(entries)
+        assert 'list' in out.getvalue() and 'detail' in out.getvalue()
+        assert 'bulk' not in out.getvalue()
+
+    def test_rejects_unknown_scenario(self):
+        with pytest.raises(CommandError):
+            call_command('loadtest', mix='nope=1', stdout=StringIO())
@@ -0,0 +1,156 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.telemetry.metrics import registry
+from apps.telemetry.middleware import RequestMetricsMiddleware
+from apps.telemetry.models import TelemetryEntry
+
+
+pytestmark = pytest.mark.django_db
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+METRICS_URL = reverse('telemetry:metrics')
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+
+
+def parse_server_timing(header):
+    timings = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        timings[name] = dict(param.split('=', 1) for param in params)
+    return timings
+
+
+def sample(text, line_start):
+    """The value of the exposition line starting with ``line_start``."""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class TestServerTiming:
+    def test_reports_time_queries_and_render(self, client, make_entry):
+        make_entry()
+        response = client.get(TELEMETRY_LIST_URL)
+
+        timings = parse_server_timing(response['Server-Timing'])
+        # COUNT(*) for the page number pagination, then the page.
+        assert timings['db']['desc'] == '"2 queries"'
+        assert float(timings['total']['dur']) >= float(timings['db']['dur'])
+        assert float(timings['render']['dur']) > 0
+
+    def test_cached_response_runs_no_queries(self, client, make_entry):
+        make_entry()
+        client.get(TELEMETRY_LIST_URL)
+        response = client.get(TELEMETRY_LIST_URL)
+        assert parse_server_timing(response['Server-Timing'])['db']['desc'] == '"0 queries"'
+
+    def test_unmatched_urls_are_timed(self, client):
+        response = client.get('/no-such-page/')
+        assert response.status_code == 404
+        assert 'Server-Timing' in response
+
+
+class TestMetricsEndpoint:
+    def test_exposes_per_view_totals(self, client, make_entry):
+        make_entry()
+        client.get(TELEMETRY_LIST_URL)
+        client.get(TELEMETRY_LIST_URL, {'status': 'warning'})
+        client.post(TELEMETRY_LIST_URL, {}, content_type='application/json')
+
+        response = client.get(METRICS_URL)
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        text = response.content.decode()
+        labels = 'view="telemetry_api:telemetry-list",method="GET"'
+        assert sample(text, f'http_requests_total{{{labels},status="200"}}') == 2
+        assert sample(text, 'http_requests_total{view="telemetry_api:telemetry-list",method="POST",status="400"}') == 1
+        assert sample(text, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 2
+        assert sample(text, f'http_request_duration_seconds_count{{{labels}}}') == 2
+        # The status filter matches nothing, so its page query is skipped.
+        assert sample(text, f'http_db_queries_total{{{labels}}}') == 3
+        assert sample(text, f'http_response_bytes_total{{{labels}}}') > 0
+
+    def test_histogram_buckets_are_cumulative(self, client):
+        for _ in range(3):
+            client.get(TELEMETRY_LIST_URL)
+        text = client.get(METRICS_URL).content.decode()
+        buckets = [
+            float(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+            if line.startswith('http_request_duration_seconds_bucket{view="telemetry_api:telemetry-list"')
+        ]
+        assert buckets == sorted(buckets)
+        assert buckets[-1] == 3
+
+
+class TestQueryWarnings:
+    def test_logs_slow_queries_with_sql(self, client, settings, caplog, make_entry):
+        make_entry()
+        settings.TELEMETRY = {'SLOW_QUERY_MS': 0}
+        with caplog.at_level(logging.WARNING, logger='apps.telemetry.metrics'):
+            client.get(TELEMETRY_LIST_URL)
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any('Slow query' in message and 'telemetry_telemetryentry' in message for message in messages)
+        text = client.get(METRICS_URL).content.decode()
+        assert sample(text, 'http_slow_queries_total{view="telemetry_api:telemetry-list",method="GET"}') == 2
+
+    def test_flags_repeated_selects(self, make_entry, caplog):
+        entries = [make_entry() for _ in range(10)]
+
+        def view(request):
+            for entry in entries:
+                TelemetryEntry.objects.get(pk=entry.pk)
+            return HttpResponse()
+
+        with caplog.at_level(logging.WARNING, logger='apps.telemetry.metrics'):
+            RequestMetricsMiddleware(view)(RequestFactory().get('/'))
+
+        assert any('Possible N+1' in record.getMessage() for record in caplog.records)
+        assert 'http_n_plus_one_total{view="unmatched",method="GET"} 1' in registry.render()
+
+    def test_repeated_inserts_are_not_flagged(self, client, settings, caplog):
+        settings.TELEMETRY = {'BULK_CHUNK_SIZE': 1}
+        rows = [
+            {'satellite_id': 'SAT-001', 'timestamp': f'2025-01-01T00:00:{i:02d}Z', 'altitude': 1.0, 'velocity': 1.0}
+            for i in range(20)
+        ]
+        with caplog.at_level(logging.WARNING, logger='apps.telemetry.metrics'):
+            client.post(reverse('telemetry_api:telemetry-bulk'), rows, content_type='application/json')
+
+        assert not any('Possible N+1' in record.getMessage() for record in caplog.records)
+
+
+class TestMiddleware:
+    def test_can_be_disabled(self, settings):
+        settings.TELEMETRY = {'METRICS_ENABLED': False}
+        with pytest.raises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(lambda request: HttpResponse())
+
+    def test_counts_queries_run_in_threads_for_async_requests(self, make_entry):
+        make_entry()
+
+        async def view(request):
+            await sync_to_async(TelemetryEntry.objects.count)()
+            return HttpResponse('ok')
+
+        response = async_to_sync(RequestMetricsMiddleware(view))(RequestFactory().get('/'))
+
+        assert 'desc="1 queries"' in response['Server-Timing']
+
+    def test_queries_outside_requests_are_ignored(self, make_entry):
+        make_entry()
+        TelemetryEntry.objects.count()
+        assert 'http_db_queries_total{' not in registry.render()
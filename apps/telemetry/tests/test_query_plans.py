@@ -0,0 +1,107 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.telemetry.api.pagination import TelemetryCursorPagination
+from apps.telemetry.api.views import TelemetryListCreateView
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+
+FILTERS = {
+    'none': {},
+    'satellite_id': {'satellite_id': 'SAT-001'},
+    'status': {'status': 'critical'},
+    'both': {'satellite_id': 'SAT-001', 'status': 'critical'},
+    'satellite_id__in': {'satellite_id__in': 'SAT-001,SAT-002'},
+    'status__in': {'status__in': 'warning,critical'},
+    'ranges': {'satellite_id__in': 'SAT-001,SAT-002', 'altitude__gte': 400, 'velocity__lt': 8},
+}
+
+# Without a filter, sorting on a measurement column has no index to walk and
+# falls back to a scan; every other combination must be served by an index.
+UNINDEXED_SORTS = {('none', 'altitude'), ('none', 'velocity')}
+
+
+def explain_list_query(params):
+    """
+    Issue a list request and return SQLite's query plan for the page query.
+    """
+    with CaptureQueriesContext(connection) as ctx:
+        response = APIClient().get(TELEMETRY_LIST_URL, params)
+    assert response.status_code == 200
+
+    # The paginator runs a COUNT(*) first; the page itself is the last SELECT.
+    sql = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')][-1]
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[3] for row in cursor.fetchall()]
+
+
+def ordering_combinations():
+    for filter_name in FILTERS:
+        for field in TelemetryListCreateView.ordering_fields:
+            if (filter_name, field) in UNINDEXED_SORTS:
+                continue
+            for ordering in (field, f'-{field}'):
+                yield filter_name, ordering
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is SQLite specific')
+@pytest.mark.django_db
+class TestListQueryPlans:
+
+    @pytest.fixture(autouse=True)
+    def entries(self, make_entry):
+        for i in range(20):
+            make_entry(
+                satellite_id=f'SAT-{i % 4:03d}',
+                status=['healthy', 'warning', 'critical'][i % 3],
+            )
+
+    @pytest.mark.parametrize('filter_name,ordering', list(ordering_combinations()))
+    def test_list_query_uses_index(self, filter_name, ordering):
+        plan = explain_list_query({**FILTERS[filter_name], 'ordering': ordering})
+        assert any('USING INDEX' in step or 'USING COVERING INDEX' in step for step in plan), plan
+
+    @pytest.mark.parametrize('filter_name,index', [
+        ('none', 'telemetry_ts_idx'),
+        ('satellite_id', 'telemetry_sat_ts_idx'),
+        ('status', 'telemetry_status_ts_idx'),
+    ])
+    def test_default_ordering_needs_no_sort(self, filter_name, index):
+        plan = explain_list_query(FILTERS[filter_name])
+        assert any(index in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+
+    @pytest.mark.parametrize('filter_name', ['none', 'satellite_id'])
+    def test_cursor_page_needs_no_sort(self, filter_name, monkeypatch):
+        monkeypatch.setattr(TelemetryCursorPagination, 'page_size', 3)
+        params = {**FILTERS[filter_name], 'pagination': 'cursor'}
+        next_link = APIClient().get(TELEMETRY_LIST_URL, params).data['next']
+        params['cursor'] = parse_qs(urlparse(next_link).query)['cursor'][0]
+
+        plan = explain_list_query(params)
+        assert any('USING INDEX' in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+
+    @pytest.mark.parametrize('filter_name,index', [
+        ('none', 'telemetry_ts_idx'),
+        ('satellite_id', 'telemetry_sat_ts_idx'),
+        ('status', 'telemetry_status_ts_idx'),
+    ])
+    def test_time_range_searches_index(self, filter_name, index):
+        # The range bounds the index search, so rows outside it are never read.
+        plan = explain_list_query({
+            **FILTERS[filter_name],
+            'from': '2025-01-01T00:00:00Z',
+            'to': '2025-02-01T00:00:00Z',
+        })
+        assert any(
+            step.startswith('SEARCH') and index in step and 'timestamp>? AND timestamp<?' in step
+            for step in plan
+        ), plan
@@ -0,0 +1,131 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.telemetry import retention
+from apps.telemetry.aggregation import aggregate
+from apps.telemetry.models import DailyRollup, HourlyRollup, TelemetryEntry
+from apps.telemetry.rollups import rebuild_rollups
+from apps.telemetry.retention import retention_cutoff, run_retention
+
+
+pytestmark = pytest.mark.django_db
+
+NOW = datetime(2025, 3, 10, 15, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def entries(make_entry):
+    created = [
+        make_entry(timestamp='2025-03-01T10:00:00Z', altitude=400.0),
+        make_entry(timestamp='2025-03-01T10:30:00Z', altitude=600.0, status='critical'),
+        make_entry(timestamp='2025-03-02T23:59:59Z', satellite_id='SAT-002'),
+        make_entry(timestamp='2025-03-03T00:00:00Z'),
+        make_entry(timestamp='2025-03-10T12:00:00Z'),
+    ]
+    rebuild_rollups()
+    return created
+
+
+class TestRunRetention:
+
+    def test_cutoff_is_start_of_day(self):
+        assert retention_cutoff(7, NOW) == datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+    def test_deletes_entries_before_cutoff(self, entries):
+        report = run_retention(days=7, now=NOW, pause=0)
+        assert report['deleted'] == 3
+        assert report['days'] == 2
+        assert list(TelemetryEntry.objects.order_by('timestamp').values_list('id', flat=True)) == [
+            entries[3].id, entries[4].id,
+        ]
+        assert report['purge_seconds'] > 0
+
+    def test_keeps_rollups_of_deleted_entries(self, entries):
+        before = aggregate('1h')
+        run_retention(days=7, now=NOW, pause=0)
+        assert aggregate('1h') == before
+        assert aggregate('1d')[0]['altitude'] == {'min': 400.0, 'max': 600.0, 'avg': 500.0}
+
+    def test_repairs_rollups_before_deleting(self, entries):
+        # Entries written around the signal are counted before they go.
+        HourlyRollup.objects.all().delete()
+        DailyRollup.objects.all().delete()
+        report = run_retention(days=7, now=NOW, pause=0)
+        assert report['rollup_rows'] == 4
+        assert [row['count'] for row in aggregate('1d')] == [2, 1]
+
+    def test_deletes_in_batches(self, entries):
+        with CaptureQueriesContext(connection) as ctx:
+            run_retention(days=7, now=NOW, batch_size=1, pause=0, compact_after=False)
+        deletes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('DELETE')]
+        assert len(deletes) == 3
+
+    def test_dry_run(self, entries):
+        report = run_retention(days=7, now=NOW, dry_run=True)
+        assert report['deleted'] == 3
+        assert TelemetryEntry.objects.count() == 5
+
+    def test_without_retention_period_does_nothing(self, entries):
+        assert run_retention(now=NOW)['cutoff'] is None
+        assert TelemetryEntry.objects.count() == 5
+
+    def test_records_last_report(self, entries):
+        report = run_retention(days=7, now=NOW, pause=0)
+        assert retention.last_report is report
+
+    def test_invalidates_cached_lists(self, entries, client, monkeypatch):
+        monkeypatch.setattr('django.utils.timezone.now', lambda: NOW)
+        assert client.get('/api/telemetry/').json()['count'] == 5
+        run_retention(days=7, pause=0)
+        assert client.get('/api/telemetry/').json()['count'] == 2
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='auto_vacuum is SQLite specific')
+@pytest.mark.django_db(transaction=True)
+def test_compacts_incrementally(make_entry):
+    retention.enable_incremental_vacuum()
+    TelemetryEntry.objects.bulk_create(
+        TelemetryEntry(satellite_id='SAT-001', timestamp=NOW.replace(day=1), altitude=1.0, velocity=1.0)
+        for _ in range(5000)
+    )
+    report = run_retention(days=7, now=NOW, pause=0)
+    assert report['deleted'] == 5000
+    assert report['pages_freed'] > 0
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA freelist_count')
+        assert cursor.fetchone()[0] == 0
+
+
+class TestEnforceRetentionCommand:
+
+    def test_reports_metrics(self, entries, monkeypatch):
+        monkeypatch.setattr('django.utils.timezone.now', lambda: NOW)
+        out = StringIO()
+        call_command('enforce_retention', '--days', '7', stdout=out)
+        assert 'Deleted 3 entries from before 2025-03-03 00:00 UTC over 2 days' in out.getvalue()
+
+    def test_dry_run(self, entries, monkeypatch):
+        monkeypatch.setattr('django.utils.timezone.now', lambda: NOW)
+        out = StringIO()
+        call_command('enforce_retention', '--days', '7', '--dry-run', stdout=out)
+        assert 'Would delete 3 entries' in out.getvalue()
+
+    def test_requires_retention_period(self):
+        with pytest.raises(CommandError, match='No retention period'):
+            call_command('enforce_retention', stdout=StringIO())
+
+
+class TestScheduler:
+
+    def test_not_started_without_interval(self, settings):
+        settings.TELEMETRY = {'RETENTION_DAYS': 30}
+        assert retention.start_scheduler() is None
+
+    def test_not_started_without_retention_period(self, settings):
+        settings.TELEMETRY = {'RETENTION_INTERVAL': 60}
+        assert retention.start_scheduler() is None
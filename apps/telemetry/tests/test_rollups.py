@@ -0,0 +1,193 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.telemetry.models import DailyRollup, HourlyRollup, TelemetryEntry
+from apps.telemetry.rollups import STAT_FIELDS, rebuild_rollups
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+TELEMETRY_AGGREGATE_URL = reverse('telemetry_api:telemetry-aggregate')
+
+HOUR_10 = datetime(2025, 1, 15, 10, tzinfo=timezone.utc)
+HOUR_11 = datetime(2025, 1, 15, 11, tzinfo=timezone.utc)
+DAY_15 = datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+
+def payload(**kwargs):
+    return {
+        'satellite_id': 'SAT-001',
+        'timestamp': '2025-01-15T10:15:00Z',
+        'altitude': 500.0,
+        'velocity': 7.5,
+        'status': 'healthy',
+        **kwargs,
+    }
+
+
+def snapshot(model):
+    return {
+        (row.satellite_id, row.bucket_start): {name: getattr(row, name) for name in STAT_FIELDS}
+        for row in model.objects.all()
+    }
+
+
+@pytest.mark.django_db
+class TestIncrementalRollups:
+
+    def test_create_updates_hourly_and_daily(self, api_client):
+        api_client.post(TELEMETRY_LIST_URL, payload(altitude=400.0), format='json')
+        api_client.post(TELEMETRY_LIST_URL, payload(altitude=600.0, status='warning'), format='json')
+
+        hourly = HourlyRollup.objects.get(satellite_id='SAT-001', bucket_start=HOUR_10)
+        assert hourly.count == 2
+        assert hourly.altitude_sum == 1000.0
+        assert (hourly.altitude_min, hourly.altitude_max) == (400.0, 600.0)
+        assert (hourly.healthy_count, hourly.warning_count, hourly.critical_count) == (1, 1, 0)
+        assert DailyRollup.objects.get(satellite_id='SAT-001', bucket_start=DAY_15).count == 2
+
+    def test_bulk_ingest_updates_rollups(self, api_client):
+        rows = [
+            payload(),
+            payload(timestamp='2025-01-15T11:30:00Z', velocity=9.0),
+            payload(satellite_id='SAT-002'),
+        ]
+        api_client.post(TELEMETRY_LIST_URL, payload(velocity=1.0), format='json')
+        api_client.post(TELEMETRY_BULK_URL, rows, format='json')
+
+        hourly = snapshot(HourlyRollup)
+        assert hourly[('SAT-001', HOUR_10)]['count'] == 2
+        assert hourly[('SAT-001', HOUR_10)]['velocity_min'] == 1.0
+        assert hourly[('SAT-001', HOUR_11)]['velocity_max'] == 9.0
+        assert hourly[('SAT-002', HOUR_10)]['count'] == 1
+        assert snapshot(DailyRollup)[('SAT-001', DAY_15)]['count'] == 3
+
+    def test_update_moves_entry_between_buckets(self, api_client):
+        low = api_client.post(TELEMETRY_LIST_URL, payload(altitude=100.0), format='json').data
+        api_client.post(TELEMETRY_LIST_URL, payload(altitude=300.0), format='json')
+
+        detail = reverse('telemetry_api:telemetry-detail', args=[low['id']])
+        api_client.put(detail, payload(altitude=100.0, timestamp='2025-01-15T11:05:00Z'), format='json')
+
+        old = HourlyRollup.objects.get(satellite_id='SAT-001', bucket_start=HOUR_10)
+        assert old.count == 1
+        assert old.altitude_min == 300.0
+        new = HourlyRollup.objects.get(satellite_id='SAT-001', bucket_start=HOUR_11)
+        assert new.count == 1
+        assert new.altitude_min == 100.0
+        assert DailyRollup.objects.get(bucket_start=DAY_15).count == 2
+
+    def test_update_within_bucket_is_not_double_counted(self, api_client):
+        entry = api_client.post(TELEMETRY_LIST_URL, payload(), format='json').data
+        detail = reverse('telemetry_api:telemetry-detail', args=[entry['id']])
+        api_client.patch(detail, {'status': 'critical'}, format='json')
+
+        hourly = HourlyRollup.objects.get()
+        assert hourly.count == 1
+        assert (hourly.healthy_count, hourly.critical_count) == (0, 1)
+
+    def test_deleting_last_entry_removes_bucket(self, api_client):
+        entry = api_client.post(TELEMETRY_LIST_URL, payload(), format='json').data
+        api_client.delete(reverse('telemetry_api:telemetry-detail', args=[entry['id']]))
+        assert not HourlyRollup.objects.exists()
+        assert not DailyRollup.objects.exists()
+
+    def test_incremental_matches_rebuild(self, api_client):
+        ids = []
+        for minute, altitude in [(5, 450.0), (20, 700.0), (50, 380.0), (70, 520.0)]:
+            hour, minute = divmod(minute, 60)
+            timestamp = f'2025-01-15T{10 + hour:02d}:{minute:02d}:00Z'
+            ids.append(api_client.post(
+                TELEMETRY_LIST_URL, payload(timestamp=timestamp, altitude=altitude), format='json',
+            ).data['id'])
+        api_client.post(TELEMETRY_BULK_URL, [payload(satellite_id='SAT-003')] * 3, format='json')
+        api_client.patch(reverse('telemetry_api:telemetry-detail', args=[ids[1]]), {'altitude': 10.0}, format='json')
+        api_client.delete(reverse('telemetry_api:telemetry-detail', args=[ids[3]]))
+
+        incremental = snapshot(HourlyRollup), snapshot(DailyRollup)
+        rebuild_rollups()
+        assert (snapshot(HourlyRollup), snapshot(DailyRollup)) == incremental
+
+
+@pytest.mark.django_db
+class TestRebuildRollups:
+
+    def test_command_rebuilds_from_raw_rows(self, make_entry):
+        make_entry(timestamp=HOUR_10, altitude=400.0)
+        make_entry(timestamp=HOUR_11, altitude=600.0)
+        HourlyRollup.objects.create(satellite_id='SAT-999', bucket_start=HOUR_10, count=5)
+
+        call_command('rebuild_rollups')
+
+        assert set(HourlyRollup.objects.values_list('satellite_id', 'bucket_start')) == {
+            ('SAT-001', HOUR_10), ('SAT-001', HOUR_11),
+        }
+        daily = DailyRollup.objects.get()
+        assert daily.count == 2
+        assert (daily.altitude_min, daily.altitude_max, daily.altitude_sum) == (400.0, 600.0, 1000.0)
+
+    def test_keeps_rollups_older_than_the_raw_rows(self, make_entry):
+        old = make_entry(timestamp=datetime(2025, 1, 14, 10, tzinfo=timezone.utc))
+        make_entry(timestamp=HOUR_10)
+        rebuild_rollups()
+        # Retention deletes the raw rows of a day and keeps its rollups.
+        old.delete()
+        HourlyRollup.objects.filter(bucket_start=HOUR_10).update(count=99)
+
+        call_command('rebuild_rollups')
+        assert set(DailyRollup.objects.values_list('bucket_start', 'count')) == {
+            (datetime(2025, 1, 14, tzinfo=timezone.utc), 1), (DAY_15, 1),
+        }
+        assert HourlyRollup.objects.get(bucket_start=HOUR_10).count == 1
+
+        TelemetryEntry.objects.all().delete()
+        call_command('rebuild_rollups')
+        assert DailyRollup.objects.count() == 2
+
+        call_command('rebuild_rollups', discard_history=True)
+        assert not DailyRollup.objects.exists()
+        assert not HourlyRollup.objects.exists()
+
+    def test_setup_db_leaves_rollups_in_sync(self):
+        call_command('setup_db')
+        assert sum(DailyRollup.objects.values_list('count', flat=True)) == TelemetryEntry.objects.count()
+
+
+@pytest.mark.django_db
+class TestAggregateReadsRollups:
+
+    @pytest.fixture
+    def rollup_only(self):
+        # A rollup row with no raw entries behind it shows which source was read.
+        HourlyRollup.objects.create(
+            satellite_id='SAT-001', bucket_start=HOUR_10, count=4,
+            altitude_sum=2000.0, altitude_min=400.0, altitude_max=600.0,
+            velocity_sum=30.0, velocity_min=7.0, velocity_max=8.0,
+            healthy_count=3, critical_count=1,
+        )
+
+    def test_aligned_range_reads_rollups(self, api_client, rollup_only):
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, {
+            'bucket': '1h', 'from': '2025-01-15T10:00:00Z', 'to': '2025-01-15T12:00:00Z',
+        })
+        [row] = response.data['results']
+        assert row['bucket'] == '2025-01-15T10:00:00Z'
+        assert row['count'] == 4
+        assert row['altitude'] == {'min': 400.0, 'max': 600.0, 'avg': 500.0}
+        assert row['velocity']['avg'] == 7.5
+        assert row['status'] == {'healthy': 3, 'warning': 0, 'critical': 1}
+
+    def test_unaligned_range_reads_raw_entries(self, api_client, rollup_only):
+        response = api_client.get(TELEMETRY_AGGREGATE_URL, {'bucket': '1h', 'from': '2025-01-15T10:30:00Z'})
+        assert response.data['results'] == []
+
+    def test_rollups_combine_satellites(self, api_client, make_entry):
+        make_entry(timestamp=HOUR_10, altitude=100.0)
+        make_entry(timestamp=HOUR_10, satellite_id='SAT-002', altitude=300.0)
+        rebuild_rollups()
+        [row] = api_client.get(TELEMETRY_AGGREGATE_URL, {'bucket': '1d'}).data['results']
+        assert row['count'] == 2
+        assert row['altitude'] == {'min': 100.0, 'max': 300.0, 'avg': 200.0}
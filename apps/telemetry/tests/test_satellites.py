@@ -0,0 +1,144 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.telemetry.models import SatelliteState
+from apps.telemetry.snapshots import STATE_FIELDS, rebuild_snapshots
+
+
+SATELLITE_LIST_URL = reverse('telemetry_api:satellite-list')
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+
+
+def detail_url(pk):
+    return reverse('telemetry_api:telemetry-detail', args=[pk])
+
+
+def payload(**kwargs):
+    return {
+        'satellite_id': 'SAT-001',
+        'timestamp': '2025-01-15T12:00:00Z',
+        'altitude': 500.0,
+        'velocity': 7.5,
+        'status': 'healthy',
+        **kwargs,
+    }
+
+
+def post(api_client, **kwargs):
+    return api_client.post(TELEMETRY_LIST_URL, payload(**kwargs), format='json').data
+
+
+def latest(api_client):
+    return {s['satellite_id']: s['latest'] for s in api_client.get(SATELLITE_LIST_URL).data}
+
+
+def snapshot():
+    return {
+        state.satellite_id: tuple(getattr(state, name) for name in STATE_FIELDS)
+        for state in SatelliteState.objects.all()
+    }
+
+
+@pytest.mark.django_db
+class TestSatelliteList:
+
+    def test_lists_latest_entry_per_satellite(self, api_client):
+        post(api_client, timestamp='2025-01-15T11:00:00Z')
+        newest = post(api_client, timestamp='2025-01-15T12:00:00Z', status='warning')
+        other = post(api_client, satellite_id='SAT-002')
+
+        response = api_client.get(SATELLITE_LIST_URL)
+        assert response.status_code == 200
+        assert response.data == [
+            {'satellite_id': 'SAT-001', 'last_seen': '2025-01-15T12:00:00Z', 'latest': newest},
+            {'satellite_id': 'SAT-002', 'last_seen': '2025-01-15T12:00:00Z', 'latest': other},
+        ]
+
+    def test_single_query_regardless_of_entries(self, api_client, django_assert_num_queries):
+        api_client.post(TELEMETRY_BULK_URL, [payload(satellite_id=f'SAT-{i % 3}') for i in range(30)], format='json')
+        with django_assert_num_queries(1):
+            response = api_client.get(SATELLITE_LIST_URL)
+        assert len(response.data) == 3
+
+    def test_listed_in_api_root(self, api_client):
+        response = api_client.get(reverse('telemetry_api:api-root'))
+        assert 'satellites' in response.data
+
+
+@pytest.mark.django_db
+class TestSatelliteSnapshots:
+
+    def test_older_entry_does_not_replace_latest(self, api_client):
+        newest = post(api_client, timestamp='2025-01-15T12:00:00Z')
+        post(api_client, timestamp='2025-01-15T09:00:00Z', altitude=1.0)
+        assert latest(api_client)['SAT-001'] == newest
+
+    def test_bulk_ingest_updates_snapshots(self, api_client):
+        post(api_client, timestamp='2025-01-15T10:00:00Z')
+        api_client.post(TELEMETRY_BULK_URL, [
+            payload(timestamp='2025-01-15T13:00:00Z', altitude=13.0),
+            payload(timestamp='2025-01-15T14:00:00Z', altitude=14.0),
+            payload(satellite_id='SAT-002', altitude=2.0),
+        ], format='json')
+        states = latest(api_client)
+        assert states['SAT-001']['altitude'] == 14.0
+        assert states['SAT-002']['altitude'] == 2.0
+
+    def test_moving_latest_entry_back_in_time_falls_back(self, api_client):
+        previous = post(api_client, timestamp='2025-01-15T11:00:00Z')
+        newest = post(api_client, timestamp='2025-01-15T12:00:00Z')
+        api_client.put(detail_url(newest['id']), payload(timestamp='2025-01-15T08:00:00Z'), format='json')
+        assert latest(api_client)['SAT-001'] == previous
+
+    def test_updating_latest_entry_refreshes_values(self, api_client):
+        newest = post(api_client)
+        api_client.patch(detail_url(newest['id']), {'status': 'critical'}, format='json')
+        assert latest(api_client)['SAT-001']['status'] == 'critical'
+
+    def test_moving_entry_to_another_satellite(self, api_client):
+        entry = post(api_client)
+        api_client.patch(detail_url(entry['id']), {'satellite_id': 'SAT-009'}, format='json')
+        assert list(latest(api_client)) == ['SAT-009']
+
+    def test_deleting_latest_entry_falls_back(self, api_client):
+        previous = post(api_client, timestamp='2025-01-15T11:00:00Z')
+        newest = post(api_client, timestamp='2025-01-15T12:00:00Z')
+        api_client.delete(detail_url(newest['id']))
+        assert latest(api_client)['SAT-001'] == previous
+
+    def test_deleting_only_entry_removes_satellite(self, api_client):
+        entry = post(api_client)
+        api_client.delete(detail_url(entry['id']))
+        assert api_client.get(SATELLITE_LIST_URL).data == []
+
+    def test_ties_on_timestamp_go_to_the_higher_id(self, api_client):
+        post(api_client)
+        second = post(api_client, altitude=1.0)
+        assert latest(api_client)['SAT-001'] == second
+
+    def test_incremental_matches_rebuild(self, api_client):
+        ids = [post(api_client, satellite_id=f'SAT-{i % 2}', timestamp=f'2025-01-15T1{i}:00:00Z')['id'] for i in range(6)]
+        api_client.delete(detail_url(ids[5]))
+        api_client.patch(detail_url(ids[4]), {'timestamp': '2025-01-14T00:00:00Z'}, format='json')
+        api_client.post(TELEMETRY_BULK_URL, [payload(satellite_id='SAT-7')], format='json')
+
+        incremental = snapshot()
+        rebuild_snapshots()
+        assert snapshot() == incremental
+
+
+@pytest.mark.django_db
+class TestRebuildSatelliteStates:
+
+    def test_command_rebuilds_from_raw_rows(self, make_entry):
+        make_entry(timestamp='2025-01-15T10:00:00Z')
+        newest = make_entry(timestamp='2025-01-15T12:00:00Z', status='critical')
+        make_entry(satellite_id='SAT-002')
+        call_command('rebuild_satellite_states')
+
+        states = {s.satellite_id: s for s in SatelliteState.objects.all()}
+        assert set(states) == {'SAT-001', 'SAT-002'}
+        assert states['SAT-001'].entry_id == newest.pk
+        assert states['SAT-001'].status == 'critical'
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.telemetry import aggregation, storage
+from apps.telemetry.ingest import write_entries
+from apps.telemetry.models import TelemetryEntry
+
+
+pytestmark = pytest.mark.django_db
+
+postgresql_only = pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL specific')
+
+START = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def entries(count):
+    return [
+        TelemetryEntry(None, f'SAT-{i % 3:03d}', START + timedelta(seconds=i), 500.0 + i, 7.5, 'healthy')
+        for i in range(count)
+    ]
+
+
+def test_write_entries_sets_primary_keys():
+    written = write_entries(entries(5))
+    assert [entry.pk for entry in written] == sorted(entry.pk for entry in written)
+    assert set(TelemetryEntry.objects.values_list('pk', flat=True)) == {entry.pk for entry in written}
+    stored = TelemetryEntry.objects.get(pk=written[3].pk)
+    assert (stored.satellite_id, stored.timestamp, stored.altitude) == ('SAT-000', START + timedelta(seconds=3), 503.0)
+
+
+@postgresql_only
+def test_write_entries_uses_copy_on_postgresql():
+    with CaptureQueriesContext(connection) as queries:
+        write_entries(entries(100))
+    # COPY bypasses the cursor's execute(), so no INSERT is recorded.
+    assert not [query for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "telemetry_telemetryentry"')]
+    assert TelemetryEntry.objects.count() == 100
+
+
+@postgresql_only
+def test_brin_index_on_postgresql():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'telemetry_ts_brin'")
+        assert 'USING brin' in cursor.fetchone()[0]
+
+
+@pytest.mark.skipif(connection.vendor == 'postgresql', reason='checks the paths taken off PostgreSQL')
+def test_orm_paths_elsewhere():
+    assert not storage.supports_copy(connection)
+    assert not storage.has_timescaledb(connection)
+
+
+def test_time_bucket_with_timescaledb(monkeypatch):
+    monkeypatch.setattr(aggregation, 'has_timescaledb', lambda connection: True)
+    write_entries(entries(3))
+    # Without the extension the function does not exist; the SQL is what matters.
+    with CaptureQueriesContext(connection) as queries, pytest.raises(DatabaseError):
+        aggregation.aggregate('1m')
+    assert 'time_bucket(' in queries.captured_queries[-1]['sql']
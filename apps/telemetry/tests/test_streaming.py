@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.telemetry.api.views import TelemetryStreamView
+from apps.telemetry.models import TelemetryEntry
+from apps.telemetry.streaming import broker
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+TELEMETRY_STREAM_URL = reverse('telemetry_api:telemetry-stream')
+
+
+@pytest.fixture(autouse=True)
+def fast_stream(settings, async_connections):
+    settings.TELEMETRY = {
+        'STREAM_POLL_INTERVAL': 0.01,
+        'STREAM_KEEPALIVE': 0.05,
+        'STREAM_MAX_SECONDS': 5,
+    }
+
+
+def create(satellite_id='SAT-001', **kwargs):
+    return TelemetryEntry.objects.create(
+        satellite_id=satellite_id, timestamp='2025-01-15T12:00:00Z', altitude=500.0, velocity=7.5, **kwargs,
+    )
+
+
+async def open_stream(query='', last_event_id=None):
+    headers = {'Last-Event-ID': str(last_event_id)} if last_event_id is not None else {}
+    request = AsyncRequestFactory().get(f'{TELEMETRY_STREAM_URL}{query}', headers=headers)
+    response = await TelemetryStreamView.as_view()(request)
+    stream = aiter(response.streaming_content)
+    # The first chunk is sent once the subscription is in place.
+    assert await anext(stream) == b'retry: 3000\n\n'
+    return response, stream
+
+
+async def read_until(stream, text, timeout=2):
+    received = b''
+    async with asyncio.timeout(timeout):
+        while text.encode() not in received:
+            received += await anext(stream)
+    return received.decode()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestTelemetryStream:
+
+    def test_streams_new_entries(self):
+        async def scenario():
+            response, stream = await open_stream()
+            assert response['Content-Type'] == 'text/event-stream'
+            entry = await sync_to_async(create)()
+            body = await read_until(stream, f'id: {entry.pk}\n')
+            await stream.aclose()
+            return entry, body
+
+        entry, body = run(scenario())
+        assert 'event: telemetry\n' in body
+        assert f'"id": {entry.pk}, "satellite_id": "SAT-001"' in body
+        assert len(broker) == 0
+
+    def test_existing_entries_are_not_replayed(self):
+        async def scenario():
+            old = await sync_to_async(create)()
+            _, stream = await open_stream()
+            new = await sync_to_async(create)()
+            body = await read_until(stream, f'id: {new.pk}\n')
+            await stream.aclose()
+            return old, body
+
+        old, body = run(scenario())
+        assert f'id: {old.pk}\n' not in body
+
+    def test_filters_by_satellite(self):
+        async def scenario():
+            _, stream = await open_stream('?satellite_id=SAT-002')
+            other = await sync_to_async(create)('SAT-001')
+            wanted = await sync_to_async(create)('SAT-002')
+            body = await read_until(stream, f'id: {wanted.pk}\n')
+            await stream.aclose()
+            return other, body
+
+        other, body = run(scenario())
+        assert f'id: {other.pk}\n' not in body
+
+    def test_last_event_id_replays_missed_entries(self):
+        async def scenario():
+            seen = await sync_to_async(create)()
+            missed = await sync_to_async(create)()
+            _, stream = await open_stream(last_event_id=seen.pk)
+            body = await read_until(stream, f'id: {missed.pk}\n')
+            await stream.aclose()
+            return seen, body
+
+        seen, body = run(scenario())
+        assert f'id: {seen.pk}\n' not in body
+
+    def test_replay_does_not_repeat_queued_entries(self):
+        async def scenario():
+            seen = await sync_to_async(create)()
+            # Keeps the broker polling while the second stream reconnects.
+            _, running = await open_stream()
+            missed = await sync_to_async(create)()
+            await read_until(running, f'id: {missed.pk}\n')
+            _, stream = await open_stream(last_event_id=seen.pk)
+            # Polled into the new stream's queue before its replay runs.
+            new = await sync_to_async(create)()
+            await read_until(running, f'id: {new.pk}\n')
+            body = await read_until(stream, f'id: {new.pk}\n')
+            # Anything queued comes before the next keep-alive.
+            body += await read_until(stream, ': keepalive')
+            await stream.aclose()
+            await running.aclose()
+            return missed, new, body
+
+        missed, new, body = run(scenario())
+        assert body.count(f'id: {missed.pk}\n') == 1
+        assert body.count(f'id: {new.pk}\n') == 1
+
+    def test_sends_keepalive_comments(self):
+        async def scenario():
+            _, stream = await open_stream()
+            body = await read_until(stream, ': keepalive')
+            await stream.aclose()
+            return body
+
+        assert run(scenario()) == ': keepalive\n\n'
+
+    def test_closes_after_max_seconds(self, settings):
+        settings.TELEMETRY = {**settings.TELEMETRY, 'STREAM_MAX_SECONDS': 0.1}
+
+        async def scenario():
+            _, stream = await open_stream()
+            async with asyncio.timeout(2):
+                return [chunk async for chunk in stream]
+
+        assert all(chunk == b': keepalive\n\n' for chunk in run(scenario()))
+        assert len(broker) == 0
+
+    def test_requires_asgi(self):
+        response = APIClient().get(TELEMETRY_STREAM_URL)
+        assert response.status_code == 501
+
+
+class TestTelemetryBroker:
+
+    def test_one_query_per_poll_for_all_subscribers(self, monkeypatch):
+        from apps.telemetry import streaming
+
+        calls = []
+        fetch_events = streaming.fetch_events
+        monkeypatch.setattr(streaming, 'fetch_events', lambda *args: calls.append(args) or fetch_events(*args))
+
+        async def scenario():
+            subscriptions = [await broker.subscribe() for _ in range(50)]
+            broker._task.cancel()
+            calls.clear()
+            await sync_to_async(create)()
+            await broker.poll()
+            sizes = [s.queue.qsize() for s in subscriptions]
+            for subscription in subscriptions:
+                broker.unsubscribe(subscription)
+            return sizes
+
+        assert run(scenario()) == [1] * 50
+        assert len(calls) == 1
+
+    def test_slow_subscriber_overflows(self, settings):
+        settings.TELEMETRY = {**settings.TELEMETRY, 'STREAM_QUEUE_SIZE': 2}
+
+        async def scenario():
+            _, stream = await open_stream()
+            entries = await sync_to_async(lambda: [create() for _ in range(5)])()
+            # Let the broker publish everything before the stream reads.
+            while len(broker):
+                await asyncio.sleep(0.01)
+            async with asyncio.timeout(2):
+                body = b''.join([chunk async for chunk in stream]).decode()
+            return entries, body
+
+        entries, body = run(scenario())
+        assert body.endswith('event: overflow\ndata: {"detail": "Stream fell too far behind."}\n\n')
+        assert f'id: {entries[1].pk}\n' in body
+        assert f'id: {entries[2].pk}\n' not in body
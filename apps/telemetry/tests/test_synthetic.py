@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from apps.telemetry import hotstore
+from apps.telemetry.ingest import write_entries
+from apps.telemetry.models import (
+    DailyRollup, HourlyRollup, SatelliteBaseline, SatelliteState, TelemetryEntry, TelemetryEvent,
+)
+from apps.telemetry.rollups import STAT_FIELDS, rebuild_rollups
+from apps.telemetry.synthetic import EARTH_RADIUS, Satellite, generate, generate_window
+
+
+END = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def _rollups(model):
+    # Sums are compared rounded: they are added up in a different order.
+    return [
+        tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+        for row in model.objects.order_by('satellite_id', 'bucket_start').values_list('satellite_id', 'bucket_start', *STAT_FIELDS)
+    ]
+
+
+class TestSatellite:
+    def test_is_deterministic_per_seed(self):
+        assert generate_window(START, 10, 0, 5, 3, seed=1) == generate_window(START, 10, 0, 5, 3, seed=1)
+        assert generate_window(START, 10, 0, 5, 3, seed=1) != generate_window(START, 10, 0, 5, 3, seed=2)
+
+    def test_windows_join_up(self):
+        whole = generate_window(START, 10, 0, 6, 2, seed=0)
+        assert [row[:2] for row in whole] == [
+            row[:2] for row in generate_window(START, 10, 0, 3, 2, seed=0) + generate_window(START, 10, 3, 6, 2, seed=0)
+        ]
+
+    def test_rows_are_in_time_order(self):
+        timestamps = [row[1] for row in generate_window(START, 10, 0, 20, 10, seed=0)]
+        assert timestamps == sorted(timestamps)
+
+    def test_orbits_are_plausible(self):
+        for number in range(1, 51):
+            satellite = Satellite(number, 10, seed=0)
+            apogee = satellite.semi_major_axis * (1 + satellite.eccentricity)
+            for t in range(0, 86400, 3600):
+                altitude, velocity = satellite.position(t)
+                assert 300 < altitude <= apogee - EARTH_RADIUS + 1e-6
+                # Between a geostationary orbit and low Earth orbit.
+                assert 3.0 < velocity < 8.0
+
+    def test_velocity_is_highest_at_perigee(self):
+        satellite = Satellite(1, 10, seed=0)
+        period = 2 * 3.141592653589793 / satellite.mean_motion
+        track = [satellite.position(t) for t in range(0, int(period), 30)]
+        lowest = min(track)
+        highest = max(track)
+        assert lowest[1] > highest[1]
+
+    def test_status_changes_gradually(self):
+        satellite = Satellite(1, 10, seed=0)
+        statuses = [satellite.status(t) for t in range(0, 60 * 86400, 600)]
+        assert {'healthy', 'warning'} <= set(statuses)
+        for previous, current in zip(statuses, statuses[1:]):
+            # Critical is entered and left through warning.
+            assert {previous, current} != {'healthy', 'critical'}
+
+
+@pytest.mark.django_db
+class TestGenerate:
+    def test_writes_rows_and_keeps_rollups_and_snapshots_current(self):
+        progress = []
+        written = generate(600, 6, 60, END, processes=1, chunk_size=120, seed=3, progress=progress.append)
+
+        assert written == 600
+        assert TelemetryEntry.objects.count() == 600
+        assert progress == [120, 240, 360, 480, 600]
+        assert SatelliteState.objects.count() == 6
+        assert TelemetryEntry.objects.latest('timestamp').timestamp <= END
+
+        hourly, daily = _rollups(HourlyRollup), _rollups(DailyRollup)
+        rebuild_rollups()
+        assert _rollups(HourlyRollup) == hourly
+        assert _rollups(DailyRollup) == daily
+
+    def test_adds_to_existing_rollups(self, make_entry):
+        make_entry(satellite_id='SAT-001', timestamp=END - timedelta(minutes=10), altitude=1.0)
+        rebuild_rollups()
+
+        generate(100, 2, 60, END, processes=1, seed=3)
+        hourly = _rollups(HourlyRollup)
+        assert min(row[STAT_FIELDS.index('altitude_min') + 2] for row in hourly) == 1.0
+        rebuild_rollups()
+        assert _rollups(HourlyRollup) == hourly
+
+
+@pytest.mark.django_db
+class TestGenerateCommand:
+    def test_generates_and_clears(self, make_entry):
+        make_entry(satellite_id='SAT-999')
+        out = StringIO()
+        call_command('generate_telemetry', rows=200, satellites=4, processes=1, clear=True, stdout=out)
+
+        assert TelemetryEntry.objects.count() == 200
+        assert not TelemetryEntry.objects.filter(satellite_id='SAT-999').exists()
+        assert 'Successfully generated 200 telemetry entries' in out.getvalue()
+
+    def test_resets_detection_and_hot_windows(self):
+        write_entries([
+            TelemetryEntry(satellite_id='SAT-001', timestamp=END + timedelta(minutes=i), altitude=500.0,
+                           velocity=7.5, status=status)
+            for i, status in enumerate(['healthy', 'critical'])
+        ])
+        assert TelemetryEvent.objects.exists() and SatelliteBaseline.objects.exists()
+        generation = cache.get(hotstore.REWRITE_GENERATION_KEY)
+
+        call_command('generate_telemetry', rows=200, satellites=4, processes=1, clear=True, stdout=StringIO())
+
+        assert not TelemetryEvent.objects.exists()
+        assert not SatelliteBaseline.objects.exists()
+        assert cache.get(hotstore.REWRITE_GENERATION_KEY) != generation
+
+    def test_rejects_too_many_satellites(self):
+        with pytest.raises(CommandError):
+            call_command('generate_telemetry', rows=10, satellites=1000, stdout=StringIO())
@@ -5,4 +5,6 @@ app_name = 'telemetry'
 
 urlpatterns = [
     path('telemetry/', views.TelemetryListView.as_view(), name='telemetry_list'),
+    # No trailing slash: the path Prometheus scrapes by default.
+    path('metrics', views.MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
@@ -1,5 +1,10 @@
+from django.http import HttpResponse
+from django.views import View
 from django.views.generic import TemplateView
 
+from .hotstore import get_window
+from .metrics import registry, render_values
+
 
 class TelemetryListView(TemplateView):
     """
@@ -7,3 +12,17 @@ class TelemetryListView(TemplateView):
     All data is fetched client-side via the REST API.
     """
     template_name = 'telemetry/telemetry_list.html'
+
+
+class MetricsView(View):
+    """
+    Serves this process's request metrics in the Prometheus text format,
+    with the size and hit counts of its hot window when there is one.
+    """
+
+    def get(self, request):
+        body = registry.render()
+        window = get_window()
+        if window is not None:
+            body += render_values(window.metrics())
+        return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,81 @@
+"""
+Compare two pytest-benchmark JSON reports and fail on regressions.
+
+    python -m benchmarks.compare BASELINE CURRENT [--stat median] [--threshold 20]
+
+Benchmarks are matched by name and by the table size they ran against,
+which the benchmark conftest records in each report. Exits with status 1
+if any benchmark's statistic grew by more than ``--threshold`` percent.
+Benchmarks present in only one report are listed but do not fail the run.
+"""
+import argparse
+import json
+import sys
+
+
+STATS = ('min', 'max', 'mean', 'median', 'iqr', 'stddev')
+
+
+def load(path):
+    """
+    Return ``{(fullname, rows): stats}`` for a pytest-benchmark JSON report.
+    """
+    with open(path) as fh:
+        report = json.load(fh)
+    rows = report.get('bench_rows')
+    return {(bench['fullname'], rows): bench['stats'] for bench in report['benchmarks']}
+
+
+def compare(baseline, current, stat='median', threshold=20.0):
+    """
+    Compare loaded reports. Returns ``(rows, regressed)`` where each row is
+    ``(name, table rows, baseline, current, change in percent)``; the
+    values are None for benchmarks missing from one side.
+    """
+    rows = []
+    regressed = False
+    for key in sorted(baseline.keys() | current.keys(), key=lambda key: (key[0], key[1] or 0)):
+        before = baseline.get(key, {}).get(stat)
+        after = current.get(key, {}).get(stat)
+        change = None
+        if before and after is not None:
+            change = (after - before) / before * 100
+            regressed |= change > threshold
+        rows.append((*key, before, after, change))
+    return rows, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline', help='pytest-benchmark JSON report to compare against.')
+    parser.add_argument('current', help='pytest-benchmark JSON report of the run being checked.')
+    parser.add_argument('--stat', choices=STATS, default='median', help='Statistic to compare (default: %(default)s).')
+    parser.add_argument(
+        '--threshold', type=float, default=20.0,
+        help='Largest allowed slowdown in percent (default: %(default)s).',
+    )
+    args = parser.parse_args(argv)
+
+    rows, regressed = compare(load(args.baseline), load(args.current), args.stat, args.threshold)
+
+    def ms(value):
+        return '-' if value is None else f'{value * 1000:.3f}'
+
+    print(f'{"benchmark":<70}{"rows":>10}{"base ms":>12}{"now ms":>12}{"change":>10}')
+    for name, table_rows, before, after, change in rows:
+        flag = ''
+        if change is None:
+            flag = '  (new)' if before is None else '  (missing)'
+        elif change > args.threshold:
+            flag = '  REGRESSED'
+        shown = '-' if change is None else f'{change:+.1f}%'
+        print(f'{name:<70}{table_rows or "-":>10}{ms(before):>12}{ms(after):>12}{shown:>10}{flag}')
+
+    if regressed:
+        print(f'{args.stat} regressed by more than {args.threshold:g}%.', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+
+from apps.telemetry.models import TelemetryEntry
+from apps.telemetry.synthetic import insert_rows
+
+
+# Number of rows seeded once per benchmark session. Override with e.g.
+# BENCH_ROWS=1000000 to reproduce production-sized tables; `make
+# benchmark-sizes` runs the suite at each of BENCH_SIZES.
+BENCH_ROWS = int(os.environ.get('BENCH_ROWS', 500_000))
+
+SEED_CHUNK_SIZE = 10_000
+SEED_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def seed_entries(count, satellites=10, seed=0):
+    """
+    Insert ``count`` deterministic telemetry rows, one second apart.
+
+    Goes through the generator's executemany insert rather than
+    bulk_create(), which matters when seeding tens of millions of rows.
+    """
+    rng = random.Random(seed)
+    statuses = TelemetryEntry.HealthStatus.values
+    adapt_datetime = connection.ops.adapt_datetimefield_value
+    for start in range(0, count, SEED_CHUNK_SIZE):
+        insert_rows([
+            (
+                f'SAT-{i % satellites + 1:03d}',
+                adapt_datetime(SEED_START + timedelta(seconds=i)),
+                rng.uniform(200, 36000),
+                rng.uniform(3, 11),
+                rng.choice(statuses),
+            )
+            for i in range(start, min(start + SEED_CHUNK_SIZE, count))
+        ])
+
+
+@pytest.fixture(scope='session')
+def seeded_db(django_db_setup, django_db_blocker):
+    """
+    Seed the test database once per session and return the row count.
+    """
+    with django_db_blocker.unblock():
+        seed_entries(BENCH_ROWS)
+    return BENCH_ROWS
+
+
+@pytest.fixture(autouse=True)
+def disable_response_cache(settings):
+    """
+    Measure the work behind each request rather than cache hits.
+    """
+    settings.TELEMETRY = {'CACHE_TTL': 0}
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    # Lets benchmarks/compare.py tell runs against different table sizes apart.
+    output_json['bench_rows'] = BENCH_ROWS
@@ -0,0 +1,170 @@
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import pytest
+from django.urls import reverse
+
+from apps.telemetry.ingest_queue import stop_queue
+from apps.telemetry.models import TelemetryEntry
+from .conftest import SEED_START
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_AGGREGATE_URL = reverse('telemetry_api:telemetry-aggregate')
+TELEMETRY_COMPARE_URL = reverse('telemetry_api:telemetry-compare')
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+ORDERINGS = ['timestamp', '-timestamp', 'satellite_id', '-altitude', 'velocity', 'status']
+FILTERS = {
+    'satellite': {'satellite_id': 'SAT-001'},
+    'status': {'status': 'critical'},
+    'time-range': {
+        'from': (SEED_START + timedelta(hours=1)).isoformat(),
+        'to': (SEED_START + timedelta(hours=2)).isoformat(),
+    },
+    'combined': {'satellite_id': 'SAT-001', 'status': 'critical'},
+    'several-satellites': {'satellite_id__in': 'SAT-001,SAT-002,SAT-003', 'status__in': 'warning,critical'},
+    'ranges': {'altitude__gte': 1000, 'altitude__lt': 2000, 'velocity__lte': 5},
+}
+
+# Every seeded satellite over six hours, starting off an hour boundary so the
+# raw entries are grouped rather than the rollups.
+COMPARED = [f'SAT-{i:03d}' for i in range(1, 11)]
+COMPARE_RANGE = {
+    'bucket': '1m',
+    'from': (SEED_START + timedelta(minutes=30)).isoformat(),
+    'to': (SEED_START + timedelta(hours=6, minutes=30)).isoformat(),
+}
+
+# One satellite over an hour: 360 of the seeded entries, re-labelled in the
+# bulk edit benchmarks.
+RELABELED = {
+    'satellite_id': 'SAT-001',
+    'from': (SEED_START + timedelta(hours=1)).isoformat(),
+    'to': (SEED_START + timedelta(hours=2)).isoformat(),
+}
+
+pytestmark = pytest.mark.django_db
+
+
+def test_compare(benchmark, api_client, seeded_db):
+    benchmark.group = 'api-compare'
+    response = benchmark(api_client.get, TELEMETRY_COMPARE_URL, {'satellite_id__in': ','.join(COMPARED), **COMPARE_RANGE})
+    assert response.status_code == 200
+
+
+def test_compare_request_per_satellite(benchmark, api_client, seeded_db):
+    # What the dashboard did before: one aggregate call per satellite.
+    benchmark.group = 'api-compare'
+
+    def aggregate_each():
+        for satellite_id in COMPARED:
+            response = api_client.get(TELEMETRY_AGGREGATE_URL, {'satellite_id': satellite_id, **COMPARE_RANGE})
+            assert response.status_code == 200
+
+    benchmark(aggregate_each)
+
+
+def detail_url(pk):
+    return reverse('telemetry_api:telemetry-detail', kwargs={'pk': pk})
+
+
+def new_entry():
+    return {
+        'satellite_id': 'SAT-001',
+        'timestamp': SEED_START.isoformat(),
+        'altitude': 500.0,
+        'velocity': 7.5,
+        'status': 'healthy',
+    }
+
+
+@pytest.fixture
+def entry_id(seeded_db):
+    # Halfway through the table, so no index is helped by picking an end.
+    return TelemetryEntry.objects.order_by('id').values_list('id', flat=True)[seeded_db // 2]
+
+
+def test_list(benchmark, api_client, seeded_db):
+    benchmark.group = 'api-read'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('params', FILTERS.values(), ids=FILTERS.keys())
+def test_filter(benchmark, api_client, seeded_db, params):
+    benchmark.group = 'api-filter'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, params)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('ordering', ORDERINGS)
+def test_ordering(benchmark, api_client, seeded_db, ordering):
+    benchmark.group = 'api-ordering'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, {'ordering': ordering})
+    assert response.status_code == 200
+
+
+def test_detail(benchmark, api_client, entry_id):
+    benchmark.group = 'api-read'
+    response = benchmark(api_client.get, detail_url(entry_id))
+    assert response.status_code == 200
+
+
+def test_create(benchmark, api_client, seeded_db):
+    benchmark.group = 'api-write'
+    response = benchmark(api_client.post, TELEMETRY_LIST_URL, new_entry(), format='json')
+    assert response.status_code == 201
+
+
+def test_create_queued(benchmark, api_client, seeded_db, settings, tmp_path):
+    """
+    A POST in queued ingest mode: validated, journaled and fsynced, then
+    written by the queue in batches.
+    """
+    benchmark.group = 'api-write'
+    settings.TELEMETRY = {'CACHE_TTL': 0, 'INGEST_MODE': 'queued', 'INGEST_JOURNAL_DIR': str(tmp_path)}
+    try:
+        response = benchmark(api_client.post, TELEMETRY_LIST_URL, new_entry(), format='json')
+    finally:
+        stop_queue()
+    assert response.status_code == 202
+
+
+def test_update(benchmark, api_client, entry_id):
+    benchmark.group = 'api-write'
+    response = benchmark(api_client.put, detail_url(entry_id), new_entry(), format='json')
+    assert response.status_code == 200
+
+
+def test_delete(benchmark, api_client, seeded_db):
+    benchmark.group = 'api-write'
+
+    def setup():
+        return (detail_url(TelemetryEntry.objects.create(**new_entry()).pk),), {}
+
+    response = benchmark.pedantic(api_client.delete, setup=setup, rounds=100)
+    assert response.status_code == 204
+
+
+def test_bulk_update(benchmark, api_client, seeded_db):
+    benchmark.group = 'api-bulk-edit'
+    url = f'{TELEMETRY_BULK_URL}?{urlencode(RELABELED)}'
+    response = benchmark.pedantic(api_client.patch, args=(url, {'status': 'warning'}), kwargs={'format': 'json'}, rounds=5)
+    assert response.status_code == 200
+    benchmark.extra_info['entries'] = response.data['updated']
+
+
+def test_update_request_per_entry(benchmark, api_client, seeded_db):
+    # What correcting a batch took before: a PATCH per entry.
+    benchmark.group = 'api-bulk-edit'
+    ids = list(TelemetryEntry.objects.filter(
+        satellite_id=RELABELED['satellite_id'], timestamp__gte=RELABELED['from'], timestamp__lt=RELABELED['to'],
+    ).values_list('id', flat=True))
+
+    def update_each():
+        for pk in ids:
+            response = api_client.patch(detail_url(pk), {'status': 'warning'}, format='json')
+            assert response.status_code == 200
+
+    benchmark.pedantic(update_each, rounds=1)
+    benchmark.extra_info['entries'] = len(ids)
@@ -0,0 +1,189 @@
+"""
+Readers against a writer, on a database file opened through the project's
+SQLite backend (the test database is in memory, where there is no WAL).
+
+A writer process inserts batches in transactions as bulk ingest does,
+while reader processes, standing in for server workers, run the list
+endpoint's page query. With Django's defaults (rollback journal,
+deferred transactions) readers wait while each commit is written and can
+fail with "database is locked"; with the project's options (WAL) they read
+the last committed snapshot without waiting.
+"""
+import multiprocessing
+import statistics
+import time
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+
+from .conftest import SEED_START
+
+
+ALIAS = 'concurrency'
+SEED_ROWS = 50_000
+# Rows per write transaction, the size of a large bulk ingest request.
+BATCH_SIZE = 50_000
+READERS = 4
+SECONDS = 3.0
+
+CREATE_TABLE = """
+    CREATE TABLE entry (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        satellite_id TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        altitude REAL NOT NULL,
+        velocity REAL NOT NULL,
+        status TEXT NOT NULL
+    )
+"""
+CREATE_INDEX = 'CREATE INDEX entry_ts_idx ON entry (timestamp DESC)'
+INSERT = 'INSERT INTO entry (satellite_id, timestamp, altitude, velocity, status) VALUES (%s, %s, %s, %s, %s)'
+PAGE_QUERY = 'SELECT * FROM entry ORDER BY timestamp DESC LIMIT 50'
+
+
+def rows(start, count):
+    return [
+        (f'SAT-{i % 10 + 1:03d}', (SEED_START + timedelta(seconds=i)).isoformat(), 500.0, 7.5, 'healthy')
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def configure(django_db_blocker):
+    """
+    Returns a function pointing the ALIAS database at a file with the
+    default database's options, overridden as given.
+    """
+    def configure(path, profile='tuned', pool=False):
+        if profile == 'tuned':
+            options = dict(settings.DATABASES['default']['OPTIONS'], pool=pool)
+        else:
+            # What the project used before: Django's defaults.
+            options = {}
+        databases = {
+            'default': settings.DATABASES['default'],
+            ALIAS: {'ENGINE': settings.DATABASES['default']['ENGINE'], 'NAME': str(path), 'OPTIONS': options},
+        }
+        if ALIAS in connections.settings:
+            reset()
+        connections.settings[ALIAS] = connections.configure_settings(databases)[ALIAS]
+
+    def reset():
+        # This thread's connection was made with the old settings.
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+
+    with django_db_blocker.unblock():
+        yield configure
+        reset()
+
+
+def _write(stop, written):
+    offset = SEED_ROWS
+    while not stop.is_set():
+        with transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+            cursor.executemany(INSERT, rows(offset, BATCH_SIZE))
+        offset += BATCH_SIZE
+    written.put(offset - SEED_ROWS)
+
+
+def _read(stop, results):
+    latencies = []
+    errors = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with connections[ALIAS].cursor() as cursor:
+                cursor.execute(PAGE_QUERY)
+                cursor.fetchall()
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    results.put((latencies, errors))
+
+
+def run_readers_during_ingest():
+    """
+    One writer and READERS reader processes, as separate server workers
+    would be, for SECONDS.
+    """
+    with transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+        cursor.execute(CREATE_TABLE)
+        cursor.execute(CREATE_INDEX)
+        cursor.executemany(INSERT, rows(0, SEED_ROWS))
+    # Children must open their own connections.
+    connections[ALIAS].close()
+
+    context = multiprocessing.get_context('fork')
+    stop = context.Event()
+    results = context.Queue()
+    written = context.Queue()
+    processes = [context.Process(target=_write, args=(stop, written))]
+    processes += [context.Process(target=_read, args=(stop, results)) for _ in range(READERS)]
+    for process in processes:
+        process.start()
+    time.sleep(SECONDS)
+    stop.set()
+
+    latencies = []
+    errors = 0
+    for _ in range(READERS):
+        reader_latencies, reader_errors = results.get()
+        latencies.extend(reader_latencies)
+        errors += reader_errors
+    rows_written = written.get()
+    for process in processes:
+        process.join()
+
+    latencies.sort()
+    return {
+        'reads_per_second': round(len(latencies) / SECONDS),
+        'read_p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'read_p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+        'read_max_ms': round(latencies[-1] * 1000, 3),
+        'read_errors': errors,
+        'rows_written_per_second': round(rows_written / SECONDS),
+    }
+
+
+@pytest.mark.parametrize('profile', ['django-default', 'tuned'])
+def test_readers_during_ingest(benchmark, configure, tmp_path, profile):
+    benchmark.group = 'readers-during-ingest'
+    configure(tmp_path / 'db.sqlite3', profile)
+    result = benchmark.pedantic(run_readers_during_ingest, rounds=1)
+    benchmark.extra_info.update(result)
+
+
+def test_wal_readers_do_not_wait_for_ingest(configure, tmp_path):
+    configure(tmp_path / 'default.sqlite3', 'django-default')
+    default = run_readers_during_ingest()
+    configure(tmp_path / 'tuned.sqlite3')
+    tuned = run_readers_during_ingest()
+    print(f'\nDjango defaults: {default}\ntuned: {tuned}')
+
+    assert tuned['read_errors'] == 0
+    # The rollback journal stalls readers for a whole commit of BATCH_SIZE
+    # rows; percentiles are dominated by scheduling when CPUs are few.
+    assert tuned['read_max_ms'] < default['read_max_ms']
+
+
+@pytest.mark.parametrize('pool', [False, True], ids=['unpooled', 'pooled'])
+def test_connection_per_request(benchmark, configure, tmp_path, pool):
+    """
+    Under ASGI every request opens (and closes) its own connection; with
+    the pool, that is a queue operation instead of a connect and pragmas.
+    """
+    benchmark.group = 'connection-per-request'
+    configure(tmp_path / 'db.sqlite3', pool=pool)
+
+    def request():
+        connection = connections[ALIAS]
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        connection.close()
+
+    benchmark(request)
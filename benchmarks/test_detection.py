@@ -0,0 +1,76 @@
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from apps.telemetry.detection import apply_changes, detect
+from apps.telemetry.models import SatelliteBaseline, TelemetryEntry, TelemetryEvent
+
+
+BATCH_SIZE = 50_000
+SATELLITES = 100
+
+# Most the detection stage may add to the write path, per entry.
+BUDGET_MICROSECONDS = 50
+
+OPTIONS = {'alpha': 0.1, 'threshold': 6.0, 'warmup': 10, 'rate_floor': {'altitude': 0.01, 'velocity': 0.00001}}
+
+
+def make_entries(size):
+    """
+    Orbit-like telemetry with occasional jumps and slowly changing status.
+    """
+    rng = random.Random(0)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    statuses = TelemetryEntry.HealthStatus.values
+    entries = []
+    for i in range(size):
+        step = i // SATELLITES
+        phase = step / 50 + i % SATELLITES
+        entries.append(TelemetryEntry(
+            i + 1,
+            f'SAT-{i % SATELLITES + 1:03d}',
+            start + timedelta(seconds=10 * step),
+            500.0 + 20 * math.sin(phase) + (5.0 if rng.random() < 0.001 else 0.0),
+            7.6 - 0.02 * math.sin(phase),
+            statuses[step // 200 % 3],
+        ))
+    return entries
+
+
+def report_cost(benchmark):
+    per_entry = benchmark.stats.stats.mean / BATCH_SIZE * 1e6
+    benchmark.extra_info['microseconds_per_entry'] = round(per_entry, 2)
+    benchmark.extra_info['budget_microseconds'] = BUDGET_MICROSECONDS
+    assert per_entry < BUDGET_MICROSECONDS
+
+
+def test_detect(benchmark):
+    """
+    The detector alone, on baselines held in memory.
+    """
+    benchmark.group = 'detection'
+    entries = make_entries(BATCH_SIZE)
+    events = benchmark.pedantic(
+        lambda baselines: detect(baselines, entries, **OPTIONS), setup=lambda: (({},), {}), rounds=5,
+    )
+    benchmark.extra_info['events'] = len(events)
+    report_cost(benchmark)
+
+
+@pytest.mark.django_db
+def test_detection_stage(benchmark):
+    """
+    The whole receiver: locking and saving baselines and storing events.
+    """
+    benchmark.group = 'detection'
+    entries = make_entries(BATCH_SIZE)
+
+    def reset():
+        SatelliteBaseline.objects.all().delete()
+        TelemetryEvent.objects.all().delete()
+
+    events = benchmark.pedantic(apply_changes, args=(entries,), setup=reset, rounds=5)
+    benchmark.extra_info['events'] = len(events)
+    report_cost(benchmark)
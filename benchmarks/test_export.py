@@ -0,0 +1,51 @@
+import tracemalloc
+
+import pytest
+from django.urls import reverse
+
+from apps.telemetry.conf import telemetry_setting
+
+
+TELEMETRY_EXPORT_URL = reverse('telemetry_api:telemetry-export')
+
+pytestmark = pytest.mark.django_db
+
+
+def consume(response):
+    size = 0
+    for chunk in response.streaming_content:
+        size += len(chunk)
+    return size
+
+
+@pytest.mark.parametrize('export_format', ['csv', 'ndjson'])
+def test_export_all_rows(benchmark, api_client, seeded_db, export_format):
+    benchmark.group = 'export'
+
+    def run():
+        return consume(api_client.get(TELEMETRY_EXPORT_URL, {'format': export_format}))
+
+    size = benchmark.pedantic(run, rounds=3)
+    benchmark.extra_info['rows'] = seeded_db
+    benchmark.extra_info['bytes'] = size
+
+
+def test_export_memory_is_constant(api_client, seeded_db):
+    """
+    Peak allocation while streaming a tenth of the table and the whole of it
+    should be about the same: one chunk of rows, not the result set.
+    """
+    if seeded_db // 10 < 2 * telemetry_setting('EXPORT_CHUNK_SIZE'):
+        pytest.skip(f'BENCH_ROWS={seeded_db} is too small for a tenth of it to span several chunks')
+
+    def peak(params):
+        tracemalloc.start()
+        try:
+            consume(api_client.get(TELEMETRY_EXPORT_URL, {'format': 'csv', **params}))
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    tenth = peak({'satellite_id': 'SAT-001'})
+    whole = peak({})
+    assert whole < tenth * 2
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from apps.telemetry.frames import decode_frames, encode_frames
+
+from .test_ingest import BATCH_SIZE, make_batch
+
+
+@pytest.fixture(scope='module')
+def batch():
+    return make_batch(BATCH_SIZE)
+
+
+def report_size(benchmark, body):
+    benchmark.extra_info['bytes'] = len(body)
+    benchmark.extra_info['bytes_per_entry'] = round(len(body) / BATCH_SIZE, 1)
+
+
+def test_parse_json(benchmark, batch):
+    benchmark.group = 'ingest-parse'
+    body = json.dumps(batch).encode()
+    report_size(benchmark, body)
+    assert len(benchmark(json.loads, body)) == BATCH_SIZE
+
+
+def test_parse_frame(benchmark, batch):
+    benchmark.group = 'ingest-parse'
+    body = encode_frames(batch)
+    report_size(benchmark, body)
+    assert len(benchmark(decode_frames, body)) == BATCH_SIZE
+
+
+def test_encode_json(benchmark, batch):
+    benchmark.group = 'ingest-encode'
+    benchmark(json.dumps, batch)
+
+
+def test_encode_frame(benchmark, batch):
+    benchmark.group = 'ingest-encode'
+    benchmark(encode_frames, batch)
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.telemetry import hotstore
+from apps.telemetry.hotstore import HotWindow
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+TELEMETRY_AGGREGATE_URL = reverse('telemetry_api:telemetry-aggregate')
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def last_day(seeded_db):
+    """
+    The start of the seeded table's last 24 hours.
+    """
+    return TelemetryEntry.objects.aggregate(latest=Max('timestamp'))['latest'] - timedelta(hours=24)
+
+
+def window_for(last_day):
+    # An hour longer, so the window still reaches last_day once loaded.
+    return HotWindow((timezone.now() - last_day) / timedelta(hours=1) + 1, 2_000_000)
+
+
+@pytest.fixture(params=['database', 'window'])
+def source(request, last_day, monkeypatch):
+    """
+    Answers queries from the database, or from a hot window holding the
+    seeded table's last 24 hours.
+    """
+    if request.param == 'window':
+        window = window_for(last_day)
+        window.load()
+        monkeypatch.setattr(hotstore, '_window', window)
+    return request.param
+
+
+def test_load(benchmark, last_day):
+    benchmark.group = 'hot-window-load'
+    window = window_for(last_day)
+    benchmark.pedantic(window.load, rounds=3)
+    status = window.status()
+    benchmark.extra_info['entries'] = status['entries']
+    benchmark.extra_info['bytes'] = status['bytes']
+
+
+@pytest.mark.parametrize('bucket', ['1m', '1h'])
+def test_aggregate_last_day(benchmark, api_client, last_day, source, bucket):
+    benchmark.group = f'hot-window-aggregate-{bucket}'
+    params = {'bucket': bucket, 'from': last_day.isoformat()}
+    response = benchmark(api_client.get, TELEMETRY_AGGREGATE_URL, params)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('params', [{}, {'satellite_id': 'SAT-003', 'status': 'critical'}], ids=['all', 'filtered'])
+def test_list_last_day(benchmark, api_client, last_day, source, params):
+    benchmark.group = f'hot-window-list-{"filtered" if params else "all"}'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, {'from': last_day.isoformat(), **params})
+    assert response.status_code == 200
+
+
+def test_cursor_first_page(benchmark, api_client, source):
+    benchmark.group = 'hot-window-cursor'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, {'pagination': 'cursor'})
+    assert response.status_code == 200
+
+
+def test_satellites(benchmark, api_client, source):
+    benchmark.group = 'hot-window-satellites'
+    response = benchmark(api_client.get, reverse('telemetry_api:satellite-list'))
+    assert response.status_code == 200
@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.urls import reverse
+
+from apps.telemetry.frames import MEDIA_TYPE, encode_frames
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_BULK_URL = reverse('telemetry_api:telemetry-bulk')
+BATCH_SIZE = 50_000
+
+# Target sustained ingest rate on SQLite, in rows per second.
+TARGET_ROWS_PER_SECOND = 50_000
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def make_batch(size):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            'satellite_id': f'SAT-{i % 10 + 1:03d}',
+            'timestamp': (start + timedelta(milliseconds=i * 100)).isoformat(),
+            'altitude': 400.0 + i % 100,
+            'velocity': 7.6,
+            'status': 'healthy',
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.fixture
+def ndjson_batch():
+    return '\n'.join(json.dumps(row) for row in make_batch(BATCH_SIZE)).encode()
+
+
+@pytest.fixture
+def json_batch():
+    return json.dumps(make_batch(BATCH_SIZE)).encode()
+
+
+def clear_table():
+    TelemetryEntry.objects.all().delete()
+
+
+def post_batch(api_client, body, content_type):
+    response = api_client.post(TELEMETRY_BULK_URL, body, content_type=content_type)
+    assert response.status_code == 201, response.data
+    return response
+
+
+def report_rate(benchmark):
+    rate = BATCH_SIZE / benchmark.stats.stats.mean
+    benchmark.extra_info['rows_per_second'] = round(rate)
+    benchmark.extra_info['target_rows_per_second'] = TARGET_ROWS_PER_SECOND
+
+
+def test_bulk_ingest_json(benchmark, api_client, json_batch):
+    benchmark.group = 'bulk-ingest'
+    benchmark.pedantic(
+        post_batch, args=(api_client, json_batch, 'application/json'), setup=clear_table, rounds=5,
+    )
+    report_rate(benchmark)
+
+
+def test_bulk_ingest_ndjson(benchmark, api_client, ndjson_batch):
+    benchmark.group = 'bulk-ingest'
+    benchmark.pedantic(
+        post_batch, args=(api_client, ndjson_batch, 'application/x-ndjson'), setup=clear_table, rounds=5,
+    )
+    report_rate(benchmark)
+
+
+def test_bulk_ingest_frame(benchmark, api_client):
+    benchmark.group = 'bulk-ingest'
+    body = encode_frames(make_batch(BATCH_SIZE))
+    benchmark.pedantic(
+        post_batch, args=(api_client, body, MEDIA_TYPE), setup=clear_table, rounds=5,
+    )
+    report_rate(benchmark)
@@ -0,0 +1,71 @@
+import timeit
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.telemetry.metrics import RequestProfile, current_profile, record_query
+from apps.telemetry.middleware import RequestMetricsMiddleware
+from apps.telemetry.models import TelemetryEntry
+
+
+# Most time profiling may add to a request, and to each of its queries,
+# in microseconds.
+MAX_REQUEST_OVERHEAD_US = 20
+MAX_QUERY_OVERHEAD_US = 5
+
+pytestmark = pytest.mark.django_db
+
+
+def empty_view(request):
+    return HttpResponse(b'{}')
+
+
+def query_view(request):
+    TelemetryEntry.objects.filter(pk=1).exists()
+    return HttpResponse(b'{}')
+
+
+VIEWS = {'no-query': empty_view, 'one-query': query_view}
+
+
+@pytest.fixture
+def get_request():
+    return RequestFactory().get('/api/telemetry/')
+
+
+@pytest.mark.parametrize('view', VIEWS.values(), ids=VIEWS.keys())
+def test_unprofiled_view(benchmark, get_request, view):
+    benchmark.group = 'metrics-overhead'
+    benchmark(view, get_request)
+
+
+@pytest.mark.parametrize('view', VIEWS.values(), ids=VIEWS.keys())
+def test_profiled_view(benchmark, get_request, view):
+    benchmark.group = 'metrics-overhead'
+    benchmark(RequestMetricsMiddleware(view), get_request)
+
+
+def best_time(func, runs=5_000):
+    return min(timeit.repeat(func, number=runs, repeat=5)) / runs
+
+
+def test_request_overhead_is_a_few_microseconds(get_request):
+    # The cost of a real query varies by more than the overhead being
+    # measured, so requests and queries are checked separately.
+    profiled = RequestMetricsMiddleware(empty_view)
+    overhead_us = (best_time(lambda: profiled(get_request)) - best_time(lambda: empty_view(get_request))) * 1e6
+    assert overhead_us < MAX_REQUEST_OVERHEAD_US
+
+
+def test_query_overhead_is_a_few_microseconds():
+    def execute(sql, params, many, context):
+        return None
+
+    args = ('SELECT 1', (), False, {})
+    token = current_profile.set(RequestProfile())
+    try:
+        overhead_us = (best_time(lambda: record_query(execute, *args)) - best_time(lambda: execute(*args))) * 1e6
+    finally:
+        current_profile.reset(token)
+    assert overhead_us < MAX_QUERY_OVERHEAD_US
@@ -0,0 +1,53 @@
+from base64 import b64encode
+from urllib.parse import urlencode
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+PAGE_SIZE = settings.REST_FRAMEWORK['PAGE_SIZE']
+DEPTHS = [1, 10, 100, 1_000, 10_000]
+
+pytestmark = pytest.mark.django_db
+
+
+def cursor_for_page(page):
+    """
+    Build the cursor a client would hold after walking to ``page``.
+
+    Equivalent to following ``next`` links ``page - 1`` times from the first
+    page under the default ``-timestamp`` ordering.
+    """
+    if page == 1:
+        return None
+    boundary = TelemetryEntry.objects.order_by('-timestamp', 'id')[(page - 1) * PAGE_SIZE - 1]
+    position = f'{boundary.timestamp}|{boundary.pk}'
+    return b64encode(urlencode({'p': position}).encode('ascii')).decode('ascii')
+
+
+@pytest.fixture(params=DEPTHS, ids=lambda depth: f'page-{depth}')
+def page(request, seeded_db):
+    if (request.param - 1) * PAGE_SIZE >= seeded_db:
+        pytest.skip(f'BENCH_ROWS={seeded_db} is too small to reach page {request.param}')
+    return request.param
+
+
+def test_page_number_pagination(benchmark, api_client, page):
+    benchmark.group = 'pagination-depth'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, {'page': page})
+    assert response.status_code == 200
+
+
+def test_cursor_pagination(benchmark, api_client, page):
+    benchmark.group = 'pagination-depth'
+    params = {'pagination': 'cursor'}
+    cursor = cursor_for_page(page)
+    if cursor:
+        params['cursor'] = cursor
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, params)
+    assert response.status_code == 200
+    assert len(response.data['results']) == PAGE_SIZE
@@ -0,0 +1,42 @@
+import pytest
+from django.urls import reverse
+
+from apps.telemetry.api.pagination import TelemetryCursorPagination
+from apps.telemetry.api.serializers import TelemetryEntrySerializer, represent_entry_rows
+from apps.telemetry.models import TelemetryEntry
+
+
+TELEMETRY_LIST_URL = reverse('telemetry_api:telemetry-list')
+PAGE_SIZES = [50, 1_000, 10_000]
+FIELDS = TelemetryEntrySerializer.Meta.fields
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=PAGE_SIZES, ids=lambda size: f'size-{size}')
+def page_size(request, seeded_db):
+    if request.param > seeded_db:
+        pytest.skip(f'BENCH_ROWS={seeded_db} is too small for a page of {request.param}')
+    return request.param
+
+
+def test_model_serializer(benchmark, page_size):
+    benchmark.group = f'list-representation-{page_size}'
+    queryset = TelemetryEntry.objects.order_by('-timestamp')[:page_size]
+    data = benchmark(lambda: TelemetryEntrySerializer(queryset.all(), many=True).data)
+    assert len(data) == page_size
+
+
+def test_values_list_rows(benchmark, page_size):
+    benchmark.group = f'list-representation-{page_size}'
+    queryset = TelemetryEntry.objects.order_by('-timestamp').values_list(*FIELDS)[:page_size]
+    data = benchmark(lambda: represent_entry_rows(queryset.all()))
+    assert len(data) == page_size
+
+
+def test_list_endpoint(benchmark, api_client, page_size, monkeypatch):
+    # Cursor pages skip the COUNT(*), leaving the fetch and encoding to measure.
+    monkeypatch.setattr(TelemetryCursorPagination, 'page_size', page_size)
+    benchmark.group = 'list-endpoint'
+    response = benchmark(api_client.get, TELEMETRY_LIST_URL, {'pagination': 'cursor'})
+    assert len(response.json()['results']) == page_size
@@ -0,0 +1,145 @@
+import asyncio
+import itertools
+from datetime import datetime, timezone
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+
+from apps.telemetry import streaming
+from apps.telemetry.ingest import validate_rows, write_entries
+from RocketDashboard.asgi import application
+
+
+TELEMETRY_STREAM_URL = reverse('telemetry_api:telemetry-stream')
+SUBSCRIBERS = 1_000
+BATCH_SIZE = 100
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class StreamClient:
+    """
+    A minimal in-process HTTP client holding one SSE connection to the ASGI app.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.disconnected = asyncio.Event()
+        self.waiting_for = None
+        self.received = None
+
+    def scope(self):
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': TELEMETRY_STREAM_URL,
+            'raw_path': TELEMETRY_STREAM_URL.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', self.port),
+            'server': ('localhost', 8000),
+        }
+
+    async def receive(self):
+        if not hasattr(self, '_sent_request'):
+            self._sent_request = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            assert message['status'] == 200
+        elif self.waiting_for and self.waiting_for in message.get('body', b''):
+            self.received.set_result(None)
+            self.waiting_for = None
+
+    def expect(self, event_id):
+        self.waiting_for = f'id: {event_id}\n'.encode()
+        self.received = asyncio.get_running_loop().create_future()
+        return self.received
+
+
+def make_batch(size, offset):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+    rows = [
+        {
+            'satellite_id': f'SAT-{i % 10 + 1:03d}',
+            'timestamp': datetime.fromtimestamp(start + offset + i, timezone.utc).isoformat(),
+            'altitude': 400.0,
+            'velocity': 7.6,
+        }
+        for i in range(size)
+    ]
+    return validate_rows(rows)[0]
+
+
+@pytest.fixture
+def subscribers(settings, monkeypatch):
+    """
+    Open SUBSCRIBERS concurrent streams on a dedicated event loop.
+
+    The poll interval is shortened so that each round measures the broker's
+    read and fan-out rather than time spent waiting for the next tick.
+    """
+    settings.TELEMETRY = {'STREAM_POLL_INTERVAL': 0.01}
+    # Earlier transactional benchmarks leave the table empty but the id
+    # sequence advanced; one row brings the latest id level with it again.
+    write_entries(make_batch(1, -1))
+
+    polls = []
+    fetch_events = streaming.fetch_events
+    monkeypatch.setattr(streaming, 'fetch_events', lambda *args, **kwargs: (
+        polls.append(args) or fetch_events(*args, **kwargs)
+    ))
+
+    loop = asyncio.new_event_loop()
+    clients = [StreamClient(port) for port in range(10_000, 10_000 + SUBSCRIBERS)]
+    tasks = [loop.create_task(application(c.scope(), c.receive, c.send)) for c in clients]
+
+    async def wait_for_subscriptions():
+        while len(streaming.broker) < SUBSCRIBERS:
+            await asyncio.sleep(0.01)
+
+    loop.run_until_complete(asyncio.wait_for(wait_for_subscriptions(), 60))
+    yield loop, clients, polls
+
+    for client in clients:
+        client.disconnected.set()
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+
+def test_fan_out_to_1000_subscribers(benchmark, subscribers):
+    loop, clients, polls = subscribers
+    offsets = itertools.count(step=BATCH_SIZE)
+
+    async def deliver_batch():
+        entries = make_batch(BATCH_SIZE, next(offsets))
+        # Ids are assigned sequentially, so the last one is known up front and
+        # every client is listening for it before the write happens.
+        last_id = await sync_to_async(streaming.latest_id)() + BATCH_SIZE
+        delivered = asyncio.gather(*(client.expect(last_id) for client in clients))
+        await sync_to_async(write_entries)(entries)
+        assert entries[-1].pk == last_id
+        await delivered
+
+    def run():
+        loop.run_until_complete(deliver_batch())
+
+    benchmark.group = 'stream-fan-out'
+    polls.clear()
+    benchmark.pedantic(run, rounds=10, warmup_rounds=1)
+
+    benchmark.extra_info['subscribers'] = SUBSCRIBERS
+    benchmark.extra_info['entries_per_round'] = BATCH_SIZE
+    # Polls that returned nothing are included: the broker keeps polling
+    # between rounds. What matters is that this does not scale with subscribers.
+    benchmark.extra_info['polls_per_round'] = round(len(polls) / 11, 1)
@@ -1,9 +1,42 @@
+import asyncio
+
 import pytest
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connections
 from django.utils import timezone
+from rest_framework.test import APIClient
 
+from apps.telemetry.api.caching import response_cache
 from apps.telemetry.models import TelemetryEntry
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Keep cached API responses from leaking between tests."""
+    response_cache.clear()
+    cache.clear()
+
+
+@pytest.fixture
+def async_connections():
+    """
+    Close the connections opened by sync_to_async() code after the test.
+
+    Outside a server, that code runs in asgiref's shared thread, whose
+    connections no request_finished signal closes; PostgreSQL would refuse
+    to drop the test database while they are open.
+    """
+    yield
+    asyncio.run(sync_to_async(connections.close_all)())
+
+
+@pytest.fixture
+def api_client():
+    """A DRF test client for requests against the API."""
+    return APIClient()
+
+
 @pytest.fixture
 def make_entry(db):
     """Factory fixture to create TelemetryEntry instances with sensible defaults."""
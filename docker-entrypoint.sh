@@ -8,7 +8,7 @@ echo "Seeding database..."
 python manage.py setup_db
 
 echo "Starting Django on :8000..."
-python manage.py runserver 0.0.0.0:8000 --insecure &
+python -m uvicorn RocketDashboard.asgi:application --host 0.0.0.0 --port 8000 &
 
 echo "Starting Vite on :5173..."
 npx vite --host 0.0.0.0
@@ -0,0 +1,28 @@
+"""
+gunicorn settings for serving the ASGI application in production:
+
+    gunicorn            (or `make serve`)
+
+gunicorn supervises WEB_CONCURRENCY uvicorn worker processes; each serves
+the API and the telemetry stream. Every worker runs its own stream broker,
+and its own retention thread if TELEMETRY['RETENTION_INTERVAL'] is set.
+"""
+import multiprocessing
+import os
+
+
+wsgi_app = 'RocketDashboard.asgi:application'
+worker_class = 'uvicorn.workers.UvicornWorker'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+raw_env = ['DJANGO_SETTINGS_MODULE=RocketDashboard.settings_production']
+
+# Workers that stop answering gunicorn's heartbeat for this long are
+# restarted. Open event streams do not count: the worker's event loop keeps
+# answering while they wait.
+timeout = 30
+# Streams close after TELEMETRY['STREAM_MAX_SECONDS'], so a restart waits
+# this long for them before cutting them off; the browsers reconnect.
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
@@ -1,13 +1,33 @@
-import { describe, it, expect, vi, beforeEach } from 'vitest'
-import { formatErrors, fetchTelemetry, createEntry, getEntry, updateEntry, deleteEntry } from './api'
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest'
+import {
+  formatErrors,
+  cursorFromLink,
+  fetchTelemetry,
+  peekTelemetry,
+  prefetchTelemetry,
+  clearTelemetryCache,
+  fetchSatellites,
+  subscribeTelemetry,
+  createEntry,
+  getEntry,
+  updateEntry,
+  deleteEntry,
+} from './api'
 
 const mockFetch = vi.fn()
 global.fetch = mockFetch
 
 beforeEach(() => {
   mockFetch.mockReset()
+  clearTelemetryCache()
 })
 
+function jsonResponse(data: unknown) {
+  return { ok: true, status: 200, json: () => Promise.resolve(data) }
+}
+
+const NO_FILTERS = { satellite_id: '', status: '' }
+
 describe('formatErrors', () => {
   it('returns string data directly', () => {
     expect(formatErrors('error' as unknown as Record<string, unknown>)).toBe('error')
@@ -26,31 +46,59 @@ describe('formatErrors', () => {
   })
 })
 
+describe('cursorFromLink', () => {
+  it('extracts the cursor token from an absolute link', () => {
+    expect(
+      cursorFromLink('http://localhost:8000/api/telemetry/?pagination=cursor&cursor=cD0x')
+    ).toBe('cD0x')
+  })
+
+  it('returns null when there is no link', () => {
+    expect(cursorFromLink(null)).toBeNull()
+  })
+})
+
 describe('fetchTelemetry', () => {
-  it('fetches with filters and page', async () => {
-    const mockData = { count: 1, next: null, previous: null, results: [] }
+  it('fetches with filters and cursor', async () => {
+    const mockData = { next: null, previous: null, results: [] }
     mockFetch.mockResolvedValueOnce({
       ok: true,
       json: () => Promise.resolve(mockData),
     })
 
-    const result = await fetchTelemetry(2, { satellite_id: 'SAT-001', status: 'healthy' })
+    const result = await fetchTelemetry(
+      { satellite_id: 'SAT-001', status: 'healthy' },
+      '-timestamp',
+      'cD0x'
+    )
 
     expect(mockFetch).toHaveBeenCalledWith(
-      '/api/telemetry/?satellite_id=SAT-001&status=healthy&page=2'
+      '/api/telemetry/?satellite_id=SAT-001&status=healthy&ordering=-timestamp&pagination=cursor&cursor=cD0x',
+      { signal: expect.any(AbortSignal) }
     )
     expect(result).toEqual(mockData)
   })
 
-  it('fetches without empty filters', async () => {
-    const mockData = { count: 0, next: null, previous: null, results: [] }
+  it('fetches the first page without empty filters', async () => {
+    const mockData = { next: null, previous: null, results: [] }
     mockFetch.mockResolvedValueOnce({
       ok: true,
       json: () => Promise.resolve(mockData),
     })
 
-    await fetchTelemetry(1, { satellite_id: '', status: '' })
-    expect(mockFetch).toHaveBeenCalledWith('/api/telemetry/?page=1')
+    await fetchTelemetry({ satellite_id: '', status: '' })
+    expect(mockFetch).toHaveBeenCalledWith('/api/telemetry/?pagination=cursor', {
+      signal: expect.any(AbortSignal),
+    })
+  })
+
+  it('asks for a page size when given one', async () => {
+    mockFetch.mockResolvedValueOnce(jsonResponse({ next: null, previous: null, results: [] }))
+    await fetchTelemetry(NO_FILTERS, '-timestamp', 'cD0x', { pageSize: 1000 })
+    expect(mockFetch).toHaveBeenCalledWith(
+      '/api/telemetry/?ordering=-timestamp&pagination=cursor&page_size=1000&cursor=cD0x',
+      { signal: expect.any(AbortSignal) }
+    )
   })
 
   it('throws on error response', async () => {
@@ -60,7 +108,7 @@ describe('fetchTelemetry', () => {
       json: () => Promise.resolve({ detail: 'Server error' }),
     })
 
-    await expect(fetchTelemetry(1, { satellite_id: '', status: '' }))
+    await expect(fetchTelemetry({ satellite_id: '', status: '' }))
       .rejects.toThrow('Server error')
   })
 
@@ -71,11 +119,127 @@ describe('fetchTelemetry', () => {
       json: () => Promise.reject(new Error('not json')),
     })
 
-    await expect(fetchTelemetry(1, { satellite_id: '', status: '' }))
+    await expect(fetchTelemetry({ satellite_id: '', status: '' }))
       .rejects.toThrow('Server error: 500')
   })
 })
 
+describe('telemetry cache', () => {
+  const entry = (id: number, timestamp: string, overrides = {}) => ({
+    id,
+    satellite_id: 'SAT-001',
+    timestamp,
+    altitude: 500,
+    velocity: 7.5,
+    status: 'healthy' as const,
+    ...overrides,
+  })
+  const page = {
+    next: null,
+    previous: null,
+    results: [entry(2, '2025-01-15T13:00:00Z'), entry(1, '2025-01-15T12:00:00Z')],
+  }
+
+  afterEach(() => {
+    vi.useRealTimers()
+  })
+
+  it('serves a fresh page from the cache', async () => {
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    await fetchTelemetry(NO_FILTERS, '-timestamp')
+    expect(await fetchTelemetry(NO_FILTERS, '-timestamp')).toEqual(page)
+    expect(mockFetch).toHaveBeenCalledTimes(1)
+  })
+
+  it('keeps a stale page to show while revalidating', async () => {
+    vi.useFakeTimers()
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    await fetchTelemetry(NO_FILTERS, '-timestamp')
+    vi.advanceTimersByTime(60_000)
+
+    const fresh = { ...page, results: [] }
+    mockFetch.mockResolvedValueOnce(jsonResponse(fresh))
+    expect(peekTelemetry(NO_FILTERS, '-timestamp')).toEqual(page)
+    expect(await fetchTelemetry(NO_FILTERS, '-timestamp')).toEqual(fresh)
+    expect(peekTelemetry(NO_FILTERS, '-timestamp')).toEqual(fresh)
+  })
+
+  it('coalesces identical requests in flight', async () => {
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    const [first, second] = await Promise.all([
+      fetchTelemetry(NO_FILTERS, '-timestamp'),
+      fetchTelemetry(NO_FILTERS, '-timestamp'),
+    ])
+    expect(first).toBe(second)
+    expect(mockFetch).toHaveBeenCalledTimes(1)
+  })
+
+  it('cancels a request once every caller has given up', async () => {
+    mockFetch.mockImplementation(
+      (_url: string, { signal }: { signal: AbortSignal }) =>
+        new Promise((_resolve, reject) => {
+          signal.addEventListener('abort', () => reject(new DOMException('Aborted', 'AbortError')))
+        })
+    )
+    const first = new AbortController()
+    const second = new AbortController()
+    const requests = [
+      fetchTelemetry(NO_FILTERS, '-timestamp', null, { signal: first.signal }),
+      fetchTelemetry(NO_FILTERS, '-timestamp', null, { signal: second.signal }),
+    ]
+    const fetchSignal: AbortSignal = mockFetch.mock.calls[0][1].signal
+
+    first.abort()
+    await expect(requests[0]).rejects.toThrow('superseded')
+    expect(fetchSignal.aborted).toBe(false)
+    second.abort()
+    await expect(requests[1]).rejects.toThrow('superseded')
+    expect(fetchSignal.aborted).toBe(true)
+  })
+
+  it('prefetches into the cache', async () => {
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    prefetchTelemetry(NO_FILTERS, '-timestamp', 'abc')
+    expect(await fetchTelemetry(NO_FILTERS, '-timestamp', 'abc')).toEqual(page)
+    expect(mockFetch).toHaveBeenCalledTimes(1)
+  })
+
+  it('patches cached pages on writes without refetching', async () => {
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    await fetchTelemetry(NO_FILTERS, '-timestamp')
+
+    mockFetch.mockResolvedValueOnce(jsonResponse(entry(3, '2025-01-15T14:00:00Z')))
+    await createEntry(entry(3, '2025-01-15T14:00:00Z'))
+    mockFetch.mockResolvedValueOnce(jsonResponse(entry(2, '2025-01-15T13:00:00Z', { altitude: 900 })))
+    await updateEntry(2, entry(2, '2025-01-15T13:00:00Z', { altitude: 900 }))
+    mockFetch.mockResolvedValueOnce({ ok: true })
+    await deleteEntry(1)
+
+    const patched = await fetchTelemetry(NO_FILTERS, '-timestamp')
+    expect(patched.results.map((e) => [e.id, e.altitude])).toEqual([[3, 500], [2, 900]])
+    expect(mockFetch).toHaveBeenCalledTimes(4)
+  })
+
+  it('refetches pages a write could not be placed on', async () => {
+    const filters = { satellite_id: '', status: 'healthy' }
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    await fetchTelemetry(filters, 'altitude')
+
+    mockFetch.mockResolvedValueOnce(jsonResponse(entry(2, '2025-01-15T13:00:00Z', { status: 'critical' })))
+    await updateEntry(2, entry(2, '2025-01-15T13:00:00Z', { status: 'critical' }))
+    // The entry no longer matches, so it simply leaves the page.
+    expect(peekTelemetry(filters, 'altitude')?.results.map((e) => e.id)).toEqual([1])
+    await fetchTelemetry(filters, 'altitude')
+    expect(mockFetch).toHaveBeenCalledTimes(2)
+
+    mockFetch.mockResolvedValueOnce(jsonResponse(entry(4, '2025-01-15T11:00:00Z')))
+    await createEntry(entry(4, '2025-01-15T11:00:00Z'))
+    mockFetch.mockResolvedValueOnce(jsonResponse(page))
+    await fetchTelemetry(filters, 'altitude')
+    expect(mockFetch).toHaveBeenCalledTimes(4)
+  })
+})
+
 describe('createEntry', () => {
   it('sends POST with JSON body', async () => {
     const entry = {
@@ -137,6 +301,60 @@ describe('updateEntry', () => {
   })
 })
 
+describe('fetchSatellites', () => {
+  it('fetches the satellite snapshot list', async () => {
+    const mockData = [{ satellite_id: 'SAT-001', last_seen: '2025-01-15T12:00:00Z', latest: {} }]
+    mockFetch.mockResolvedValueOnce({
+      ok: true,
+      json: () => Promise.resolve(mockData),
+    })
+
+    expect(await fetchSatellites()).toEqual(mockData)
+    expect(mockFetch).toHaveBeenCalledWith('/api/satellites/')
+  })
+})
+
+describe('subscribeTelemetry', () => {
+  class FakeEventSource {
+    static instances: FakeEventSource[] = []
+    listeners: Record<string, (event: MessageEvent) => void> = {}
+    close = vi.fn()
+    constructor(public url: string) {
+      FakeEventSource.instances.push(this)
+    }
+    addEventListener(type: string, listener: (event: MessageEvent) => void) {
+      this.listeners[type] = listener
+    }
+  }
+
+  beforeEach(() => {
+    FakeEventSource.instances = []
+    vi.stubGlobal('EventSource', FakeEventSource)
+  })
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('opens the stream for a satellite and parses entries', () => {
+    const onEntry = vi.fn()
+    const close = subscribeTelemetry('SAT-001', onEntry)
+    const source = FakeEventSource.instances[0]
+    expect(source.url).toBe('/api/telemetry/stream/?satellite_id=SAT-001')
+
+    source.listeners.telemetry({ data: '{"id": 7}' } as MessageEvent)
+    expect(onEntry).toHaveBeenCalledWith({ id: 7 })
+
+    close()
+    expect(source.close).toHaveBeenCalled()
+  })
+
+  it('streams every satellite when none is selected', () => {
+    subscribeTelemetry('', vi.fn())
+    expect(FakeEventSource.instances[0].url).toBe('/api/telemetry/stream/')
+  })
+})
+
 describe('deleteEntry', () => {
   it('sends DELETE request', async () => {
     mockFetch.mockResolvedValueOnce({ ok: true })
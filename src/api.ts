@@ -1,6 +1,8 @@
-import { TelemetryEntry, PaginatedResponse, TelemetryFilters } from './types'
+import { TelemetryEntry, CursorPaginatedResponse, SatelliteState, TelemetryFilters } from './types'
 
 const API_BASE = '/api/telemetry/'
+const STREAM_URL = `${API_BASE}stream/`
+const SATELLITES_URL = '/api/satellites/'
 
 export function formatErrors(data: Record<string, unknown>): string {
   if (typeof data === 'string') return data
@@ -20,22 +22,270 @@ async function handleResponse<T>(resp: Response): Promise<T> {
   return resp.json()
 }
 
-export async function fetchTelemetry(
-  page: number,
+// Pull the opaque cursor token out of a `next`/`previous` link. The links are
+// absolute URLs pointing at Django rather than the Vite dev server, so only the
+// token is kept and the request is rebuilt against API_BASE.
+export function cursorFromLink(link: string | null): string | null {
+  if (!link) return null
+  return new URL(link, window.location.origin).searchParams.get('cursor')
+}
+
+type EntryPage = CursorPaginatedResponse<TelemetryEntry>
+
+// Pages are served from the cache without a request for this long after they
+// were fetched. Older pages are still returned by peekTelemetry() so the UI can
+// show them while it revalidates (stale-while-revalidate).
+const FRESH_FOR_MS = 15_000
+// Most pages kept; the least recently used are dropped first.
+const MAX_CACHED_PAGES = 50
+
+interface CachedPage {
+  filters: TelemetryFilters
+  ordering: string
+  cursor: string | null
+  data: EntryPage
+  // When the page was fetched, or 0 once a write may have changed it.
+  fetchedAt: number
+}
+
+interface PendingRequest {
+  url: string
+  promise: Promise<EntryPage>
+  controller: AbortController
+  // Callers still waiting; the request is aborted when the last one gives up.
+  waiters: number
+}
+
+// Keyed on the request URL, which holds every query parameter.
+const pageCache = new Map<string, CachedPage>()
+const pendingRequests = new Map<string, PendingRequest>()
+// Bumped by every write. A response to a request started before a write is
+// cached as stale, since it may predate the change.
+let writeGeneration = 0
+
+export interface QueryOptions {
+  // Entries per page, up to the server's maximum of 1000; its default of 50
+  // when omitted.
+  pageSize?: number
+}
+
+export interface FetchOptions extends QueryOptions {
+  // Aborting stops waiting; the request itself is cancelled once every caller
+  // waiting for it has aborted.
+  signal?: AbortSignal
+}
+
+export function telemetryUrl(
   filters: TelemetryFilters,
-  ordering?: string
-): Promise<PaginatedResponse<TelemetryEntry>> {
+  ordering?: string,
+  cursor?: string | null,
+  options: QueryOptions = {}
+): string {
   const params = new URLSearchParams()
   if (filters.satellite_id) params.set('satellite_id', filters.satellite_id)
   if (filters.status) params.set('status', filters.status)
-  if (page) params.set('page', String(page))
   if (ordering) params.set('ordering', ordering)
-  const qs = params.toString()
-  const url = API_BASE + (qs ? '?' + qs : '')
-  const resp = await fetch(url)
+  params.set('pagination', 'cursor')
+  if (options.pageSize) params.set('page_size', String(options.pageSize))
+  if (cursor) params.set('cursor', cursor)
+  return API_BASE + '?' + params.toString()
+}
+
+// Fetch a page of entries. A page fetched in the last FRESH_FOR_MS is returned
+// from the cache, and identical requests already in flight are shared rather
+// than repeated.
+export async function fetchTelemetry(
+  filters: TelemetryFilters,
+  ordering?: string,
+  cursor?: string | null,
+  options: FetchOptions = {}
+): Promise<EntryPage> {
+  const url = telemetryUrl(filters, ordering, cursor, options)
+  const cached = pageCache.get(url)
+  if (cached && Date.now() - cached.fetchedAt < FRESH_FOR_MS) {
+    touch(url, cached)
+    return cached.data
+  }
+  const request =
+    pendingRequests.get(url) ??
+    startRequest(url, { filters, ordering: ordering ?? '', cursor: cursor ?? null })
+  return waitFor(request, options.signal)
+}
+
+// The cached page for a query, however old, or undefined. Show it straight
+// away and call fetchTelemetry() for a current one.
+export function peekTelemetry(
+  filters: TelemetryFilters,
+  ordering?: string,
+  cursor?: string | null,
+  options: QueryOptions = {}
+): EntryPage | undefined {
+  return pageCache.get(telemetryUrl(filters, ordering, cursor, options))?.data
+}
+
+// Warm the cache with a page the user is likely to open next.
+export function prefetchTelemetry(
+  filters: TelemetryFilters,
+  ordering?: string,
+  cursor?: string | null,
+  options: QueryOptions = {}
+): void {
+  fetchTelemetry(filters, ordering, cursor, { pageSize: options.pageSize }).catch(() => {})
+}
+
+export function clearTelemetryCache(): void {
+  pageCache.clear()
+  pendingRequests.forEach((request) => request.controller.abort())
+  pendingRequests.clear()
+}
+
+function startRequest(
+  url: string,
+  query: Omit<CachedPage, 'data' | 'fetchedAt'>
+): PendingRequest {
+  const controller = new AbortController()
+  const generation = writeGeneration
+  const promise = fetch(url, { signal: controller.signal })
+    .then((resp) => handleResponse<EntryPage>(resp))
+    .then((data) => {
+      const fetchedAt = generation === writeGeneration ? Date.now() : 0
+      touch(url, { ...query, data, fetchedAt })
+      return data
+    })
+    .finally(() => {
+      if (pendingRequests.get(url) === request) pendingRequests.delete(url)
+    })
+  const request: PendingRequest = { url, promise, controller, waiters: 0 }
+  pendingRequests.set(url, request)
+  return request
+}
+
+function waitFor(request: PendingRequest, signal?: AbortSignal): Promise<EntryPage> {
+  request.waiters += 1
+  if (!signal) return request.promise
+  if (signal.aborted) {
+    release(request)
+    return Promise.reject(new DOMException('The request was superseded.', 'AbortError'))
+  }
+  return new Promise((resolve, reject) => {
+    const onAbort = () => {
+      release(request)
+      reject(new DOMException('The request was superseded.', 'AbortError'))
+    }
+    signal.addEventListener('abort', onAbort, { once: true })
+    request.promise
+      .then(resolve, reject)
+      .finally(() => signal.removeEventListener('abort', onAbort))
+  })
+}
+
+function release(request: PendingRequest) {
+  request.waiters -= 1
+  if (request.waiters > 0) return
+  // Later callers start afresh rather than join a cancelled request.
+  if (pendingRequests.get(request.url) === request) pendingRequests.delete(request.url)
+  request.controller.abort()
+}
+
+// Store a page as the most recently used, dropping the least recently used
+// beyond MAX_CACHED_PAGES.
+function touch(url: string, page: CachedPage) {
+  pageCache.delete(url)
+  pageCache.set(url, page)
+  while (pageCache.size > MAX_CACHED_PAGES) {
+    pageCache.delete(pageCache.keys().next().value as string)
+  }
+}
+
+function matchesFilters(entry: TelemetryEntry, filters: TelemetryFilters): boolean {
+  return (
+    (!filters.satellite_id || entry.satellite_id === filters.satellite_id) &&
+    (!filters.status || entry.status === filters.status)
+  )
+}
+
+function orderingField(ordering: string): keyof TelemetryEntry {
+  return (ordering.replace(/^-/, '') || 'timestamp') as keyof TelemetryEntry
+}
+
+function withResults(page: CachedPage, results: TelemetryEntry[]): CachedPage {
+  return { ...page, data: { ...page.data, results } }
+}
+
+// Patch every cached page for a written entry, so the UI can show the change
+// without fetching again. `entry` is null for a delete. Cursor pages are
+// bounded by values rather than offsets, so a write only ever changes the
+// pages the entry leaves or joins. Where its new place cannot be worked out
+// locally, the page is marked stale and the next fetchTelemetry() for it goes
+// to the server.
+function applyWrite(id: number, entry: TelemetryEntry | null, created: boolean) {
+  writeGeneration += 1
+  pageCache.forEach((page, url) => {
+    const index = page.data.results.findIndex((e) => e.id === id)
+    const joins = entry !== null && matchesFilters(entry, page.filters)
+    let patched = page
+
+    if (index >= 0) {
+      const results = [...page.data.results]
+      const field = orderingField(page.ordering)
+      if (entry && joins && results[index][field] === entry[field]) {
+        results[index] = entry
+        patched = withResults(page, results)
+      } else {
+        results.splice(index, 1)
+        patched = { ...withResults(page, results), fetchedAt: joins ? 0 : page.fetchedAt }
+      }
+    } else if (entry && joins) {
+      // A new entry goes first on the newest-first first page when it is the
+      // newest, as the stream does; anywhere else its place is unknown.
+      const first = page.data.results[0]
+      const newest = !first || Date.parse(entry.timestamp) >= Date.parse(first.timestamp)
+      if (created && page.cursor === null && page.ordering === '-timestamp' && newest) {
+        patched = withResults(page, [entry, ...page.data.results])
+      } else {
+        patched = { ...page, fetchedAt: 0 }
+      }
+    }
+    if (patched !== page) pageCache.set(url, patched)
+  })
+}
+
+function isCached(id: number): boolean {
+  for (const page of pageCache.values()) {
+    if (page.data.results.some((e) => e.id === id)) return true
+  }
+  return false
+}
+
+export async function fetchSatellites(): Promise<SatelliteState[]> {
+  const resp = await fetch(SATELLITES_URL)
   return handleResponse(resp)
 }
 
+// Open a live feed of newly inserted entries. EventSource reconnects on its own
+// and resumes from the last event it saw; `onReset` fires when the server could
+// not replay everything that was missed, so the caller should reload instead.
+// Returns a function that closes the feed.
+export function subscribeTelemetry(
+  satelliteId: string,
+  onEntry: (entry: TelemetryEntry) => void,
+  onReset?: () => void
+): () => void {
+  if (typeof EventSource === 'undefined') return () => {}
+  const params = new URLSearchParams()
+  if (satelliteId) params.set('satellite_id', satelliteId)
+  const query = params.toString()
+  const source = new EventSource(query ? `${STREAM_URL}?${query}` : STREAM_URL)
+  source.addEventListener('telemetry', (event) => {
+    const entry: TelemetryEntry = JSON.parse((event as MessageEvent).data)
+    if (!isCached(entry.id)) applyWrite(entry.id, entry, true)
+    onEntry(entry)
+  })
+  if (onReset) source.addEventListener('reset', onReset)
+  return () => source.close()
+}
+
+// Writes patch the cached pages (see applyWrite()) once the server accepts them.
 export async function createEntry(
   body: Omit<TelemetryEntry, 'id'>
 ): Promise<TelemetryEntry> {
@@ -44,7 +294,11 @@ export async function createEntry(
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(body),
   })
-  return handleResponse(resp)
+  const entry = await handleResponse<TelemetryEntry>(resp)
+  // With queued ingest the server answers 202 before the entry exists; the
+  // stream delivers it once it is written.
+  if (resp.status !== 202) applyWrite(entry.id, entry, true)
+  return entry
 }
 
 export async function getEntry(id: number): Promise<TelemetryEntry> {
@@ -61,7 +315,9 @@ export async function updateEntry(
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(body),
   })
-  return handleResponse(resp)
+  const entry = await handleResponse<TelemetryEntry>(resp)
+  applyWrite(id, entry, false)
+  return entry
 }
 
 export async function deleteEntry(id: number): Promise<void> {
@@ -70,4 +326,5 @@ export async function deleteEntry(id: number): Promise<void> {
     const data = await resp.json().catch(() => null)
     throw new Error(data ? formatErrors(data) : `Server error: ${resp.status}`)
   }
+  applyWrite(id, null, false)
 }
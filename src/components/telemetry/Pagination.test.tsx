@@ -4,42 +4,39 @@ import { describe, it, expect, vi } from 'vitest'
 import Pagination from './Pagination'
 
 describe('Pagination', () => {
-  it('renders nothing when totalPages is 1', () => {
+  it('renders nothing when there is only one page', () => {
     const { container } = render(
       <Pagination
-        currentPage={1}
-        totalPages={1}
         hasNext={false}
         hasPrevious={false}
-        onPageChange={vi.fn()}
+        onNext={vi.fn()}
+        onPrevious={vi.fn()}
       />
     )
     expect(container.innerHTML).toBe('')
   })
 
-  it('renders page buttons for multiple pages', () => {
+  it('renders Previous and Next without page numbers', () => {
     render(
       <Pagination
-        currentPage={1}
-        totalPages={3}
         hasNext={true}
-        hasPrevious={false}
-        onPageChange={vi.fn()}
+        hasPrevious={true}
+        onNext={vi.fn()}
+        onPrevious={vi.fn()}
       />
     )
-    expect(screen.getByText('1')).toBeInTheDocument()
-    expect(screen.getByText('2')).toBeInTheDocument()
-    expect(screen.getByText('3')).toBeInTheDocument()
+    expect(screen.getByText(/Previous/)).toBeInTheDocument()
+    expect(screen.getByText(/Next/)).toBeInTheDocument()
+    expect(screen.queryByText('1')).not.toBeInTheDocument()
   })
 
   it('disables Previous button on first page', () => {
     render(
       <Pagination
-        currentPage={1}
-        totalPages={3}
         hasNext={true}
         hasPrevious={false}
-        onPageChange={vi.fn()}
+        onNext={vi.fn()}
+        onPrevious={vi.fn()}
       />
     )
     expect(screen.getByText(/Previous/)).toBeDisabled()
@@ -48,57 +45,40 @@ describe('Pagination', () => {
   it('disables Next button on last page', () => {
     render(
       <Pagination
-        currentPage={3}
-        totalPages={3}
         hasNext={false}
         hasPrevious={true}
-        onPageChange={vi.fn()}
+        onNext={vi.fn()}
+        onPrevious={vi.fn()}
       />
     )
     expect(screen.getByText(/Next/)).toBeDisabled()
   })
 
-  it('marks current page as active', () => {
-    render(
-      <Pagination
-        currentPage={2}
-        totalPages={3}
-        hasNext={true}
-        hasPrevious={true}
-        onPageChange={vi.fn()}
-      />
-    )
-    expect(screen.getByText('2').closest('li')).toHaveClass('active')
-    expect(screen.getByText('1').closest('li')).not.toHaveClass('active')
-  })
-
-  it('calls onPageChange with correct page number', async () => {
-    const onPageChange = vi.fn()
+  it('calls onNext for Next button', async () => {
+    const onNext = vi.fn()
     render(
       <Pagination
-        currentPage={1}
-        totalPages={3}
         hasNext={true}
         hasPrevious={false}
-        onPageChange={onPageChange}
+        onNext={onNext}
+        onPrevious={vi.fn()}
       />
     )
-    await userEvent.click(screen.getByText('2'))
-    expect(onPageChange).toHaveBeenCalledWith(2)
+    await userEvent.click(screen.getByText(/Next/))
+    expect(onNext).toHaveBeenCalled()
   })
 
-  it('calls onPageChange for Next button', async () => {
-    const onPageChange = vi.fn()
+  it('calls onPrevious for Previous button', async () => {
+    const onPrevious = vi.fn()
     render(
       <Pagination
-        currentPage={1}
-        totalPages={3}
-        hasNext={true}
-        hasPrevious={false}
-        onPageChange={onPageChange}
+        hasNext={false}
+        hasPrevious={true}
+        onNext={vi.fn()}
+        onPrevious={onPrevious}
       />
     )
-    await userEvent.click(screen.getByText(/Next/))
-    expect(onPageChange).toHaveBeenCalledWith(2)
+    await userEvent.click(screen.getByText(/Previous/))
+    expect(onPrevious).toHaveBeenCalled()
   })
 })
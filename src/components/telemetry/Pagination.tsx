@@ -1,21 +1,19 @@
 interface PaginationProps {
-  currentPage: number
-  totalPages: number
   hasNext: boolean
   hasPrevious: boolean
-  onPageChange: (page: number) => void
+  onNext: () => void
+  onPrevious: () => void
 }
 
+// Cursor pages have no total count or page numbers, so navigation is limited
+// to stepping through the opaque next/previous cursors returned by the API.
 export default function Pagination({
-  currentPage,
-  totalPages,
   hasNext,
   hasPrevious,
-  onPageChange,
+  onNext,
+  onPrevious,
 }: PaginationProps) {
-  if (totalPages <= 1) return null
-
-  const pages = Array.from({ length: totalPages }, (_, i) => i + 1)
+  if (!hasNext && !hasPrevious) return null
 
   return (
     <nav aria-label="Telemetry pagination">
@@ -23,26 +21,16 @@ export default function Pagination({
         <li className={`page-item ${hasPrevious ? '' : 'disabled'}`}>
           <button
             className="page-link"
-            onClick={() => onPageChange(currentPage - 1)}
+            onClick={onPrevious}
             disabled={!hasPrevious}
           >
             &laquo; Previous
           </button>
         </li>
-        {pages.map((page) => (
-          <li
-            key={page}
-            className={`page-item ${page === currentPage ? 'active' : ''}`}
-          >
-            <button className="page-link" onClick={() => onPageChange(page)}>
-              {page}
-            </button>
-          </li>
-        ))}
         <li className={`page-item ${hasNext ? '' : 'disabled'}`}>
           <button
             className="page-link"
-            onClick={() => onPageChange(currentPage + 1)}
+            onClick={onNext}
             disabled={!hasNext}
           >
             Next &raquo;
@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { memo, useState } from 'react'
 import { HealthStatus, TelemetryEntry } from '../../types'
 
 interface TelemetryRowProps {
@@ -8,6 +8,8 @@ interface TelemetryRowProps {
   onSaveEdit: (id: number, data: Omit<TelemetryEntry, 'id'>) => Promise<void>
   onCancelEdit: () => void
   onDelete: (id: number) => void
+  // Fixed row height in pixels, which the virtualized table relies on.
+  height?: number
 }
 
 function formatTimestamp(isoString: string): string {
@@ -56,14 +58,17 @@ function StatusBadge({ status }: { status: string }) {
   )
 }
 
-export default function TelemetryRow({
+function TelemetryRow({
   entry,
   isEditing,
   onStartEdit,
   onSaveEdit,
   onCancelEdit,
   onDelete,
+  height,
 }: TelemetryRowProps) {
+  const style = height ? { height } : undefined
+
   const [editData, setEditData] = useState({
     satellite_id: entry.satellite_id,
     timestamp: toDatetimeLocalValue(entry.timestamp),
@@ -85,7 +90,7 @@ export default function TelemetryRow({
 
   if (isEditing) {
     return (
-      <tr>
+      <tr style={style}>
         <td>
           <input
             type="text"
@@ -165,7 +170,7 @@ export default function TelemetryRow({
   }
 
   return (
-    <tr>
+    <tr style={style}>
       <td className="fw-bold">{entry.satellite_id}</td>
       <td>{formatTimestamp(entry.timestamp)}</td>
       <td>{entry.altitude.toFixed(2)}</td>
@@ -192,3 +197,7 @@ export default function TelemetryRow({
     </tr>
   )
 }
+
+// Rows re-render only when their own props change, not whenever the table
+// does, e.g. on every scroll of a virtualized table or streamed entry.
+export default memo(TelemetryRow)
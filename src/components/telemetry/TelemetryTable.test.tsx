@@ -1,8 +1,8 @@
-import { render, screen } from '@testing-library/react'
+import { fireEvent, render, screen } from '@testing-library/react'
 import userEvent from '@testing-library/user-event'
 import { describe, it, expect, vi } from 'vitest'
 import { TelemetryEntry } from '../../types'
-import TelemetryTable from './TelemetryTable'
+import TelemetryTable, { ROW_HEIGHT, visibleRange } from './TelemetryTable'
 
 const mockEntries: TelemetryEntry[] = [
   {
@@ -108,3 +108,63 @@ describe('TelemetryTable', () => {
     expect(velocityHeader).toHaveAttribute('aria-sort', 'ascending')
   })
 })
+
+describe('virtualized TelemetryTable', () => {
+  const manyEntries: TelemetryEntry[] = Array.from({ length: 100_000 }, (_, i) => ({
+    ...mockEntries[0],
+    id: i + 1,
+    satellite_id: `SAT-${i + 1}`,
+  }))
+
+  function dataRows() {
+    return screen.getAllByRole('row').filter((row) => row.querySelector('td'))
+  }
+
+  // jsdom does no layout, so the scroll position is set by hand.
+  function scrollToRow(row: number) {
+    const scroller = screen.getByRole('table').parentElement!
+    Object.defineProperty(scroller, 'scrollTop', {
+      configurable: true,
+      value: row * ROW_HEIGHT,
+    })
+    fireEvent.scroll(scroller)
+  }
+
+  it('renders only the rows in view', () => {
+    render(<TelemetryTable {...defaultProps} entries={manyEntries} virtualized />)
+    const rows = dataRows()
+    expect(rows.length).toBeLessThan(50)
+    expect(screen.getByText('SAT-1')).toBeInTheDocument()
+    expect(screen.queryByText('SAT-100000')).not.toBeInTheDocument()
+  })
+
+  it('renders further rows when scrolled', () => {
+    render(<TelemetryTable {...defaultProps} entries={manyEntries} virtualized />)
+    scrollToRow(50_000)
+    expect(screen.getByText('SAT-50001')).toBeInTheDocument()
+    expect(screen.queryByText('SAT-1')).not.toBeInTheDocument()
+    expect(dataRows().length).toBeLessThan(50)
+  })
+
+  it('calls onEndReached near the last row', () => {
+    const onEndReached = vi.fn()
+    render(
+      <TelemetryTable
+        {...defaultProps}
+        entries={manyEntries}
+        virtualized
+        onEndReached={onEndReached}
+      />
+    )
+    expect(onEndReached).not.toHaveBeenCalled()
+    scrollToRow(99_990)
+    expect(onEndReached).toHaveBeenCalled()
+  })
+
+  it('keeps the window on an even row', () => {
+    expect(visibleRange(0, 100)).toEqual([0, 23])
+    expect(visibleRange(15 * ROW_HEIGHT, 100)).toEqual([4, 38])
+    // A list that shrank below the scroll position keeps its last rows.
+    expect(visibleRange(1000 * ROW_HEIGHT, 11)).toEqual([10, 11])
+  })
+})
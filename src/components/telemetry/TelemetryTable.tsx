@@ -1,3 +1,4 @@
+import { UIEvent, useEffect, useState } from 'react'
 import { TelemetryEntry, SortConfig } from '../../types'
 import TelemetryRow from './TelemetryRow'
 
@@ -9,6 +10,15 @@ const SORTABLE_COLUMNS: { field: string; label: string }[] = [
   { field: 'status', label: 'Health Status' },
 ]
 
+// Virtualized mode renders only the rows in view, plus OVERSCAN_ROWS either
+// side, inside a scroll box VIEWPORT_HEIGHT pixels high. Rows are fixed at
+// ROW_HEIGHT, the height of a row of small buttons or inputs, so positions are
+// computed rather than measured and the rows out of view are stood in for by
+// two spacer rows.
+export const ROW_HEIGHT = 49
+export const VIEWPORT_HEIGHT = 600
+export const OVERSCAN_ROWS = 10
+
 interface TelemetryTableProps {
   entries: TelemetryEntry[]
   loading: boolean
@@ -19,6 +29,26 @@ interface TelemetryTableProps {
   onSaveEdit: (id: number, data: Omit<TelemetryEntry, 'id'>) => Promise<void>
   onCancelEdit: () => void
   onDelete: (id: number) => void
+  // Render only the rows in view, for lists of thousands of entries.
+  virtualized?: boolean
+  // Called when a virtualized table is scrolled near its last row, to load
+  // more entries.
+  onEndReached?: () => void
+}
+
+// The rows of a virtualized table to render: [start, end) of `entries`.
+export function visibleRange(scrollTop: number, count: number): [number, number] {
+  let start = Math.max(
+    0,
+    Math.min(count, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS)
+  )
+  // Starting on an even row keeps the stripes from flickering while scrolling.
+  start -= start % 2
+  const end = Math.min(
+    count,
+    Math.ceil((scrollTop + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN_ROWS
+  )
+  return [start, Math.max(start, end)]
 }
 
 export default function TelemetryTable({
@@ -31,11 +61,42 @@ export default function TelemetryTable({
   onSaveEdit,
   onCancelEdit,
   onDelete,
+  virtualized = false,
+  onEndReached,
 }: TelemetryTableProps) {
+  const [scrollTop, setScrollTop] = useState(0)
+  const [start, end] = virtualized
+    ? visibleRange(scrollTop, entries.length)
+    : [0, entries.length]
+
+  useEffect(() => {
+    if (
+      virtualized &&
+      onEndReached &&
+      entries.length > 0 &&
+      end >= entries.length - OVERSCAN_ROWS
+    ) {
+      onEndReached()
+    }
+  }, [virtualized, onEndReached, end, entries.length])
+
+  function handleScroll(event: UIEvent<HTMLDivElement>) {
+    setScrollTop(event.currentTarget.scrollTop)
+  }
+
   return (
-    <div className="table-responsive">
+    <div
+      className="table-responsive"
+      style={
+        virtualized ? { height: VIEWPORT_HEIGHT, overflowY: 'auto' } : undefined
+      }
+      onScroll={virtualized ? handleScroll : undefined}
+    >
       <table className="table table-striped table-hover align-middle">
-        <thead className="table-dark">
+        <thead
+          className="table-dark"
+          style={virtualized ? { position: 'sticky', top: 0, zIndex: 1 } : undefined}
+        >
           <tr>
             {SORTABLE_COLUMNS.map(({ field, label }) => (
               <th
@@ -78,17 +139,29 @@ export default function TelemetryTable({
               </td>
             </tr>
           ) : (
-            entries.map((entry) => (
-              <TelemetryRow
-                key={entry.id}
-                entry={entry}
-                isEditing={editingId === entry.id}
-                onStartEdit={onStartEdit}
-                onSaveEdit={onSaveEdit}
-                onCancelEdit={onCancelEdit}
-                onDelete={onDelete}
-              />
-            ))
+            <>
+              {start > 0 && (
+                <tr aria-hidden="true" style={{ height: start * ROW_HEIGHT }} />
+              )}
+              {entries.slice(start, end).map((entry) => (
+                <TelemetryRow
+                  key={entry.id}
+                  entry={entry}
+                  isEditing={editingId === entry.id}
+                  onStartEdit={onStartEdit}
+                  onSaveEdit={onSaveEdit}
+                  onCancelEdit={onCancelEdit}
+                  onDelete={onDelete}
+                  height={virtualized ? ROW_HEIGHT : undefined}
+                />
+              ))}
+              {end < entries.length && (
+                <tr
+                  aria-hidden="true"
+                  style={{ height: (entries.length - end) * ROW_HEIGHT }}
+                />
+              )}
+            </>
           )}
         </tbody>
       </table>
@@ -1,4 +1,4 @@
-import { render, screen, waitFor, within } from '@testing-library/react'
+import { act, render, screen, waitFor, within } from '@testing-library/react'
 import userEvent from '@testing-library/user-event'
 import { describe, it, expect, vi, beforeEach } from 'vitest'
 import { MemoryRouter } from 'react-router-dom'
@@ -27,7 +27,6 @@ const mockEntries = [
 ]
 
 const mockResponse = {
-  count: 2,
   next: null,
   previous: null,
   results: mockEntries,
@@ -50,6 +49,12 @@ beforeEach(() => {
   vi.mocked(api.createEntry).mockResolvedValue(mockEntries[0])
   vi.mocked(api.updateEntry).mockResolvedValue(mockEntries[0])
   vi.mocked(api.deleteEntry).mockResolvedValue(undefined)
+  vi.mocked(api.subscribeTelemetry).mockReturnValue(() => {})
+  vi.mocked(api.fetchSatellites).mockResolvedValue(
+    [...mockEntries, { ...mockEntries[0], id: 9, satellite_id: 'SAT-009' }].map(
+      (entry) => ({ satellite_id: entry.satellite_id, last_seen: entry.timestamp, latest: entry })
+    )
+  )
 })
 
 describe('TelemetryPage', () => {
@@ -70,7 +75,7 @@ describe('TelemetryPage', () => {
   it('shows entry count after loading', async () => {
     renderPage()
     await waitFor(() => {
-      expect(screen.getByText('Showing 2 of 2 entries')).toBeInTheDocument()
+      expect(screen.getByText('Showing 2 entries')).toBeInTheDocument()
     })
   })
 
@@ -78,11 +83,140 @@ describe('TelemetryPage', () => {
     renderPage()
     await waitFor(() => {
       expect(api.fetchTelemetry).toHaveBeenCalledWith(
-        1,
         { satellite_id: '', status: '' },
-        '-timestamp'
+        '-timestamp',
+        null,
+        expect.objectContaining({ signal: expect.any(AbortSignal) })
+      )
+    })
+  })
+
+  it('follows the next cursor when Next is clicked', async () => {
+    vi.mocked(api.fetchTelemetry).mockResolvedValueOnce({
+      ...mockResponse,
+      next: 'http://testserver/api/telemetry/?cursor=abc',
+    })
+    vi.mocked(api.cursorFromLink).mockImplementation((link) =>
+      link ? 'abc' : null
+    )
+    renderPage()
+    await userEvent.click(await screen.findByText(/Next/))
+    await waitFor(() => {
+      expect(api.fetchTelemetry).toHaveBeenLastCalledWith(
+        { satellite_id: '', status: '' },
+        '-timestamp',
+        'abc',
+        expect.objectContaining({ signal: expect.any(AbortSignal) })
+      )
+    })
+  })
+
+  it('prefetches the next page', async () => {
+    vi.mocked(api.fetchTelemetry).mockResolvedValueOnce({
+      ...mockResponse,
+      next: 'http://testserver/api/telemetry/?cursor=abc',
+    })
+    vi.mocked(api.cursorFromLink).mockImplementation((link) =>
+      link ? 'abc' : null
+    )
+    renderPage()
+    await waitFor(() => {
+      expect(api.prefetchTelemetry).toHaveBeenCalledWith(
+        { satellite_id: '', status: '' },
+        '-timestamp',
+        'abc',
+        {}
+      )
+    })
+  })
+
+  it('loads large chunks in continuous scroll mode', async () => {
+    renderPage()
+    await waitFor(() => {
+      expect(screen.getByText('Showing 2 entries')).toBeInTheDocument()
+    })
+    await userEvent.click(screen.getByLabelText('Continuous scroll'))
+    await waitFor(() => {
+      expect(api.fetchTelemetry).toHaveBeenLastCalledWith(
+        { satellite_id: '', status: '' },
+        '-timestamp',
+        null,
+        expect.objectContaining({ pageSize: 1000 })
       )
     })
+    expect(screen.queryByText(/Next/)).not.toBeInTheDocument()
+  })
+
+  it('appends the next chunk when scrolled to the end', async () => {
+    vi.mocked(api.fetchTelemetry).mockImplementation(async (_filters, _ordering, cursor) =>
+      cursor === 'abc'
+        ? { ...mockResponse, results: [{ ...mockEntries[0], id: 3, satellite_id: 'SAT-003' }] }
+        : { ...mockResponse, next: 'http://testserver/api/telemetry/?cursor=abc' }
+    )
+    vi.mocked(api.cursorFromLink).mockImplementation((link) =>
+      link ? 'abc' : null
+    )
+    renderPage()
+    await userEvent.click(screen.getByLabelText('Continuous scroll'))
+    // Two entries leave the end of the list in view, so the next chunk
+    // follows the first straight away.
+    await waitFor(() => {
+      expect(screen.getByText('Showing 3 entries')).toBeInTheDocument()
+    })
+    expect(api.fetchTelemetry).toHaveBeenLastCalledWith(
+      { satellite_id: '', status: '' },
+      '-timestamp',
+      'abc',
+      expect.objectContaining({ pageSize: 1000 })
+    )
+  })
+
+  it('shows a cached page while it is revalidated', async () => {
+    vi.mocked(api.peekTelemetry).mockReturnValueOnce(mockResponse)
+    vi.mocked(api.fetchTelemetry).mockReturnValueOnce(new Promise(() => {}))
+    renderPage()
+    expect(screen.getByText('Showing 2 entries')).toBeInTheDocument()
+  })
+
+  it('lists every known satellite in the filter', async () => {
+    renderPage()
+    const select = screen.getByLabelText('Satellite ID')
+    await waitFor(() => {
+      expect(within(select).getByText('SAT-009')).toBeInTheDocument()
+    })
+    expect(api.fetchSatellites).toHaveBeenCalledTimes(1)
+  })
+
+  it('prepends streamed entries to the first page', async () => {
+    renderPage()
+    await waitFor(() => {
+      expect(screen.getByText('Showing 2 entries')).toBeInTheDocument()
+    })
+    const calls = vi.mocked(api.subscribeTelemetry).mock.calls
+    const onEntry = calls[calls.length - 1][1]
+    act(() => {
+      onEntry({ ...mockEntries[0], id: 3, satellite_id: 'SAT-003' })
+      onEntry(mockEntries[0])
+    })
+    expect(within(getTable()).getByText('SAT-003')).toBeInTheDocument()
+    expect(screen.getByText('Showing 3 entries')).toBeInTheDocument()
+  })
+
+  it('does not stream onto later pages', async () => {
+    vi.mocked(api.fetchTelemetry).mockResolvedValueOnce({
+      ...mockResponse,
+      next: 'http://testserver/api/telemetry/?cursor=abc',
+    })
+    vi.mocked(api.cursorFromLink).mockImplementation((link) =>
+      link ? 'abc' : null
+    )
+    const close = vi.fn()
+    vi.mocked(api.subscribeTelemetry).mockReturnValue(close)
+    renderPage()
+    await userEvent.click(await screen.findByText(/Next/))
+    await waitFor(() => {
+      expect(close).toHaveBeenCalled()
+    })
   })
 
   it('shows error when fetchTelemetry fails', async () => {
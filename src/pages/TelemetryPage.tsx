@@ -1,5 +1,5 @@
-import { useCallback, useEffect, useRef, useState } from 'react'
-import { TelemetryEntry, TelemetryFilters, SortConfig } from '../types'
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react'
+import { CursorPaginatedResponse, TelemetryEntry, TelemetryFilters, SortConfig } from '../types'
 import * as api from '../api'
 import AlertBanner from '../components/telemetry/AlertBanner'
 import FilterBar from '../components/telemetry/FilterBar'
@@ -7,10 +7,16 @@ import AddEntryForm from '../components/telemetry/AddEntryForm'
 import TelemetryTable from '../components/telemetry/TelemetryTable'
 import Pagination from '../components/telemetry/Pagination'
 
+// Entries fetched at a time in continuous scroll mode.
+const SCROLL_CHUNK_SIZE = 1000
+
 export default function TelemetryPage() {
   const [entries, setEntries] = useState<TelemetryEntry[]>([])
-  const [count, setCount] = useState(0)
-  const [currentPage, setCurrentPage] = useState(1)
+  // Cursor of the page on screen (null for the first page) and the cursors
+  // either side of it, as returned by the API.
+  const [cursor, setCursor] = useState<string | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [previousCursor, setPreviousCursor] = useState<string | null>(null)
   const [hasNext, setHasNext] = useState(false)
   const [hasPrevious, setHasPrevious] = useState(false)
   const [loading, setLoading] = useState(true)
@@ -24,96 +30,224 @@ export default function TelemetryPage() {
     direction: 'desc',
   })
   const [editingId, setEditingId] = useState<number | null>(null)
+  // Continuous scroll shows one long virtualized list that grows by a chunk
+  // whenever the end comes into view, instead of pages of 50.
+  const [scrolling, setScrolling] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [success, setSuccess] = useState<string | null>(null)
 
   const errorTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null)
   const successTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null)
 
-  function showError(message: string) {
+  const showError = useCallback((message: string) => {
     if (errorTimerRef.current) clearTimeout(errorTimerRef.current)
     setError(message)
     errorTimerRef.current = setTimeout(() => setError(null), 8000)
-  }
+  }, [])
 
-  function showSuccess(message: string) {
+  const showSuccess = useCallback((message: string) => {
     if (successTimerRef.current) clearTimeout(successTimerRef.current)
     setSuccess(message)
     successTimerRef.current = setTimeout(() => setSuccess(null), 4000)
-  }
+  }, [])
 
   const ordering =
     sortConfig.direction === 'desc'
       ? `-${sortConfig.field}`
       : sortConfig.field
 
+  const pageQuery = useMemo<api.QueryOptions>(
+    () => (scrolling ? { pageSize: SCROLL_CHUNK_SIZE } : {}),
+    [scrolling]
+  )
+
+  // Aborted when a newer load replaces it, e.g. on the next filter change.
+  const loadControllerRef = useRef<AbortController | null>(null)
+  const loadingMoreRef = useRef(false)
+
+  const showPage = useCallback(
+    (data: CursorPaginatedResponse<TelemetryEntry>, pageCursor: string | null) => {
+      setEntries(data.results)
+      setCursor(pageCursor)
+      setHasNext(data.next !== null)
+      setHasPrevious(data.previous !== null)
+      setNextCursor(api.cursorFromLink(data.next))
+      setPreviousCursor(api.cursorFromLink(data.previous))
+    },
+    []
+  )
+
+  // Show the cached copy of the page at once, if there is one, then whatever
+  // fetchTelemetry returns: the same page while it is fresh, otherwise the
+  // server's. The page after it is prefetched so Next is instant.
   const loadData = useCallback(
-    async (page: number) => {
-      setLoading(true)
+    async (pageCursor: string | null) => {
+      loadControllerRef.current?.abort()
+      const controller = new AbortController()
+      loadControllerRef.current = controller
+
+      const cached = api.peekTelemetry(filters, ordering, pageCursor, pageQuery)
+      if (cached) showPage(cached, pageCursor)
+      setLoading(!cached)
       try {
-        const data = await api.fetchTelemetry(page, filters, ordering)
-        setEntries(data.results)
-        setCount(data.count)
-        setCurrentPage(page)
-        setHasNext(data.next !== null)
-        setHasPrevious(data.previous !== null)
-
-        // Accumulate satellite IDs across pages.
-        const newIds = data.results.map((e) => e.satellite_id)
-        setSatelliteIds((prev) => {
-          const combined = new Set([...prev, ...newIds])
-          return [...combined].sort()
+        const data = await api.fetchTelemetry(filters, ordering, pageCursor, {
+          ...pageQuery,
+          signal: controller.signal,
         })
+        showPage(data, pageCursor)
+        if (data.next) {
+          api.prefetchTelemetry(
+            filters,
+            ordering,
+            api.cursorFromLink(data.next),
+            pageQuery
+          )
+        }
       } catch (err) {
+        if (controller.signal.aborted) return
         showError(err instanceof Error ? err.message : 'Failed to load data.')
       } finally {
-        setLoading(false)
+        if (loadControllerRef.current === controller) setLoading(false)
       }
     },
-    [filters, ordering]
+    [filters, ordering, pageQuery, showPage, showError]
   )
 
   useEffect(() => {
-    loadData(1)
+    loadData(null)
   }, [loadData])
 
-  // Clean up timers on unmount.
+  // Append the next chunk in continuous scroll mode. It belongs to the list
+  // the last loadData() started, so it is dropped if that has been replaced.
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMoreRef.current) return
+    const signal = loadControllerRef.current?.signal
+    loadingMoreRef.current = true
+    try {
+      const data = await api.fetchTelemetry(filters, ordering, nextCursor, {
+        ...pageQuery,
+        signal,
+      })
+      setEntries((prev) => [...prev, ...data.results])
+      setHasNext(data.next !== null)
+      setNextCursor(api.cursorFromLink(data.next))
+      if (data.next) {
+        api.prefetchTelemetry(
+          filters,
+          ordering,
+          api.cursorFromLink(data.next),
+          pageQuery
+        )
+      }
+    } catch (err) {
+      if (signal?.aborted) return
+      showError(err instanceof Error ? err.message : 'Failed to load data.')
+    } finally {
+      loadingMoreRef.current = false
+    }
+  }, [filters, ordering, pageQuery, nextCursor, showError])
+
+  // The filter lists every known satellite, not just those on screen.
+  const loadSatellites = useCallback(async () => {
+    try {
+      const states = await api.fetchSatellites()
+      setSatelliteIds(states.map((s) => s.satellite_id))
+    } catch (err) {
+      showError(err instanceof Error ? err.message : 'Failed to load satellites.')
+    }
+  }, [showError])
+
+  useEffect(() => {
+    loadSatellites()
+  }, [loadSatellites])
+
+  // Stream new entries onto the first page while it shows the newest first.
+  // Other pages and orderings would need the new rows placed mid-list, so they
+  // only change on reload.
+  const live = cursor === null && ordering === '-timestamp'
+
+  useEffect(() => {
+    if (!live) return
+    return api.subscribeTelemetry(
+      filters.satellite_id,
+      (entry) => {
+        if (filters.status && entry.status !== filters.status) return
+        setEntries((prev) =>
+          prev.some((e) => e.id === entry.id) ? prev : [entry, ...prev]
+        )
+        setSatelliteIds((prev) =>
+          prev.includes(entry.satellite_id)
+            ? prev
+            : [...prev, entry.satellite_id].sort()
+        )
+      },
+      () => loadData(null)
+    )
+  }, [live, filters, loadData])
+
+  // Clean up timers and any load in flight on unmount.
   useEffect(() => {
     return () => {
       if (errorTimerRef.current) clearTimeout(errorTimerRef.current)
       if (successTimerRef.current) clearTimeout(successTimerRef.current)
+      loadControllerRef.current?.abort()
     }
   }, [])
 
+  // Writes patch the API layer's cached pages, so reloading the page after
+  // one shows the change from the cache. Only a page the change could not be
+  // placed on goes back to the server. A continuous list is patched in place
+  // instead, so edits far down it keep their scroll position; new entries
+  // reload it from the top.
   async function handleAddEntry(entryData: Omit<TelemetryEntry, 'id'>) {
     await api.createEntry(entryData)
     showSuccess('Telemetry entry added successfully.')
-    loadData(currentPage)
+    loadData(cursor)
+    setSatelliteIds((prev) =>
+      prev.includes(entryData.satellite_id)
+        ? prev
+        : [...prev, entryData.satellite_id].sort()
+    )
   }
 
-  async function handleSaveEdit(
-    id: number,
-    data: Omit<TelemetryEntry, 'id'>
-  ) {
-    try {
-      await api.updateEntry(id, data)
-      showSuccess('Entry updated successfully.')
-      setEditingId(null)
-      loadData(currentPage)
-    } catch (err) {
-      showError(err instanceof Error ? err.message : 'Failed to update entry.')
-    }
-  }
+  // The row callbacks keep their identity across renders that only stream in
+  // an entry or show a banner, so the memoized rows are left alone.
+  const handleSaveEdit = useCallback(
+    async (id: number, data: Omit<TelemetryEntry, 'id'>) => {
+      try {
+        const entry = await api.updateEntry(id, data)
+        showSuccess('Entry updated successfully.')
+        setEditingId(null)
+        if (scrolling) {
+          setEntries((prev) => prev.map((e) => (e.id === id ? entry : e)))
+        } else {
+          loadData(cursor)
+        }
+      } catch (err) {
+        showError(err instanceof Error ? err.message : 'Failed to update entry.')
+      }
+    },
+    [scrolling, cursor, loadData, showSuccess, showError]
+  )
 
-  async function handleDelete(id: number) {
-    try {
-      await api.deleteEntry(id)
-      showSuccess('Entry deleted.')
-      loadData(currentPage)
-    } catch (err) {
-      showError(err instanceof Error ? err.message : 'Failed to delete entry.')
-    }
-  }
+  const handleCancelEdit = useCallback(() => setEditingId(null), [])
+
+  const handleDelete = useCallback(
+    async (id: number) => {
+      try {
+        await api.deleteEntry(id)
+        showSuccess('Entry deleted.')
+        if (scrolling) {
+          setEntries((prev) => prev.filter((e) => e.id !== id))
+        } else {
+          loadData(cursor)
+        }
+      } catch (err) {
+        showError(err instanceof Error ? err.message : 'Failed to delete entry.')
+      }
+    },
+    [scrolling, cursor, loadData, showSuccess, showError]
+  )
 
   function handleSort(field: string) {
     setSortConfig((prev) =>
@@ -127,9 +261,6 @@ export default function TelemetryPage() {
     setFilters({ satellite_id: '', status: '' })
   }
 
-  const pageSize = entries.length || 50
-  const totalPages = Math.ceil(count / pageSize)
-
   return (
     <>
       <h1 className="mb-4">
@@ -149,9 +280,22 @@ export default function TelemetryPage() {
 
       <AddEntryForm onSubmit={handleAddEntry} />
 
-      <p className="text-muted mb-3">
-        Showing {entries.length} of {count} entries
-      </p>
+      <div className="d-flex justify-content-between align-items-center mb-3">
+        <p className="text-muted mb-0">Showing {entries.length} entries</p>
+        <div className="form-check form-switch mb-0">
+          <input
+            className="form-check-input"
+            type="checkbox"
+            role="switch"
+            id="continuousScroll"
+            checked={scrolling}
+            onChange={(e) => setScrolling(e.target.checked)}
+          />
+          <label className="form-check-label" htmlFor="continuousScroll">
+            Continuous scroll
+          </label>
+        </div>
+      </div>
 
       <TelemetryTable
         entries={entries}
@@ -161,17 +305,20 @@ export default function TelemetryPage() {
         onSort={handleSort}
         onStartEdit={setEditingId}
         onSaveEdit={handleSaveEdit}
-        onCancelEdit={() => setEditingId(null)}
+        onCancelEdit={handleCancelEdit}
         onDelete={handleDelete}
+        virtualized={scrolling}
+        onEndReached={hasNext ? loadMore : undefined}
       />
 
-      <Pagination
-        currentPage={currentPage}
-        totalPages={totalPages}
-        hasNext={hasNext}
-        hasPrevious={hasPrevious}
-        onPageChange={(page) => loadData(page)}
-      />
+      {!scrolling && (
+        <Pagination
+          hasNext={hasNext}
+          hasPrevious={hasPrevious}
+          onNext={() => loadData(nextCursor)}
+          onPrevious={() => loadData(previousCursor)}
+        />
+      )}
     </>
   )
 }
@@ -9,6 +9,12 @@ export interface TelemetryEntry {
   status: HealthStatus
 }
 
+export interface SatelliteState {
+  satellite_id: string
+  last_seen: string
+  latest: TelemetryEntry
+}
+
 export interface PaginatedResponse<T> {
   count: number
   next: string | null
@@ -16,6 +22,12 @@ export interface PaginatedResponse<T> {
   results: T[]
 }
 
+export interface CursorPaginatedResponse<T> {
+  next: string | null
+  previous: string | null
+  results: T[]
+}
+
 export interface TelemetryFilters {
   satellite_id: string
   status: string